@@ -18,6 +18,7 @@ SUPABASE_SERVICE_ROLE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
 
 # OpenRouter / LLM Configuration
 OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY")
+OPENROUTER_BASE_URL = os.getenv("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1")  # Or a local mock (scripts/mock_openrouter.py)
 
 # Single LLM model env var for the entire stack
 # Default: google/gemini-2.5-flash (Gemini 2.5 Flash via OpenRouter)
@@ -48,6 +49,119 @@ ELEVENLABS_API_KEY = os.getenv("ELEVENLABS_API_KEY")
 # Parallel.ai (Company Research)
 PARALLEL_API_KEY = os.getenv("PARALLEL_API_KEY")
 PARALLEL_API_URL = os.getenv("PARALLEL_API_URL", "https://api.parallel.ai/v1")
+PARALLEL_API_MODE = os.getenv("PARALLEL_API_MODE", "live")  # "local" serves searches offline from fixtures
+
+# Company research cache (keyed by normalised company domain)
+COMPANY_INTEL_FRESH_TTL = float(os.getenv("COMPANY_INTEL_FRESH_TTL", str(7 * 24 * 3600)))  # serve without refresh
+COMPANY_INTEL_STALE_TTL = float(os.getenv("COMPANY_INTEL_STALE_TTL", str(30 * 24 * 3600)))  # serve stale, refresh in background
+
+# Market insights store (offer prep salary bands keyed by normalised role + location)
+MARKET_DATA_FRESH_TTL = float(os.getenv("MARKET_DATA_FRESH_TTL", str(7 * 24 * 3600)))  # serve without refresh
+MARKET_DATA_STALE_TTL = float(os.getenv("MARKET_DATA_STALE_TTL", str(60 * 24 * 3600)))  # serve stale, refresh in background
+MARKET_DATA_PREFETCH_ON_STARTUP = os.getenv("MARKET_DATA_PREFETCH_ON_STARTUP", "false").lower() == "true"
+MARKET_DATA_PREFETCH_CONCURRENCY = int(os.getenv("MARKET_DATA_PREFETCH_CONCURRENCY", "4"))
+
+# Offer prep candidate intelligence snapshots (invalidated on new analytics/transcripts)
+CANDIDATE_INTEL_CACHE_TTL = float(os.getenv("CANDIDATE_INTEL_CACHE_TTL", "600"))  # seconds; 0 disables
+CANDIDATE_INTEL_CACHE_SIZE = int(os.getenv("CANDIDATE_INTEL_CACHE_SIZE", "256"))  # max candidates held
+
+# Per-job analytics summary (invalidated when a job's analytics are written)
+JOB_ANALYTICS_CACHE_TTL = float(os.getenv("JOB_ANALYTICS_CACHE_TTL", "300"))  # seconds; 0 disables
+JOB_ANALYTICS_CACHE_SIZE = int(os.getenv("JOB_ANALYTICS_CACHE_SIZE", "256"))  # max jobs held
+
+# Organization ownership checks (entity id -> org id; invalidated on delete/archive)
+OWNERSHIP_CACHE_TTL = float(os.getenv("OWNERSHIP_CACHE_TTL", "300"))  # seconds; 0 disables
+OWNERSHIP_CACHE_SIZE = int(os.getenv("OWNERSHIP_CACHE_SIZE", "10000"))  # max entities held
+
+# Invalidations of the three caches above shared between processes (see services/cache_invalidation.py)
+CACHE_INVALIDATION_BACKEND = os.getenv("CACHE_INVALIDATION_BACKEND", "")  # "memory" (per process) or "sqlite" (shared on the host); empty picks by MULTI_PROCESS below
+CACHE_INVALIDATION_DB_PATH = os.getenv("CACHE_INVALIDATION_DB_PATH")  # defaults to backend/data/cache_invalidation.db
+CACHE_INVALIDATION_POLL_INTERVAL = float(os.getenv("CACHE_INVALIDATION_POLL_INTERVAL", "1"))  # seconds another process's invalidation may take to apply here
+
+# Job pipeline counts (job_pipeline_counts table, kept current by DB triggers)
+PIPELINE_COUNTS_RECONCILE_INTERVAL = float(os.getenv("PIPELINE_COUNTS_RECONCILE_INTERVAL", "3600"))  # seconds between drift repairs; 0 disables
+
+# Resume text extraction (process pool; text cached by file content hash)
+RESUME_PARSE_WORKERS = int(os.getenv("RESUME_PARSE_WORKERS", "2"))  # parser processes; 0 parses in a thread instead
+RESUME_PARSE_TIMEOUT = float(os.getenv("RESUME_PARSE_TIMEOUT", "30"))  # seconds per file before the worker is killed
+RESUME_MAX_PAGES = int(os.getenv("RESUME_MAX_PAGES", "20"))  # PDF pages read per resume
+RESUME_TEXT_CACHE_SIZE = int(os.getenv("RESUME_TEXT_CACHE_SIZE", "512"))  # texts held in memory; 0 disables caching
+RESUME_TEXT_DISK_CACHE_MB = float(os.getenv("RESUME_TEXT_DISK_CACHE_MB", "256"))  # cap on data/resume_text; least recently used texts are removed first
+
+# Candidate screening
+SCREENING_PACK_SIZE = int(os.getenv("SCREENING_PACK_SIZE", "1"))  # candidates per LLM call sharing one job-context prefix; 1 = one call each
+
+# Durable background task queue (screening, resume parsing, JD extraction, analytics)
+TASK_QUEUE_DB_PATH = os.getenv("TASK_QUEUE_DB_PATH")  # defaults to backend/data/task_queue.db
+TASK_WORKER_MODE = os.getenv("TASK_WORKER_MODE", "inline")  # "inline" runs a worker in the API process; "external" expects worker.py
+TASK_WORKER_CONCURRENCY = int(os.getenv("TASK_WORKER_CONCURRENCY", "4"))  # tasks run at once per worker process
+TASK_QUEUE_LEASE_SECONDS = float(os.getenv("TASK_QUEUE_LEASE_SECONDS", "300"))  # reclaim tasks from dead workers after this
+TASK_QUEUE_MAX_ATTEMPTS = int(os.getenv("TASK_QUEUE_MAX_ATTEMPTS", "5"))
+TASK_QUEUE_RETRY_BASE_DELAY = float(os.getenv("TASK_QUEUE_RETRY_BASE_DELAY", "10"))  # seconds, doubled per attempt
+TASK_QUEUE_RETRY_MAX_DELAY = float(os.getenv("TASK_QUEUE_RETRY_MAX_DELAY", "900"))
+
+# Idempotency-Key replay (see middleware/idempotency.py)
+IDEMPOTENCY_BACKEND = os.getenv("IDEMPOTENCY_BACKEND", "")  # "memory" (per process) or "sqlite" (shared by workers on the host); empty picks by MULTI_PROCESS below
+IDEMPOTENCY_DB_PATH = os.getenv("IDEMPOTENCY_DB_PATH")  # defaults to backend/data/idempotency.db
+IDEMPOTENCY_TTL = float(os.getenv("IDEMPOTENCY_TTL", "86400"))  # seconds a completed response is replayed
+IDEMPOTENCY_IN_PROGRESS_TTL = float(os.getenv("IDEMPOTENCY_IN_PROGRESS_TTL", "300"))  # release keys of requests that never finished
+IDEMPOTENCY_MAX_KEYS = int(os.getenv("IDEMPOTENCY_MAX_KEYS", "10000"))
+
+# Metrics and tracing (GET /metrics, Prometheus text format; see services/telemetry.py)
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+OTEL_EXPORTER_OTLP_ENDPOINT = os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT")  # also export spans as traces (needs opentelemetry-sdk + OTLP HTTP exporter)
+OTEL_SERVICE_NAME = os.getenv("OTEL_SERVICE_NAME", "briefing-room-api")
+
+# LLM usage ledger (llm_usage table) and per-organization limits checked before each call is sent
+LLM_USAGE_LEDGER_ENABLED = os.getenv("LLM_USAGE_LEDGER_ENABLED", "true").lower() == "true"
+LLM_USAGE_FLUSH_SIZE = int(os.getenv("LLM_USAGE_FLUSH_SIZE", "50"))  # records buffered before a batch insert
+LLM_USAGE_FLUSH_INTERVAL = float(os.getenv("LLM_USAGE_FLUSH_INTERVAL", "10"))  # seconds; also flushed on shutdown
+LLM_PRICES = os.getenv("LLM_PRICES", "")  # JSON {"model": [input, cached_input, output]} USD per 1M tokens, when usage has no cost
+LLM_RESERVE_COMPLETION_TOKENS = int(os.getenv("LLM_RESERVE_COMPLETION_TOKENS", "1000"))  # output tokens assumed when reserving budget for a call without max_tokens
+LLM_INTERACTIVE_FAMILIES = os.getenv(
+    "LLM_INTERACTIVE_FAMILIES",
+    "coach_suggestion,coach_chat,room_chat,room_debrief,live_analytics,prebrief,job_architect,email_draft",
+)  # prompt families in the interactive lane; everything else is bulk
+LLM_ORG_BULK_RPM = float(os.getenv("LLM_ORG_BULK_RPM", "0"))  # bulk calls per minute per org; 0 = unlimited
+LLM_ORG_INTERACTIVE_RPM = float(os.getenv("LLM_ORG_INTERACTIVE_RPM", "0"))  # interactive calls per minute per org; 0 = unlimited
+LLM_ORG_DAILY_BUDGET_USD = float(os.getenv("LLM_ORG_DAILY_BUDGET_USD", "0"))  # per org per UTC day; 0 = no budget
+LLM_BULK_BUDGET_SHARE = float(os.getenv("LLM_BULK_BUDGET_SHARE", "0.8"))  # share of the daily budget bulk work may spend
+LLM_LIMIT_MAX_WAIT = float(os.getenv("LLM_LIMIT_MAX_WAIT", "30"))  # seconds a bulk call waits for its rate lane; interactive never waits
+LLM_ORG_LIMITS = os.getenv("LLM_ORG_LIMITS", "")  # JSON {"<org_id>": {"bulk_rpm": ..., "interactive_rpm": ..., "daily_budget_usd": ...}}
+
+# LLM request scheduling (deadlines, hedging, per-process concurrency; see services/llm_scheduler.py)
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "64"))  # LLM calls in flight per process; 0 = unlimited
+LLM_INTERACTIVE_RESERVED = int(os.getenv("LLM_INTERACTIVE_RESERVED", "8"))  # of those, slots bulk calls may not take
+LLM_INTERACTIVE_DEADLINE = float(os.getenv("LLM_INTERACTIVE_DEADLINE", "12"))  # seconds live-interview routes allow their LLM calls
+LLM_HEDGE_FAMILIES = os.getenv("LLM_HEDGE_FAMILIES", "coach_suggestion,coach_chat,room_chat,pluto_scoring")  # prompt families (as set with llm_family()) that may send a hedge
+LLM_HEDGE_PERCENTILE = float(os.getenv("LLM_HEDGE_PERCENTILE", "0.95"))  # hedge once a call is slower than this share of recent calls
+LLM_HEDGE_MIN_DELAY = float(os.getenv("LLM_HEDGE_MIN_DELAY", "0.5"))  # seconds
+LLM_HEDGE_DEFAULT_DELAY = float(os.getenv("LLM_HEDGE_DEFAULT_DELAY", "4"))  # seconds, until a family has 20 latency samples
+LLM_HEDGE_FALLBACK_MODEL = os.getenv("LLM_HEDGE_FALLBACK_MODEL")  # send hedges to this model instead of the original
+
+# Voice ingest session cache (write-behind for Vapi tool calls)
+PROFILE_CACHE_ENABLED = os.getenv("PROFILE_CACHE_ENABLED", "true").lower() == "true"
+PROFILE_CACHE_FLUSH_DELAY = float(os.getenv("PROFILE_CACHE_FLUSH_DELAY", "2.0"))  # seconds after last tool call
+PROFILE_CACHE_IDLE_TTL = float(os.getenv("PROFILE_CACHE_IDLE_TTL", "1800"))  # evict idle sessions after 30 min
+
+# Process roles (python serve.py api|realtime|worker; see serve.py)
+API_PORT = int(os.getenv("API_PORT", "8000"))
+API_WORKERS = int(os.getenv("API_WORKERS", "1"))  # uvicorn processes for CRUD, uploads and dashboards
+API_LIMIT_CONCURRENCY = int(os.getenv("API_LIMIT_CONCURRENCY", "0"))  # open connections per process before 503; 0 = unlimited
+REALTIME_PORT = int(os.getenv("REALTIME_PORT", "8001"))
+REALTIME_WORKERS = int(os.getenv("REALTIME_WORKERS", "1"))  # keep 1 unless sessions are pinned: voice-ingest profiles are cached per process
+REALTIME_LIMIT_CONCURRENCY = int(os.getenv("REALTIME_LIMIT_CONCURRENCY", "0"))  # open connections (incl. WebSockets) per process; 0 = unlimited
+WORKER_PROCESSES = int(os.getenv("WORKER_PROCESSES", "1"))  # task worker processes started by scripts/run_local.py; each runs TASK_WORKER_CONCURRENCY tasks
+API_ROLES = [r.strip() for r in os.getenv("API_ROLES", "all").split(",") if r.strip()]  # routers served: all, or any of public, voice, recruiter, webhooks
+
+# Split roles, an external task worker or several uvicorn processes mean per-process state
+# must be shared on the host: Idempotency-Key claims go to SQLite, and cache invalidations
+# reach the other processes within CACHE_INVALIDATION_POLL_INTERVAL. With the memory backends,
+# a summary, offer-prep snapshot or ownership cached by another process can stay stale for
+# its cache's TTL (JOB_ANALYTICS_CACHE_TTL, CANDIDATE_INTEL_CACHE_TTL, OWNERSHIP_CACHE_TTL).
+MULTI_PROCESS = API_ROLES != ["all"] or TASK_WORKER_MODE == "external" or API_WORKERS > 1 or REALTIME_WORKERS > 1
+IDEMPOTENCY_BACKEND = IDEMPOTENCY_BACKEND or ("sqlite" if MULTI_PROCESS else "memory")
+CACHE_INVALIDATION_BACKEND = CACHE_INVALIDATION_BACKEND or ("sqlite" if MULTI_PROCESS else "memory")
 
 # Resend (Email)
 RESEND_API_KEY = os.getenv("RESEND_API_KEY")
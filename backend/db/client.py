@@ -1,22 +1,26 @@
 """
 Supabase client configuration.
+
+The supabase package (and its auth, storage and realtime clients) is imported
+when the first client is built rather than at import, and which key is in use
+is logged then too.
 """
+import logging
 import os
-from pathlib import Path
-from supabase import create_client, Client
-from dotenv import load_dotenv
-
-# Load environment variables from project root
-# Search upward from this file to find .env
-current = Path(__file__).resolve().parent
-while current != current.parent:
-    env_file = current / ".env"
-    if env_file.exists():
-        load_dotenv(env_file)
-        break
-    current = current.parent
-else:
-    load_dotenv()  # Fallback to default
+from typing import TYPE_CHECKING
+
+import config  # noqa: F401  (loads .env before the settings below are read)
+
+if TYPE_CHECKING:
+    from supabase import Client
+
+logger = logging.getLogger(__name__)
+
+# "supabase" for the hosted project, "local" for the in-process SQLite stand-in
+# (db/local_client.py) used for offline tests and load testing
+DB_BACKEND = os.getenv("DB_BACKEND", "supabase")
+LOCAL_DB_PATH = os.getenv("LOCAL_DB_PATH", ":memory:")  # SQLite file for DB_BACKEND=local
+LOCAL_DB_LATENCY_MS = float(os.getenv("LOCAL_DB_LATENCY_MS", "0"))  # Simulated round trip per query
 
 # Supabase configuration
 SUPABASE_URL = os.getenv("SUPABASE_URL")
@@ -27,36 +31,44 @@ SUPABASE_SERVICE_ROLE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
 # Also check for generic SUPABASE_KEY which some .env files use
 SUPABASE_KEY = SUPABASE_SERVICE_ROLE_KEY or SUPABASE_ANON_KEY or os.getenv("SUPABASE_KEY")
 
-# Debug: Print which key type is being used (don't print actual key)
-if SUPABASE_SERVICE_ROLE_KEY:
-    print("[Supabase] Using SERVICE_ROLE_KEY (full access)")
-elif SUPABASE_ANON_KEY:
-    print("[Supabase] WARNING: Using ANON_KEY (limited access - may cause RLS issues)")
-elif os.getenv("SUPABASE_KEY"):
-    print("[Supabase] Using SUPABASE_KEY")
-else:
-    print("[Supabase] ERROR: No API key found!")
-
 
-def get_supabase_client() -> Client:
+def get_supabase_client() -> "Client":
     """Get Supabase client instance."""
     if not SUPABASE_URL:
         raise ValueError("SUPABASE_URL environment variable not set")
     if not SUPABASE_KEY:
         raise ValueError("SUPABASE_KEY environment variable not set")
-    
+
+    from supabase import create_client
+
+    # Which key type is in use (never the key itself)
+    if SUPABASE_SERVICE_ROLE_KEY:
+        logger.info("Supabase: using SERVICE_ROLE_KEY (full access)")
+    elif SUPABASE_ANON_KEY:
+        logger.warning("Supabase: using ANON_KEY (limited access - may cause RLS issues)")
+    else:
+        logger.info("Supabase: using SUPABASE_KEY")
     return create_client(SUPABASE_URL, SUPABASE_KEY)
 
 
+def get_local_client():
+    """Get a SQLite-backed stand-in for the Supabase client."""
+    from .local_client import LocalSupabase
+    logger.info(f"Supabase: using local SQLite stand-in ({LOCAL_DB_PATH})")
+    return LocalSupabase(LOCAL_DB_PATH, latency=LOCAL_DB_LATENCY_MS / 1000)
+
+
 # Singleton instance for reuse
-_supabase_client: Client | None = None
+_supabase_client: "Client | None" = None
 
 
-def get_db() -> Client:
-    """Get singleton Supabase client."""
+def get_db() -> "Client":
+    """Get singleton Supabase client (or the local stand-in when DB_BACKEND=local)."""
     global _supabase_client
     if _supabase_client is None:
-        _supabase_client = get_supabase_client()
+        from services.telemetry import instrument_db_client
+        client = get_local_client() if DB_BACKEND == "local" else get_supabase_client()
+        _supabase_client = instrument_db_client(client)
     return _supabase_client
 
 
@@ -66,6 +78,17 @@ def reset_db_client():
     _supabase_client = None
 
 
+def use_db_client(client):
+    """
+    Make get_db() return the given client, e.g. a LocalSupabase in tests.
+
+    Repositories keep the client they were constructed with, so swap it
+    before creating them.
+    """
+    global _supabase_client
+    _supabase_client = client
+
+
 # For convenience - direct import (lazy to avoid early creation issues)
 supabase = None
 def _get_supabase():
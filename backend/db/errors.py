@@ -0,0 +1,21 @@
+"""
+Recognising PostgREST errors.
+
+Optional migrations (trigger-maintained tables, aggregate RPCs, the LLM usage
+ledger) may not be installed. Repositories keep a class-level flag per
+optional table or function, turn it off the first time is_missing_relation()
+recognises the error, and use their fallback path from then on. Other errors
+that merely mention the name (a foreign key or check constraint violation,
+say) are not mistaken for a missing migration.
+"""
+
+# PostgREST schema-cache misses (table, function) and the Postgres errors
+# behind them when a query reaches the database
+MISSING_RELATION_CODES = frozenset({"PGRST202", "PGRST205", "42P01", "42883"})
+
+
+def is_missing_relation(error: BaseException, name: str) -> bool:
+    """Whether error reports that the table or function called name does not exist."""
+    if getattr(error, "code", None) not in MISSING_RELATION_CODES:
+        return False
+    return name in (getattr(error, "message", None) or str(error))
@@ -0,0 +1,680 @@
+"""
+In-process stand-in for the Supabase client, backed by SQLite.
+
+Implements the part of the supabase-py query builder the repositories use
+(select/insert/update/upsert/delete, the eq/neq/gt/gte/lt/lte/in_/is_/like/
+ilike/contains/match/or_/not_ filters, order/limit/range, single/maybe_single
+and count="exact"), so repositories and endpoints can be exercised and
+load-tested without a Supabase project.
+
+Each table is a SQLite table of JSON documents. Filters, ordering and paging
+run in SQL over json_extract(); embedded selects such as
+"*, persons(name, email)" or "candidates!fk_interviews_candidate(name)" are
+resolved from foreign-key columns named after the related table (person_id,
+candidate_id, ...). There are no triggers or stored functions: rpc() raises
+the same "Could not find the function" error PostgREST does unless a Python
+implementation is registered, and trigger-maintained tables are reported as
+missing, so repositories take their fallback paths.
+
+Select it with DB_BACKEND=local (see db/client.py) or inject one directly:
+
+    client = LocalSupabase(latency=0.02)
+    client.seed("job_postings", [{"title": "Data Engineer", ...}])
+    use_db_client(client)
+"""
+import json
+import random
+import re
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from postgrest import APIError, APIResponse
+from postgrest.base_request_builder import SingleAPIResponse
+
+# Tables the database fills through triggers; the local client can't keep them
+# current, so reads fail like an uninstalled migration and repositories fall back
+DEFAULT_ABSENT_TABLES = ("job_pipeline_counts",)
+
+_IDENT = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+_NUMERIC = re.compile(r"^-?\d+(\.\d+)?$")
+_EMBED = re.compile(r"^(?:(\w+):)?(\w+)((?:!\w+)*)\((.*)\)$", re.S)
+_FIELD = re.compile(r"^(?:(\w+):)?(\w+)(?:::\w+)?$")
+_OPS = {"eq": "=", "neq": "!=", "gt": ">", "gte": ">=", "lt": "<", "lte": "<="}
+
+Condition = Tuple[str, list]
+
+
+def _ident(name: str) -> str:
+    if not _IDENT.match(name or ""):
+        raise ValueError(f"Unsupported identifier for local database: {name!r}")
+    return name
+
+
+def _col(column: str) -> str:
+    return f"json_extract(doc, '$.{_ident(column)}')"
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, Decimal):
+        return float(value)
+    return str(value)
+
+
+def _param(value: Any) -> Any:
+    """Convert a filter value to what json_extract() returns for the stored JSON."""
+    if isinstance(value, Enum):
+        value = value.value
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, (int, float, str)) or value is None:
+        return value
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=_json_default, separators=(",", ":"))
+    return _json_default(value)
+
+
+def _singular(table: str) -> str:
+    if table.endswith("ies"):
+        return table[:-3] + "y"
+    return table[:-1] if table.endswith("s") else table
+
+
+def _split_top(text: str) -> List[str]:
+    """Split on commas outside parentheses and double quotes."""
+    parts, depth, quoted, start = [], 0, False, 0
+    for i, ch in enumerate(text):
+        if ch == '"' and (i == 0 or text[i - 1] != "\\"):
+            quoted = not quoted
+        elif quoted:
+            continue
+        elif ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+        elif ch == "," and depth == 0:
+            parts.append(text[start:i].strip())
+            start = i + 1
+    parts.append(text[start:].strip())
+    return [p for p in parts if p]
+
+
+def _unquote(value: str) -> str:
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        return value[1:-1].replace('\\"', '"')
+    return value
+
+
+def _from_text(value: str) -> Any:
+    """Type a value taken from a PostgREST filter string (or_, filter)."""
+    value = _unquote(value)
+    return {"true": True, "false": False, "null": None}.get(value, value)
+
+
+def _compare(column: str, op: str, value: Any) -> Condition:
+    expr, value = _col(column), _param(value)
+    if isinstance(value, str) and _NUMERIC.match(value):
+        # PostgREST sends every value as text and Postgres casts it to the column
+        # type; do the same for numbers stored as JSON numbers
+        return (
+            f"(CASE WHEN typeof({expr}) IN ('integer', 'real') "
+            f"THEN {expr} {_OPS[op]} CAST(? AS REAL) ELSE {expr} {_OPS[op]} ? END)",
+            [value, value],
+        )
+    return f"{expr} {_OPS[op]} ?", [value]
+
+
+def _in(column: str, values: Iterable[Any]) -> Condition:
+    values = [_param(v) for v in values]
+    if not values:
+        return "0", []
+    return f"{_col(column)} IN ({', '.join('?' * len(values))})", values
+
+
+def _is(column: str, value: Any) -> Condition:
+    if value is None or value == "null":
+        return f"{_col(column)} IS NULL", []
+    if value in (True, "true"):
+        return f"{_col(column)} IS 1", []
+    if value in (False, "false"):
+        return f"{_col(column)} IS 0", []
+    raise ValueError(f"Unsupported is_ value for local database: {value!r}")
+
+
+def _like(column: str, pattern: str, case_sensitive: bool) -> Condition:
+    pattern = pattern.replace("*", "%")
+    if case_sensitive:
+        return f"{_col(column)} GLOB ?", [pattern.replace("%", "*").replace("_", "?")]
+    return f"{_col(column)} LIKE ?", [pattern]
+
+
+def _contains(column: str, value: Any) -> Condition:
+    if isinstance(value, str):
+        value = [_unquote(v) for v in _split_top(value.strip("{}"))]
+    if isinstance(value, dict):
+        conds = [
+            (f"json_extract({_col(column)}, '$.{_ident(key)}') = ?", [_param(v)]) for key, v in value.items()
+        ]
+    else:
+        conds = [
+            (f"EXISTS (SELECT 1 FROM json_each({_col(column)}) WHERE value = ?)", [_param(v)])
+            for v in value
+        ]
+    return _join(conds, "AND")
+
+
+def _join(conds: List[Condition], glue: str) -> Condition:
+    if not conds:
+        return ("1", []) if glue == "AND" else ("0", [])
+    return f"({f' {glue} '.join(sql for sql, _ in conds)})", [p for _, params in conds for p in params]
+
+
+def _negate(cond: Condition) -> Condition:
+    return f"NOT ({cond[0]})", cond[1]
+
+
+def _text_condition(column: str, op: str, raw: str) -> Condition:
+    """Build a condition from PostgREST's text syntax ("score.gte.80")."""
+    if op == "not":
+        op, raw = raw.split(".", 1)
+        return _negate(_text_condition(column, op, raw))
+    if op in _OPS:
+        return _compare(column, op, _from_text(raw))
+    if op == "in":
+        return _in(column, [_from_text(v) for v in _split_top(raw.strip("()"))])
+    if op == "is":
+        return _is(column, _from_text(raw))
+    if op in ("like", "ilike"):
+        return _like(column, _unquote(raw), op == "like")
+    if op == "cs":
+        return _contains(column, raw)
+    raise NotImplementedError(f"Filter operator '{op}' is not supported by the local database")
+
+
+def _parse_logic(text: str) -> Condition:
+    """Parse an or_() argument: comma-separated conditions with nested and()/or()."""
+    return _join([_parse_term(term) for term in _split_top(text)], "OR")
+
+
+def _parse_term(term: str) -> Condition:
+    negated = term.startswith("not.")
+    if negated:
+        term = term[4:]
+    for glue in ("and", "or"):
+        if term.startswith(f"{glue}(") and term.endswith(")"):
+            cond = _join([_parse_term(t) for t in _split_top(term[len(glue) + 1:-1])], glue.upper())
+            return _negate(cond) if negated else cond
+    column, op, raw = (term.split(".", 2) + [""])[:3]
+    cond = _text_condition(column, op, raw)
+    return _negate(cond) if negated else cond
+
+
+def _parse_select(columns: str) -> Tuple[bool, List[tuple], List[tuple]]:
+    """Split a select string into (star, [(alias, column)], [(alias, table, hints, inner, nested)])."""
+    star, fields, embeds = False, [], []
+    for item in _split_top(columns or "*"):
+        if item == "*":
+            star = True
+            continue
+        match = _EMBED.match(item)
+        if match:
+            alias, table, hints, inner = match.groups()
+            hints = [h for h in hints.split("!") if h]
+            embeds.append((alias or table, table, [h for h in hints if h != "inner"], "inner" in hints, _parse_select(inner)))
+            continue
+        match = _FIELD.match(item)
+        if not match:
+            raise NotImplementedError(f"Select item '{item}' is not supported by the local database")
+        alias, name = match.groups()
+        fields.append((alias or name, name))
+    return star, fields, embeds
+
+
+class LocalQuery:
+    """Filter/shaping builder for one select, insert, update, upsert or delete."""
+
+    def __init__(self, client: "LocalSupabase", table: str, method: str, payload: Any = None, count: Optional[str] = None):
+        self._client = client
+        self._table = table
+        self._method = method
+        self._columns = "*"
+        self._payload = payload
+        self._count = count
+        self._head = False
+        self._on_conflict: List[str] = ["id"]
+        self._ignore_duplicates = False
+        self._conds: List[Condition] = []
+        self._orders: List[str] = []
+        self._limit: Optional[int] = None
+        self._offset = 0
+        self._single: Optional[str] = None
+        self._negate_next = False
+
+    # -- filters ------------------------------------------------------------
+
+    def _where(self, cond: Condition) -> "LocalQuery":
+        if self._negate_next:
+            cond, self._negate_next = _negate(cond), False
+        self._conds.append(cond)
+        return self
+
+    @property
+    def not_(self) -> "LocalQuery":
+        self._negate_next = True
+        return self
+
+    def eq(self, column: str, value: Any) -> "LocalQuery":
+        return self._where(_compare(column, "eq", value))
+
+    def neq(self, column: str, value: Any) -> "LocalQuery":
+        return self._where(_compare(column, "neq", value))
+
+    def gt(self, column: str, value: Any) -> "LocalQuery":
+        return self._where(_compare(column, "gt", value))
+
+    def gte(self, column: str, value: Any) -> "LocalQuery":
+        return self._where(_compare(column, "gte", value))
+
+    def lt(self, column: str, value: Any) -> "LocalQuery":
+        return self._where(_compare(column, "lt", value))
+
+    def lte(self, column: str, value: Any) -> "LocalQuery":
+        return self._where(_compare(column, "lte", value))
+
+    def in_(self, column: str, values: Iterable[Any]) -> "LocalQuery":
+        return self._where(_in(column, values))
+
+    def is_(self, column: str, value: Any) -> "LocalQuery":
+        return self._where(_is(column, value))
+
+    def like(self, column: str, pattern: str) -> "LocalQuery":
+        return self._where(_like(column, pattern, case_sensitive=True))
+
+    def ilike(self, column: str, pattern: str) -> "LocalQuery":
+        return self._where(_like(column, pattern, case_sensitive=False))
+
+    def contains(self, column: str, value: Any) -> "LocalQuery":
+        return self._where(_contains(column, value))
+
+    def match(self, query: Dict[str, Any]) -> "LocalQuery":
+        for column, value in query.items():
+            self.eq(column, value)
+        return self
+
+    def or_(self, filters: str, reference_table: Optional[str] = None) -> "LocalQuery":
+        return self._where(_parse_logic(filters))
+
+    def filter(self, column: str, operator: str, criteria: str) -> "LocalQuery":
+        return self._where(_text_condition(column, operator, criteria))
+
+    # -- shaping ------------------------------------------------------------
+
+    def order(self, column: str, *, desc: bool = False, nullsfirst: Optional[bool] = None, foreign_table: Optional[str] = None) -> "LocalQuery":
+        if foreign_table is None:
+            if nullsfirst is None:
+                nullsfirst = desc  # Postgres: NULLs sort as the largest value
+            self._orders.append(f"{_col(column)} {'DESC' if desc else 'ASC'} NULLS {'FIRST' if nullsfirst else 'LAST'}")
+        return self
+
+    def limit(self, size: int, *, foreign_table: Optional[str] = None) -> "LocalQuery":
+        if foreign_table is None:
+            self._limit = size
+        return self
+
+    def range(self, start: int, end: int, foreign_table: Optional[str] = None) -> "LocalQuery":
+        if foreign_table is None:
+            self._offset, self._limit = start, end - start + 1
+        return self
+
+    def single(self) -> "LocalQuery":
+        self._single = "single"
+        return self
+
+    def maybe_single(self) -> "LocalQuery":
+        self._single = "maybe"
+        return self
+
+    # -- execution ----------------------------------------------------------
+
+    def execute(self):
+        self._client._delay()
+        with self._client._lock:
+            if self._method == "select":
+                data, count = self._select()
+            else:
+                data = getattr(self._client, f"_{self._method}")(self)
+                count = len(data) if self._count else None
+
+        if self._single:
+            if len(data) == 1:
+                return SingleAPIResponse(data=data[0], count=count)
+            if not data and self._single == "maybe":
+                return None
+            raise APIError({
+                "message": "Cannot coerce the result to a single JSON object",
+                "code": "PGRST116",
+                "hint": None,
+                "details": f"The result contains {len(data)} rows",
+            })
+        return APIResponse(data=data, count=count)
+
+    def _where_sql(self) -> Condition:
+        sql, params = _join(self._conds, "AND")
+        return f" WHERE {sql}", params
+
+    def _select(self) -> Tuple[List[dict], Optional[int]]:
+        client = self._client
+        client._check_readable(self._table)
+        where, params = self._where_sql()
+        count = None
+        if self._count:
+            count = client._conn.execute(f'SELECT COUNT(*) FROM "{self._table}"{where}', params).fetchone()[0]
+        if self._head:
+            return [], count
+
+        sql = f'SELECT doc FROM "{self._table}"{where} ORDER BY {", ".join(self._orders + ["rowid"])}'
+        if self._limit is not None or self._offset:
+            sql += " LIMIT ? OFFSET ?"
+            params = params + [-1 if self._limit is None else self._limit, self._offset]
+        rows = [json.loads(doc) for (doc,) in client._conn.execute(sql, params)]
+        return client._project(self._table, rows, _parse_select(self._columns)), count
+
+    def _matching(self) -> List[Tuple[int, dict]]:
+        where, params = self._where_sql()
+        rows = self._client._conn.execute(f'SELECT rowid, doc FROM "{self._table}"{where} ORDER BY rowid', params)
+        return [(rowid, json.loads(doc)) for rowid, doc in rows]
+
+
+class LocalTable:
+    """Entry point for one table, like postgrest's request builder: each call starts a new query."""
+
+    def __init__(self, client: "LocalSupabase", name: str):
+        self._client = client
+        self._name = _ident(name)
+
+    def select(self, *columns: str, count: Optional[str] = None, head: Optional[bool] = None) -> LocalQuery:
+        query = LocalQuery(self._client, self._name, "select", count=count)
+        query._columns = ",".join(columns) or "*"
+        query._head = bool(head)
+        return query
+
+    def insert(self, json: Any, *, count: Optional[str] = None, upsert: bool = False, **kwargs) -> LocalQuery:
+        if upsert:
+            return self.upsert(json, count=count)
+        return LocalQuery(self._client, self._name, "insert", json, count)
+
+    def upsert(
+        self,
+        json: Any,
+        *,
+        count: Optional[str] = None,
+        ignore_duplicates: bool = False,
+        on_conflict: str = "",
+        **kwargs,
+    ) -> LocalQuery:
+        query = LocalQuery(self._client, self._name, "upsert", json, count)
+        query._ignore_duplicates = ignore_duplicates
+        if on_conflict:
+            query._on_conflict = [_ident(c.strip()) for c in on_conflict.split(",")]
+        return query
+
+    def update(self, json: dict, *, count: Optional[str] = None, **kwargs) -> LocalQuery:
+        return LocalQuery(self._client, self._name, "update", json, count)
+
+    def delete(self, *, count: Optional[str] = None, **kwargs) -> LocalQuery:
+        return LocalQuery(self._client, self._name, "delete", count=count)
+
+
+class LocalRPC:
+    """Call of a Python function registered with LocalSupabase.register_rpc()."""
+
+    def __init__(self, client: "LocalSupabase", name: str, params: Optional[dict]):
+        self._client = client
+        self._name = name
+        self._params = params or {}
+
+    def execute(self) -> APIResponse:
+        self._client._delay()
+        fn = self._client._rpcs.get(self._name)
+        if fn is None:
+            raise APIError({
+                "message": f"Could not find the function public.{self._name}({', '.join(sorted(self._params))}) in the schema cache",
+                "code": "PGRST202",
+                "hint": None,
+                "details": None,
+            })
+        with self._client._lock:
+            return APIResponse(data=fn(self._client, **self._params), count=None)
+
+
+class LocalSupabase:
+    """
+    SQLite-backed stand-in for the supabase-py Client.
+
+    path is a SQLite file (":memory:" by default). Every execute() sleeps for
+    latency seconds plus up to jitter more, outside the database lock, to model
+    the PostgREST round trip. relations overrides how an embedded select is
+    joined: {(parent_table, name_or_hint): ("one" | "many", fk_column)}.
+    """
+
+    def __init__(
+        self,
+        path: str = ":memory:",
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        relations: Optional[Dict[Tuple[str, str], Tuple[str, str]]] = None,
+        absent_tables: Iterable[str] = DEFAULT_ABSENT_TABLES,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.relations = dict(relations or {})
+        self.absent_tables = set(absent_tables)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._lock = threading.RLock()
+        self._tables = {
+            name for (name,) in self._conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+        }
+        self._rpcs: Dict[str, Callable[..., Any]] = {}
+
+    # -- client API ---------------------------------------------------------
+
+    def table(self, name: str) -> LocalTable:
+        return LocalTable(self, name)
+
+    from_ = table
+
+    def rpc(self, name: str, params: Optional[dict] = None, **kwargs) -> LocalRPC:
+        return LocalRPC(self, name, params)
+
+    # -- setup helpers ------------------------------------------------------
+
+    def register_rpc(self, name: str, fn: Callable[..., Any]) -> None:
+        """Serve rpc(name, params) with fn(client, **params)."""
+        self._rpcs[name] = fn
+
+    def seed(self, table: str, rows: List[dict]) -> List[dict]:
+        """Insert rows (filling id and timestamps) and return them as stored."""
+        return self.table(table).insert(rows).execute().data if rows else []
+
+    def rows(self, table: str) -> List[dict]:
+        """All rows of a table in insertion order."""
+        with self._lock:
+            if table not in self._tables:
+                return []
+            return [json.loads(doc) for (doc,) in self._conn.execute(f'SELECT doc FROM "{_ident(table)}" ORDER BY rowid')]
+
+    def create_index(self, table: str, *columns: str) -> None:
+        """Index columns of a table, e.g. to match the production schema in load tests."""
+        with self._lock:
+            self._ensure_table(table)
+            name = f"{table}_{'_'.join(map(_ident, columns))}_idx"
+            self._conn.execute(f'CREATE INDEX IF NOT EXISTS "{name}" ON "{table}" ({", ".join(map(_col, columns))})')
+
+    # -- internals ----------------------------------------------------------
+
+    def _delay(self) -> None:
+        if self.latency or self.jitter:
+            time.sleep(self.latency + random.uniform(0, self.jitter))
+
+    def _check_readable(self, table: str) -> None:
+        if table in self.absent_tables:
+            raise APIError({
+                "message": f"Could not find the table 'public.{table}' in the schema cache",
+                "code": "PGRST205",
+                "hint": None,
+                "details": None,
+            })
+        self._ensure_table(table)
+
+    def _ensure_table(self, table: str) -> None:
+        if table in self._tables:
+            return
+        _ident(table)
+        self._conn.execute(f'CREATE TABLE IF NOT EXISTS "{table}" (doc TEXT NOT NULL)')
+        self._conn.execute(f'CREATE UNIQUE INDEX IF NOT EXISTS "{table}_pkey" ON "{table}" ({_col("id")})')
+        self._tables.add(table)
+
+    def _write(self, table: str, statements: List[Tuple[str, list]]) -> None:
+        self._conn.execute("BEGIN")
+        try:
+            for sql, params in statements:
+                self._conn.execute(sql, params)
+        except sqlite3.IntegrityError as e:
+            self._conn.execute("ROLLBACK")
+            raise APIError({
+                "message": f'duplicate key value violates unique constraint "{table}_pkey"',
+                "code": "23505",
+                "hint": None,
+                "details": str(e),
+            })
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+
+    @staticmethod
+    def _dump(row: dict) -> str:
+        return json.dumps(row, default=_json_default, separators=(",", ":"))
+
+    @classmethod
+    def _new_row(cls, row: dict) -> dict:
+        row = json.loads(cls._dump(row))
+        now = datetime.now(timezone.utc).isoformat()
+        row.setdefault("id", str(uuid.uuid4()))
+        row.setdefault("created_at", now)
+        row.setdefault("updated_at", now)
+        return row
+
+    def _insert(self, query: LocalQuery) -> List[dict]:
+        self._check_readable(query._table)
+        payload = query._payload if isinstance(query._payload, list) else [query._payload]
+        rows = [self._new_row(row) for row in payload]
+        self._write(query._table, [(f'INSERT INTO "{query._table}" (doc) VALUES (?)', [self._dump(r)]) for r in rows])
+        return rows
+
+    def _update(self, query: LocalQuery) -> List[dict]:
+        self._check_readable(query._table)
+        changes = json.loads(self._dump(query._payload))
+        updated, statements = [], []
+        for rowid, row in query._matching():
+            row.update(changes)
+            updated.append(row)
+            statements.append((f'UPDATE "{query._table}" SET doc = ? WHERE rowid = ?', [self._dump(row), rowid]))
+        self._write(query._table, statements)
+        return updated
+
+    def _delete(self, query: LocalQuery) -> List[dict]:
+        self._check_readable(query._table)
+        matching = query._matching()
+        self._write(query._table, [(f'DELETE FROM "{query._table}" WHERE rowid = ?', [rowid]) for rowid, _ in matching])
+        return [row for _, row in matching]
+
+    def _upsert(self, query: LocalQuery) -> List[dict]:
+        self._check_readable(query._table)
+        payload = query._payload if isinstance(query._payload, list) else [query._payload]
+        written, statements = [], []
+        for row in payload:
+            row = json.loads(self._dump(row))
+            existing = None
+            if all(key in row for key in query._on_conflict):
+                cond = _join([_compare(key, "eq", row[key]) for key in query._on_conflict], "AND")
+                existing = self._conn.execute(
+                    f'SELECT rowid, doc FROM "{query._table}" WHERE {cond[0]} LIMIT 1', cond[1]
+                ).fetchone()
+            if existing is None:
+                row = self._new_row(row)
+                statements.append((f'INSERT INTO "{query._table}" (doc) VALUES (?)', [self._dump(row)]))
+            elif query._ignore_duplicates:
+                continue
+            else:
+                rowid, doc = existing
+                row = {**json.loads(doc), **row}
+                statements.append((f'UPDATE "{query._table}" SET doc = ? WHERE rowid = ?', [self._dump(row), rowid]))
+            written.append(row)
+        self._write(query._table, statements)
+        return written
+
+    def _relation(self, parent: str, target: str, hints: List[str], rows: List[dict]) -> Tuple[str, str]:
+        """Work out how target joins parent: ("one", fk on parent) or ("many", fk on target)."""
+        hint = hints[0] if hints else None
+        override = self.relations.get((parent, hint or target))
+        if override:
+            return override
+        if hint is None:
+            column = f"{_singular(target)}_id"
+            if any(column in row for row in rows):
+                return "one", column
+            return "many", f"{_singular(parent)}_id"
+        # Constraint names: <table>_<column>_fkey or fk_<table>_<referenced>
+        for table, kind in ((parent, "one"), (target, "many")):
+            if hint.startswith(f"{table}_") and hint.endswith("_fkey"):
+                return kind, hint[len(table) + 1:-len("_fkey")]
+            if hint.startswith(f"fk_{table}_"):
+                return kind, f"{hint[len(table) + 4:]}_id"
+        return ("one" if any(hint in row for row in rows) else "many"), hint
+
+    def _project(self, table: str, rows: List[dict], spec: tuple) -> List[dict]:
+        star, fields, embeds = spec
+        out = [dict(row) if star else {alias: row.get(name) for alias, name in fields} for row in rows]
+        if star:
+            for projected, row in zip(out, rows):
+                projected.update({alias: row.get(name) for alias, name in fields})
+
+        keep = [True] * len(rows)
+        for alias, target, hints, inner, nested in embeds:
+            kind, column = self._relation(table, target, hints, rows)
+            if kind == "one":
+                keys = {row.get(column) for row in rows} - {None}
+                children = self._fetch(target, "id", keys)
+                by_key = dict(zip([child["id"] for child in children], self._project(target, children, nested)))
+                values = [by_key.get(row.get(column)) for row in rows]
+            else:
+                keys = {row.get("id") for row in rows} - {None}
+                children = self._fetch(target, column, keys)
+                grouped: Dict[Any, List[dict]] = {}
+                for child, projected in zip(children, self._project(target, children, nested)):
+                    grouped.setdefault(child.get(column), []).append(projected)
+                values = [grouped.get(row.get("id"), []) for row in rows]
+            for i, value in enumerate(values):
+                out[i][alias] = value
+                if inner and not value:
+                    keep[i] = False
+        return [row for row, kept in zip(out, keep) if kept]
+
+    def _fetch(self, table: str, column: str, keys: set) -> List[dict]:
+        if not keys or table in self.absent_tables or table not in self._tables:
+            return []
+        cond = _in(column, keys)
+        return [
+            json.loads(doc)
+            for (doc,) in self._conn.execute(f'SELECT doc FROM "{table}" WHERE {cond[0]} ORDER BY rowid', cond[1])
+        ]
@@ -0,0 +1,28 @@
+-- ============================================
+-- MIGRATION: Bulk Candidate Status Updates
+-- ============================================
+-- Adds an RPC used by POST /api/jobs/{job_id}/candidates/bulk-update to move
+-- many candidates in one transaction. Only candidates of the given job are
+-- changed; the IDs actually updated are returned so the API can report
+-- per-candidate results. The backend falls back to chunked updates when this
+-- function is not installed.
+-- ============================================
+
+CREATE OR REPLACE FUNCTION bulk_update_candidate_status(
+    p_job_id UUID,
+    p_candidate_ids UUID[],
+    p_pipeline_status TEXT
+)
+RETURNS TABLE (id UUID) AS $$
+BEGIN
+    RETURN QUERY
+    UPDATE candidates c
+    SET pipeline_status = p_pipeline_status,
+        updated_at = NOW()
+    WHERE c.job_posting_id = p_job_id
+      AND c.id = ANY(p_candidate_ids)
+    RETURNING c.id;
+END;
+$$ LANGUAGE plpgsql;
+
+COMMENT ON FUNCTION bulk_update_candidate_status(UUID, UUID[], TEXT) IS 'Set pipeline_status for many candidates of one job atomically; returns updated IDs.';
@@ -0,0 +1,50 @@
+-- ============================================
+-- MIGRATION: Job Analytics Summary Aggregate
+-- ============================================
+-- Adds an RPC used by GET /api/jobs/{job_id}/analytics/summary to compute the
+-- job dashboard aggregates in the database: analytics count, average score,
+-- count per recommendation and the top N candidates by score (with LIMIT),
+-- instead of shipping every analytics row to the API. The backend falls back
+-- to aggregating projected rows when this function is not installed.
+--
+-- Recommendations are normalised the same way as the API
+-- (AnalyticsRepository._map_recommendation).
+-- ============================================
+
+CREATE OR REPLACE FUNCTION job_analytics_summary(p_job_id UUID, p_top_n INT DEFAULT 5)
+RETURNS JSON AS $$
+    WITH job_analytics AS (
+        SELECT
+            a.overall_score,
+            CASE
+                WHEN a.recommendation IN ('strong_hire', 'Strong Hire') THEN 'strong_hire'
+                WHEN a.recommendation IN ('hire', 'Hire') THEN 'hire'
+                WHEN a.recommendation IN ('no_hire', 'No Hire') THEN 'no_hire'
+                ELSE 'maybe'
+            END AS recommendation,
+            c.name AS candidate_name
+        FROM analytics a
+        JOIN interviews i ON i.id = a.interview_id
+        LEFT JOIN candidates c ON c.id = i.candidate_id
+        WHERE i.job_posting_id = p_job_id
+    )
+    SELECT json_build_object(
+        'total', (SELECT COUNT(*) FROM job_analytics),
+        'avg_score', (SELECT AVG(overall_score) FROM job_analytics WHERE overall_score > 0),
+        'recommendation_breakdown', COALESCE(
+            (SELECT json_object_agg(recommendation, n)
+             FROM (SELECT recommendation, COUNT(*) AS n FROM job_analytics GROUP BY recommendation) r),
+            '{}'::json
+        ),
+        'top_candidates', COALESCE(
+            (SELECT json_agg(t)
+             FROM (SELECT candidate_name, overall_score AS score, recommendation
+                   FROM job_analytics
+                   ORDER BY COALESCE(overall_score, 0) DESC
+                   LIMIT p_top_n) t),
+            '[]'::json
+        )
+    );
+$$ LANGUAGE sql STABLE;
+
+COMMENT ON FUNCTION job_analytics_summary(UUID, INT) IS 'Job dashboard aggregates: count, average score, recommendation breakdown and top N candidates.';
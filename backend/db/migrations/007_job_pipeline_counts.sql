@@ -0,0 +1,112 @@
+-- ============================================
+-- MIGRATION: Job Pipeline Counts
+-- ============================================
+-- Maintains per-job candidate counts by pipeline_status so the jobs list and
+-- the dashboard read a few small rows per job instead of every candidate row.
+--
+-- Counts are kept current by a trigger on candidates (insert, delete, and any
+-- change of job_posting_id or pipeline_status), so every write path is covered,
+-- including the bulk status RPC and direct SQL. NULL statuses count as 'new'.
+-- reconcile_job_pipeline_counts() recomputes counts from candidates and
+-- repairs any drift; the backend runs it periodically (see
+-- PIPELINE_COUNTS_RECONCILE_INTERVAL) and it can also be scheduled with pg_cron.
+--
+-- The backend falls back to counting candidate rows when this table is not
+-- installed.
+-- ============================================
+
+CREATE TABLE IF NOT EXISTS job_pipeline_counts (
+    job_posting_id UUID NOT NULL REFERENCES job_postings(id) ON DELETE CASCADE,
+    pipeline_status TEXT NOT NULL,
+    count INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (job_posting_id, pipeline_status)
+);
+
+COMMENT ON TABLE job_pipeline_counts IS 'Candidates per (job, pipeline_status), maintained by trg_candidates_pipeline_counts.';
+
+CREATE OR REPLACE FUNCTION bump_job_pipeline_count(p_job_id UUID, p_status TEXT, p_delta INTEGER)
+RETURNS VOID AS $$
+BEGIN
+    IF p_job_id IS NULL THEN
+        RETURN;
+    END IF;
+    -- Decrements never insert: the job may be mid-delete (candidates' FK is
+    -- ON DELETE SET NULL), and a missing row is drift for reconciliation
+    IF p_delta < 0 THEN
+        UPDATE job_pipeline_counts
+        SET count = GREATEST(count + p_delta, 0), updated_at = NOW()
+        WHERE job_posting_id = p_job_id AND pipeline_status = COALESCE(p_status, 'new');
+        RETURN;
+    END IF;
+    INSERT INTO job_pipeline_counts (job_posting_id, pipeline_status, count, updated_at)
+    VALUES (p_job_id, COALESCE(p_status, 'new'), p_delta, NOW())
+    ON CONFLICT (job_posting_id, pipeline_status)
+    DO UPDATE SET count = job_pipeline_counts.count + p_delta,
+                  updated_at = NOW();
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION candidates_pipeline_counts_trigger()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM bump_job_pipeline_count(OLD.job_posting_id, OLD.pipeline_status, -1);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM bump_job_pipeline_count(NEW.job_posting_id, NEW.pipeline_status, 1);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_candidates_pipeline_counts ON candidates;
+CREATE TRIGGER trg_candidates_pipeline_counts
+    AFTER INSERT OR DELETE OR UPDATE OF job_posting_id, pipeline_status ON candidates
+    FOR EACH ROW
+    EXECUTE FUNCTION candidates_pipeline_counts_trigger();
+
+-- Recompute counts from candidates for some jobs (or all when NULL) and
+-- return how many count rows were corrected.
+CREATE OR REPLACE FUNCTION reconcile_job_pipeline_counts(p_job_ids UUID[] DEFAULT NULL)
+RETURNS INTEGER AS $$
+DECLARE
+    corrected INTEGER;
+BEGIN
+    WITH actual AS (
+        SELECT job_posting_id, COALESCE(pipeline_status, 'new') AS pipeline_status, COUNT(*)::INTEGER AS count
+        FROM candidates
+        WHERE job_posting_id IS NOT NULL
+          AND (p_job_ids IS NULL OR job_posting_id = ANY(p_job_ids))
+        GROUP BY 1, 2
+    ),
+    stored AS (
+        SELECT job_posting_id, pipeline_status, count
+        FROM job_pipeline_counts
+        WHERE p_job_ids IS NULL OR job_posting_id = ANY(p_job_ids)
+    ),
+    drift AS (
+        SELECT COALESCE(a.job_posting_id, s.job_posting_id) AS job_posting_id,
+               COALESCE(a.pipeline_status, s.pipeline_status) AS pipeline_status,
+               COALESCE(a.count, 0) AS count
+        FROM actual a
+        FULL OUTER JOIN stored s
+          ON s.job_posting_id = a.job_posting_id AND s.pipeline_status = a.pipeline_status
+        WHERE COALESCE(a.count, 0) IS DISTINCT FROM COALESCE(s.count, 0)
+    ),
+    fixed AS (
+        INSERT INTO job_pipeline_counts (job_posting_id, pipeline_status, count, updated_at)
+        SELECT job_posting_id, pipeline_status, count, NOW() FROM drift
+        ON CONFLICT (job_posting_id, pipeline_status)
+        DO UPDATE SET count = EXCLUDED.count, updated_at = NOW()
+        RETURNING 1
+    )
+    SELECT COUNT(*) INTO corrected FROM fixed;
+    RETURN corrected;
+END;
+$$ LANGUAGE plpgsql;
+
+COMMENT ON FUNCTION reconcile_job_pipeline_counts(UUID[]) IS 'Repair job_pipeline_counts from candidates; returns the number of rows corrected.';
+
+-- Backfill
+SELECT reconcile_job_pipeline_counts();
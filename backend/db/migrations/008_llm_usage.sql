@@ -0,0 +1,82 @@
+-- ============================================
+-- MIGRATION: LLM Usage Ledger
+-- ============================================
+-- One row per LLM call (including calls refused by the per-organization rate
+-- and budget limits), attributed to the organization, job and candidate it was
+-- made for. Written in batches by services/llm_usage.py and summarised by
+-- GET /api/usage/summary through llm_usage_summary().
+--
+-- Rows keep their job and candidate ids after those are deleted, so spend
+-- stays attributable; they go with their organization.
+--
+-- The backend aggregates rows itself when llm_usage_summary() is not
+-- installed, and stops recording when the table is not installed.
+-- ============================================
+
+CREATE TABLE IF NOT EXISTS llm_usage (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    organization_id UUID REFERENCES organizations(id) ON DELETE CASCADE,
+    job_id UUID,
+    candidate_id UUID,
+    family TEXT NOT NULL,                -- prompt family, e.g. 'screening', 'coach_chat'
+    lane TEXT NOT NULL,                  -- 'interactive' or 'bulk'
+    model TEXT,
+    outcome TEXT NOT NULL,               -- 'ok', 'error', 'limited' (refused before dispatch) or 'cancelled' (a hedge's loser)
+    status_code INTEGER,
+    prompt_tokens INTEGER NOT NULL DEFAULT 0,
+    completion_tokens INTEGER NOT NULL DEFAULT 0,
+    cached_tokens INTEGER NOT NULL DEFAULT 0,
+    cache_hit BOOLEAN NOT NULL DEFAULT FALSE,
+    latency_ms INTEGER,
+    cost_usd NUMERIC(12, 6) NOT NULL DEFAULT 0,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_llm_usage_org_created ON llm_usage (organization_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_llm_usage_job ON llm_usage (job_id) WHERE job_id IS NOT NULL;
+
+COMMENT ON TABLE llm_usage IS 'Per-call LLM token, latency and cost ledger, written by the backend.';
+
+CREATE OR REPLACE FUNCTION llm_usage_summary(
+    p_org_id UUID,
+    p_group_by TEXT,
+    p_since TIMESTAMPTZ,
+    p_until TIMESTAMPTZ DEFAULT NULL
+)
+RETURNS TABLE (
+    key TEXT,
+    calls BIGINT,
+    limited BIGINT,
+    errors BIGINT,
+    prompt_tokens BIGINT,
+    completion_tokens BIGINT,
+    cached_tokens BIGINT,
+    cache_hits BIGINT,
+    cost_usd NUMERIC,
+    avg_latency_ms NUMERIC
+) AS $$
+    SELECT
+        CASE p_group_by
+            WHEN 'job' THEN job_id::TEXT
+            WHEN 'candidate' THEN candidate_id::TEXT
+            WHEN 'family' THEN family
+            WHEN 'model' THEN model
+            WHEN 'lane' THEN lane
+            WHEN 'day' THEN TO_CHAR(created_at AT TIME ZONE 'UTC', 'YYYY-MM-DD')
+        END AS key,
+        COUNT(*) FILTER (WHERE outcome <> 'limited'),
+        COUNT(*) FILTER (WHERE outcome = 'limited'),
+        COUNT(*) FILTER (WHERE outcome = 'error'),
+        COALESCE(SUM(prompt_tokens), 0),
+        COALESCE(SUM(completion_tokens), 0),
+        COALESCE(SUM(cached_tokens), 0),
+        COUNT(*) FILTER (WHERE cache_hit),
+        COALESCE(SUM(cost_usd), 0),
+        ROUND(AVG(latency_ms) FILTER (WHERE outcome <> 'limited'), 1)
+    FROM llm_usage
+    WHERE organization_id = p_org_id
+      AND created_at >= p_since
+      AND (p_until IS NULL OR created_at < p_until)
+    GROUP BY 1
+    ORDER BY 9 DESC;
+$$ LANGUAGE sql STABLE;
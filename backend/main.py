@@ -1,22 +1,78 @@
-from fastapi import FastAPI
+import asyncio
+import importlib
+
+from fastapi import APIRouter, FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from routers import rooms, realtime, analytics, coach, prebrief, pluto, db_interviews, db_managers, db_interviewers, voice_ingest, offer_prep, vapi_interview
-from routers import jobs as jobs_router  # Streamlined flow
-from routers import dashboard as dashboard_router  # Phase 7 - Dashboard
-from routers import recruiters as recruiters_router  # Recruiter management
-from routers import auth as auth_router  # Authentication
-from routers import persons as persons_router  # Talent Pool
-from routers import scheduling as scheduling_router  # Interview scheduling
-from routers import job_architect
-from routers import public as public_router  # Public career pages
+from fastapi.responses import JSONResponse, PlainTextResponse
+from config import API_ROLES, METRICS_ENABLED
+from middleware.ownership_scope import OwnershipScopeMiddleware
+from middleware.idempotency import IdempotencyMiddleware
+from middleware.metrics import MetricsMiddleware
+from services.llm_usage import LLMLimitExceeded
 from typing import Annotated, Optional
 
+# Router modules in registration order: (module, prefix, deployment roles).
+# API_ROLES picks the roles this process serves; only their routers are imported.
+# WEBHOOKS serves just the routes ending in "webhook" of the routers marked with it.
+PUBLIC, VOICE, RECRUITER, WEBHOOKS = "public", "voice", "recruiter", "webhooks"
+ROUTERS = [
+    ("rooms", "/api", {VOICE}),
+    ("realtime", "/api", {VOICE}),
+    ("analytics", "/api", {VOICE}),
+    ("coach", "/api", {VOICE}),
+    ("prebrief", "/api", {VOICE}),
+    ("pluto", "/api", {RECRUITER}),
+    ("db_interviews", "", {RECRUITER}),    # Multi-stage interview routes
+    ("db_managers", "", {RECRUITER}),      # Manager dashboard routes
+    ("db_interviewers", "", {RECRUITER}),  # Interviewer analytics routes
+    ("voice_ingest", "", {VOICE, WEBHOOKS}),    # Voice ingest onboarding routes
+    ("vapi_interview", "", {VOICE, WEBHOOKS}),  # Vapi Candidate Interview routes
+    ("offer_prep", "", {RECRUITER}),       # Offer preparation and coaching routes
+    ("jobs", "", {RECRUITER, WEBHOOKS}),   # Streamlined flow - job management
+    ("dashboard", "", {RECRUITER}),        # Phase 7 - Recruiter dashboard
+    ("recruiters", "", {RECRUITER}),       # Recruiter management
+    ("auth", "", {RECRUITER}),             # Authentication routes
+    ("persons", "", {RECRUITER}),          # Talent Pool
+    ("scheduling", "", {RECRUITER}),       # Interview scheduling
+    ("job_architect", "", {RECRUITER}),    # AI Job Architect
+    ("public", "", {PUBLIC}),              # Public career pages
+    ("tasks", "", {RECRUITER}),            # Background task queue status
+    ("usage", "", {RECRUITER}),            # LLM usage and limits
+]
+
+
+def _webhook_routes(router: APIRouter) -> APIRouter:
+    webhooks = APIRouter()
+    webhooks.routes = [route for route in router.routes if getattr(route, "path", "").endswith("webhook")]
+    return webhooks
+
+
+def include_routers(app: FastAPI, roles) -> None:
+    """Import and register the routers serving the given roles ("all" for every router)."""
+    roles = set(roles)
+    unknown = roles - {"all", PUBLIC, VOICE, RECRUITER, WEBHOOKS}
+    if unknown:
+        raise ValueError(
+            f"Unknown API_ROLES {sorted(unknown)}; use all, {PUBLIC}, {VOICE}, {RECRUITER} or {WEBHOOKS}"
+        )
+    for module, prefix, router_roles in ROUTERS:
+        if "all" in roles or roles & (router_roles - {WEBHOOKS}):
+            app.include_router(importlib.import_module(f"routers.{module}").router, prefix=prefix)
+        elif WEBHOOKS in roles & router_roles:
+            app.include_router(_webhook_routes(importlib.import_module(f"routers.{module}").router), prefix=prefix)
+
 app = FastAPI(
     title="Briefing Room API",
     description="Backend API for the Briefing Room interview preparation assistant",
     version="1.0.0"
 )
 
+# Memoise org ownership checks per request
+app.add_middleware(OwnershipScopeMiddleware)
+
+# Replay responses for retried mutations carrying an Idempotency-Key header
+app.add_middleware(IdempotencyMiddleware)
+
 # CORS configuration
 app.add_middleware(
     CORSMiddleware,
@@ -31,28 +87,79 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Outermost, so route latency includes every other middleware
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 # Include routers
-app.include_router(rooms.router, prefix="/api")
-app.include_router(realtime.router, prefix="/api")
-app.include_router(analytics.router, prefix="/api")
-app.include_router(coach.router, prefix="/api")
-app.include_router(prebrief.router, prefix="/api")
-app.include_router(pluto.router, prefix="/api")
-
-app.include_router(db_interviews.router)  # Multi-stage interview routes
-app.include_router(db_managers.router)    # Manager dashboard routes
-app.include_router(db_interviewers.router)  # Interviewer analytics routes
-app.include_router(voice_ingest.router)   # Voice ingest onboarding routes
-app.include_router(vapi_interview.router) # Vapi Candidate Interview routes
-app.include_router(offer_prep.router)     # Offer preparation and coaching routes
-app.include_router(jobs_router.router)    # Streamlined flow - job management
-app.include_router(dashboard_router.router)  # Phase 7 - Recruiter dashboard
-app.include_router(recruiters_router.router)  # Recruiter management
-app.include_router(auth_router.router)  # Authentication routes
-app.include_router(persons_router.router)  # Talent Pool
-app.include_router(scheduling_router.router)  # Interview scheduling
-app.include_router(job_architect.router)      # AI Job Architect
-app.include_router(public_router.router)      # Public career pages
+include_routers(app, API_ROLES)
+
+
+@app.exception_handler(LLMLimitExceeded)
+async def llm_limit_exceeded(request: Request, exc: LLMLimitExceeded):
+    """An organization's LLM rate or budget limit refused a call this request needed."""
+    headers = {"Retry-After": str(max(1, round(exc.retry_after)))} if exc.retry_after else None
+    return JSONResponse(
+        status_code=429,
+        content={"detail": str(exc), "reason": exc.reason, "lane": exc.lane},
+        headers=headers,
+    )
+
+
+@app.on_event("startup")
+async def prefetch_market_data():
+    """Optionally warm offer-prep market data for open jobs in the background."""
+    from config import MARKET_DATA_PREFETCH_ON_STARTUP
+    if MARKET_DATA_PREFETCH_ON_STARTUP:
+        from services.market_insights_store import market_insights_store
+        app.state.market_prefetch = asyncio.create_task(market_insights_store.prefetch_open_jobs())
+
+
+@app.on_event("startup")
+async def start_inline_task_worker():
+    """Run queued background tasks in-process unless dedicated workers are deployed."""
+    from config import TASK_WORKER_MODE, TASK_WORKER_CONCURRENCY
+    if TASK_WORKER_MODE == "inline":
+        from services.task_queue import task_queue, TaskWorker
+        import services.task_handlers  # noqa: F401  (registers handlers)
+        app.state.task_worker = TaskWorker(task_queue, concurrency=TASK_WORKER_CONCURRENCY)
+        app.state.task_worker_run = asyncio.create_task(app.state.task_worker.run())
+
+
+@app.on_event("startup")
+async def schedule_pipeline_counts_reconcile():
+    """Queue the periodic job_pipeline_counts drift repair (at most one per interval)."""
+    from services.task_handlers import enqueue_pipeline_counts_reconcile
+    await asyncio.to_thread(enqueue_pipeline_counts_reconcile)
+
+
+@app.on_event("shutdown")
+async def stop_inline_task_worker():
+    """Stop claiming tasks; unfinished ones are reclaimed after their lease."""
+    worker = getattr(app.state, "task_worker", None)
+    if worker is not None:
+        worker.stop()
+
+
+@app.on_event("shutdown")
+async def flush_profile_cache():
+    """Persist any write-behind voice-ingest profiles before exit."""
+    from services.profile_cache import profile_cache
+    await profile_cache.flush_all()
+
+
+@app.on_event("shutdown")
+async def flush_llm_usage():
+    """Write buffered LLM usage records before exit."""
+    from services.llm_usage import usage_ledger
+    await asyncio.to_thread(usage_ledger.flush)
+
+
+@app.on_event("shutdown")
+async def stop_resume_parsers():
+    """Shut down the resume parsing process pool, if it was started."""
+    from services.resume_text import resume_text_extractor
+    await asyncio.to_thread(resume_text_extractor.shutdown)
 
 
 @app.get("/health")
@@ -61,6 +168,15 @@ async def health_check():
     return {"status": "healthy", "service": "briefing-room-api"}
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metrics for this process: route latency, DB round trips, LLM calls"""
+    from services.telemetry import registry, PROMETHEUS_CONTENT_TYPE
+    if not METRICS_ENABLED:
+        return PlainTextResponse("Metrics disabled\n", status_code=404)
+    return PlainTextResponse(registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
 
 
 
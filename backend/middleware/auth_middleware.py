@@ -2,12 +2,13 @@
 Authentication middleware for protected routes.
 """
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from typing import Optional
 
 from models.auth import CurrentUser
 from services.auth_service import decode_access_token
+from services.llm_usage import attribute_request
 
 
 # HTTP Bearer token extractor
@@ -15,6 +16,7 @@ security = HTTPBearer(auto_error=False)
 
 
 async def get_current_user(
+    request: Request,
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security)
 ) -> CurrentUser:
     """
@@ -42,6 +44,13 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"}
         )
 
+    # LLM calls made for this request count against the user's organization
+    attribute_request(
+        organization_id=user.organization_id,
+        job_id=request.path_params.get("job_id"),
+        candidate_id=request.path_params.get("candidate_id"),
+        interview_id=request.path_params.get("interview_id"),
+    )
     return user
 
 
@@ -1,36 +1,259 @@
 """
 Idempotency middleware for preventing duplicate mutations.
 
-This module provides a simple in-memory idempotency cache for critical
-operations like job creation and interview scheduling.
+Clients send an ``Idempotency-Key`` header on POST/PUT/PATCH/DELETE; the
+first response for a key is stored and replayed for retries, and a retry that
+arrives while the original is still running gets 409 instead of running twice.
+
+Keys live in a pluggable store:
+- MemoryIdempotencyStore: per-process, two insertion-ordered dicts
+  (in-progress and completed). Each has a single TTL, so insertion order is
+  expiry order and eviction pops from the front in amortised O(1).
+- SqliteIdempotencyStore: a local SQLite table shared by every worker process
+  on the host, with expired rows purged through an index on expires_at.
+
+Pick one with IDEMPOTENCY_BACKEND; unset, it is sqlite whenever the backend
+runs as more than one process (MULTI_PROCESS in config.py) and memory
+otherwise. The helper functions below keep working
+for handlers that manage keys themselves.
 """
 
-from typing import Optional, Dict, Any
-from datetime import datetime, timedelta
-from functools import wraps
+from typing import Optional, Dict, Any, List, Tuple
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+import asyncio
+import base64
 import hashlib
 import json
 import logging
+import sqlite3
+import threading
+import time
+
+from config import (
+    IDEMPOTENCY_BACKEND,
+    IDEMPOTENCY_DB_PATH,
+    IDEMPOTENCY_TTL,
+    IDEMPOTENCY_IN_PROGRESS_TTL,
+    IDEMPOTENCY_MAX_KEYS,
+)
 
 logger = logging.getLogger(__name__)
 
-# In-memory cache for idempotency keys
-# In production, use Redis or a database
-_idempotency_cache: Dict[str, Dict[str, Any]] = {}
-
-# How long to keep idempotency keys (24 hours)
-IDEMPOTENCY_TTL = timedelta(hours=24)
-
-
-def _clean_expired_keys():
-    """Remove expired idempotency keys from cache."""
-    now = datetime.utcnow()
-    expired = [
-        key for key, value in _idempotency_cache.items()
-        if now - value["created_at"] > IDEMPOTENCY_TTL
-    ]
-    for key in expired:
-        del _idempotency_cache[key]
+IDEMPOTENCY_HEADER = "idempotency-key"
+
+# Only these methods mutate; GET/HEAD/OPTIONS are passed straight through
+IDEMPOTENT_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+# Responses larger than this are passed through without being stored
+MAX_STORED_BODY_BYTES = 1024 * 1024
+
+# Response headers worth replaying (others, like date or CORS, are recomputed)
+REPLAYED_HEADERS = {b"content-type", b"location"}
+
+
+class MemoryIdempotencyStore:
+    """Per-process store with O(1) amortised expiry and a size bound."""
+
+    blocking = False
+
+    def __init__(
+        self,
+        ttl: float = IDEMPOTENCY_TTL,
+        in_progress_ttl: float = IDEMPOTENCY_IN_PROGRESS_TTL,
+        max_keys: int = IDEMPOTENCY_MAX_KEYS,
+    ):
+        self.ttl = ttl
+        self.in_progress_ttl = in_progress_ttl
+        self.max_keys = max_keys
+        # key -> expires_at, oldest first
+        self._pending: "OrderedDict[str, float]" = OrderedDict()
+        # key -> (expires_at, response), oldest first
+        self._done: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _evict(self, now: float) -> None:
+        while self._pending:
+            key, expires_at = next(iter(self._pending.items()))
+            if expires_at > now:
+                break
+            del self._pending[key]
+        while self._done:
+            key, (expires_at, _) = next(iter(self._done.items()))
+            if expires_at > now and len(self._done) <= self.max_keys:
+                break
+            del self._done[key]
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """{"response": ...} when completed, {"in_progress": True} while running, else None."""
+        with self._lock:
+            self._evict(time.time())
+            if key in self._done:
+                return {"response": self._done[key][1]}
+            if key in self._pending:
+                return {"response": None, "in_progress": True}
+            return None
+
+    def reserve(self, key: str) -> bool:
+        """Claim a key for a new request; False if it is running or already answered."""
+        with self._lock:
+            now = time.time()
+            self._evict(now)
+            if key in self._done or key in self._pending:
+                return False
+            self._pending[key] = now + self.in_progress_ttl
+            while len(self._pending) > self.max_keys:
+                self._pending.popitem(last=False)
+            return True
+
+    def put(self, key: str, response: Any) -> None:
+        with self._lock:
+            now = time.time()
+            self._pending.pop(key, None)
+            self._done.pop(key, None)
+            self._done[key] = (now + self.ttl, response)
+            self._evict(now)
+
+    def release(self, key: str) -> None:
+        """Drop an in-progress claim (the request failed and may be retried)."""
+        with self._lock:
+            self._pending.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._pending.clear()
+            self._done.clear()
+
+
+class SqliteIdempotencyStore:
+    """Host-wide store in a local SQLite table, shared by all worker processes."""
+
+    # Disk I/O: the middleware calls this store from a worker thread
+    blocking = True
+
+    # Purge expired rows (and enforce max_keys) every N writes rather than on each one
+    PURGE_EVERY = 100
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        ttl: float = IDEMPOTENCY_TTL,
+        in_progress_ttl: float = IDEMPOTENCY_IN_PROGRESS_TTL,
+        max_keys: int = IDEMPOTENCY_MAX_KEYS,
+    ):
+        if db_path is None:
+            db_path = IDEMPOTENCY_DB_PATH or Path(__file__).parent.parent / "data" / "idempotency.db"
+        self.db_path = Path(db_path)
+        self.ttl = ttl
+        self.in_progress_ttl = in_progress_ttl
+        self.max_keys = max_keys
+        self._writes = 0
+        self._initialized = False
+
+    @contextmanager
+    def _connect(self):
+        """One connection per operation; safe across threads and processes."""
+        if not self._initialized:
+            self._init_db()
+        conn = sqlite3.connect(str(self.db_path), timeout=30, isolation_level=None)
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            yield conn
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def _init_db(self) -> None:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.db_path), timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS idempotency_keys (
+                    key TEXT PRIMARY KEY,
+                    response TEXT,
+                    in_progress INTEGER NOT NULL,
+                    expires_at REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_idempotency_expires
+                    ON idempotency_keys (expires_at);
+                """
+            )
+            conn.commit()
+        finally:
+            conn.close()
+        self._initialized = True
+
+    def _after_write(self, conn, now: float) -> None:
+        self._writes += 1
+        if self._writes % self.PURGE_EVERY:
+            return
+        conn.execute("DELETE FROM idempotency_keys WHERE expires_at <= ?", (now,))
+        (count,) = conn.execute("SELECT COUNT(*) FROM idempotency_keys").fetchone()
+        if count > self.max_keys:
+            conn.execute(
+                "DELETE FROM idempotency_keys WHERE key IN "
+                "(SELECT key FROM idempotency_keys ORDER BY expires_at LIMIT ?)",
+                (count - self.max_keys,),
+            )
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT response, in_progress FROM idempotency_keys WHERE key = ? AND expires_at > ?",
+                (key, time.time()),
+            ).fetchone()
+        if row is None:
+            return None
+        if row[1]:
+            return {"response": None, "in_progress": True}
+        return {"response": json.loads(row[0])}
+
+    def reserve(self, key: str) -> bool:
+        with self._connect() as conn:
+            now = time.time()
+            conn.execute("DELETE FROM idempotency_keys WHERE key = ? AND expires_at <= ?", (key, now))
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO idempotency_keys (key, response, in_progress, expires_at) VALUES (?, NULL, 1, ?)",
+                (key, now + self.in_progress_ttl),
+            )
+            self._after_write(conn, now)
+            return cursor.rowcount == 1
+
+    def put(self, key: str, response: Any) -> None:
+        with self._connect() as conn:
+            now = time.time()
+            conn.execute(
+                "INSERT OR REPLACE INTO idempotency_keys (key, response, in_progress, expires_at) VALUES (?, ?, 0, ?)",
+                (key, json.dumps(response, default=str), now + self.ttl),
+            )
+            self._after_write(conn, now)
+
+    def release(self, key: str) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM idempotency_keys WHERE key = ? AND in_progress = 1", (key,))
+
+    def clear(self) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM idempotency_keys")
+
+
+def create_idempotency_store(backend: str = IDEMPOTENCY_BACKEND):
+    """Build the configured store ("memory" or "sqlite")."""
+    if backend == "sqlite":
+        return SqliteIdempotencyStore()
+    if backend != "memory":
+        logger.warning(f"Unknown IDEMPOTENCY_BACKEND '{backend}', using in-memory store")
+    return MemoryIdempotencyStore()
+
+
+# Global instance
+idempotency_store = create_idempotency_store()
 
 
 def get_cached_response(idempotency_key: str) -> Optional[Dict[str, Any]]:
@@ -43,10 +266,8 @@ def get_cached_response(idempotency_key: str) -> Optional[Dict[str, Any]]:
     Returns:
         The cached response if found and not expired, None otherwise
     """
-    _clean_expired_keys()
-
-    if idempotency_key in _idempotency_cache:
-        cached = _idempotency_cache[idempotency_key]
+    cached = idempotency_store.get(idempotency_key)
+    if cached and cached.get("response") is not None:
         logger.info(f"Idempotency cache hit for key: {idempotency_key[:8]}...")
         return cached["response"]
 
@@ -61,10 +282,7 @@ def cache_response(idempotency_key: str, response: Dict[str, Any]):
         idempotency_key: The idempotency key from the request header
         response: The response to cache
     """
-    _idempotency_cache[idempotency_key] = {
-        "response": response,
-        "created_at": datetime.utcnow(),
-    }
+    idempotency_store.put(idempotency_key, response)
     logger.info(f"Idempotency response cached for key: {idempotency_key[:8]}...")
 
 
@@ -95,11 +313,10 @@ def is_duplicate_request(idempotency_key: str) -> bool:
     Returns:
         True if this key has been seen before
     """
-    _clean_expired_keys()
-    return idempotency_key in _idempotency_cache
+    return idempotency_store.get(idempotency_key) is not None
 
 
-def mark_request_in_progress(idempotency_key: str):
+def mark_request_in_progress(idempotency_key: str) -> bool:
     """
     Mark a request as in progress to prevent concurrent duplicates.
 
@@ -108,12 +325,11 @@ def mark_request_in_progress(idempotency_key: str):
 
     Args:
         idempotency_key: The idempotency key to mark
+
+    Returns:
+        False if the key is already in progress or answered
     """
-    _idempotency_cache[idempotency_key] = {
-        "response": None,
-        "created_at": datetime.utcnow(),
-        "in_progress": True,
-    }
+    return idempotency_store.reserve(idempotency_key)
 
 
 def clear_in_progress(idempotency_key: str):
@@ -123,7 +339,133 @@ def clear_in_progress(idempotency_key: str):
     Args:
         idempotency_key: The idempotency key to clear
     """
-    if idempotency_key in _idempotency_cache:
-        cached = _idempotency_cache[idempotency_key]
-        if cached.get("in_progress") and cached.get("response") is None:
-            del _idempotency_cache[idempotency_key]
+    idempotency_store.release(idempotency_key)
+
+
+async def _call(store, method: str, *args):
+    """Run a store operation, off the event loop if the store does I/O."""
+    func = getattr(store, method)
+    if store.blocking:
+        return await asyncio.to_thread(func, *args)
+    return func(*args)
+
+
+def _json_response(status: int, body: Dict[str, Any]) -> Tuple[int, List[Tuple[bytes, bytes]], bytes]:
+    return status, [(b"content-type", b"application/json")], json.dumps(body).encode()
+
+
+class IdempotencyMiddleware:
+    """
+    Pure ASGI middleware that applies idempotency keys to every mutating route.
+
+    The stored key is scoped to the caller (Authorization header), method and
+    path, and remembers a hash of the request body: reusing a key with a
+    different body is rejected with 422. 5xx responses and failures release
+    the key so the client can retry.
+    """
+
+    def __init__(self, app, store=None):
+        self.app = app
+        self.store = store
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in IDEMPOTENT_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        client_key = headers.get(IDEMPOTENCY_HEADER.encode())
+        if not client_key:
+            await self.app(scope, receive, send)
+            return
+
+        store = self.store or idempotency_store
+        body, more_body = b"", True
+        while more_body:
+            message = await receive()
+            body += message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+        key = hashlib.sha256(b"\0".join([
+            headers.get(b"authorization", b""),
+            scope["method"].encode(),
+            scope["path"].encode(),
+            client_key,
+        ])).hexdigest()
+        fingerprint = hashlib.sha256(body).hexdigest()
+
+        cached = await _call(store, "get", key)
+        if cached is None and await _call(store, "reserve", key):
+            await self._run_and_store(scope, body, receive, send, store, key, fingerprint)
+            return
+        if cached is None:
+            # Lost a race with a concurrent request for the same key
+            cached = await _call(store, "get", key) or {"in_progress": True}
+
+        if cached.get("in_progress"):
+            status, reply_headers, reply = _json_response(
+                409, {"detail": "A request with this Idempotency-Key is already in progress"}
+            )
+        elif cached["response"]["fingerprint"] != fingerprint:
+            status, reply_headers, reply = _json_response(
+                422, {"detail": "Idempotency-Key was already used with a different request body"}
+            )
+        else:
+            stored = cached["response"]
+            status = stored["status"]
+            reply_headers = [(k.encode("latin-1"), v.encode("latin-1")) for k, v in stored["headers"]]
+            reply = base64.b64decode(stored["body"])
+            reply_headers.append((b"idempotent-replayed", b"true"))
+
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": reply_headers + [(b"content-length", str(len(reply)).encode())],
+        })
+        await send({"type": "http.response.body", "body": reply})
+
+    async def _run_and_store(self, scope, body: bytes, receive, send, store, key: str, fingerprint: str) -> None:
+        replayed = False
+
+        async def replay_receive():
+            # Hand the buffered body to the app once, then defer to the real channel (disconnects)
+            nonlocal replayed
+            if not replayed:
+                replayed = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        response: Dict[str, Any] = {"status": 500, "headers": [], "chunks": [], "size": 0}
+
+        async def capture_send(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+                response["headers"] = [
+                    (k.decode("latin-1"), v.decode("latin-1"))
+                    for k, v in message.get("headers", [])
+                    if k.lower() in REPLAYED_HEADERS
+                ]
+            elif message["type"] == "http.response.body" and response["chunks"] is not None:
+                chunk = message.get("body", b"")
+                response["size"] += len(chunk)
+                if response["size"] > MAX_STORED_BODY_BYTES:
+                    response["chunks"] = None
+                else:
+                    response["chunks"].append(chunk)
+            await send(message)
+
+        try:
+            await self.app(scope, replay_receive, capture_send)
+        except Exception:
+            await _call(store, "release", key)
+            raise
+
+        if response["status"] >= 500 or response["chunks"] is None:
+            await _call(store, "release", key)
+            return
+        await _call(store, "put", key, {
+            "status": response["status"],
+            "headers": response["headers"],
+            "body": base64.b64encode(b"".join(response["chunks"])).decode(),
+            "fingerprint": fingerprint,
+        })
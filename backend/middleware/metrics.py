@@ -0,0 +1,43 @@
+"""
+Per-request timing for GET /metrics.
+
+Opens a server span for each HTTP request, so DB and LLM calls made while
+serving it (including in asyncio.to_thread workers) count towards it, and
+records latency under the matched route template once the response is done.
+"""
+import time
+
+from services.telemetry import record_request, span
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware (no response buffering) that times each request by route."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        with span(f"{method} request", kind="server", **{"http.method": method}) as request_span:
+            try:
+                await self.app(scope, receive, send_with_status)
+            finally:
+                # The router stores the matched route in the scope; unmatched paths share one label
+                route = getattr(scope.get("route"), "path", None) or "unmatched"
+                request_span.rename(f"{method} {route}")
+                request_span.set_attribute("http.route", route)
+                request_span.set_attribute("http.status_code", status)
+                record_request(method, route, status, time.perf_counter() - start, request_span.db_round_trips)
@@ -0,0 +1,23 @@
+"""
+Request-scoped memo for organization ownership checks.
+
+Wraps each HTTP request in access_control.ownership_scope() so repeated
+job/candidate/interview ownership checks within one request are answered
+once. Worker threads started with asyncio.to_thread inherit the memo.
+"""
+
+from services.access_control import ownership_scope
+
+
+class OwnershipScopeMiddleware:
+    """Pure ASGI middleware (no response buffering) that opens an ownership scope per request."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        with ownership_scope():
+            await self.app(scope, receive, send)
@@ -117,14 +117,18 @@ class CandidateWithScore(Candidate):
 
 
 class CandidateListItem(BaseModel):
-    """Lightweight candidate for list views."""
+    """Lightweight candidate for list views (no screening blobs or skills)."""
     id: UUID
-    person_name: str
-    person_email: str
+    person_id: Optional[UUID] = None
+    job_id: Optional[UUID] = None
+    person_name: Optional[str] = None
+    person_email: Optional[str] = None
     current_title: Optional[str] = None
     current_company: Optional[str] = None
+    combined_score: Optional[int] = None
+    tier: Optional[str] = None
     interview_status: InterviewStatus
-    skills: List[str] = Field(default_factory=list)
+    pipeline_status: Optional[str] = None
     created_at: datetime
 
     class Config:
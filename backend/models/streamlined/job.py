@@ -325,13 +325,18 @@ class Job(JobBase):
 
 
 class JobSummary(BaseModel):
-    """Lightweight job summary for list views."""
+    """Lightweight job for list views (no description or AI-extracted data)."""
     id: UUID
     title: str
     status: JobStatus
+    recruiter_id: Optional[UUID] = None
+    interview_stages: List[str] = Field(default_factory=lambda: DEFAULT_INTERVIEW_STAGES.copy())
+    interview_stage_icons: List[str] = Field(default_factory=lambda: ["bot", "video", "building"])
     candidate_count: int = 0
     interviewed_count: int = 0
+    stage_counts: List[StageCount] = Field(default_factory=list)
     created_at: datetime
+    updated_at: Optional[datetime] = None
     deleted_at: Optional[datetime] = None
     is_archived: bool = False
 
@@ -11,6 +11,19 @@ from db.client import get_db
 logger = logging.getLogger(__name__)
 
 
+def _invalidate_candidate_intel(interview_id: Optional[str]) -> None:
+    """Drop cached offer-prep intelligence built from this interview."""
+    from services.candidate_intel_cache import candidate_intel_cache
+    candidate_intel_cache.invalidate_interview(interview_id)
+
+
+def _invalidate_analytics_caches(interview_id: Optional[str]) -> None:
+    """Drop offer-prep intelligence and the job analytics summary built from this interview's analytics."""
+    from services.job_analytics_cache import job_analytics_cache
+    _invalidate_candidate_intel(interview_id)
+    job_analytics_cache.invalidate_interview(interview_id)
+
+
 class AnalyticsRepository:
     """Repository for interview analytics and transcripts."""
     
@@ -47,6 +60,7 @@ class AnalyticsRepository:
             result = self._get_db().table(self.analytics_table)\
                 .insert(data)\
                 .execute()
+            _invalidate_analytics_caches(data.get("interview_id"))
             return result.data[0] if result.data else None
         except Exception as e:
             logger.error(f"Error creating analytics: {e}")
@@ -59,6 +73,7 @@ class AnalyticsRepository:
                 .update(data)\
                 .eq("interview_id", interview_id)\
                 .execute()
+            _invalidate_analytics_caches(interview_id)
             return result.data[0] if result.data else None
         except Exception as e:
             logger.error(f"Error updating analytics: {e}")
@@ -136,6 +151,7 @@ class AnalyticsRepository:
                     .execute()
 
             logger.info(f"Analytics saved for interview {interview_id}")
+            _invalidate_analytics_caches(interview_id)
             return result.data[0] if result.data else None
         except Exception as e:
             logger.error(f"Error saving analytics: {e}")
@@ -204,6 +220,7 @@ class AnalyticsRepository:
             result = self._get_db().table(self.transcripts_table)\
                 .insert(data)\
                 .execute()
+            _invalidate_candidate_intel(interview_id)
             return result.data[0] if result.data else None
         except Exception as e:
             logger.error(f"Error creating transcript: {e}")
@@ -219,6 +236,7 @@ class AnalyticsRepository:
                 })\
                 .eq("interview_id", interview_id)\
                 .execute()
+            _invalidate_candidate_intel(interview_id)
             return result.data[0] if result.data else None
         except Exception as e:
             logger.error(f"Error updating transcript: {e}")
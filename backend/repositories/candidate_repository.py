@@ -7,6 +7,7 @@ import logging
 
 from db.client import get_db
 from models.candidate import Candidate
+from services.access_control import forget_owner
 
 logger = logging.getLogger(__name__)
 
@@ -185,6 +186,7 @@ class CandidateRepository:
                 .delete()\
                 .eq("id", candidate_id)\
                 .execute()
+            forget_owner("candidate", candidate_id)
             return len(result.data) > 0
         except Exception as e:
             logger.error(f"Error deleting candidate {candidate_id}: {e}")
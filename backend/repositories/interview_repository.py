@@ -8,9 +8,23 @@ import logging
 import uuid
 
 from db.client import get_db
+from services.access_control import forget_owner
 
 logger = logging.getLogger(__name__)
 
+
+def _invalidate_candidate_intel(interview_id: str, candidate_id: Optional[str] = None) -> None:
+    """Drop cached offer-prep intelligence for the interview's candidate."""
+    from services.candidate_intel_cache import candidate_intel_cache
+    candidate_intel_cache.invalidate_interview(interview_id, candidate_id)
+
+
+def _invalidate_job_analytics(interview_id: str, job_id: Optional[str]) -> None:
+    """Drop the cached analytics summary of the interview's job."""
+    from services.job_analytics_cache import job_analytics_cache
+    job_analytics_cache.invalidate_interview(interview_id, job_id)
+
+
 # Stage order for auto-increment
 STAGE_ORDER = ["round_1", "round_2", "round_3"]
 
@@ -247,7 +261,9 @@ class InterviewRepository:
                 .update(data)\
                 .eq("id", interview_id)\
                 .execute()
-            return result.data[0] if result.data else None
+            updated = result.data[0] if result.data else None
+            _invalidate_candidate_intel(interview_id, updated.get("candidate_id") if updated else None)
+            return updated
         except Exception as e:
             logger.error(f"Error updating interview {interview_id}: {e}")
             return None
@@ -361,6 +377,11 @@ class InterviewRepository:
                 .delete()\
                 .eq("id", interview_id)\
                 .execute()
+            _invalidate_candidate_intel(interview_id)
+            forget_owner("interview", interview_id)
+            if result.data:
+                # Analytics cascade with the interview
+                _invalidate_job_analytics(interview_id, result.data[0].get("job_posting_id"))
             return len(result.data) > 0 if result.data else False
         except Exception as e:
             logger.error(f"Error deleting interview {interview_id}: {e}")
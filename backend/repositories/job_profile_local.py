@@ -1,13 +1,31 @@
 """
 Local File-Based Job Profile Repository.
-Stores job profiles in a JSON file for local development without database.
+Stores job profiles on disk for local development without database.
+
+Layout (under data/job_profiles/):
+    <profile_id>.json   one file per profile, replaced atomically on write
+    index.jsonl         append-only log of (id, created_at) for list_all
+    .lock               fcntl record locks serialising writers across processes
+
+Get and update touch a single profile file, so they cost the same with
+ten profiles or ten thousand. A legacy single-file job_profiles.json is
+migrated into this layout on first use.
 """
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterator
+from contextlib import contextmanager, asynccontextmanager
 from datetime import datetime
 from pathlib import Path
 import logging
 import json
 import os
+import re
+import tempfile
+import zlib
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-process dev server, no cross-process locking
+    fcntl = None
 
 from models.voice_ingest import (
     JobProfile,
@@ -23,6 +41,15 @@ from models.voice_ingest import (
 logger = logging.getLogger(__name__)
 
 
+# Number of lock slots in the lock file; slot 0 guards the index
+LOCK_SLOTS = 4096
+
+# Rewrite the index once tombstones outnumber live entries by this much
+INDEX_COMPACT_RATIO = 1.0
+
+_SAFE_ID = re.compile(r"^[A-Za-z0-9_.-]+$")
+
+
 class LocalJobProfileRepository:
     """Local file-based repository for job profile operations."""
 
@@ -30,27 +57,143 @@ class LocalJobProfileRepository:
         if data_dir is None:
             data_dir = Path(__file__).parent.parent / "data"
         self.data_dir = Path(data_dir)
-        self.data_dir.mkdir(parents=True, exist_ok=True)
-        self.profiles_file = self.data_dir / "job_profiles.json"
-        self._ensure_file_exists()
+        self.profiles_dir = self.data_dir / "job_profiles"
+        self.profiles_dir.mkdir(parents=True, exist_ok=True)
+        self.index_file = self.profiles_dir / "index.jsonl"
+        self.lock_file = self.profiles_dir / ".lock"
+        self.legacy_file = self.data_dir / "job_profiles.json"
+        self._index_cache: Optional[tuple] = None  # ((mtime_ns, size), ordered ids)
+        self._ensure_storage()
 
-    def _ensure_file_exists(self):
-        """Create the profiles file if it doesn't exist."""
-        if not self.profiles_file.exists():
-            self._save_all({})
+    # ==========================================================================
+    # Storage Engine
+    # ==========================================================================
 
-    def _load_all(self) -> Dict[str, Dict]:
-        """Load all profiles from file."""
+    def _ensure_storage(self):
+        """Create the index, migrating a legacy job_profiles.json if present."""
+        if self.index_file.exists():
+            return
+
+        with self._locked(0):
+            if self.index_file.exists():
+                return
+            entries = []
+            if self.legacy_file.exists():
+                try:
+                    with open(self.legacy_file, 'r') as f:
+                        legacy = json.load(f)
+                except (json.JSONDecodeError, FileNotFoundError):
+                    legacy = {}
+                for profile_id, data in legacy.items():
+                    self._write_json(self._profile_path(profile_id), data)
+                    entries.append({"id": profile_id, "created_at": data.get("created_at", "")})
+                logger.info(f"Migrated {len(entries)} job profiles from {self.legacy_file.name}")
+            self._write_index(entries)
+
+    def _profile_path(self, profile_id: str) -> Path:
+        """Path of a profile's file; rejects IDs that could escape the directory."""
+        if not profile_id or not _SAFE_ID.match(profile_id):
+            raise ValueError(f"Invalid profile id: {profile_id!r}")
+        return self.profiles_dir / f"{profile_id}.json"
+
+    @contextmanager
+    def _locked(self, slot: int) -> Iterator[None]:
+        """Hold an exclusive cross-process lock on one slot of the lock file."""
+        if fcntl is None:
+            yield
+            return
+        with open(self.lock_file, 'a+') as lock:
+            fcntl.lockf(lock, fcntl.LOCK_EX, 1, slot)
+            try:
+                yield
+            finally:
+                fcntl.lockf(lock, fcntl.LOCK_UN, 1, slot)
+
+    def _profile_slot(self, profile_id: str) -> int:
+        return 1 + zlib.crc32(profile_id.encode()) % (LOCK_SLOTS - 1)
+
+    def _write_json(self, path: Path, data: Any):
+        """Write JSON to a temp file and atomically replace the target."""
+        fd, tmp_path = tempfile.mkstemp(dir=self.profiles_dir, prefix=".tmp-", suffix=".json")
         try:
-            with open(self.profiles_file, 'r') as f:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(data, f, default=str)
+            os.replace(tmp_path, path)
+        except Exception:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+    def _read_profile(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        """Read one profile file. Readers need no lock: writes are atomic replaces."""
+        try:
+            with open(self._profile_path(profile_id), 'r') as f:
                 return json.load(f)
         except (json.JSONDecodeError, FileNotFoundError):
-            return {}
+            return None
 
-    def _save_all(self, profiles: Dict[str, Dict]):
-        """Save all profiles to file."""
-        with open(self.profiles_file, 'w') as f:
-            json.dump(profiles, f, indent=2, default=str)
+    def _write_profile(self, profile_id: str, data: Dict[str, Any]):
+        self._write_json(self._profile_path(profile_id), data)
+
+    def _write_index(self, entries: List[Dict[str, Any]]):
+        """Rewrite the whole index (initial build and compaction)."""
+        fd, tmp_path = tempfile.mkstemp(dir=self.profiles_dir, prefix=".tmp-", suffix=".jsonl")
+        with os.fdopen(fd, 'w') as f:
+            for entry in entries:
+                f.write(json.dumps(entry) + "\n")
+        os.replace(tmp_path, self.index_file)
+        self._index_cache = None
+
+    def _append_index(self, entry: Dict[str, Any]):
+        """Append one create/delete record to the index. Caller holds slot 0."""
+        with open(self.index_file, 'a') as f:
+            f.write(json.dumps(entry) + "\n")
+
+    def _parse_index(self) -> tuple:
+        """Replay the index log into {id: created_at}; also returns the record count."""
+        live: Dict[str, str] = {}
+        records = 0
+        try:
+            with open(self.index_file, 'r') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # torn trailing write from a crashed process
+                    records += 1
+                    if entry.get("deleted"):
+                        live.pop(entry["id"], None)
+                    else:
+                        live[entry["id"]] = entry.get("created_at", "")
+        except FileNotFoundError:
+            pass
+        return live, records
+
+    def _read_index(self) -> List[str]:
+        """Profile IDs ordered by creation date (newest first), cached on file stat."""
+        try:
+            stat = self.index_file.stat()
+        except FileNotFoundError:
+            return []
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        if self._index_cache and self._index_cache[0] == stamp:
+            return self._index_cache[1]
+
+        live, records = self._parse_index()
+        if records - len(live) > max(len(live), 1) * INDEX_COMPACT_RATIO:
+            self._compact_index()
+
+        ordered = sorted(live, key=lambda pid: live[pid], reverse=True)
+        self._index_cache = (stamp, ordered)
+        return ordered
+
+    def _compact_index(self):
+        """Drop tombstones from the index, re-reading it under the lock."""
+        with self._locked(0):
+            live, _ = self._parse_index()
+            self._write_index([{"id": pid, "created_at": created} for pid, created in live.items()])
 
     def _to_dict(self, profile: JobProfile) -> Dict[str, Any]:
         """Convert JobProfile to dictionary for storage."""
@@ -121,12 +264,13 @@ class LocalJobProfileRepository:
     async def create(self, profile: JobProfile) -> Optional[JobProfile]:
         """Create a new job profile."""
         try:
-            profiles = self._load_all()
             data = self._to_dict(profile)
             data["created_at"] = datetime.utcnow().isoformat()
             data["updated_at"] = datetime.utcnow().isoformat()
-            profiles[profile.id] = data
-            self._save_all(profiles)
+            with self._locked(self._profile_slot(profile.id)):
+                self._write_profile(profile.id, data)
+            with self._locked(0):
+                self._append_index({"id": profile.id, "created_at": data["created_at"]})
             logger.info(f"Created job profile: {profile.id}")
             return self._from_dict(data)
         except Exception as e:
@@ -136,9 +280,9 @@ class LocalJobProfileRepository:
     async def get(self, profile_id: str) -> Optional[JobProfile]:
         """Get a job profile by ID."""
         try:
-            profiles = self._load_all()
-            if profile_id in profiles:
-                return self._from_dict(profiles[profile_id])
+            data = self._read_profile(profile_id)
+            if data is not None:
+                return self._from_dict(data)
             return None
         except Exception as e:
             logger.error(f"Error getting job profile {profile_id}: {e}")
@@ -147,15 +291,15 @@ class LocalJobProfileRepository:
     async def update(self, profile_id: str, profile: JobProfile) -> Optional[JobProfile]:
         """Update an entire job profile."""
         try:
-            profiles = self._load_all()
-            if profile_id not in profiles:
-                return None
-
-            data = self._to_dict(profile)
-            data["created_at"] = profiles[profile_id].get("created_at", datetime.utcnow().isoformat())
-            data["updated_at"] = datetime.utcnow().isoformat()
-            profiles[profile_id] = data
-            self._save_all(profiles)
+            with self._locked(self._profile_slot(profile_id)):
+                existing = self._read_profile(profile_id)
+                if existing is None:
+                    return None
+
+                data = self._to_dict(profile)
+                data["created_at"] = existing.get("created_at", datetime.utcnow().isoformat())
+                data["updated_at"] = datetime.utcnow().isoformat()
+                self._write_profile(profile_id, data)
             return self._from_dict(data)
         except Exception as e:
             logger.error(f"Error updating job profile {profile_id}: {e}")
@@ -164,19 +308,23 @@ class LocalJobProfileRepository:
     async def save(self, profile: JobProfile) -> Optional[JobProfile]:
         """Save a job profile (create or update based on existence)."""
         try:
-            profiles = self._load_all()
             data = self._to_dict(profile)
-
-            if profile.id in profiles:
-                # Update existing
-                data["created_at"] = profiles[profile.id].get("created_at", datetime.utcnow().isoformat())
-            else:
-                # Create new
-                data["created_at"] = datetime.utcnow().isoformat()
-
-            data["updated_at"] = datetime.utcnow().isoformat()
-            profiles[profile.id] = data
-            self._save_all(profiles)
+            with self._locked(self._profile_slot(profile.id)):
+                existing = self._read_profile(profile.id)
+
+                if existing is not None:
+                    # Update existing
+                    data["created_at"] = existing.get("created_at", datetime.utcnow().isoformat())
+                else:
+                    # Create new
+                    data["created_at"] = datetime.utcnow().isoformat()
+
+                data["updated_at"] = datetime.utcnow().isoformat()
+                self._write_profile(profile.id, data)
+
+            if existing is None:
+                with self._locked(0):
+                    self._append_index({"id": profile.id, "created_at": data["created_at"]})
             return self._from_dict(data)
         except Exception as e:
             logger.error(f"Error saving job profile {profile.id}: {e}")
@@ -185,12 +333,14 @@ class LocalJobProfileRepository:
     async def delete(self, profile_id: str) -> bool:
         """Delete a job profile."""
         try:
-            profiles = self._load_all()
-            if profile_id in profiles:
-                del profiles[profile_id]
-                self._save_all(profiles)
-                return True
-            return False
+            with self._locked(self._profile_slot(profile_id)):
+                path = self._profile_path(profile_id)
+                if not path.exists():
+                    return False
+                path.unlink()
+            with self._locked(0):
+                self._append_index({"id": profile_id, "deleted": True})
+            return True
         except Exception as e:
             logger.error(f"Error deleting job profile {profile_id}: {e}")
             return False
@@ -198,18 +348,40 @@ class LocalJobProfileRepository:
     async def list_all(self, limit: int = 20, offset: int = 0) -> List[JobProfile]:
         """List all job profiles, ordered by creation date (newest first)."""
         try:
-            profiles = self._load_all()
-            sorted_profiles = sorted(
-                profiles.values(),
-                key=lambda x: x.get("created_at", ""),
-                reverse=True
-            )
-            paginated = sorted_profiles[offset:offset + limit]
-            return [self._from_dict(p) for p in paginated]
+            page = self._read_index()[offset:offset + limit]
+            profiles = []
+            for profile_id in page:
+                data = self._read_profile(profile_id)
+                if data is not None:
+                    profiles.append(self._from_dict(data))
+            return profiles
         except Exception as e:
             logger.error(f"Error listing job profiles: {e}")
             return []
 
+    async def count(self) -> int:
+        """Number of stored job profiles."""
+        return len(self._read_index())
+
+    @asynccontextmanager
+    async def _editing(self, profile_id: str):
+        """
+        Read-modify-write a profile under its lock.
+
+        Yields the profile (None if missing); changes made in the block are
+        written back on exit unless it raises. The block must not await,
+        so no other coroutine can interleave with the edit.
+        """
+        with self._locked(self._profile_slot(profile_id)):
+            data = self._read_profile(profile_id)
+            profile = self._from_dict(data) if data is not None else None
+            yield profile
+            if profile is not None:
+                updated = self._to_dict(profile)
+                updated["created_at"] = data.get("created_at", datetime.utcnow().isoformat())
+                updated["updated_at"] = datetime.utcnow().isoformat()
+                self._write_profile(profile_id, updated)
+
     # ==========================================================================
     # Partial Updates (for tool calls)
     # ==========================================================================
@@ -217,17 +389,16 @@ class LocalJobProfileRepository:
     async def update_requirements(self, session_id: str, updates: Dict[str, Any]) -> bool:
         """Update job requirements fields."""
         try:
-            profile = await self.get(session_id)
-            if not profile:
-                return False
+            async with self._editing(session_id) as profile:
+                if not profile:
+                    return False
 
-            req_dict = profile.requirements.model_dump()
-            for key, value in updates.items():
-                req_dict[key] = value
+                req_dict = profile.requirements.model_dump()
+                for key, value in updates.items():
+                    req_dict[key] = value
 
-            profile.requirements = HardRequirements(**req_dict)
-            profile.update_completion_status()
-            await self.update(session_id, profile)
+                profile.requirements = HardRequirements(**req_dict)
+                profile.update_completion_status()
             return True
         except Exception as e:
             logger.error(f"Error updating requirements: {e}")
@@ -236,13 +407,12 @@ class LocalJobProfileRepository:
     async def update_company_intel(self, session_id: str, company_intel: CompanyIntelligence) -> bool:
         """Update the entire company intelligence."""
         try:
-            profile = await self.get(session_id)
-            if not profile:
-                return False
+            async with self._editing(session_id) as profile:
+                if not profile:
+                    return False
 
-            profile.company = company_intel
-            profile.parallel_research_status = "complete"
-            await self.update(session_id, profile)
+                profile.company = company_intel
+                profile.parallel_research_status = "complete"
             return True
         except Exception as e:
             logger.error(f"Error updating company intel: {e}")
@@ -251,12 +421,11 @@ class LocalJobProfileRepository:
     async def update_research_status(self, session_id: str, status: str) -> bool:
         """Update Parallel.ai research status."""
         try:
-            profile = await self.get(session_id)
-            if not profile:
-                return False
+            async with self._editing(session_id) as profile:
+                if not profile:
+                    return False
 
-            profile.parallel_research_status = status
-            await self.update(session_id, profile)
+                profile.parallel_research_status = status
             return True
         except Exception as e:
             logger.error(f"Error updating research status: {e}")
@@ -269,12 +438,11 @@ class LocalJobProfileRepository:
     async def add_trait(self, session_id: str, trait: CandidateTrait) -> bool:
         """Add a trait to the profile."""
         try:
-            profile = await self.get(session_id)
-            if not profile:
-                return False
+            async with self._editing(session_id) as profile:
+                if not profile:
+                    return False
 
-            profile.add_trait(trait)
-            await self.update(session_id, profile)
+                profile.add_trait(trait)
             return True
         except Exception as e:
             logger.error(f"Error adding trait: {e}")
@@ -283,22 +451,20 @@ class LocalJobProfileRepository:
     async def update_trait(self, session_id: str, trait_name: str, updates: Dict[str, Any]) -> bool:
         """Update a specific trait."""
         try:
-            profile = await self.get(session_id)
-            if not profile:
-                return False
-
-            for trait in profile.traits:
-                if trait.name.lower() == trait_name.lower():
-                    if "description" in updates:
-                        trait.description = updates["description"]
-                    if "priority" in updates:
-                        from models.voice_ingest.enums import TraitPriority
-                        trait.priority = TraitPriority(updates["priority"])
-                    if "add_signals" in updates:
-                        trait.signals.extend(updates["add_signals"])
-                    break
-
-            await self.update(session_id, profile)
+            async with self._editing(session_id) as profile:
+                if not profile:
+                    return False
+
+                for trait in profile.traits:
+                    if trait.name.lower() == trait_name.lower():
+                        if "description" in updates:
+                            trait.description = updates["description"]
+                        if "priority" in updates:
+                            from models.voice_ingest.enums import TraitPriority
+                            trait.priority = TraitPriority(updates["priority"])
+                        if "add_signals" in updates:
+                            trait.signals.extend(updates["add_signals"])
+                        break
             return True
         except Exception as e:
             logger.error(f"Error updating trait: {e}")
@@ -307,12 +473,11 @@ class LocalJobProfileRepository:
     async def delete_trait(self, session_id: str, trait_name: str) -> bool:
         """Delete a trait from the profile."""
         try:
-            profile = await self.get(session_id)
-            if not profile:
-                return False
+            async with self._editing(session_id) as profile:
+                if not profile:
+                    return False
 
-            profile.remove_trait(trait_name)
-            await self.update(session_id, profile)
+                profile.remove_trait(trait_name)
             return True
         except Exception as e:
             logger.error(f"Error deleting trait: {e}")
@@ -325,12 +490,11 @@ class LocalJobProfileRepository:
     async def add_interview_stage(self, session_id: str, stage: InterviewStage) -> bool:
         """Add an interview stage to the profile."""
         try:
-            profile = await self.get(session_id)
-            if not profile:
-                return False
+            async with self._editing(session_id) as profile:
+                if not profile:
+                    return False
 
-            profile.add_interview_stage(stage)
-            await self.update(session_id, profile)
+                profile.add_interview_stage(stage)
             return True
         except Exception as e:
             logger.error(f"Error adding interview stage: {e}")
@@ -339,21 +503,19 @@ class LocalJobProfileRepository:
     async def update_interview_stage(self, session_id: str, stage_name: str, updates: Dict[str, Any]) -> bool:
         """Update a specific interview stage."""
         try:
-            profile = await self.get(session_id)
-            if not profile:
-                return False
-
-            for stage in profile.interview_stages:
-                if stage.name.lower() == stage_name.lower():
-                    if "description" in updates:
-                        stage.description = updates["description"]
-                    if "duration_minutes" in updates:
-                        stage.duration_minutes = updates["duration_minutes"]
-                    if "add_actions" in updates:
-                        stage.actions.extend(updates["add_actions"])
-                    break
-
-            await self.update(session_id, profile)
+            async with self._editing(session_id) as profile:
+                if not profile:
+                    return False
+
+                for stage in profile.interview_stages:
+                    if stage.name.lower() == stage_name.lower():
+                        if "description" in updates:
+                            stage.description = updates["description"]
+                        if "duration_minutes" in updates:
+                            stage.duration_minutes = updates["duration_minutes"]
+                        if "add_actions" in updates:
+                            stage.actions.extend(updates["add_actions"])
+                        break
             return True
         except Exception as e:
             logger.error(f"Error updating interview stage: {e}")
@@ -362,12 +524,11 @@ class LocalJobProfileRepository:
     async def delete_interview_stage(self, session_id: str, stage_name: str) -> bool:
         """Delete an interview stage from the profile."""
         try:
-            profile = await self.get(session_id)
-            if not profile:
-                return False
+            async with self._editing(session_id) as profile:
+                if not profile:
+                    return False
 
-            profile.remove_interview_stage(stage_name)
-            await self.update(session_id, profile)
+                profile.remove_interview_stage(stage_name)
             return True
         except Exception as e:
             logger.error(f"Error deleting interview stage: {e}")
@@ -380,12 +541,11 @@ class LocalJobProfileRepository:
     async def add_nuance(self, session_id: str, nuance: NuanceCapture) -> bool:
         """Add a nuance to the profile."""
         try:
-            profile = await self.get(session_id)
-            if not profile:
-                return False
+            async with self._editing(session_id) as profile:
+                if not profile:
+                    return False
 
-            profile.add_nuance(nuance)
-            await self.update(session_id, profile)
+                profile.add_nuance(nuance)
             return True
         except Exception as e:
             logger.error(f"Error adding nuance: {e}")
@@ -398,18 +558,16 @@ class LocalJobProfileRepository:
     async def mark_field_complete(self, session_id: str, field_name: str) -> bool:
         """Mark a specific field as confirmed/complete."""
         try:
-            profile = await self.get(session_id)
-            if not profile:
-                return False
-
             from models.voice_ingest.enums import ExtractionSource
-            confidence = FieldConfidence.high_confidence(field_name, ExtractionSource.CONVERSATION)
 
-            profile.field_confidence = [fc for fc in profile.field_confidence if fc.field_name != field_name]
-            profile.field_confidence.append(confidence)
-            profile.update_completion_status()
+            async with self._editing(session_id) as profile:
+                if not profile:
+                    return False
 
-            await self.update(session_id, profile)
+                confidence = FieldConfidence.high_confidence(field_name, ExtractionSource.CONVERSATION)
+                profile.field_confidence = [fc for fc in profile.field_confidence if fc.field_name != field_name]
+                profile.field_confidence.append(confidence)
+                profile.update_completion_status()
             return True
         except Exception as e:
             logger.error(f"Error marking field complete: {e}")
@@ -418,13 +576,12 @@ class LocalJobProfileRepository:
     async def mark_complete(self, session_id: str) -> bool:
         """Mark the entire profile as complete."""
         try:
-            profile = await self.get(session_id)
-            if not profile:
-                return False
+            async with self._editing(session_id) as profile:
+                if not profile:
+                    return False
 
-            profile.is_complete = True
-            profile.missing_required_fields = []
-            await self.update(session_id, profile)
+                profile.is_complete = True
+                profile.missing_required_fields = []
             return True
         except Exception as e:
             logger.error(f"Error marking profile complete: {e}")
@@ -0,0 +1,137 @@
+"""
+LLM usage repository - the per-call ledger written by services/llm_usage.py.
+"""
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from db.client import get_db
+from db.errors import is_missing_relation
+
+logger = logging.getLogger(__name__)
+
+# group_by value -> ledger column (the RPC groups "day" by UTC date of created_at)
+GROUP_COLUMNS = {
+    "job": "job_id",
+    "candidate": "candidate_id",
+    "family": "family",
+    "model": "model",
+    "lane": "lane",
+    "day": "created_at",
+}
+
+SUMMARY_FIELDS = (
+    "calls", "limited", "errors", "prompt_tokens", "completion_tokens",
+    "cached_tokens", "cache_hits", "cost_usd", "avg_latency_ms",
+)
+
+PAGE_SIZE = 1000  # PostgREST's default max rows per response
+
+
+class LLMUsageRepository:
+    """Batched writes to and grouped reads from the llm_usage table."""
+
+    _table_available = True  # see db.errors
+    _summary_rpc_available = True
+
+    def __init__(self):
+        self.client = get_db()
+        self.table = "llm_usage"
+
+    def insert_many_sync(self, rows: List[Dict[str, Any]]) -> int:
+        """Insert ledger rows in one round trip. Returns how many were written."""
+        if not rows or not LLMUsageRepository._table_available:
+            return 0
+        try:
+            self.client.table(self.table).insert(rows).execute()
+        except Exception as e:
+            if not is_missing_relation(e, self.table):
+                raise
+            logger.warning(f"llm_usage table unavailable, not recording LLM usage: {e}")
+            LLMUsageRepository._table_available = False
+            return 0
+        return len(rows)
+
+    def summary_sync(
+        self,
+        organization_id: str,
+        group_by: str,
+        since: datetime,
+        until: Optional[datetime] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Calls, tokens, cache hits and cost for an organization, grouped by
+        job, candidate, family, model, lane or day, most expensive first.
+        """
+        if group_by not in GROUP_COLUMNS:
+            raise ValueError(f"Unknown group_by {group_by!r}")
+        if not LLMUsageRepository._table_available:
+            return []
+
+        if LLMUsageRepository._summary_rpc_available:
+            try:
+                result = self.client.rpc("llm_usage_summary", {
+                    "p_org_id": str(organization_id),
+                    "p_group_by": group_by,
+                    "p_since": since.isoformat(),
+                    "p_until": until.isoformat() if until else None,
+                }).execute()
+                return [self._summary_row(row) for row in result.data or []]
+            except Exception as e:
+                if not is_missing_relation(e, "llm_usage_summary"):
+                    raise
+                logger.warning(f"llm_usage_summary RPC unavailable, aggregating in Python: {e}")
+                LLMUsageRepository._summary_rpc_available = False
+
+        groups: Dict[Optional[str], Dict[str, Any]] = {}
+        latencies: Dict[Optional[str], List[int]] = {}
+        for row in self._rows_sync(organization_id, since, until):
+            key = row.get(GROUP_COLUMNS[group_by])
+            if group_by == "day" and key:
+                key = key[:10]
+            entry = groups.setdefault(key, {"key": key, **{f: 0 for f in SUMMARY_FIELDS}})
+            if row.get("outcome") == "limited":
+                entry["limited"] += 1
+                continue
+            entry["calls"] += 1
+            entry["errors"] += row.get("outcome") == "error"
+            for field in ("prompt_tokens", "completion_tokens", "cached_tokens"):
+                entry[field] += row.get(field) or 0
+            entry["cache_hits"] += bool(row.get("cache_hit"))
+            entry["cost_usd"] += float(row.get("cost_usd") or 0)
+            if row.get("latency_ms") is not None:
+                latencies.setdefault(key, []).append(row["latency_ms"])
+
+        for key, entry in groups.items():
+            values = latencies.get(key)
+            entry["avg_latency_ms"] = round(sum(values) / len(values), 1) if values else None
+            entry["cost_usd"] = round(entry["cost_usd"], 6)
+        return sorted(groups.values(), key=lambda entry: entry["cost_usd"], reverse=True)
+
+    def _rows_sync(self, organization_id: str, since: datetime, until: Optional[datetime]) -> List[Dict[str, Any]]:
+        rows: List[Dict[str, Any]] = []
+        while True:
+            query = self.client.table(self.table)\
+                .select(
+                    "job_id, candidate_id, family, model, lane, outcome, prompt_tokens, "
+                    "completion_tokens, cached_tokens, cache_hit, latency_ms, cost_usd, created_at"
+                )\
+                .eq("organization_id", str(organization_id))\
+                .gte("created_at", since.isoformat())
+            if until:
+                query = query.lt("created_at", until.isoformat())
+            page = query.order("created_at").range(len(rows), len(rows) + PAGE_SIZE - 1).execute().data or []
+            rows.extend(page)
+            if len(page) < PAGE_SIZE:
+                return rows
+
+    @staticmethod
+    def _summary_row(row: Dict[str, Any]) -> Dict[str, Any]:
+        entry = {"key": row.get("key")}
+        for field in SUMMARY_FIELDS:
+            value = row.get(field)
+            if field in ("cost_usd", "avg_latency_ms"):
+                entry[field] = float(value) if value is not None else (None if field == "avg_latency_ms" else 0.0)
+            else:
+                entry[field] = int(value or 0)
+        return entry
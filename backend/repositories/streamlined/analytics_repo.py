@@ -2,6 +2,7 @@
 Analytics Repository - Database operations for Analytics entities.
 """
 
+import logging
 from typing import List, Optional, Dict, Any
 from uuid import UUID
 from datetime import datetime
@@ -10,11 +11,30 @@ from models.streamlined.analytics import (
     Analytics, AnalyticsCreate, CompetencyScore, Recommendation
 )
 from db.client import get_db
+from db.errors import is_missing_relation
+
+logger = logging.getLogger(__name__)
+
+# Analytics columns the job-level list and summary need (no competency or raw AI blobs)
+JOB_LIST_COLUMNS = (
+    "id, interview_id, overall_score, recommendation, summary, synthesis, "
+    "strengths, concerns, red_flags_detected, created_at"
+)
+
+
+def _invalidate_analytics_caches(interview_id: Optional[str]) -> None:
+    """Drop offer-prep intelligence and the job analytics summary built from this interview's analytics."""
+    from services.candidate_intel_cache import candidate_intel_cache
+    from services.job_analytics_cache import job_analytics_cache
+    candidate_intel_cache.invalidate_interview(interview_id)
+    job_analytics_cache.invalidate_interview(interview_id)
 
 
 class AnalyticsRepository:
     """Repository for Analytics database operations."""
 
+    _summary_rpc_available = True  # see db.errors
+
     def __init__(self):
         self.client = get_db()
         self.table = "analytics"
@@ -41,6 +61,7 @@ class AnalyticsRepository:
         if not result.data:
             raise Exception("Failed to create analytics")
 
+        _invalidate_analytics_caches(data["interview_id"])
         return self._parse_analytics(result.data[0])
 
     def create_sync(self, analytics_data: AnalyticsCreate) -> Analytics:
@@ -65,6 +86,7 @@ class AnalyticsRepository:
         if not result.data:
             raise Exception("Failed to create analytics")
 
+        _invalidate_analytics_caches(data["interview_id"])
         return self._parse_analytics(result.data[0])
 
     async def get_by_id(self, analytics_id: UUID) -> Optional[Analytics]:
@@ -187,6 +209,100 @@ class AnalyticsRepository:
 
         return analytics_list
 
+    def list_summaries_by_job_sync(self, job_id: UUID) -> List[Dict[str, Any]]:
+        """
+        List a job's analytics as lightweight rows, best score first.
+
+        Selects only JOB_LIST_COLUMNS and skips model parsing, for list views
+        that show counts rather than competency detail.
+        """
+        interviews = self._job_interviews_sync(job_id)
+        if not interviews:
+            return []
+
+        result = self.client.table(self.table)\
+            .select(JOB_LIST_COLUMNS)\
+            .in_("interview_id", list(interviews))\
+            .order("overall_score", desc=True, nullsfirst=False)\
+            .execute()
+
+        rows = []
+        for data in result.data:
+            interview = interviews.get(data.get("interview_id")) or {}
+            rows.append({
+                **data,
+                "candidate_name": (interview.get("candidates") or {}).get("name"),
+                "recommendation": self._map_recommendation(data.get("recommendation")).value,
+                "summary": data.get("summary") or data.get("synthesis", ""),
+            })
+        return rows
+
+    def get_job_summary_sync(self, job_id: UUID, top_n: int = 5) -> Dict[str, Any]:
+        """
+        Aggregate a job's analytics: count, average score, recommendation
+        breakdown and the top N candidates by score.
+
+        Uses the job_analytics_summary RPC (one aggregate query with LIMIT)
+        when installed; otherwise aggregates projected score/recommendation
+        rows here.
+        """
+        if AnalyticsRepository._summary_rpc_available:
+            try:
+                result = self.client.rpc("job_analytics_summary", {
+                    "p_job_id": str(job_id),
+                    "p_top_n": top_n,
+                }).execute()
+                summary = result.data or {}
+                return {
+                    "total_candidates": summary.get("total") or 0,
+                    "avg_score": round(float(summary.get("avg_score") or 0), 1),
+                    "recommendation_breakdown": summary.get("recommendation_breakdown") or {},
+                    "top_candidates": summary.get("top_candidates") or [],
+                }
+            except Exception as e:
+                if not is_missing_relation(e, "job_analytics_summary"):
+                    raise
+                logger.warning(f"job_analytics_summary RPC unavailable, aggregating in Python: {e}")
+                AnalyticsRepository._summary_rpc_available = False
+
+        interviews = self._job_interviews_sync(job_id)
+        rows = []
+        if interviews:
+            rows = self.client.table(self.table)\
+                .select("interview_id, overall_score, recommendation")\
+                .in_("interview_id", list(interviews))\
+                .execute().data
+
+        scores = [row["overall_score"] for row in rows if row.get("overall_score")]
+        breakdown: Dict[str, int] = {}
+        for row in rows:
+            rec = self._map_recommendation(row.get("recommendation")).value
+            breakdown[rec] = breakdown.get(rec, 0) + 1
+
+        top = sorted(rows, key=lambda row: row.get("overall_score") or 0, reverse=True)[:top_n]
+        return {
+            "total_candidates": len(rows),
+            "avg_score": round(sum(scores) / len(scores), 1) if scores else 0,
+            "recommendation_breakdown": breakdown,
+            "top_candidates": [
+                {
+                    "candidate_name": ((interviews.get(row["interview_id"]) or {}).get("candidates") or {}).get("name"),
+                    "score": row.get("overall_score"),
+                    "recommendation": self._map_recommendation(row.get("recommendation")).value,
+                }
+                for row in top
+            ],
+        }
+
+    def _job_interviews_sync(self, job_id: UUID) -> Dict[str, dict]:
+        """Map interview_id -> interview row (with candidate name) for a job."""
+        result = self.client.table("interviews")\
+            .select("id, candidate_id, candidates!fk_interviews_candidate(name)")\
+            .eq("job_posting_id", str(job_id))\
+            .execute()
+
+        return {row["id"]: row for row in result.data}
+
     async def list_all(self, limit: int = 100) -> List[Analytics]:
         """Get all analytics records."""
         result = self.client.table(self.table)\
@@ -221,6 +337,7 @@ class AnalyticsRepository:
         if not result.data:
             return None
 
+        _invalidate_analytics_caches(result.data[0].get("interview_id"))
         return self._parse_analytics(result.data[0])
 
     def update_sync(
@@ -237,6 +354,7 @@ class AnalyticsRepository:
         if not result.data:
             return None
 
+        _invalidate_analytics_caches(result.data[0].get("interview_id"))
         return self._parse_analytics(result.data[0])
 
     async def delete(self, analytics_id: UUID) -> bool:
@@ -246,6 +364,8 @@ class AnalyticsRepository:
             .eq("id", str(analytics_id))\
             .execute()
 
+        for row in result.data:
+            _invalidate_analytics_caches(row.get("interview_id"))
         return len(result.data) > 0
 
     def delete_sync(self, analytics_id: UUID) -> bool:
@@ -255,6 +375,8 @@ class AnalyticsRepository:
             .eq("id", str(analytics_id))\
             .execute()
 
+        for row in result.data:
+            _invalidate_analytics_caches(row.get("interview_id"))
         return len(result.data) > 0
 
     def _parse_analytics(self, data: dict) -> Analytics:
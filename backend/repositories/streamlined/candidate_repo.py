@@ -4,19 +4,89 @@ Candidate Repository - Database operations for Candidate entities.
 Handles CRUD operations for candidates (Person + Job junction).
 """
 
-from typing import List, Optional
+import base64
+import json
+import logging
+import math
+from typing import Any, Dict, List, Optional, Tuple
 from uuid import UUID
 from datetime import datetime
 
 from models.streamlined.candidate import (
-    Candidate, CandidateCreate, CandidateUpdate, InterviewStatus
+    Candidate, CandidateCreate, CandidateUpdate, CandidateListItem, InterviewStatus
 )
+from repositories.streamlined.job_repo import JobRepository, INTERVIEWED_STATUSES
 from db.client import get_db
+from db.errors import is_missing_relation
+from services.access_control import forget_owner
+
+logger = logging.getLogger(__name__)
+
+
+# IDs per in_() filter; keeps PostgREST query strings well under URL limits
+BULK_CHUNK_SIZE = 200
+
+# Columns behind CandidateListItem; screening notes, bio and skills stay in the DB
+LIST_ITEM_COLUMNS = (
+    "id, person_id, job_posting_id, job_title, current_company, combined_score, "
+    "tier, pipeline_status, created_at, persons(name, email)"
+)
+CANDIDATE_SORTS = ("created", "score", "stage")
+CANDIDATE_FIELDS = ("full", "summary")
+
+
+def pipeline_stage_order(interview_stage_count: int = 0) -> List[str]:
+    """Pipeline statuses in board order, including a job's configurable stage_N columns."""
+    return (
+        ["new", "round_1", "round_2", "round_3"]
+        + [f"stage_{i}" for i in range(interview_stage_count)]
+        + ["decision_pending", "accepted", "rejected"]
+    )
+
+
+def encode_cursor(values: List[Any]) -> str:
+    """Opaque page cursor: the sort name plus the last row's sort key."""
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> List[Any]:
+    """
+    Reverse encode_cursor; raises ValueError for anything malformed.
+
+    Cursors come back from the client and end up in PostgREST filter strings,
+    so the last row's id must be a UUID and its sort value None, a number or
+    an ISO-8601 timestamp.
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except ValueError as e:
+        raise ValueError("Invalid cursor") from e
+    if not isinstance(values, list) or len(values) not in (3, 4) or not isinstance(values[-1], str):
+        raise ValueError("Invalid cursor")
+    try:
+        values[-1] = str(UUID(values[-1]))
+        values[-2] = _sort_value(values[-2])
+    except ValueError as e:
+        raise ValueError("Invalid cursor") from e
+    return values
+
+
+def _sort_value(value: Any) -> Any:
+    """A cursor's sort key as None, a finite number or a normalised timestamp string."""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value):
+        return value
+    if isinstance(value, str):
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).isoformat()
+    raise ValueError(f"Unsupported cursor sort value {value!r}")
 
 
 class CandidateRepository:
     """Repository for Candidate database operations."""
 
+    _bulk_rpc_available = True  # see db.errors
+
     def __init__(self):
         self.client = get_db()
         self.table = "candidates"
@@ -188,6 +258,128 @@ class CandidateRepository:
 
         return candidates
 
+    def list_page_by_job_sync(
+        self,
+        job_id: UUID,
+        status: Optional[str] = None,
+        sort: str = "created",
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        fields: str = "full",
+        stages: Optional[List[str]] = None,
+    ) -> Tuple[list, Optional[str]]:
+        """
+        List a job's candidates with server-side sort and keyset pagination.
+
+        Args:
+            job_id: Job to list candidates for
+            status: Only this pipeline status
+            sort: "created" (newest first), "score" (highest first, unscored
+                last) or "stage" (pipeline order, then score)
+            limit: Page size; None returns every candidate
+            cursor: next_cursor from the previous page
+            fields: "summary" selects only list columns (CandidateListItem),
+                "full" returns Candidate with screening notes
+            stages: Stage order for sort="stage" (see pipeline_stage_order)
+
+        Returns:
+            (candidates, next_cursor); next_cursor is None on the last page
+
+        Raises:
+            ValueError: Unknown sort or fields, or a malformed cursor
+        """
+        if sort not in CANDIDATE_SORTS:
+            raise ValueError(f"sort must be one of: {', '.join(CANDIDATE_SORTS)}")
+        if fields not in CANDIDATE_FIELDS:
+            raise ValueError(f"fields must be one of: {', '.join(CANDIDATE_FIELDS)}")
+
+        after = decode_cursor(cursor) if cursor else None
+        if after and after[0] != sort:
+            raise ValueError("Cursor was issued for a different sort")
+
+        columns = LIST_ITEM_COLUMNS if fields == "summary" else "*, persons(name, email)"
+        if sort == "stage":
+            rows = self._stage_rows(job_id, status, columns, limit, after, stages)
+            key = lambda row: ["stage", row.get("pipeline_status") or "new", row.get("combined_score"), row["id"]]
+        else:
+            column = "created_at" if sort == "created" else "combined_score"
+            query = self._job_query(job_id, status, columns)
+            if after:
+                query = self._after(query, column, after[1], after[2])
+            query = query.order(column, desc=True, nullsfirst=False).order("id", desc=True)
+            if limit:
+                query = query.limit(limit + 1)
+            rows = query.execute().data
+            key = lambda row: [sort, row.get(column), row["id"]]
+
+        # One extra row was fetched to tell whether another page exists
+        next_cursor = None
+        if limit and len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(key(rows[-1]))
+
+        parse = self._parse_list_item if fields == "summary" else self._parse_candidate_with_joins
+        return [parse(row) for row in rows], next_cursor
+
+    def _job_query(self, job_id: UUID, status: Optional[str], columns: str):
+        query = self.client.table(self.table)\
+            .select(columns)\
+            .eq("job_posting_id", str(job_id))
+
+        if status:
+            query = query.eq("pipeline_status", status)
+        return query
+
+    @staticmethod
+    def _after(query, column: str, value: Any, last_id: str):
+        """Keyset filter for rows after (value, last_id) in "column desc nulls last, id desc" order."""
+        if value is None:
+            return query.is_(column, "null").lt("id", last_id)
+        return query.or_(
+            f'{column}.lt."{value}",{column}.is.null,and({column}.eq."{value}",id.lt.{last_id})'
+        )
+
+    def _stage_rows(
+        self,
+        job_id: UUID,
+        status: Optional[str],
+        columns: str,
+        limit: Optional[int],
+        after: Optional[List[Any]],
+        stages: Optional[List[str]],
+    ) -> List[dict]:
+        """Walk stages in pipeline order, best score first within each, until the page is full."""
+        order = [status] if status else (stages or pipeline_stage_order())
+        start = 0
+        if after:
+            if len(after) < 4 or after[1] not in order:
+                raise ValueError("Invalid cursor")
+            start = order.index(after[1])
+
+        rows: List[dict] = []
+        for stage in order[start:]:
+            if limit and len(rows) > limit:
+                break
+
+            query = self.client.table(self.table)\
+                .select(columns)\
+                .eq("job_posting_id", str(job_id))
+            if stage == "new":
+                # Rows without a status show in the New column of the board
+                query = query.or_("pipeline_status.eq.new,pipeline_status.is.null")
+            else:
+                query = query.eq("pipeline_status", stage)
+
+            if after and stage == after[1]:
+                query = self._after(query, "combined_score", after[2], after[3])
+
+            query = query.order("combined_score", desc=True, nullsfirst=False).order("id", desc=True)
+            if limit:
+                query = query.limit(limit + 1 - len(rows))
+            rows.extend(query.execute().data)
+
+        return rows
+
     async def list_by_person(self, person_id: UUID) -> List[Candidate]:
         """List all job applications for a person."""
         result = self.client.table(self.table)\
@@ -302,6 +494,7 @@ class CandidateRepository:
             .delete()\
             .eq("id", str(candidate_id))\
             .execute()
+        forget_owner("candidate", candidate_id)
 
         return len(result.data) > 0
 
@@ -311,6 +504,7 @@ class CandidateRepository:
             .delete()\
             .eq("id", str(candidate_id))\
             .execute()
+        forget_owner("candidate", candidate_id)
 
         return len(result.data) > 0
 
@@ -336,6 +530,24 @@ class CandidateRepository:
             person_email=data.get("email"),
         )
 
+    def _parse_list_item(self, data: dict) -> CandidateListItem:
+        """Parse a LIST_ITEM_COLUMNS row into CandidateListItem."""
+        person = data.get("persons") or {}
+        return CandidateListItem(
+            id=data.get("id"),
+            person_id=data.get("person_id"),
+            job_id=data.get("job_posting_id"),
+            person_name=person.get("name"),
+            person_email=person.get("email"),
+            current_title=data.get("job_title"),
+            current_company=data.get("current_company"),
+            combined_score=data.get("combined_score"),
+            tier=data.get("tier"),
+            interview_status=self._map_pipeline_status(data.get("pipeline_status") or "new"),
+            pipeline_status=data.get("pipeline_status"),
+            created_at=data.get("created_at"),
+        )
+
     def _parse_candidate_with_joins(self, data: dict) -> Candidate:
         """Parse database row with joins into Candidate model."""
         candidate = self._parse_candidate(data)
@@ -402,12 +614,16 @@ class CandidateRepository:
 
         return list(person_ids)
 
-    def count_by_job_sync(self, job_id: UUID) -> int:
-        """Count candidates for a specific job."""
-        result = self.client.table(self.table)\
+    def count_by_job_sync(self, job_id: UUID, status: Optional[str] = None) -> int:
+        """Count candidates for a specific job, optionally in one pipeline status."""
+        query = self.client.table(self.table)\
             .select("id", count="exact")\
-            .eq("job_posting_id", str(job_id))\
-            .execute()
+            .eq("job_posting_id", str(job_id))
+
+        if status:
+            query = query.eq("pipeline_status", status)
+
+        result = query.execute()
 
         return result.count if result.count else 0
 
@@ -467,29 +683,113 @@ class CandidateRepository:
 
     def count_by_jobs_batch_sync(self, job_ids: List[str]) -> dict:
         """
-        Count candidates for multiple jobs in a single query.
+        Count candidates for multiple jobs from the per-job pipeline counts.
 
         Args:
             job_ids: List of job IDs to count candidates for
 
         Returns:
-            Dict mapping job_id -> candidate count
+            Dict mapping job_id -> candidate count (jobs without candidates are omitted)
         """
         if not job_ids:
             return {}
 
-        result = self.client.table(self.table)\
-            .select("job_posting_id")\
-            .in_("job_posting_id", job_ids)\
-            .execute()
+        job_counts = JobRepository().get_pipeline_status_counts_sync(job_ids)
+        return {
+            job_id: sum(status_counts.values())
+            for job_id, status_counts in job_counts.items()
+            if status_counts
+        }
 
-        # Count candidates per job
-        counts: dict = {}
-        for row in result.data:
-            job_id = row.get("job_posting_id")
-            if job_id:
-                counts[job_id] = counts.get(job_id, 0) + 1
+    def count_for_org_sync(self, organization_id: UUID) -> Dict[str, int]:
+        """
+        Candidate totals across an organization's jobs, from the per-job
+        pipeline counts (no candidate rows are loaded).
+
+        Returns:
+            Dict with 'total' and 'interviewed' (past screening) counts
+        """
+        status_counts = JobRepository().status_counts_for_org_sync(organization_id)
+        return {
+            "total": sum(status_counts.values()),
+            "interviewed": sum(
+                count for status, count in status_counts.items()
+                if status in INTERVIEWED_STATUSES
+            ),
+        }
 
+    def count_by_interview_status_sync(self, job_ids: List[str]) -> Dict[str, int]:
+        """
+        Candidates per interview status (pending, in_progress, completed,
+        rejected) across jobs, from the per-job pipeline counts.
+        """
+        counts: Dict[str, int] = {}
+        for status_counts in JobRepository().get_pipeline_status_counts_sync(job_ids).values():
+            for status, count in status_counts.items():
+                interview_status = self._map_pipeline_status(status).value
+                counts[interview_status] = counts.get(interview_status, 0) + count
         return counts
 
+    def get_job_ids_sync(self, candidate_ids: List[str]) -> Dict[str, str]:
+        """
+        Look up which job each candidate belongs to, one query per chunk.
+
+        Args:
+            candidate_ids: Candidate IDs to look up
+
+        Returns:
+            Dict mapping candidate_id -> job_posting_id (unknown IDs are omitted)
+        """
+        job_ids: Dict[str, str] = {}
+        for i in range(0, len(candidate_ids), BULK_CHUNK_SIZE):
+            result = self.client.table(self.table)\
+                .select("id, job_posting_id")\
+                .in_("id", candidate_ids[i:i + BULK_CHUNK_SIZE])\
+                .execute()
+            for row in result.data:
+                job_ids[row["id"]] = row.get("job_posting_id")
+        return job_ids
+
+    def bulk_update_pipeline_status_sync(
+        self,
+        job_id: UUID,
+        candidate_ids: List[str],
+        pipeline_status: str,
+    ) -> List[str]:
+        """
+        Set pipeline_status on many candidates of one job.
+
+        Uses the bulk_update_candidate_status RPC (one transaction) when it is
+        installed, otherwise one update per chunk filtered by job, so IDs from
+        another job are never touched.
+
+        Returns:
+            IDs of the candidates that were updated
+        """
+        if not candidate_ids:
+            return []
 
+        if CandidateRepository._bulk_rpc_available:
+            try:
+                result = self.client.rpc("bulk_update_candidate_status", {
+                    "p_job_id": str(job_id),
+                    "p_candidate_ids": candidate_ids,
+                    "p_pipeline_status": pipeline_status,
+                }).execute()
+                return [row["id"] for row in result.data or []]
+            except Exception as e:
+                if not is_missing_relation(e, "bulk_update_candidate_status"):
+                    raise
+                logger.warning(f"bulk_update_candidate_status RPC unavailable, using chunked updates: {e}")
+                CandidateRepository._bulk_rpc_available = False
+
+        updated: List[str] = []
+        now = datetime.utcnow().isoformat()
+        for i in range(0, len(candidate_ids), BULK_CHUNK_SIZE):
+            result = self.client.table(self.table)\
+                .update({"pipeline_status": pipeline_status, "updated_at": now})\
+                .eq("job_posting_id", str(job_id))\
+                .in_("id", candidate_ids[i:i + BULK_CHUNK_SIZE])\
+                .execute()
+            updated.extend(row["id"] for row in result.data)
+        return updated
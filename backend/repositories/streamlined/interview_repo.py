@@ -11,6 +11,7 @@ from models.streamlined.interview import (
     InterviewType, InterviewSessionStatus
 )
 from db.client import get_db
+from services.access_control import forget_owner
 
 
 class InterviewRepository:
@@ -262,6 +263,7 @@ class InterviewRepository:
             .delete()\
             .eq("id", str(interview_id))\
             .execute()
+        forget_owner("interview", interview_id)
 
         return len(result.data) > 0
 
@@ -271,6 +273,7 @@ class InterviewRepository:
             .delete()\
             .eq("id", str(interview_id))\
             .execute()
+        forget_owner("interview", interview_id)
 
         return len(result.data) > 0
 
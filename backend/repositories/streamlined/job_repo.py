@@ -7,21 +7,77 @@ company context, and scoring criteria.
 Phase 4: Organization scoping - All queries filtered by organization_id.
 """
 
-from typing import List, Optional, Dict, Any
+import logging
+from typing import List, Optional, Dict, Any, Union
 from uuid import UUID
 from datetime import datetime
 
 from models.streamlined.job import (
-    Job, JobCreate, JobUpdate, JobStatus,
+    Job, JobCreate, JobUpdate, JobStatus, JobSummary,
     ExtractedRequirements, CompanyContext, ScoringCriteria,
     StageCount, DEFAULT_INTERVIEW_STAGES
 )
 from db.client import get_db
+from db.errors import is_missing_relation
+from services.access_control import forget_owner
+
+logger = logging.getLogger(__name__)
+
+# Candidates past screening: legacy round_N statuses, configurable stage_N, and offer
+INTERVIEWED_STATUSES = frozenset(
+    ["round_1", "round_2", "round_3", "decision_pending", "accepted"]
+    + [f"stage_{i}" for i in range(10)]
+)
+
+# Job IDs per in_() filter when reading counts
+COUNTS_CHUNK_SIZE = 200
+
+# Columns behind JobSummary; description and AI-extracted JSONB stay in the DB
+JOB_LIST_COLUMNS = (
+    "id, title, status, recruiter_id, interview_stages, interview_stage_icons, created_at, updated_at, deleted_at"
+)
+JOB_FIELDS = ("full", "summary")
+
+# ExtractedRequirements lists that legacy rows stored as plain strings
+WEIGHTED_REQUIREMENT_FIELDS = (
+    "required_skills", "preferred_skills", "success_signals", "red_flags",
+    "behavioral_traits", "cultural_indicators", "deal_breakers",
+)
+
+
+def build_stage_counts(status_counts: Dict[str, int], interview_stages: List[str]) -> List[StageCount]:
+    """
+    Board columns from per-status counts: Screen ('new'), one column per
+    interview stage (stage_N, plus legacy round_N+1 for the first three) and
+    Offer (decision_pending + accepted).
+    """
+    stage_counts = [StageCount(stage_key="new", stage_name="Screen", count=status_counts.get("new", 0))]
+
+    for i, stage_name in enumerate(interview_stages):
+        count = status_counts.get(f"stage_{i}", 0)
+        if i < 3:
+            count += status_counts.get(f"round_{i + 1}", 0)
+        stage_counts.append(StageCount(stage_key=f"stage_{i}", stage_name=stage_name, count=count))
+
+    stage_counts.append(StageCount(
+        stage_key="offer",
+        stage_name="Offer",
+        count=status_counts.get("decision_pending", 0) + status_counts.get("accepted", 0)
+    ))
+    return stage_counts
+
+
+def _remember_job_owner(job_id, organization_id) -> None:
+    """Seed the ownership cache from a job just loaded for its organization."""
+    from services.access_control import ownership_resolver
+    ownership_resolver.remember("job", job_id, organization_id)
 
 
 class JobRepository:
     """Repository for Job database operations."""
 
+    _counts_table_available = True  # see db.errors
+
     def __init__(self):
         self.client = get_db()
         self.table = "job_postings"
@@ -88,8 +144,9 @@ class JobRepository:
         status: Optional[str] = None,
         recruiter_id: Optional[UUID] = None,
         include_archived: bool = False,
-        include_counts: bool = True
-    ) -> List[Job]:
+        include_counts: bool = True,
+        fields: str = "full"
+    ) -> List[Union[Job, JobSummary]]:
         """
         List all jobs for an organization.
 
@@ -98,13 +155,18 @@ class JobRepository:
             status: Optional status filter
             recruiter_id: Optional recruiter filter
             include_archived: If True, include archived (soft-deleted) jobs
-            include_counts: If True, include candidate/interviewed counts (can be slow)
+            include_counts: If True, include candidate/interviewed/stage counts
+            fields: "summary" selects only list columns (JobSummary),
+                "full" returns Job with requirements and context
 
         Returns:
             List of jobs belonging to the organization
+
+        Raises:
+            ValueError: Unknown fields
         """
         query = self.client.table(self.table)\
-            .select("*")\
+            .select(self._columns(fields))\
             .eq("organization_id", str(organization_id))
 
         if status:
@@ -128,22 +190,12 @@ class JobRepository:
             else:
                 raise e
 
-        jobs = []
-        for job_data in result.data:
-            job = self._parse_job(job_data)
-            jobs.append(job)
+        parse = self._parse_summary if fields == "summary" else self._parse_job
+        jobs = [parse(job_data) for job_data in result.data]
 
-        # Batch fetch counts to avoid N+1 queries
+        # Counts for every job from one small job_pipeline_counts query
         if include_counts and jobs:
-            job_ids = [job.id for job in jobs]
-            counts_map = self._get_batch_candidate_counts_sync(job_ids)
-            interviewed_map = self._get_batch_interviewed_counts_sync(job_ids)
-
-            for job in jobs:
-                job.candidate_count = counts_map.get(str(job.id), 0)
-                job.interviewed_count = interviewed_map.get(str(job.id), 0)
-            # Batch fetch stage counts
-            self._populate_batch_stage_counts_sync(jobs)
+            self._populate_counts_sync(jobs)
 
         return jobs
 
@@ -174,36 +226,29 @@ class JobRepository:
 
         jobs = [self._parse_job(job_data) for job_data in result.data]
 
-        # Use batch methods to avoid N+1
-        job_ids = [job.id for job in jobs]
-        counts_map = self._get_batch_candidate_counts_sync(job_ids)
-        interviewed_map = self._get_batch_interviewed_counts_sync(job_ids)
-
-        for job in jobs:
-            job.candidate_count = counts_map.get(str(job.id), 0)
-            job.interviewed_count = interviewed_map.get(str(job.id), 0)
-            # Batch fetch stage counts
-            self._populate_batch_stage_counts_sync(jobs)
+        self._populate_counts_sync(jobs)
 
         return jobs
 
     def get_by_id_for_org_sync(
         self,
         job_id: UUID,
-        organization_id: UUID
-    ) -> Optional[Job]:
+        organization_id: UUID,
+        fields: str = "full"
+    ) -> Optional[Union[Job, JobSummary]]:
         """
         Get a job by ID, verifying it belongs to the organization.
 
         Args:
             job_id: UUID of the job
             organization_id: UUID of the organization
+            fields: "summary" for views that only need title, stages and counts
 
         Returns:
             Job if found and belongs to org, None otherwise
         """
         result = self.client.table(self.table)\
-            .select("*")\
+            .select(self._columns(fields))\
             .eq("id", str(job_id))\
             .eq("organization_id", str(organization_id))\
             .execute()
@@ -211,79 +256,12 @@ class JobRepository:
         if not result.data:
             return None
 
-        job = self._parse_job(result.data[0])
-        
-        # Get all counts from a single query
-        self._populate_job_counts_sync(job)
-
-        return job
+        job = self._parse_summary(result.data[0]) if fields == "summary" else self._parse_job(result.data[0])
+        _remember_job_owner(job_id, organization_id)
 
-    def _populate_job_counts_sync(self, job: Job) -> None:
-        """
-        Populate candidate_count, interviewed_count, and stage_counts in ONE query.
-        
-        This replaces 3 separate queries with 1 query + in-memory aggregation.
-        """
-        # Single query: fetch all pipeline statuses for this job
-        result = self.client.table("candidates")\
-            .select("pipeline_status")\
-            .eq("job_posting_id", str(job.id))\
-            .execute()
-
-        # Count statuses in Python
-        status_counts: Dict[str, int] = {}
-        total_count = 0
-        for row in result.data:
-            status = row.get("pipeline_status") or "new"
-            status_counts[status] = status_counts.get(status, 0) + 1
-            total_count += 1
-
-        # 1. Total candidate count
-        job.candidate_count = total_count
-
-        # 2. Interviewed count (candidates past "new" stage)
-        interviewed_statuses = {
-            "round_1", "round_2", "round_3", "decision_pending", "accepted",
-            "stage_0", "stage_1", "stage_2", "stage_3", "stage_4",
-            "stage_5", "stage_6", "stage_7", "stage_8", "stage_9"
-        }
-        job.interviewed_count = sum(
-            count for status, count in status_counts.items() 
-            if status in interviewed_statuses
-        )
-
-        # 3. Stage counts
-        stage_counts = []
-        
-        # Screen stage
-        stage_counts.append(StageCount(
-            stage_key="new",
-            stage_name="Screen",
-            count=status_counts.get("new", 0)
-        ))
-
-        # Interview stages
-        for i, stage_name in enumerate(job.interview_stages):
-            legacy_status = f"round_{i + 1}" if i < 3 else None
-            new_status = f"stage_{i}"
-            count = status_counts.get(new_status, 0)
-            if legacy_status:
-                count += status_counts.get(legacy_status, 0)
-            stage_counts.append(StageCount(
-                stage_key=new_status,
-                stage_name=stage_name,
-                count=count
-            ))
-
-        # Offer stage
-        stage_counts.append(StageCount(
-            stage_key="offer",
-            stage_name="Offer",
-            count=status_counts.get("decision_pending", 0) + status_counts.get("accepted", 0)
-        ))
-
-        job.stage_counts = stage_counts
+        self._populate_counts_sync([job])
 
+        return job
 
     def create_for_org_sync(
         self,
@@ -392,6 +370,7 @@ class JobRepository:
             .eq("id", str(job_id))\
             .eq("organization_id", str(organization_id))\
             .execute()
+        forget_owner("job", job_id)
 
         return len(result.data) > 0
 
@@ -420,6 +399,7 @@ class JobRepository:
             .eq("id", str(job_id))\
             .eq("organization_id", str(organization_id))\
             .execute()
+        forget_owner("job", job_id)
 
         if not result.data:
             return None
@@ -466,9 +446,7 @@ class JobRepository:
             return None
 
         job = self._parse_job(result.data[0])
-        job.candidate_count = self._get_candidate_count_sync(job_id)
-        job.interviewed_count = self._get_interviewed_count_sync(job_id)
-        job.stage_counts = self._get_stage_counts_sync(job_id, job.interview_stages)
+        self._populate_counts_sync([job])
 
         return job
 
@@ -503,6 +481,7 @@ class JobRepository:
             .eq("id", str(job_id))\
             .eq("organization_id", str(organization_id))\
             .execute()
+        forget_owner("job", job_id)
 
         return len(result.data) > 0
 
@@ -532,9 +511,7 @@ class JobRepository:
             return None
 
         job = self._parse_job(result.data[0])
-        job.candidate_count = self._get_candidate_count_sync(job_id)
-        job.interviewed_count = self._get_interviewed_count_sync(job_id)
-        job.stage_counts = self._get_stage_counts_sync(job_id, job.interview_stages)
+        self._populate_counts_sync([job])
 
         return job
 
@@ -608,9 +585,7 @@ class JobRepository:
 
         job = self._parse_job(result.data[0])
 
-        # Get candidate counts
-        job.candidate_count = await self._get_candidate_count(job_id)
-        job.interviewed_count = await self._get_interviewed_count(job_id)
+        self._populate_counts_sync([job])
 
         return job
 
@@ -626,10 +601,7 @@ class JobRepository:
 
         job = self._parse_job(result.data[0])
 
-        # Get candidate counts
-        job.candidate_count = self._get_candidate_count_sync(job_id)
-        job.interviewed_count = self._get_interviewed_count_sync(job_id)
-        job.stage_counts = self._get_stage_counts_sync(job_id, job.interview_stages)
+        self._populate_counts_sync([job])
 
         return job
 
@@ -651,18 +623,19 @@ class JobRepository:
 
         result = query.order("created_at", desc=True).execute()
 
-        jobs = []
-        for job_data in result.data:
-            job = self._parse_job(job_data)
-            job.candidate_count = await self._get_candidate_count(job.id)
-            job.interviewed_count = await self._get_interviewed_count(job.id)
-            jobs.append(job)
+        jobs = [self._parse_job(job_data) for job_data in result.data]
+        self._populate_counts_sync(jobs)
 
         return jobs
 
-    def list_all_sync(self, status: Optional[str] = None, recruiter_id: Optional[UUID] = None) -> List[Job]:
-        """Synchronous version of list_all."""
-        query = self.client.table(self.table).select("*")
+    def list_all_sync(
+        self,
+        status: Optional[str] = None,
+        recruiter_id: Optional[UUID] = None,
+        fields: str = "full"
+    ) -> List[Union[Job, JobSummary]]:
+        """Synchronous version of list_all ("summary" fields as in list_all_for_org_sync)."""
+        query = self.client.table(self.table).select(self._columns(fields))
 
         if status:
             query = query.eq("status", status)
@@ -672,16 +645,30 @@ class JobRepository:
 
         result = query.order("created_at", desc=True).execute()
 
-        jobs = []
-        for job_data in result.data:
-            job = self._parse_job(job_data)
-            job.candidate_count = self._get_candidate_count_sync(job.id)
-            job.interviewed_count = self._get_interviewed_count_sync(job.id)
-            job.stage_counts = self._get_stage_counts_sync(job.id, job.interview_stages)
-            jobs.append(job)
+        parse = self._parse_summary if fields == "summary" else self._parse_job
+        jobs = [parse(job_data) for job_data in result.data]
+        self._populate_counts_sync(jobs)
 
         return jobs
 
+    def list_role_locations_sync(self, status: str = JobStatus.ACTIVE.value) -> List[tuple]:
+        """
+        List (title, location) for jobs with a status, without candidate counts.
+
+        Used to prefetch market data for open roles; location comes from the
+        extracted requirements and is None when the JD didn't state one.
+        """
+        result = self.client.table(self.table)\
+            .select("title, extracted_requirements")\
+            .eq("status", status)\
+            .execute()
+
+        return [
+            (row.get("title"), (row.get("extracted_requirements") or {}).get("location"))
+            for row in result.data or []
+            if row.get("title")
+        ]
+
     async def update(self, job_id: UUID, job_update: JobUpdate) -> Optional[Job]:
         """
         Update a job.
@@ -746,6 +733,7 @@ class JobRepository:
             .delete()\
             .eq("id", str(job_id))\
             .execute()
+        forget_owner("job", job_id)
 
         return len(result.data) > 0
 
@@ -755,6 +743,7 @@ class JobRepository:
             .delete()\
             .eq("id", str(job_id))\
             .execute()
+        forget_owner("job", job_id)
 
         return len(result.data) > 0
 
@@ -848,25 +837,12 @@ class JobRepository:
             "red_flags": data.get("red_flags", []) or [],
             "interview_stages": interview_stages,
         }
+        if data.get("interview_stage_icons") is not None:
+            job_data["interview_stage_icons"] = data["interview_stage_icons"]
 
         # Parse nested JSONB fields
         if data.get("extracted_requirements"):
-            try:
-                job_data["extracted_requirements"] = ExtractedRequirements(
-                    **data["extracted_requirements"]
-                )
-            except Exception:
-                # Handle legacy format (list of strings instead of WeightedAttributes)
-                req_data = data["extracted_requirements"]
-                # Convert old string arrays to WeightedAttribute format if needed
-                for field in ["required_skills", "preferred_skills", "success_signals",
-                             "red_flags", "behavioral_traits", "cultural_indicators", "deal_breakers"]:
-                    if field in req_data and req_data[field]:
-                        items = req_data[field]
-                        if items and isinstance(items[0], str):
-                            # Convert strings to weighted attributes
-                            req_data[field] = [{"value": item, "weight": 0.7} for item in items]
-                job_data["extracted_requirements"] = ExtractedRequirements(**req_data)
+            job_data["extracted_requirements"] = self._parse_requirements(data["extracted_requirements"])
 
         if data.get("company_context_enriched"):
             job_data["company_context"] = CompanyContext(
@@ -885,287 +861,135 @@ class JobRepository:
 
         return Job(**job_data)
 
-    async def _get_candidate_count(self, job_id: UUID) -> int:
-        """Get count of candidates for a job."""
-        result = self.client.table("candidates")\
-            .select("id", count="exact")\
-            .eq("job_posting_id", str(job_id))\
-            .execute()
-        return result.count or 0
-
-    def _get_candidate_count_sync(self, job_id: UUID) -> int:
-        """Synchronous version of _get_candidate_count."""
-        result = self.client.table("candidates")\
-            .select("id", count="exact")\
-            .eq("job_posting_id", str(job_id))\
-            .execute()
-        return result.count or 0
-
-    def _get_batch_candidate_counts_sync(self, job_ids: List[UUID]) -> Dict[str, int]:
-        """
-        Get candidate counts for multiple jobs in a single query.
+    @staticmethod
+    def _columns(fields: str) -> str:
+        if fields not in JOB_FIELDS:
+            raise ValueError(f"fields must be one of: {', '.join(JOB_FIELDS)}")
+        return JOB_LIST_COLUMNS if fields == "summary" else "*"
 
-        Args:
-            job_ids: List of job UUIDs
-
-        Returns:
-            Dict mapping job_id string to candidate count
-        """
-        if not job_ids:
-            return {}
-
-        job_id_strs = [str(jid) for jid in job_ids]
-
-        # Query all candidates for these jobs and group by job_posting_id
-        result = self.client.table("candidates")\
-            .select("job_posting_id")\
-            .in_("job_posting_id", job_id_strs)\
-            .execute()
-
-        # Count candidates per job
-        counts: Dict[str, int] = {jid: 0 for jid in job_id_strs}
-        for row in result.data:
-            job_id = row.get("job_posting_id")
-            if job_id:
-                counts[job_id] = counts.get(job_id, 0) + 1
-
-        return counts
+    def _parse_summary(self, data: dict) -> JobSummary:
+        """Parse a JOB_LIST_COLUMNS row into JobSummary (no JSONB models are built)."""
+        deleted_at = data.get("deleted_at")
+        interview_stages = data.get("interview_stages")
+        icons = data.get("interview_stage_icons")
+        return JobSummary(
+            id=data["id"],
+            title=data.get("title", ""),
+            status=data.get("status", "draft"),
+            recruiter_id=data.get("recruiter_id"),
+            interview_stages=DEFAULT_INTERVIEW_STAGES.copy() if interview_stages is None else interview_stages,
+            **({} if icons is None else {"interview_stage_icons": icons}),
+            created_at=data.get("created_at"),
+            updated_at=data.get("updated_at"),
+            deleted_at=deleted_at,
+            is_archived=deleted_at is not None,
+        )
 
-    def _get_batch_interviewed_counts_sync(self, job_ids: List[UUID]) -> Dict[str, int]:
+    @staticmethod
+    def _parse_requirements(raw: dict) -> ExtractedRequirements:
         """
-        Get interviewed candidate counts for multiple jobs in a single query.
-
-        Args:
-            job_ids: List of job UUIDs
-
-        Returns:
-            Dict mapping job_id string to interviewed count
+        Build ExtractedRequirements, converting legacy string lists to
+        weighted attributes up front instead of retrying after a failed parse.
         """
-        if not job_ids:
-            return {}
-
-        job_id_strs = [str(jid) for jid in job_ids]
-
-        # Query all interviewed candidates for these jobs
-        interviewed_statuses = [
-            "round_1", "round_2", "round_3", "decision_pending", "accepted",
-            "stage_0", "stage_1", "stage_2", "stage_3", "stage_4",
-            "stage_5", "stage_6", "stage_7", "stage_8", "stage_9"
-        ]
-
-        result = self.client.table("candidates")\
-            .select("job_posting_id")\
-            .in_("job_posting_id", job_id_strs)\
-            .in_("pipeline_status", interviewed_statuses)\
-            .execute()
-
-        # Count interviewed candidates per job
-        counts: Dict[str, int] = {jid: 0 for jid in job_id_strs}
-        for row in result.data:
-            job_id = row.get("job_posting_id")
-            if job_id:
-                counts[job_id] = counts.get(job_id, 0) + 1
-
-        return counts
+        legacy = {
+            field: [{"value": item, "weight": 0.7} if isinstance(item, str) else item for item in raw[field]]
+            for field in WEIGHTED_REQUIREMENT_FIELDS
+            if raw.get(field) and any(isinstance(item, str) for item in raw[field])
+        }
+        return ExtractedRequirements(**{**raw, **legacy}) if legacy else ExtractedRequirements(**raw)
 
-    async def _get_interviewed_count(self, job_id: UUID) -> int:
-        """Get count of interviewed candidates for a job."""
-        result = self.client.table("candidates")\
-            .select("id", count="exact")\
-            .eq("job_posting_id", str(job_id))\
-            .in_("pipeline_status", ["round_1", "round_2", "round_3", "decision_pending", "accepted"])\
-            .execute()
-        return result.count or 0
-
-    def _get_interviewed_count_sync(self, job_id: UUID) -> int:
-        """Synchronous version of _get_interviewed_count."""
-        result = self.client.table("candidates")\
-            .select("id", count="exact")\
-            .eq("job_posting_id", str(job_id))\
-            .in_("pipeline_status", ["round_1", "round_2", "round_3", "decision_pending", "accepted",
-                                      "stage_0", "stage_1", "stage_2", "stage_3", "stage_4",
-                                      "stage_5", "stage_6", "stage_7", "stage_8", "stage_9"])\
-            .execute()
-        return result.count or 0
+    # =========================================================================
+    # Pipeline Counts
+    # =========================================================================
 
-    def _get_all_job_counts_sync(self, job_ids: List[UUID]) -> Dict[str, Dict]:
+    def get_pipeline_status_counts_sync(self, job_ids: List) -> Dict[str, Dict[str, int]]:
         """
-        Get candidate and interviewed counts for multiple jobs in ONE query.
+        Candidates per pipeline_status for each job: {job_id: {status: count}}.
 
-        This is a performance optimization that reduces N+1 queries when listing jobs.
-        Instead of 3 queries per job (candidate count, interviewed count, stage counts),
-        this fetches all data in a single query and aggregates in Python.
-
-        Args:
-            job_ids: List of job UUIDs to get counts for
-
-        Returns:
-            Dictionary mapping job_id strings to {"total": int, "interviewed": int}
+        Reads the trigger-maintained job_pipeline_counts table (a handful of
+        rows per job). Falls back to counting candidate rows when the
+        migration isn't installed.
         """
-        if not job_ids:
-            return {}
-
-        job_id_strings = [str(jid) for jid in job_ids]
-
-        # Single query to get all candidates for all jobs
-        result = self.client.table("candidates")\
-            .select("job_posting_id, pipeline_status")\
-            .in_("job_posting_id", job_id_strings)\
-            .execute()
-
-        # Aggregate in Python (fast in-memory operation)
-        counts: Dict[str, Dict] = {}
-        interviewed_statuses = {
-            "round_1", "round_2", "round_3", "decision_pending", "accepted",
-            "stage_0", "stage_1", "stage_2", "stage_3", "stage_4",
-            "stage_5", "stage_6", "stage_7", "stage_8", "stage_9"
-        }
-
-        for row in result.data:
-            job_id = row["job_posting_id"]
-            status = row["pipeline_status"]
-
-            if job_id not in counts:
-                counts[job_id] = {"total": 0, "interviewed": 0}
-
-            counts[job_id]["total"] += 1
-            if status in interviewed_statuses:
-                counts[job_id]["interviewed"] += 1
+        job_id_strs = list(dict.fromkeys(str(jid) for jid in job_ids))
+        counts: Dict[str, Dict[str, int]] = {jid: {} for jid in job_id_strs}
+        if not job_id_strs:
+            return counts
 
+        if JobRepository._counts_table_available:
+            try:
+                for i in range(0, len(job_id_strs), COUNTS_CHUNK_SIZE):
+                    result = self.client.table("job_pipeline_counts")\
+                        .select("job_posting_id, pipeline_status, count")\
+                        .in_("job_posting_id", job_id_strs[i:i + COUNTS_CHUNK_SIZE])\
+                        .gt("count", 0)\
+                        .execute()
+                    for row in result.data:
+                        counts[row["job_posting_id"]][row["pipeline_status"]] = row["count"]
+                return counts
+            except Exception as e:
+                if not is_missing_relation(e, "job_pipeline_counts"):
+                    raise
+                logger.warning(f"job_pipeline_counts unavailable, counting candidate rows: {e}")
+                JobRepository._counts_table_available = False
+                counts = {jid: {} for jid in job_id_strs}
+
+        for i in range(0, len(job_id_strs), COUNTS_CHUNK_SIZE):
+            result = self.client.table("candidates")\
+                .select("job_posting_id, pipeline_status")\
+                .in_("job_posting_id", job_id_strs[i:i + COUNTS_CHUNK_SIZE])\
+                .execute()
+            for row in result.data:
+                status_counts = counts.get(row.get("job_posting_id"))
+                if status_counts is not None:
+                    status = row.get("pipeline_status") or "new"
+                    status_counts[status] = status_counts.get(status, 0) + 1
         return counts
 
-    def _get_stage_counts_sync(self, job_id: UUID, interview_stages: List[str]) -> List[StageCount]:
-        """
-        Get candidate counts for each pipeline stage using a SINGLE database query.
-
-        Returns counts for:
-        - Screen (new): Candidates not yet moved to any interview stage
-        - Interview stages (stage_0, stage_1, etc.): Based on job's interview_stages
-        - Offer (decision_pending, accepted): Candidates in final stages
-
-        Args:
-            job_id: UUID of the job
-            interview_stages: List of interview stage names for this job
+    def status_counts_for_org_sync(self, organization_id: UUID) -> Dict[str, int]:
+        """Candidates per pipeline_status across an organization's (non-archived) jobs."""
+        query = self.client.table(self.table)\
+            .select("id")\
+            .eq("organization_id", str(organization_id))
+        try:
+            result = query.is_("deleted_at", "null").execute()
+        except Exception as e:
+            if "deleted_at" not in str(e):
+                raise
+            result = query.execute()
 
-        Returns:
-            List of StageCount objects with actual candidate counts
-        """
-        # Single query: fetch all pipeline statuses for this job
-        result = self.client.table("candidates")\
-            .select("pipeline_status")\
-            .eq("job_posting_id", str(job_id))\
-            .execute()
+        totals: Dict[str, int] = {}
+        job_counts = self.get_pipeline_status_counts_sync([row["id"] for row in result.data])
+        for status_counts in job_counts.values():
+            for status, count in status_counts.items():
+                totals[status] = totals.get(status, 0) + count
+        return totals
 
-        # Count statuses in Python (fast in-memory operation)
-        status_counts: Dict[str, int] = {}
-        for row in result.data:
-            status = row.get("pipeline_status") or "new"
-            status_counts[status] = status_counts.get(status, 0) + 1
-
-        stage_counts = []
-
-        # 1. Screen stage (candidates with status 'new' or NULL)
-        screen_count = status_counts.get("new", 0)
-        stage_counts.append(StageCount(
-            stage_key="new",
-            stage_name="Screen",
-            count=screen_count
-        ))
-
-        # 2. Interview stages (based on job's interview_stages)
-        for i, stage_name in enumerate(interview_stages):
-            # Check both new format (stage_X) and legacy format (round_X)
-            legacy_status = f"round_{i + 1}" if i < 3 else None
-            new_status = f"stage_{i}"
-
-            count = status_counts.get(new_status, 0)
-            if legacy_status:
-                count += status_counts.get(legacy_status, 0)
-
-            stage_counts.append(StageCount(
-                stage_key=new_status,
-                stage_name=stage_name,
-                count=count
-            ))
-
-        # 3. Offer stage (decision_pending + accepted)
-        offer_count = status_counts.get("decision_pending", 0) + status_counts.get("accepted", 0)
-        stage_counts.append(StageCount(
-            stage_key="offer",
-            stage_name="Offer",
-            count=offer_count
-        ))
-
-        return stage_counts
-
-    def _populate_batch_stage_counts_sync(self, jobs: List[Job]) -> None:
+    def reconcile_pipeline_counts_sync(self, job_ids: Optional[List] = None) -> int:
         """
-        Populate stage_counts for a list of jobs using a SINGLE database query.
-        
-        Args:
-            jobs: List of Job objects to populate
+        Recompute job_pipeline_counts from candidate rows (all jobs when job_ids
+        is None) and return how many count rows were corrected.
         """
+        params = {"p_job_ids": [str(jid) for jid in job_ids] if job_ids is not None else None}
+        try:
+            result = self.client.rpc("reconcile_job_pipeline_counts", params).execute()
+        except Exception as e:
+            if not is_missing_relation(e, "reconcile_job_pipeline_counts"):
+                raise
+            logger.warning(f"reconcile_job_pipeline_counts RPC unavailable, nothing to reconcile: {e}")
+            JobRepository._counts_table_available = False
+            return 0
+        return result.data or 0
+
+    def _populate_counts_sync(self, jobs: List[Union[Job, JobSummary]]) -> None:
+        """Set candidate_count, interviewed_count and stage_counts on jobs (one query)."""
         if not jobs:
             return
-
-        job_ids = [str(job.id) for job in jobs]
-
-        # Single query: fetch all pipeline statuses for these jobs
-        result = self.client.table("candidates")\
-            .select("job_posting_id, pipeline_status")\
-            .in_("job_posting_id", job_ids)\
-            .execute()
-
-        # Group statuses by job_id
-        # {job_id: {"new": 5, "round_1": 2, ...}}
-        job_status_counts: Dict[str, Dict[str, int]] = {jid: {} for jid in job_ids}
-        
-        for row in result.data:
-            jid = row.get("job_posting_id")
-            if not jid:
-                continue
-            
-            status = row.get("pipeline_status") or "new"
-            if jid in job_status_counts:
-                job_status_counts[jid][status] = job_status_counts[jid].get(status, 0) + 1
-
-        # Calculate stage counts for each job
+        job_counts = self.get_pipeline_status_counts_sync([job.id for job in jobs])
         for job in jobs:
-            jid = str(job.id)
-            status_counts = job_status_counts.get(jid, {})
-            interview_stages = job.interview_stages
-            
-            stage_counts = []
-
-            # 1. Screen stage
-            screen_count = status_counts.get("new", 0)
-            stage_counts.append(StageCount(
-                stage_key="new",
-                stage_name="Screen",
-                count=screen_count
-            ))
-
-            # 2. Interview stages
-            for i, stage_name in enumerate(interview_stages):
-                legacy_status = f"round_{i + 1}" if i < 3 else None
-                new_status = f"stage_{i}"
-
-                count = status_counts.get(new_status, 0)
-                if legacy_status:
-                    count += status_counts.get(legacy_status, 0)
-
-                stage_counts.append(StageCount(
-                    stage_key=new_status,
-                    stage_name=stage_name,
-                    count=count
-                ))
-
-            # 3. Offer stage
-            offer_count = status_counts.get("decision_pending", 0) + status_counts.get("accepted", 0)
-            stage_counts.append(StageCount(
-                stage_key="offer",
-                stage_name="Offer",
-                count=offer_count
-            ))
-
-            job.stage_counts = stage_counts
+            status_counts = job_counts.get(str(job.id), {})
+            job.candidate_count = sum(status_counts.values())
+            job.interviewed_count = sum(
+                count for status, count in status_counts.items()
+                if status in INTERVIEWED_STATUSES
+            )
+            job.stage_counts = build_stage_counts(status_counts, job.interview_stages)
@@ -8,7 +8,9 @@ import httpx
 import json
 import logging
 
-from config import OPENROUTER_API_KEY, GEMINI_ANALYTICS_MODEL
+from config import OPENROUTER_API_KEY, OPENROUTER_BASE_URL, GEMINI_ANALYTICS_MODEL
+from services.llm_usage import LLMLimitExceeded
+from services.telemetry import llm_event_hooks, record_llm_retry
 from models.analytics import InterviewAnalytics, QuestionAnswer, QuestionMetrics, OverallMetrics
 
 # Database repositories for saving analytics
@@ -179,10 +181,12 @@ async def get_interview_analytics(room_name: str, request: AnalyticsRequest) ->
     last_error = None
     
     for attempt in range(MAX_RETRIES + 1):
+        if attempt:
+            record_llm_retry("live_analytics", reason="error")
         try:
-            async with httpx.AsyncClient(timeout=120.0) as client:
+            async with httpx.AsyncClient(timeout=120.0, event_hooks=llm_event_hooks("live_analytics")) as client:
                 response = await client.post(
-                    "https://openrouter.ai/api/v1/chat/completions",
+                    f"{OPENROUTER_BASE_URL}/chat/completions",
                     headers={
                         "Authorization": f"Bearer {OPENROUTER_API_KEY}",
                         "Content-Type": "application/json",
@@ -311,7 +315,7 @@ async def get_interview_analytics(room_name: str, request: AnalyticsRequest) ->
             if attempt < MAX_RETRIES:
                 continue
             raise HTTPException(status_code=504, detail=last_error)
-        except HTTPException:
+        except (HTTPException, LLMLimitExceeded):
             raise
         except Exception as e:
             print(f"[Analytics] Unexpected error (attempt {attempt + 1}): {type(e).__name__}: {str(e)}")
@@ -12,7 +12,7 @@ from models.auth import (
     ChangePasswordRequest
 )
 from services.auth_service import (
-    hash_password, verify_password, create_access_token
+    hash_password_async, verify_password_async, create_access_token
 )
 from middleware.auth_middleware import get_current_user
 from db.client import get_db
@@ -62,7 +62,7 @@ async def signup(request: SignupRequest):
         )
 
     # Hash password and create recruiter
-    password_hash = hash_password(request.password)
+    password_hash = await hash_password_async(request.password)
 
     recruiter_data = {
         "name": request.name,
@@ -141,7 +141,7 @@ async def login(request: LoginRequest):
             detail="Account not set up for password login. Please contact admin."
         )
 
-    if not verify_password(request.password, recruiter["password_hash"]):
+    if not await verify_password_async(request.password, recruiter["password_hash"]):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password"
@@ -226,14 +226,14 @@ async def change_password(
         )
 
     # Verify current password
-    if not verify_password(request.current_password, result.data[0]["password_hash"]):
+    if not await verify_password_async(request.current_password, result.data[0]["password_hash"]):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Current password is incorrect"
         )
 
     # Hash and update new password
-    new_hash = hash_password(request.new_password)
+    new_hash = await hash_password_async(request.new_password)
 
     db.table("recruiters")\
         .update({
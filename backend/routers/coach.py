@@ -1,13 +1,16 @@
 """
 Coach Mode router for real-time interview suggestions after each Q&A exchange
 """
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
 from typing import Optional
 import httpx
 import json
 
-from config import OPENROUTER_API_KEY, GEMINI_ANALYTICS_MODEL
+from config import OPENROUTER_API_KEY, OPENROUTER_BASE_URL, GEMINI_ANALYTICS_MODEL, LLM_INTERACTIVE_DEADLINE
+from services.llm_scheduler import LLMDeadlineExceeded, llm_transport, request_deadline
+from services.llm_usage import LLMLimitExceeded
+from services.telemetry import llm_event_hooks
 from models.analytics import CoachSuggestion
 
 router = APIRouter(prefix="/coach", tags=["coach"])
@@ -60,7 +63,7 @@ Based on the candidate's last answer, provide coaching guidance as JSON:
 Return ONLY valid JSON."""
 
 
-@router.post("/suggest")
+@router.post("/suggest", dependencies=[Depends(request_deadline(LLM_INTERACTIVE_DEADLINE))])
 async def get_coach_suggestion(request: CoachRequest) -> CoachSuggestion:
     """
     Get a coaching suggestion based on the latest Q&A exchange
@@ -87,9 +90,9 @@ async def get_coach_suggestion(request: CoachRequest) -> CoachSuggestion:
     )
     
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        async with httpx.AsyncClient(timeout=30.0, transport=llm_transport("coach_suggestion"), event_hooks=llm_event_hooks("coach_suggestion")) as client:
             response = await client.post(
-                "https://openrouter.ai/api/v1/chat/completions",
+                f"{OPENROUTER_BASE_URL}/chat/completions",
                 headers={
                     "Authorization": f"Bearer {OPENROUTER_API_KEY}",
                     "Content-Type": "application/json",
@@ -136,6 +139,11 @@ async def get_coach_suggestion(request: CoachRequest) -> CoachSuggestion:
                     topic_suggestion=None
                 )
                 
+    except LLMLimitExceeded:
+        raise
+    except LLMDeadlineExceeded:
+        # A fallback here would be indistinguishable from a real suggestion
+        raise HTTPException(status_code=504, detail="Coach suggestion timed out, please try again")
     except Exception as e:
         print(f"[Coach] Unexpected error: {e}")
         return CoachSuggestion(
@@ -162,7 +170,7 @@ class ChatResponse(BaseModel):
     response: str
 
 
-@router.post("/chat")
+@router.post("/chat", dependencies=[Depends(request_deadline(LLM_INTERACTIVE_DEADLINE))])
 async def coach_chat(request: ChatRequest) -> ChatResponse:
     """
     Chat with the AI coach during an interview.
@@ -186,13 +194,13 @@ Your role:
 Keep your responses brief and practical - the interviewer is in a live session."""
 
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        async with httpx.AsyncClient(timeout=30.0, transport=llm_transport("coach_chat"), event_hooks=llm_event_hooks("coach_chat")) as client:
             # Build messages with system prompt
             messages = [{"role": "system", "content": system_message}]
             messages.extend(request.messages[-10:])  # Last 10 messages for context
             
             response = await client.post(
-                "https://openrouter.ai/api/v1/chat/completions",
+                f"{OPENROUTER_BASE_URL}/chat/completions",
                 headers={
                     "Authorization": f"Bearer {OPENROUTER_API_KEY}",
                     "Content-Type": "application/json",
@@ -216,6 +224,10 @@ Keep your responses brief and practical - the interviewer is in a live session."
             
             return ChatResponse(response=content)
             
+    except LLMLimitExceeded:
+        raise
+    except LLMDeadlineExceeded:
+        raise HTTPException(status_code=504, detail="AI coach timed out, please try again")
     except Exception as e:
         print(f"[Coach Chat] Error: {e}")
         return ChatResponse(response="Sorry, I encountered an error. Please try again.")
@@ -159,7 +159,8 @@ async def get_dashboard_stats(
             # Fallback: Get all jobs, then batch fetch all candidates in ONE query
             all_jobs = job_repo.list_all_for_org_sync(
                 current_user.organization_id,
-                include_counts=False
+                include_counts=False,
+                fields="summary"
             )
             job_ids = [str(job.id) for job in all_jobs]
             
@@ -245,7 +246,8 @@ async def get_jobs_summary(
     # Get jobs for the user's organization (with counts already included)
     all_jobs = job_repo.list_all_for_org_sync(
         current_user.organization_id,
-        include_counts=True
+        include_counts=True,
+        fields="summary"
     )
 
     # Filter by status if provided
@@ -324,17 +326,17 @@ async def get_pipeline_stats(
     }
 
     # Get all job IDs for the user's organization
-    all_jobs = job_repo.list_all_for_org_sync(current_user.organization_id, include_counts=False)
+    all_jobs = job_repo.list_all_for_org_sync(current_user.organization_id, include_counts=False, fields="summary")
     job_ids = [str(job.id) for job in all_jobs]
 
     if not job_ids:
         return PipelineStats(**pipeline)
 
-    # BATCH FETCH: Get all candidates for all jobs in ONE query
+    # Candidates per interview status from the per-job pipeline counts
     try:
-        all_candidates = candidate_repo.list_by_job_ids_sync(job_ids)
+        status_counts = candidate_repo.count_by_interview_status_sync(job_ids)
     except Exception:
-        all_candidates = []
+        status_counts = {}
 
     # BATCH FETCH: Get all analytics in ONE query
     try:
@@ -344,18 +346,9 @@ async def get_pipeline_stats(
     except Exception:
         analytics_by_interview = {}
 
-    # Count candidate statuses (no additional queries needed)
-    for candidate in all_candidates:
-        status = candidate.interview_status
-        if hasattr(status, 'value'):
-            status = status.value
-
-        if status == "pending":
-            pipeline["applied"] += 1
-        elif status == "in_progress":
-            pipeline["in_progress"] += 1
-        elif status == "completed":
-            pipeline["completed"] += 1
+    pipeline["applied"] = status_counts.get("pending", 0)
+    pipeline["in_progress"] = status_counts.get("in_progress", 0)
+    pipeline["completed"] = status_counts.get("completed", 0)
 
     # Count recommendations from analytics (already fetched in batch)
     for analytics in all_analytics:
@@ -397,7 +390,7 @@ async def get_recent_activity(
     cutoff_date = datetime.utcnow() - timedelta(days=days)
 
     # Get all jobs for the user's organization (skip expensive counts)
-    all_jobs = job_repo.list_all_for_org_sync(current_user.organization_id, include_counts=False)
+    all_jobs = job_repo.list_all_for_org_sync(current_user.organization_id, include_counts=False, fields="summary")
 
     # Build job lookup map
     job_map = {str(job.id): job for job in all_jobs}
@@ -509,7 +502,7 @@ async def get_top_candidates(
     top_candidates: List[TopCandidate] = []
 
     # Get organization's jobs for filtering
-    org_jobs = job_repo.list_all_for_org_sync(current_user.organization_id, include_counts=False)
+    org_jobs = job_repo.list_all_for_org_sync(current_user.organization_id, include_counts=False, fields="summary")
     org_job_ids = {str(j.id) for j in org_jobs}
     job_map = {str(j.id): j for j in org_jobs}
 
@@ -608,7 +601,7 @@ async def get_job_dashboard_summary(
     analytics_repo = get_analytics_repo()
 
     # Verify job exists and belongs to user's organization
-    job = job_repo.get_by_id_for_org_sync(job_id, current_user.organization_id)
+    job = job_repo.get_by_id_for_org_sync(job_id, current_user.organization_id, fields="summary")
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
 
@@ -800,7 +800,8 @@ async def generate_transcript_analytics(
     This uses the existing analytics generation logic.
     """
     import httpx
-    from config import OPENROUTER_API_KEY, GEMINI_ANALYTICS_MODEL
+    from config import OPENROUTER_API_KEY, OPENROUTER_BASE_URL, GEMINI_ANALYTICS_MODEL
+    from services.telemetry import llm_event_hooks
 
     # Get the interview
     interview = interview_repo.get_by_id(interview_id)
@@ -989,9 +990,9 @@ IMPORTANT: Return ONLY valid JSON. No markdown, no code blocks, no explanatory t
 
     try:
         # Call OpenRouter for candidate analytics
-        async with httpx.AsyncClient(timeout=120.0) as client:
+        async with httpx.AsyncClient(timeout=120.0, event_hooks=llm_event_hooks("transcript_analytics")) as client:
             response = await client.post(
-                "https://openrouter.ai/api/v1/chat/completions",
+                f"{OPENROUTER_BASE_URL}/chat/completions",
                 headers={
                     "Authorization": f"Bearer {OPENROUTER_API_KEY}",
                     "Content-Type": "application/json",
@@ -9,9 +9,9 @@ Phase 4: Candidate CSV upload with resume processing
 Phase 4 Multi-tenancy: Organization-scoped queries with authentication
 """
 
-from fastapi import APIRouter, HTTPException, BackgroundTasks, UploadFile, File, Depends
+from fastapi import APIRouter, HTTPException, BackgroundTasks, UploadFile, File, Depends, Query
 from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Union
 from uuid import UUID
 from enum import Enum
 import csv
@@ -29,13 +29,17 @@ from models.auth import CurrentUser
 from repositories.streamlined.job_repo import JobRepository
 from repositories.streamlined.person_repo import PersonRepository
 from repositories.streamlined.candidate_repo import CandidateRepository
-from services.jd_extractor import (
-    trigger_jd_extraction_for_job,
-    extract_requirements_for_streamlined,
+from services.jd_extractor import extract_requirements_for_streamlined
+from services.task_handlers import (
+    enqueue_jd_extraction,
+    enqueue_screenings,
+    enqueue_resume_extraction,
+    enqueue_interview_analytics,
+    enqueue_post_call,
 )
 from middleware.auth_middleware import get_current_user, get_optional_user
+from services.access_control import require_job_access
 from config import VAPI_PUBLIC_KEY, VAPI_ASSISTANT_ID, LLM_MODEL
-from services.candidate_screening import process_candidate_screening
 
 logger = logging.getLogger(__name__)
 
@@ -50,7 +54,6 @@ def get_job_repo() -> JobRepository:
 @router.post("/", response_model=Job)
 async def create_job(
     job_data: JobCreate,
-    background_tasks: BackgroundTasks,
     current_user: CurrentUser = Depends(get_current_user),
 ) -> Job:
     """
@@ -74,13 +77,9 @@ async def create_job(
         created_by_recruiter_id=current_user.recruiter_id
     )
 
-    # Trigger async extraction ONLY if not already provided
+    # Queue extraction ONLY if not already provided
     if not job_data.extracted_requirements and job_data.raw_description and len(job_data.raw_description) > 50:
-        background_tasks.add_task(
-            trigger_jd_extraction_for_job,
-            str(job.id),
-            job_data.raw_description
-        )
+        await asyncio.to_thread(enqueue_jd_extraction, str(job.id))
 
     return job
 
@@ -123,13 +122,14 @@ async def extract_requirements(
     return requirements
 
 
-@router.get("/", response_model=List[Job])
+@router.get("/", response_model=Union[List[Job], List[JobSummary]])
 async def list_jobs(
     status: Optional[str] = None,
     recruiter_id: Optional[str] = None,
     include_counts: bool = True,
+    fields: str = Query("full", description="summary (list columns only) or full"),
     current_user: CurrentUser = Depends(get_current_user),
-) -> List[Job]:
+) -> Union[List[Job], List[JobSummary]]:
     """
     List all jobs for the authenticated user's organization.
 
@@ -138,6 +138,8 @@ async def list_jobs(
         recruiter_id: Optional filter - UUID of the recruiter
         include_counts: If True (default), include candidate counts and stage counts.
                        Set to False for faster loading when counts aren't needed.
+        fields: "summary" returns title, status, stages and counts only, skipping
+                the description and AI-extracted requirements/context.
 
     Returns:
         List of jobs with candidate counts (scoped to organization)
@@ -145,25 +147,34 @@ async def list_jobs(
     repo = get_job_repo()
     recruiter_uuid = UUID(recruiter_id) if recruiter_id else None
 
-    jobs = repo.list_all_for_org_sync(
-        organization_id=current_user.organization_id,
-        status=status,
-        recruiter_id=recruiter_uuid,
-        include_counts=include_counts
-    )
+    try:
+        jobs = repo.list_all_for_org_sync(
+            organization_id=current_user.organization_id,
+            status=status,
+            recruiter_id=recruiter_uuid,
+            include_counts=include_counts,
+            fields=fields
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     return jobs
 
 
-@router.get("/active", response_model=List[Job])
+@router.get("/active", response_model=Union[List[Job], List[JobSummary]])
 async def list_active_jobs(
+    fields: str = Query("full", description="summary (list columns only) or full"),
     current_user: CurrentUser = Depends(get_current_user),
-) -> List[Job]:
+) -> Union[List[Job], List[JobSummary]]:
     """List all active jobs only for the authenticated user's organization."""
     repo = get_job_repo()
-    jobs = repo.list_all_for_org_sync(
-        organization_id=current_user.organization_id,
-        status="active"
-    )
+    try:
+        jobs = repo.list_all_for_org_sync(
+            organization_id=current_user.organization_id,
+            status="active",
+            fields=fields
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     return jobs
 
 
@@ -377,7 +388,6 @@ async def reopen_job(
 @router.post("/{job_id}/extract", response_model=Job)
 async def trigger_extraction(
     job_id: UUID,
-    background_tasks: BackgroundTasks,
     current_user: CurrentUser = Depends(get_current_user),
 ) -> Job:
     """
@@ -397,12 +407,8 @@ async def trigger_extraction(
             detail="Job description is too short for extraction"
         )
 
-    # Trigger extraction in background
-    background_tasks.add_task(
-        trigger_jd_extraction_for_job,
-        str(job_id),
-        job.raw_description
-    )
+    # Queue extraction in the background task queue
+    await asyncio.to_thread(enqueue_jd_extraction, str(job_id))
 
     return job
 
@@ -411,27 +417,52 @@ async def trigger_extraction(
 async def get_job_candidates(
     job_id: UUID,
     status: Optional[str] = None,
+    sort: str = Query("created", description="created, score or stage"),
+    limit: Optional[int] = Query(None, ge=1, le=500, description="Page size; omit for all candidates"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    fields: str = Query("full", description="summary (list columns only) or full"),
     current_user: CurrentUser = Depends(get_current_user),
 ):
     """
-    Get all candidates for a specific job (must belong to user's organization).
+    Get candidates for a specific job (must belong to user's organization).
+
+    Sorted server-side by creation date, score or pipeline stage. Pass limit
+    to page through large jobs with next_cursor, and fields=summary to skip
+    screening notes and other detail columns.
     """
-    from repositories.streamlined.candidate_repo import CandidateRepository
+    from repositories.streamlined.candidate_repo import CandidateRepository, pipeline_stage_order
 
     repo = get_job_repo()
-    job = repo.get_by_id_for_org_sync(job_id, current_user.organization_id)
+    job = repo.get_by_id_for_org_sync(job_id, current_user.organization_id, fields="summary")
 
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
 
     candidate_repo = CandidateRepository()
-    candidates = candidate_repo.list_by_job_sync(job_id, status=status)
+    try:
+        candidates, next_cursor = candidate_repo.list_page_by_job_sync(
+            job_id,
+            status=status,
+            sort=sort,
+            limit=limit,
+            cursor=cursor,
+            fields=fields,
+            stages=pipeline_stage_order(len(getattr(job, "interview_stages", None) or [])),
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if limit and (cursor or next_cursor):
+        total = candidate_repo.count_by_job_sync(job_id, status=status)
+    else:
+        total = len(candidates)
 
     return {
         "job_id": str(job_id),
         "job_title": job.title,
         "candidates": candidates,
-        "total": len(candidates),
+        "total": total,
+        "next_cursor": next_cursor,
     }
 
 
@@ -447,11 +478,8 @@ async def get_job_candidate(
     from repositories.streamlined.candidate_repo import CandidateRepository
     from repositories.streamlined.person_repo import PersonRepository
 
-    repo = get_job_repo()
-    job = repo.get_by_id_for_org_sync(job_id, current_user.organization_id)
-
-    if not job:
-        raise HTTPException(status_code=404, detail="Job not found")
+    # Ownership only; the job row itself isn't needed
+    require_job_access(job_id, current_user.organization_id)
 
     candidate_repo = CandidateRepository()
     candidate = candidate_repo.get_by_id_sync(candidate_id)
@@ -496,11 +524,8 @@ async def delete_job_candidate(
     """
     from repositories.streamlined.candidate_repo import CandidateRepository
 
-    repo = get_job_repo()
-    job = repo.get_by_id_for_org_sync(job_id, current_user.organization_id)
-
-    if not job:
-        raise HTTPException(status_code=404, detail="Job not found")
+    # Ownership only; the job row itself isn't needed
+    require_job_access(job_id, current_user.organization_id)
 
     candidate_repo = CandidateRepository()
     candidate = candidate_repo.get_by_id_sync(candidate_id)
@@ -523,8 +548,12 @@ async def get_job_analytics_summary(
 ):
     """
     Get aggregated analytics for all candidates in a job.
+
+    Aggregated in the database and cached per job until the job's analytics
+    are created, regenerated or deleted.
     """
     from repositories.streamlined.analytics_repo import AnalyticsRepository
+    from services.job_analytics_cache import job_analytics_cache
 
     repo = get_job_repo()
     job = repo.get_by_id_for_org_sync(job_id, current_user.organization_id)
@@ -532,55 +561,24 @@ async def get_job_analytics_summary(
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
 
-    analytics_repo = AnalyticsRepository()
-
-    try:
-        analytics_list = analytics_repo.list_by_job_sync(job_id)
-    except Exception:
-        analytics_list = []
-
-    if not analytics_list:
-        return {
-            "job_id": str(job_id),
-            "job_title": job.title,
-            "total_candidates": 0,
-            "avg_score": 0,
-            "recommendation_breakdown": {},
-            "top_candidates": [],
-        }
-
-    # Calculate aggregates
-    scores = [a.overall_score for a in analytics_list if a.overall_score]
-    avg_score = sum(scores) / len(scores) if scores else 0
-
-    # Count recommendations
-    rec_breakdown = {}
-    for a in analytics_list:
-        rec = a.recommendation.value if hasattr(a.recommendation, 'value') else str(a.recommendation)
-        rec_breakdown[rec] = rec_breakdown.get(rec, 0) + 1
-
-    # Get top candidates
-    sorted_analytics = sorted(
-        analytics_list,
-        key=lambda a: a.overall_score or 0,
-        reverse=True
-    )
-    top_candidates = [
-        {
-            "candidate_name": a.candidate_name,
-            "score": a.overall_score,
-            "recommendation": a.recommendation.value if hasattr(a.recommendation, 'value') else str(a.recommendation),
-        }
-        for a in sorted_analytics[:5]
-    ]
+    summary = job_analytics_cache.get(str(job_id))
+    if summary is None:
+        try:
+            summary = await asyncio.to_thread(AnalyticsRepository().get_job_summary_sync, job_id)
+            job_analytics_cache.put(str(job_id), summary)
+        except Exception as e:
+            logger.error(f"Error aggregating analytics for job {job_id}: {e}")
+            summary = {
+                "total_candidates": 0,
+                "avg_score": 0,
+                "recommendation_breakdown": {},
+                "top_candidates": [],
+            }
 
     return {
         "job_id": str(job_id),
         "job_title": job.title,
-        "total_candidates": len(analytics_list),
-        "avg_score": round(avg_score, 1),
-        "recommendation_breakdown": rec_breakdown,
-        "top_candidates": top_candidates,
+        **summary,
     }
 
 
@@ -1011,7 +1009,6 @@ def _extract_profile_from_enrichment(enrichment: Dict[str, Any]) -> Dict[str, An
 @router.post("/{job_id}/candidates/upload", response_model=UploadResult)
 async def upload_candidates(
     job_id: UUID,
-    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     current_user: CurrentUser = Depends(get_current_user),
 ) -> UploadResult:
@@ -1030,19 +1027,16 @@ async def upload_candidates(
        - Parse crustdata_enrichment_data if present to extract profile (headline, summary, skills, etc.)
        - Find or create Person (by email or linkedin_url if available) with enriched profile
        - Find or create Candidate (person + job)
-    4. Triggers LLM extraction and screening in PARALLEL BATCHES of 10 for speed
+    4. Queues LLM extraction and screening as durable tasks (one per candidate)
     5. Returns upload summary
     """
     import asyncio
 
-    job_repo = get_job_repo()
     person_repo = PersonRepository()
     candidate_repo = CandidateRepository()
 
     # Validate job exists and belongs to user's organization
-    job = job_repo.get_by_id_for_org_sync(job_id, current_user.organization_id)
-    if not job:
-        raise HTTPException(status_code=404, detail="Job not found")
+    require_job_access(job_id, current_user.organization_id)
 
     # Parse CSV
     content = await file.read()
@@ -1239,24 +1233,17 @@ async def upload_candidates(
             candidates_to_screen.append(res["screening"])
         
         if res.get("resume_task"):
-             # For resume processing, we still use background tasks but just queue them here
-             background_tasks.add_task(
-                _process_resume_async,
+            await asyncio.to_thread(
+                enqueue_resume_extraction,
+                job_id,
                 res["resume_task"]["candidate_id"],
                 res["resume_task"]["resume_text"],
-                job.extracted_requirements
             )
 
-    # Run LLM extraction and screening in parallel batches of 10
+    # Queue LLM extraction and screening; workers run them with bounded concurrency
     if candidates_to_screen:
-        logger.info(f"Starting parallel LLM screening for {len(candidates_to_screen)} candidates in batches of 10")
-        background_tasks.add_task(
-            _process_candidates_batch_parallel,
-            candidates_to_screen,
-            job.title,
-            job.raw_description or "",
-            job.extracted_requirements,
-        )
+        logger.info(f"Queueing LLM screening for {len(candidates_to_screen)} candidates")
+        await asyncio.to_thread(enqueue_screenings, job_id, candidates_to_screen)
 
     return UploadResult(
         job_id=str(job_id),
@@ -1267,86 +1254,6 @@ async def upload_candidates(
     )
 
 
-async def _process_candidates_batch_parallel(
-    candidates: List[Dict[str, Any]],
-    job_title: str,
-    job_description: str,
-    extracted_requirements,
-    batch_size: int = 10,
-):
-    """
-    Process candidates in parallel batches for LLM extraction and screening.
-
-    Args:
-        candidates: List of dicts with candidate_id, person_id, enrichment_data
-        job_title: The job title
-        job_description: Full job description text
-        extracted_requirements: ExtractedRequirements with weighted attributes
-        batch_size: Number of concurrent LLM calls (default 10)
-    """
-    import asyncio
-
-    total = len(candidates)
-    logger.info(f"Processing {total} candidates in parallel batches of {batch_size}")
-
-    for i in range(0, total, batch_size):
-        batch = candidates[i:i + batch_size]
-        batch_num = (i // batch_size) + 1
-        total_batches = (total + batch_size - 1) // batch_size
-
-        logger.info(f"Processing batch {batch_num}/{total_batches} ({len(batch)} candidates)")
-
-        # Create tasks for this batch
-        tasks = [
-            process_candidate_screening(
-                candidate["candidate_id"],
-                candidate["person_id"],
-                candidate["enrichment_data"],
-                job_title,
-                job_description,
-                extracted_requirements,
-            )
-            for candidate in batch
-        ]
-
-        # Run batch concurrently
-        await asyncio.gather(*tasks, return_exceptions=True)
-
-        logger.info(f"Completed batch {batch_num}/{total_batches}")
-
-    logger.info(f"Finished processing all {total} candidates")
-
-
-async def _process_resume_async(
-    candidate_id: str,
-    resume_text: str,
-    job_requirements
-):
-    """
-    Process a resume in the background and update the candidate.
-
-    Extracts bio summary and skills from the resume text.
-    """
-    from services.resume_processor import extract_resume_data
-
-    try:
-        extracted = await extract_resume_data(resume_text, job_requirements)
-
-        if extracted:
-            candidate_repo = CandidateRepository()
-            from models.streamlined.candidate import CandidateUpdate
-
-            candidate_repo.update_sync(UUID(candidate_id), CandidateUpdate(
-                bio_summary=extracted.get("bio_summary"),
-                skills=extracted.get("skills", []),
-            ))
-
-            logger.info(f"Processed resume for candidate {candidate_id}")
-
-    except Exception as e:
-        logger.error(f"Failed to process resume for candidate {candidate_id}: {e}")
-
-
 # =============================================================================
 # Phase 5: Candidate Interview Flow with Full Job Context
 # =============================================================================
@@ -1603,7 +1510,6 @@ def _build_interview_variables(candidate, job, interview) -> Dict[str, str]:
 @router.post("/interviews/{interview_id}/end", response_model=InterviewEndResponse)
 async def end_interview(
     interview_id: UUID,
-    background_tasks: BackgroundTasks,
 ) -> InterviewEndResponse:
     """
     End an interview session.
@@ -1644,11 +1550,9 @@ async def end_interview(
         interview_status=InterviewStatus.COMPLETED,
     ))
 
-    # Trigger analytics generation in background (Phase 6)
-    background_tasks.add_task(
-        _trigger_analytics_generation,
-        str(interview_id)
-    )
+    # Queue analytics generation (Phase 6)
+    logger.info(f"Analytics generation queued for interview {interview_id}")
+    await asyncio.to_thread(enqueue_interview_analytics, str(interview_id))
 
     logger.info(f"Ended interview {interview_id}, duration: {duration_seconds}s")
 
@@ -1660,71 +1564,39 @@ async def end_interview(
     )
 
 
-async def _trigger_analytics_generation(interview_id: str):
-    """Trigger analytics generation for a completed interview."""
-    from services.analytics_generator import generate_analytics_background
-
-    logger.info(f"Analytics generation triggered for interview {interview_id}")
-
-    # Use synchronous version to avoid event loop issues in background tasks
-    generate_analytics_background(interview_id)
-
-
 @router.post("/interviews/webhook")
 async def interview_webhook(request: Dict[str, Any]):
     """
     Webhook endpoint for Vapi events during candidate interviews.
 
     Handles:
-    - transcript updates (saves to interview record)
-    - end-of-call events (marks interview as completed)
+    - end-of-call events: queues the post-call pipeline (transcript, turns,
+      candidate and interviewer analytics, candidate status) and acks at once.
+      Keyed on the Vapi call ID, so redelivered reports are ignored.
     """
-    import json
-
-    message_type = request.get("message", {}).get("type")
+    message = request.get("message", {})
+    message_type = message.get("type")
 
     logger.info(f"Interview webhook received: {message_type}")
 
     if message_type == "end-of-call-report":
         # Extract interview ID from metadata
-        message = request.get("message", {})
         call_data = message.get("call", {})
         metadata = call_data.get("assistantOverrides", {}).get("metadata", {})
 
         interview_id = metadata.get("interviewId")
         if interview_id:
-            # Get transcript from the report
-            transcript = message.get("transcript", "")
-
-            interview_repo = InterviewRepository()
-            candidate_repo = CandidateRepository()
-
-            # Update interview with transcript
-            interview = interview_repo.get_by_id_sync(UUID(interview_id))
-            if interview:
-                # Calculate duration (handle timezone-aware vs naive datetimes)
-                duration_seconds = None
-                if interview.started_at:
-                    now = datetime.utcnow()
-                    started_at = interview.started_at
-                    if started_at.tzinfo is not None:
-                        started_at = started_at.replace(tzinfo=None)
-                    duration = now - started_at
-                    duration_seconds = int(duration.total_seconds())
-
-                interview_repo.update_sync(UUID(interview_id), InterviewUpdate(
-                    status=InterviewSessionStatus.COMPLETED,
-                    ended_at=datetime.utcnow(),
-                    duration_seconds=duration_seconds,
-                    transcript=transcript,
-                ))
-
-                # Update candidate status
-                candidate_repo.update_sync(interview.candidate_id, CandidateUpdate(
-                    interview_status=InterviewStatus.COMPLETED,
-                ))
-
-                logger.info(f"Interview {interview_id} completed via webhook")
+            artifact = message.get("artifact") or {}
+            # The queue's SQLite write may wait on a worker's lock; keep it off the event loop
+            await asyncio.to_thread(enqueue_post_call, {
+                "interview_id": interview_id,
+                "call_id": call_data.get("id"),
+                "transcript": message.get("transcript") or artifact.get("transcript") or "",
+                "messages": message.get("messages") or artifact.get("messages") or [],
+                "ended_at": message.get("endedAt"),
+                "duration_seconds": message.get("durationSeconds"),
+            })
+            logger.info(f"Post-call pipeline queued for interview {interview_id}")
 
     return {"status": "ok"}
 
@@ -2050,32 +1922,29 @@ async def get_all_job_analytics(
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
 
-    # Get all analytics for this job
+    # Get all analytics for this job, projected and sorted (highest score first) in the query
     try:
-        analytics_list = analytics_repo.list_by_job_sync(job_id)
+        analytics_rows = await asyncio.to_thread(analytics_repo.list_summaries_by_job_sync, job_id)
     except Exception as e:
         logger.error(f"Error fetching job analytics: {e}")
-        analytics_list = []
+        analytics_rows = []
 
     # Format response
     formatted = []
-    for a in analytics_list:
+    for a in analytics_rows:
         formatted.append({
-            "id": str(a.id),
-            "interview_id": str(a.interview_id),
-            "candidate_name": a.candidate_name,
-            "overall_score": a.overall_score,
-            "recommendation": a.recommendation.value if hasattr(a.recommendation, 'value') else str(a.recommendation),
-            "summary": a.summary,
-            "strengths_count": len(a.strengths),
-            "concerns_count": len(a.concerns),
-            "red_flags_count": len(a.red_flags_detected),
-            "created_at": a.created_at.isoformat() if a.created_at else None,
+            "id": str(a["id"]),
+            "interview_id": str(a["interview_id"]),
+            "candidate_name": a["candidate_name"],
+            "overall_score": a.get("overall_score") or 0,
+            "recommendation": a["recommendation"],
+            "summary": a["summary"],
+            "strengths_count": len(a.get("strengths") or []),
+            "concerns_count": len(a.get("concerns") or []),
+            "red_flags_count": len(a.get("red_flags_detected") or []),
+            "created_at": a.get("created_at"),
         })
 
-    # Sort by score (highest first)
-    formatted.sort(key=lambda x: x["overall_score"], reverse=True)
-
     return {
         "job_id": str(job_id),
         "job_title": job.title,
@@ -2106,6 +1975,13 @@ class BulkUpdateRequest(BaseModel):
     )
 
 
+class BulkUpdateItemResult(BaseModel):
+    """Outcome for one candidate in a bulk update."""
+    candidate_id: str
+    status: str = Field(..., description="updated, not_found, wrong_job or failed")
+    error: Optional[str] = None
+
+
 class BulkUpdateResult(BaseModel):
     """Result of a bulk update operation."""
     success_count: int
@@ -2113,6 +1989,7 @@ class BulkUpdateResult(BaseModel):
     updated_ids: List[str]
     failed_ids: List[str]
     errors: List[str]
+    results: List[BulkUpdateItemResult] = Field(default_factory=list)
 
 
 @router.post("/{job_id}/candidates/bulk-update", response_model=BulkUpdateResult)
@@ -2129,17 +2006,14 @@ async def bulk_update_candidates(
     - reject: Mark candidates as rejected
     - accept: Mark candidates as accepted
 
-    All candidates must belong to the specified job.
+    All candidates must belong to the specified job. Membership is checked
+    with one query and the change applied with one update filtered by job;
+    the response reports the outcome for every candidate ID.
     """
-    from enum import Enum as PyEnum
-
-    job_repo = get_job_repo()
     candidate_repo = CandidateRepository()
 
     # Validate job exists and belongs to user's organization
-    job = job_repo.get_by_id_for_org_sync(job_id, current_user.organization_id)
-    if not job:
-        raise HTTPException(status_code=404, detail="Job not found")
+    require_job_access(job_id, current_user.organization_id)
 
     # Validate target_stage for move_stage action
     if request.action == BulkActionType.MOVE_STAGE:
@@ -2154,62 +2028,72 @@ async def bulk_update_candidates(
                 status_code=400,
                 detail=f"Invalid target_stage. Must be one of: {', '.join(valid_stages)}"
             )
+        pipeline_status = request.target_stage
+    elif request.action == BulkActionType.REJECT:
+        pipeline_status = "rejected"
+    else:
+        pipeline_status = "accepted"
+
+    candidate_ids = [str(cid) for cid in dict.fromkeys(request.candidate_ids)]
+    results: Dict[str, BulkUpdateItemResult] = {}
+
+    # Verify job membership for every candidate in one query
+    job_ids = await asyncio.to_thread(candidate_repo.get_job_ids_sync, candidate_ids)
+    eligible = []
+    for candidate_id in candidate_ids:
+        if candidate_id not in job_ids:
+            results[candidate_id] = BulkUpdateItemResult(
+                candidate_id=candidate_id, status="not_found",
+                error=f"Candidate {candidate_id} not found",
+            )
+        elif job_ids[candidate_id] != str(job_id):
+            results[candidate_id] = BulkUpdateItemResult(
+                candidate_id=candidate_id, status="wrong_job",
+                error=f"Candidate {candidate_id} does not belong to this job",
+            )
+        else:
+            eligible.append(candidate_id)
 
-    updated_ids = []
-    failed_ids = []
-    errors = []
-
-    for candidate_id in request.candidate_ids:
+    # Apply the status change to all eligible candidates at once
+    updated = set()
+    if eligible:
         try:
-            # Verify candidate belongs to this job
-            candidate = candidate_repo.get_by_id_sync(candidate_id)
-            if not candidate:
-                failed_ids.append(str(candidate_id))
-                errors.append(f"Candidate {candidate_id} not found")
-                continue
-
-            if candidate.job_id != job_id:
-                failed_ids.append(str(candidate_id))
-                errors.append(f"Candidate {candidate_id} does not belong to this job")
-                continue
-
-            # Determine update based on action
-            update_data = {}
-
-            if request.action == BulkActionType.MOVE_STAGE:
-                update_data["pipeline_status"] = request.target_stage
-            elif request.action == BulkActionType.REJECT:
-                update_data["pipeline_status"] = "rejected"
-                update_data["interview_status"] = "completed"
-            elif request.action == BulkActionType.ACCEPT:
-                update_data["pipeline_status"] = "accepted"
-                update_data["interview_status"] = "completed"
-
-            # Apply the update
-            from models.streamlined.candidate import CandidateUpdate
-            candidate_update = CandidateUpdate(**update_data)
-            updated = candidate_repo.update_sync(candidate_id, candidate_update)
-
-            if updated:
-                updated_ids.append(str(candidate_id))
-            else:
-                failed_ids.append(str(candidate_id))
-                errors.append(f"Failed to update candidate {candidate_id}")
-
+            updated = set(await asyncio.to_thread(
+                candidate_repo.bulk_update_pipeline_status_sync, job_id, eligible, pipeline_status
+            ))
         except Exception as e:
-            failed_ids.append(str(candidate_id))
-            errors.append(f"Error updating candidate {candidate_id}: {str(e)}")
-            logger.error(f"Bulk update error for candidate {candidate_id}: {e}")
+            logger.error(f"Bulk update error for job {job_id}: {e}")
+            for candidate_id in eligible:
+                results[candidate_id] = BulkUpdateItemResult(
+                    candidate_id=candidate_id, status="failed",
+                    error=f"Error updating candidate {candidate_id}: {str(e)}",
+                )
+
+    for candidate_id in eligible:
+        if candidate_id in results:
+            continue
+        if candidate_id in updated:
+            results[candidate_id] = BulkUpdateItemResult(candidate_id=candidate_id, status="updated")
+        else:
+            results[candidate_id] = BulkUpdateItemResult(
+                candidate_id=candidate_id, status="failed",
+                error=f"Failed to update candidate {candidate_id}",
+            )
+
+    ordered = [results[candidate_id] for candidate_id in candidate_ids]
+    updated_ids = [r.candidate_id for r in ordered if r.status == "updated"]
+    failed = [r for r in ordered if r.status != "updated"]
 
     logger.info(
         f"Bulk update completed for job {job_id}: "
-        f"{len(updated_ids)} updated, {len(failed_ids)} failed"
+        f"{len(updated_ids)} updated, {len(failed)} failed"
     )
 
     return BulkUpdateResult(
         success_count=len(updated_ids),
-        failed_count=len(failed_ids),
+        failed_count=len(failed),
         updated_ids=updated_ids,
-        failed_ids=failed_ids,
-        errors=errors,
+        failed_ids=[r.candidate_id for r in failed],
+        errors=[r.error for r in failed],
+        results=ordered,
     )
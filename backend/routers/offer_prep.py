@@ -6,14 +6,14 @@ Provides:
 - Coaching session management
 """
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, BackgroundTasks
 from pydantic import BaseModel, Field
 from typing import Optional, List, Dict, Any
 import logging
 import json
 
-from services.parallel_ai import parallel_service
-from services.compensation_extractor import compensation_extractor
+from services.market_insights_store import market_insights_store
+from services.candidate_intel_cache import candidate_intel_cache
 from models.compensation import (
     CompensationData,
     CompensationResearchRequest,
@@ -156,15 +156,15 @@ async def get_market_data(request: MarketDataRequest) -> MarketDataResponse:
     Get market compensation data for a role.
 
     Uses web search to find salary ranges, equity benchmarks, and market trends,
-    then extracts structured data using an LLM.
+    then extracts structured data using an LLM. Results are cached by
+    normalised role and location in the market insights store.
     """
     logger.info(f"Market data request for: {request.role_title} in {request.location}")
 
     errors = []
 
     try:
-        # Step 1: Search for compensation data
-        raw_results = await parallel_service.research_compensation(
+        lookup = await market_insights_store.get_compensation(
             role_title=request.role_title,
             location=request.location,
             company_stage=request.company_stage,
@@ -172,16 +172,11 @@ async def get_market_data(request: MarketDataRequest) -> MarketDataResponse:
             industry=request.industry,
             specific_company=request.specific_company
         )
+        errors.extend(lookup.errors)
+        compensation_data = lookup.data
 
-        # Collect any search errors
-        for error in raw_results.get("errors", []):
-            errors.append(f"Search error: {error.get('error', 'Unknown')}")
-
-        # Step 2: Extract structured data
-        compensation_data = await compensation_extractor.extract(raw_results)
-
-        results_count = len(raw_results.get("search_results", []))
-        logger.info(f"Market data extracted from {results_count} results")
+        results_count = lookup.results_count
+        logger.info(f"Market data {'served from cache' if lookup.cached else 'extracted'} from {results_count} results")
 
         return MarketDataResponse(
             status="success" if compensation_data.salary_median else "partial",
@@ -211,17 +206,14 @@ async def compare_offer(request: OfferComparisonRequest) -> OfferComparisonRespo
 
     try:
         # Get market data first
-        raw_results = await parallel_service.research_compensation(
+        lookup = await market_insights_store.get_compensation(
             role_title=request.role_title,
             location=request.location,
             company_stage=request.company_stage,
             industry=request.industry
         )
-
-        for error in raw_results.get("errors", []):
-            errors.append(f"Search error: {error.get('error', 'Unknown')}")
-
-        market_data = await compensation_extractor.extract(raw_results)
+        errors.extend(lookup.errors)
+        market_data = lookup.data
 
         # Calculate comparison
         comparison = _calculate_comparison(
@@ -289,35 +281,19 @@ async def get_enhanced_market_data(request: EnhancedMarketDataRequest) -> Market
     errors = []
 
     try:
-        # Build comprehensive search with company context
-        raw_results = await parallel_service.research_compensation(
+        # Search with company context; the store merges company-specific
+        # research when a website is given
+        lookup = await market_insights_store.get_compensation(
             role_title=request.role_title,
             location=request.location,
             company_stage=request.company_stage,
             years_experience=request.years_experience,
             industry=request.industry,
-            specific_company=request.company_name
+            specific_company=request.company_name,
+            company_website=request.company_website
         )
-
-        # If we have company website, also do company-specific research
-        if request.company_website and request.company_name:
-            try:
-                company_results = await parallel_service.research_company(
-                    company_name=request.company_name,
-                    website=request.company_website
-                )
-                # Merge company results for better context
-                if company_results.get("search_results"):
-                    raw_results["company_context"] = company_results.get("search_results", [])[:3]
-            except Exception as e:
-                logger.warning(f"Company research failed: {e}")
-
-        # Collect any search errors
-        for error in raw_results.get("errors", []):
-            errors.append(f"Search error: {error.get('error', 'Unknown')}")
-
-        # Extract structured data
-        compensation_data = await compensation_extractor.extract(raw_results)
+        errors.extend(lookup.errors)
+        compensation_data = lookup.data
 
         # Set role_title and location if not extracted
         if not compensation_data.role_title:
@@ -325,8 +301,8 @@ async def get_enhanced_market_data(request: EnhancedMarketDataRequest) -> Market
         if not compensation_data.location:
             compensation_data.location = request.location
 
-        results_count = len(raw_results.get("search_results", []))
-        logger.info(f"Enhanced market data extracted from {results_count} results")
+        results_count = lookup.results_count
+        logger.info(f"Enhanced market data {'served from cache' if lookup.cached else 'extracted'} from {results_count} results")
 
         return MarketDataResponse(
             status="success" if compensation_data.salary_median else "partial",
@@ -343,6 +319,17 @@ async def get_enhanced_market_data(request: EnhancedMarketDataRequest) -> Market
         )
 
 
+@router.post("/market-data/prefetch")
+async def prefetch_market_data(background_tasks: BackgroundTasks) -> Dict[str, str]:
+    """
+    Warm the market data cache for every active job's role and location.
+
+    Runs in the background; roles already cached and fresh are skipped.
+    """
+    background_tasks.add_task(market_insights_store.prefetch_open_jobs)
+    return {"status": "scheduled"}
+
+
 # ============================================================================
 # Helper Functions
 # ============================================================================
@@ -432,7 +419,7 @@ def _calculate_comparison(
 # ============================================================================
 
 @router.get("/candidate/{candidate_id}/intelligence")
-async def get_candidate_intelligence(candidate_id: str) -> CandidateIntelligence:
+async def get_candidate_intelligence(candidate_id: str, include_transcripts: bool = True) -> CandidateIntelligence:
     """
     Get aggregated intelligence about a candidate for offer preparation.
 
@@ -440,13 +427,30 @@ async def get_candidate_intelligence(candidate_id: str) -> CandidateIntelligence
     - Candidate profile
     - All interview transcripts
     - All interview analytics
+
+    The aggregate is cached per candidate until new analytics or transcripts
+    arrive. Pass include_transcripts=false for the lightweight view
+    (scores, priorities, quotes and risks without full transcript turns).
     """
+    intelligence = candidate_intel_cache.get(candidate_id)
+    if intelligence is None:
+        intelligence, interview_ids = _build_candidate_intelligence(candidate_id)
+        candidate_intel_cache.put(candidate_id, intelligence, interview_ids)
+
+    if not include_transcripts:
+        intelligence = intelligence.model_copy(update={"all_transcripts": []})
+    # Never hand out the cached snapshot itself
+    return intelligence.model_copy(deep=True)
+
+
+def _build_candidate_intelligence(candidate_id: str) -> tuple:
+    """Aggregate a candidate's interviews; returns (intelligence, interview ids)."""
     # Get candidate
     candidate = candidate_repo.get_by_id(candidate_id)
     if not candidate:
         raise HTTPException(status_code=404, detail="Candidate not found")
 
-    # Get all interviews with analytics
+    # Get all interviews with analytics and transcripts in a single query
     interviews = interview_repo.get_candidate_interviews(candidate_id)
 
     # Aggregate data
@@ -460,14 +464,16 @@ async def get_candidate_intelligence(candidate_id: str) -> CandidateIntelligence
             continue
 
         # Get transcript
-        transcript = analytics_repo.get_transcript_by_interview(interview["id"])
+        transcript = interview.get("transcripts")
+        if isinstance(transcript, list):
+            transcript = transcript[0] if transcript else None
         if transcript:
             all_transcripts.append({
                 "stage": interview["stage"],
                 "turns": transcript.get("turns", []),
                 "full_text": transcript.get("full_text", "")
             })
-            total_turns += len(transcript.get("turns", []))
+            total_turns += len(transcript.get("turns") or [])
 
         # Get analytics
         analytics = interview.get("analytics")
@@ -499,7 +505,7 @@ async def get_candidate_intelligence(candidate_id: str) -> CandidateIntelligence
     key_quotes = _extract_quotes_structured(all_analytics)
     risk_factors = _extract_risks_structured(all_analytics)
 
-    return CandidateIntelligence(
+    intelligence = CandidateIntelligence(
         candidate_id=candidate_id,
         candidate_name=candidate.get("name", "Unknown"),
         role_title=candidate.get("job_title"),
@@ -516,6 +522,7 @@ async def get_candidate_intelligence(candidate_id: str) -> CandidateIntelligence
         all_transcripts=all_transcripts,
         all_analytics=all_analytics
     )
+    return intelligence, [interview["id"] for interview in interviews if interview.get("id")]
 
 
 @router.get("/candidate/{candidate_id}/context")
@@ -524,7 +531,8 @@ async def get_offer_prep_context(
     include_market_data: bool = True,
     role_title: Optional[str] = None,
     location: Optional[str] = None,
-    company_stage: Optional[str] = None
+    company_stage: Optional[str] = None,
+    include_transcripts: bool = True
 ) -> OfferPrepContext:
     """
     Get full context for offer preparation including candidate intelligence
@@ -533,18 +541,18 @@ async def get_offer_prep_context(
     This is the main endpoint for the Offer Prep page.
     """
     # Get candidate intelligence
-    intelligence = await get_candidate_intelligence(candidate_id)
+    intelligence = await get_candidate_intelligence(candidate_id, include_transcripts=include_transcripts)
 
     # Get market data if requested
     market_data = None
     if include_market_data and (role_title or intelligence.role_title):
         try:
-            raw_results = await parallel_service.research_compensation(
+            lookup = await market_insights_store.get_compensation(
                 role_title=role_title or intelligence.role_title or "Software Engineer",
                 location=location or "San Francisco",
                 company_stage=company_stage
             )
-            market_data = await compensation_extractor.extract(raw_results)
+            market_data = lookup.data
         except Exception as e:
             logger.error(f"Error fetching market data: {e}")
 
@@ -648,11 +656,11 @@ async def prepare_coaching_session(request: CoachingSessionRequest) -> Dict[str,
     market_str = "Market data not available"
     if request.role_title or intelligence.role_title:
         try:
-            raw_results = await parallel_service.research_compensation(
+            lookup = await market_insights_store.get_compensation(
                 role_title=request.role_title or intelligence.role_title or "Software Engineer",
                 location=request.location or "San Francisco"
             )
-            market_data = await compensation_extractor.extract(raw_results)
+            market_data = lookup.data
             if market_data.salary_median:
                 market_str = (
                     f"Market salary range: ${market_data.salary_min:,} - ${market_data.salary_max:,} "
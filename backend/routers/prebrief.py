@@ -5,9 +5,11 @@ from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from typing import Optional
 import httpx
-import json
 
-from config import OPENROUTER_API_KEY, GEMINI_ANALYTICS_MODEL
+from config import OPENROUTER_API_KEY, OPENROUTER_BASE_URL, GEMINI_ANALYTICS_MODEL
+from services.llm_usage import LLMLimitExceeded
+from services.telemetry import llm_event_hooks, record_llm_retry
+from services.structured_output import StructuredOutputError, generate_structured
 from models.prebrief import PreInterviewBrief
 
 router = APIRouter(prefix="/prebrief", tags=["prebrief"])
@@ -129,7 +131,7 @@ MAX_RETRIES = 2
 
 
 def normalize_prebrief_data(data: dict) -> dict:
-    """Handle common LLM output issues"""
+    """Handle common LLM output issues (before schema repair; see services/structured_output.py)"""
     # Ensure all required lists exist
     for field in ["skill_matches", "experience_highlights", "strengths", "concerns", "suggested_questions", "topics_to_avoid", "key_things_to_remember"]:
         if field not in data or data[field] is None:
@@ -173,70 +175,54 @@ async def generate_pre_brief(room_name: str, request: PreBriefRequest) -> PreInt
         company_context=company_context
     )
     
-    last_error = None
-    
-    for attempt in range(MAX_RETRIES + 1):
-        try:
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                response = await client.post(
-                    "https://openrouter.ai/api/v1/chat/completions",
-                    headers={
-                        "Authorization": f"Bearer {OPENROUTER_API_KEY}",
-                        "Content-Type": "application/json",
-                        "HTTP-Referer": "http://localhost:3000",
-                        "X-Title": "Briefing Room Pre-Brief"
-                    },
-                    json={
-                        "model": GEMINI_ANALYTICS_MODEL,
-                        "messages": [
-                            {"role": "system", "content": PREBRIEF_SYSTEM_PROMPT},
-                            {"role": "user", "content": user_prompt}
-                        ],
-                        "temperature": 0.3 + (attempt * 0.1),
-                        "response_format": {"type": "json_object"}
-                    }
-                )
-                
-                if response.status_code != 200:
-                    print(f"[PreBrief] OpenRouter error: {response.status_code} - {response.text}")
-                    raise HTTPException(status_code=500, detail=f"Pre-brief API error: {response.status_code}")
-                
-                result = response.json()
-                content = result["choices"][0]["message"]["content"]
-                
-                try:
-                    prebrief_data = json.loads(content)
-                    prebrief_data = normalize_prebrief_data(prebrief_data)
-                    prebrief = PreInterviewBrief(**prebrief_data)
-                    print(f"[PreBrief] Successfully generated brief for {prebrief.candidate_name} (score: {prebrief.overall_fit_score})")
-                    return prebrief
-                    
-                except json.JSONDecodeError as e:
-                    print(f"[PreBrief] JSON parse error (attempt {attempt + 1}): {e}")
-                    last_error = f"Failed to parse pre-brief response"
-                    if attempt < MAX_RETRIES:
-                        continue
-                    raise HTTPException(status_code=500, detail=last_error)
-                    
-                except Exception as e:
-                    print(f"[PreBrief] Validation error (attempt {attempt + 1}): {e}")
-                    last_error = f"Pre-brief validation error: {str(e)}"
-                    if attempt < MAX_RETRIES:
-                        continue
-                    raise HTTPException(status_code=500, detail=last_error)
-                    
-        except httpx.TimeoutException:
-            last_error = "Pre-brief request timed out"
-            if attempt < MAX_RETRIES:
-                continue
-            raise HTTPException(status_code=504, detail=last_error)
-        except HTTPException:
-            raise
-        except Exception as e:
-            print(f"[PreBrief] Unexpected error (attempt {attempt + 1}): {e}")
-            last_error = f"Pre-brief failed: {str(e)}"
-            if attempt < MAX_RETRIES:
-                continue
-            raise HTTPException(status_code=500, detail=last_error)
-    
-    raise HTTPException(status_code=500, detail=last_error or "Pre-brief failed after retries")
+    async def complete(messages: list, attempt: int) -> str:
+        for transport_attempt in range(MAX_RETRIES + 1):
+            if transport_attempt:
+                record_llm_retry("prebrief", reason="timeout")
+            try:
+                async with httpx.AsyncClient(timeout=60.0, event_hooks=llm_event_hooks("prebrief")) as client:
+                    response = await client.post(
+                        f"{OPENROUTER_BASE_URL}/chat/completions",
+                        headers={
+                            "Authorization": f"Bearer {OPENROUTER_API_KEY}",
+                            "Content-Type": "application/json",
+                            "HTTP-Referer": "http://localhost:3000",
+                            "X-Title": "Briefing Room Pre-Brief"
+                        },
+                        json={
+                            "model": GEMINI_ANALYTICS_MODEL,
+                            "messages": messages,
+                            "temperature": 0.3 + (attempt * 0.1),
+                            "response_format": {"type": "json_object"}
+                        }
+                    )
+            except httpx.TimeoutException:
+                if transport_attempt < MAX_RETRIES:
+                    continue
+                raise HTTPException(status_code=504, detail="Pre-brief request timed out")
+
+            if response.status_code != 200:
+                print(f"[PreBrief] OpenRouter error: {response.status_code} - {response.text}")
+                raise HTTPException(status_code=500, detail=f"Pre-brief API error: {response.status_code}")
+            return response.json()["choices"][0]["message"]["content"]
+
+    messages = [
+        {"role": "system", "content": PREBRIEF_SYSTEM_PROMPT},
+        {"role": "user", "content": user_prompt}
+    ]
+    try:
+        prebrief = await generate_structured(
+            PreInterviewBrief, messages, complete, family="prebrief",
+            normalize=normalize_prebrief_data, max_attempts=MAX_RETRIES + 1,
+        )
+    except StructuredOutputError as e:
+        print(f"[PreBrief] {e}")
+        raise HTTPException(status_code=500, detail=f"Pre-brief validation error: {e}")
+    except (HTTPException, LLMLimitExceeded):
+        raise
+    except Exception as e:
+        print(f"[PreBrief] Unexpected error: {e}")
+        raise HTTPException(status_code=500, detail=f"Pre-brief failed: {str(e)}")
+
+    print(f"[PreBrief] Successfully generated brief for {prebrief.candidate_name} (score: {prebrief.overall_fit_score})")
+    return prebrief
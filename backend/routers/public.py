@@ -4,10 +4,11 @@ Public Router - Unauthenticated endpoints for career pages.
 Handles public job viewing and candidate applications.
 """
 
-from fastapi import APIRouter, HTTPException, BackgroundTasks, UploadFile, File, Form
+from fastapi import APIRouter, HTTPException, UploadFile, File, Form
 from pydantic import BaseModel, EmailStr, Field
 from typing import Optional, List
 from uuid import UUID
+import asyncio
 import logging
 import shutil
 import os
@@ -20,7 +21,7 @@ from repositories.streamlined.job_repo import JobRepository
 from repositories.streamlined.person_repo import PersonRepository
 from repositories.streamlined.candidate_repo import CandidateRepository
 
-from services.application_processor import process_new_application
+from services.task_handlers import enqueue_application
 
 
 
@@ -115,7 +116,6 @@ async def get_public_job(job_id: UUID):
 @router.post("/jobs/{job_id}/apply")
 async def apply_to_job(
     job_id: UUID,
-    background_tasks: BackgroundTasks,
     name: str = Form(...),
     email: EmailStr = Form(...),
     phone: Optional[str] = Form(None),
@@ -202,8 +202,8 @@ async def apply_to_job(
     except Exception as e:
         logger.error(f"Failed to send confirmation email: {e}")
     
-    # 6. Trigger Resume Parsing / Screening (Async - runs AFTER confirmation email)
+    # 6. Queue Resume Parsing / Screening (high priority - runs AFTER confirmation email)
     # If candidate is a Strong Fit, they'll get the interview link email after screening
-    background_tasks.add_task(process_new_application, candidate.id, resume_path)
+    await asyncio.to_thread(enqueue_application, candidate.id, resume_path)
 
     return {"message": "Application submitted successfully", "candidate_id": str(candidate.id)}
@@ -175,7 +175,7 @@ async def get_recruiter_jobs(
         raise HTTPException(status_code=404, detail="Recruiter not found")
 
     # Get jobs for this recruiter
-    jobs = job_repo.list_all_sync(status=status, recruiter_id=recruiter_id)
+    jobs = job_repo.list_all_sync(status=status, recruiter_id=recruiter_id, fields="summary")
 
     return {
         "recruiter_id": str(recruiter_id),
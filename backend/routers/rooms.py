@@ -1,11 +1,14 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
 from datetime import datetime, timedelta
 from typing import Optional
 import httpx
 from services.daily import daily_service
 from services.supabase import get_supabase_client
-from config import OPENROUTER_API_KEY, OPENROUTER_MODEL
+from config import OPENROUTER_API_KEY, OPENROUTER_BASE_URL, OPENROUTER_MODEL, LLM_INTERACTIVE_DEADLINE
+from services.llm_scheduler import llm_transport, request_deadline
+from services.llm_usage import LLMLimitExceeded
+from services.telemetry import llm_event_hooks
 
 router = APIRouter(prefix="/rooms", tags=["rooms"])
 
@@ -291,7 +294,8 @@ what skills they're looking for, and if they have any specific concerns about th
     return " ".join(parts).strip()
 
 
-@router.post("/{room_name}/chat", response_model=ChatResponse)
+@router.post("/{room_name}/chat", response_model=ChatResponse,
+             dependencies=[Depends(request_deadline(LLM_INTERACTIVE_DEADLINE))])
 async def chat(room_name: str, request: ChatRequest):
     """
     Chat with the AI assistant during an interview
@@ -326,9 +330,9 @@ IMPORTANT: If you have context about the job or candidate below, USE IT. Do not
         messages.append({"role": "user", "content": request.message})
 
         # Call OpenRouter
-        async with httpx.AsyncClient() as client:
+        async with httpx.AsyncClient(transport=llm_transport("room_chat"), event_hooks=llm_event_hooks("room_chat")) as client:
             response = await client.post(
-                "https://openrouter.ai/api/v1/chat/completions",
+                f"{OPENROUTER_BASE_URL}/chat/completions",
                 headers={
                     "Authorization": f"Bearer {OPENROUTER_API_KEY}",
                     "Content-Type": "application/json",
@@ -353,8 +357,10 @@ IMPORTANT: If you have context about the job or candidate below, USE IT. Do not
             
             return ChatResponse(response=assistant_message)
             
-    except HTTPException:
+    except (HTTPException, LLMLimitExceeded):
         raise
+    except httpx.TimeoutException:
+        raise HTTPException(status_code=504, detail="AI assistant timed out, please try again")
     except Exception as e:
         print(f"Chat error: {type(e).__name__}: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Chat failed: {str(e)}")
@@ -460,9 +466,9 @@ Based on what the interviewer was asking you (the AI) during the call, infer wha
 """
 
         # Call OpenRouter
-        async with httpx.AsyncClient() as client:
+        async with httpx.AsyncClient(event_hooks=llm_event_hooks("room_debrief")) as client:
             response = await client.post(
-                "https://openrouter.ai/api/v1/chat/completions",
+                f"{OPENROUTER_BASE_URL}/chat/completions",
                 headers={
                     "Authorization": f"Bearer {OPENROUTER_API_KEY}",
                     "Content-Type": "application/json",
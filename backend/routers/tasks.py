@@ -0,0 +1,83 @@
+"""
+Tasks Router - Status API for the durable background task queue.
+
+Endpoints:
+- Queue statistics by task kind and status
+- Task listing and lookup (by id or idempotency key)
+- Manual retry of dead tasks
+"""
+
+from fastapi import APIRouter, HTTPException, Depends, Query
+from typing import Any, Dict, List, Optional
+import asyncio
+import logging
+
+from middleware.auth_middleware import get_current_user
+from models.auth import CurrentUser
+from services.task_queue import task_queue
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/tasks", tags=["tasks"])
+
+
+def _summary(task: Dict[str, Any]) -> Dict[str, Any]:
+    """Task row without its payload (payloads can carry candidate PII)."""
+    return {k: v for k, v in task.items() if k != "payload"}
+
+
+@router.get("/stats")
+async def get_task_stats(
+    current_user: CurrentUser = Depends(get_current_user),
+) -> Dict[str, Dict[str, int]]:
+    """Counts of tasks by kind and status."""
+    return await asyncio.to_thread(task_queue.stats)
+
+
+@router.get("/")
+async def list_tasks(
+    status: Optional[str] = None,
+    kind: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    current_user: CurrentUser = Depends(get_current_user),
+) -> List[Dict[str, Any]]:
+    """List tasks, newest first, optionally filtered by status and kind."""
+    tasks = await asyncio.to_thread(task_queue.list_tasks, status=status, kind=kind, limit=limit, offset=offset)
+    return [_summary(t) for t in tasks]
+
+
+@router.get("/by-key/{task_key:path}")
+async def get_task_by_key(
+    task_key: str,
+    current_user: CurrentUser = Depends(get_current_user),
+) -> Dict[str, Any]:
+    """Latest task for an idempotency key, e.g. 'screening:<candidate_id>'."""
+    task = await asyncio.to_thread(task_queue.get_by_key, task_key)
+    if not task:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return _summary(task)
+
+
+@router.get("/{task_id}")
+async def get_task(
+    task_id: str,
+    current_user: CurrentUser = Depends(get_current_user),
+) -> Dict[str, Any]:
+    task = await asyncio.to_thread(task_queue.get, task_id)
+    if not task:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return _summary(task)
+
+
+@router.post("/{task_id}/retry")
+async def retry_task(
+    task_id: str,
+    current_user: CurrentUser = Depends(get_current_user),
+) -> Dict[str, Any]:
+    """Requeue a dead task with a fresh attempt budget."""
+    task = await asyncio.to_thread(task_queue.retry, task_id)
+    if not task:
+        raise HTTPException(status_code=404, detail="No dead task with that id")
+    logger.info(f"Task {task_id} requeued by {current_user.email}")
+    return _summary(task)
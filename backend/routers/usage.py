@@ -0,0 +1,77 @@
+"""
+Usage Router - LLM token and cost accounting for the caller's organization.
+
+Endpoints:
+- Usage summary grouped by job, candidate, prompt family, model, lane or day
+- The organization's LLM limits and today's spend against them
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+from fastapi import APIRouter, Depends, Query
+
+from middleware.auth_middleware import get_current_user
+from models.auth import CurrentUser
+from repositories.llm_usage_repository import LLMUsageRepository
+from services.llm_usage import BULK, INTERACTIVE, usage_ledger
+
+router = APIRouter(prefix="/api/usage", tags=["usage"])
+
+
+def _utc(value: Optional[datetime]) -> Optional[datetime]:
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+@router.get("/summary")
+async def get_usage_summary(
+    group_by: str = Query("family", pattern="^(job|candidate|family|model|lane|day)$"),
+    since: Optional[datetime] = Query(None, description="Start (inclusive); defaults to 30 days ago"),
+    until: Optional[datetime] = Query(None, description="End (exclusive); defaults to now"),
+    current_user: CurrentUser = Depends(get_current_user),
+) -> Dict[str, Any]:
+    """Calls, tokens, cache hits, latency and cost, grouped and most expensive first."""
+    since = _utc(since) or datetime.now(timezone.utc) - timedelta(days=30)
+    until = _utc(until)
+
+    # Include this process's most recent calls
+    await asyncio.to_thread(usage_ledger.flush)
+    rows = await asyncio.to_thread(
+        LLMUsageRepository().summary_sync, current_user.organization_id, group_by, since, until
+    )
+    totals = {
+        field: sum(row[field] for row in rows)
+        for field in ("calls", "limited", "errors", "prompt_tokens", "completion_tokens", "cached_tokens", "cache_hits")
+    }
+    totals["cost_usd"] = round(sum(row["cost_usd"] for row in rows), 6)
+    return {
+        "group_by": group_by,
+        "since": since.isoformat(),
+        "until": until.isoformat() if until else None,
+        "rows": rows,
+        "totals": totals,
+    }
+
+
+@router.get("/limits")
+async def get_usage_limits(
+    current_user: CurrentUser = Depends(get_current_user),
+) -> Dict[str, Any]:
+    """Rate and budget limits for the organization, with today's spend by lane (UTC day)."""
+    org_id = str(current_user.organization_id)
+    limits = usage_ledger.limits_for(org_id)
+    if limits.daily_budget_usd:
+        await asyncio.to_thread(usage_ledger.load_spend_sync, org_id)
+    spent = usage_ledger.spent_today(org_id)
+    budget = limits.daily_budget_usd or None
+    return {
+        "bulk_rpm": limits.bulk_rpm or None,
+        "interactive_rpm": limits.interactive_rpm or None,
+        "daily_budget_usd": budget,
+        "bulk_budget_usd": round(budget * usage_ledger.bulk_budget_share, 6) if budget else None,
+        "spent_today_usd": {lane: round(spent.get(lane, 0.0), 6) for lane in (INTERACTIVE, BULK)},
+        "remaining_today_usd": round(max(budget - sum(spent.values()), 0.0), 6) if budget else None,
+    }
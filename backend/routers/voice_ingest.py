@@ -13,6 +13,7 @@ import jwt
 
 from config import VAPI_API_KEY, VAPI_PUBLIC_KEY, VAPI_ASSISTANT_ID, LLM_MODEL
 from services.websocket_hub import ws_hub
+from services.profile_cache import profile_cache
 from services.vapi_service import vapi_service
 from models.voice_ingest import (
     JobProfile,
@@ -258,7 +259,7 @@ async def list_profiles(complete_only: bool = False, limit: int = 20):
 @router.get("/{session_id}", response_model=ProfileResponse)
 async def get_profile(session_id: str):
     """Get the current job profile."""
-    profile = await job_profile_repo.get(session_id)
+    profile = await profile_cache.get(session_id)
     if not profile:
         raise HTTPException(404, "Session not found")
 
@@ -276,7 +277,7 @@ async def get_company_intel(session_id: str):
 
     Poll this endpoint to check when Parallel.ai research is complete.
     """
-    profile = await job_profile_repo.get(session_id)
+    profile = await profile_cache.get(session_id)
     if not profile:
         raise HTTPException(404, "Session not found")
 
@@ -310,7 +311,7 @@ async def parse_jd(session_id: str, request: ParseJDRequest):
     scores, and identifies gaps that need to be filled via voice conversation.
     """
     # Validate session exists
-    profile = await job_profile_repo.get(session_id)
+    profile = await profile_cache.get(session_id)
     if not profile:
         raise HTTPException(404, "Session not found")
 
@@ -329,15 +330,17 @@ async def parse_jd(session_id: str, request: ParseJDRequest):
     if "extraction_failed" in missing_fields:
         raise HTTPException(500, "JD extraction failed. Please try again or use voice input.")
 
-    # Update profile with extracted data
-    updated_profile = jd_extractor.build_job_profile_from_extraction(
-        extracted_data=extracted_data,
-        confidence_scores=confidence_scores,
-        existing_profile=profile
-    )
-
-    # Save updated profile
-    await job_profile_repo.update(session_id, updated_profile)
+    # Merge into the latest profile (a live call may have changed it during extraction) and save
+    async with profile_cache.exclusive(session_id):
+        profile = await job_profile_repo.get(session_id)
+        if not profile:
+            raise HTTPException(404, "Session not found")
+        updated_profile = jd_extractor.build_job_profile_from_extraction(
+            extracted_data=extracted_data,
+            confidence_scores=confidence_scores,
+            existing_profile=profile
+        )
+        await job_profile_repo.update(session_id, updated_profile)
 
     # Calculate optional missing fields (nice to have but not required)
     optional_missing = _get_optional_missing_fields(updated_profile)
@@ -435,257 +438,266 @@ def _generate_extraction_summary(
 @router.patch("/{session_id}/requirements")
 async def update_requirements(session_id: str, request: UpdateRequirementsRequest):
     """Update job requirements."""
-    profile = await job_profile_repo.get(session_id)
-    if not profile:
-        raise HTTPException(404, "Session not found")
+    async with profile_cache.exclusive(session_id):
+        profile = await job_profile_repo.get(session_id)
+        if not profile:
+            raise HTTPException(404, "Session not found")
 
-    # Build updates dict (only non-None values)
-    updates = {k: v for k, v in request.model_dump().items() if v is not None}
+        # Build updates dict (only non-None values)
+        updates = {k: v for k, v in request.model_dump().items() if v is not None}
 
-    if not updates:
-        raise HTTPException(400, "No updates provided")
+        if not updates:
+            raise HTTPException(400, "No updates provided")
 
-    success = await job_profile_repo.update_requirements(session_id, updates)
-    if not success:
-        raise HTTPException(500, "Failed to update requirements")
+        success = await job_profile_repo.update_requirements(session_id, updates)
+        if not success:
+            raise HTTPException(500, "Failed to update requirements")
 
-    # Return updated profile
-    updated_profile = await job_profile_repo.get(session_id)
-    return {
-        "success": True,
-        "requirements": updated_profile.requirements.model_dump(),
-        "completion_percentage": updated_profile.calculate_completion_percentage(),
-        "missing_fields": updated_profile.get_missing_fields()
-    }
+        # Return updated profile
+        updated_profile = await job_profile_repo.get(session_id)
+        return {
+            "success": True,
+            "requirements": updated_profile.requirements.model_dump(),
+            "completion_percentage": updated_profile.calculate_completion_percentage(),
+            "missing_fields": updated_profile.get_missing_fields()
+        }
 
 
 @router.post("/{session_id}/traits")
 async def create_trait(session_id: str, request: CreateTraitRequest):
     """Add a candidate trait."""
-    profile = await job_profile_repo.get(session_id)
-    if not profile:
-        raise HTTPException(404, "Session not found")
+    async with profile_cache.exclusive(session_id):
+        profile = await job_profile_repo.get(session_id)
+        if not profile:
+            raise HTTPException(404, "Session not found")
 
-    from models.voice_ingest.enums import TraitPriority
+        from models.voice_ingest.enums import TraitPriority
 
-    trait = CandidateTrait(
-        name=request.name,
-        description=request.description,
-        priority=TraitPriority(request.priority),
-        signals=request.signals,
-    )
+        trait = CandidateTrait(
+            name=request.name,
+            description=request.description,
+            priority=TraitPriority(request.priority),
+            signals=request.signals,
+        )
 
-    success = await job_profile_repo.add_trait(session_id, trait)
-    if not success:
-        raise HTTPException(500, "Failed to add trait")
+        success = await job_profile_repo.add_trait(session_id, trait)
+        if not success:
+            raise HTTPException(500, "Failed to add trait")
 
-    updated_profile = await job_profile_repo.get(session_id)
-    return {
-        "success": True,
-        "trait": trait.model_dump(),
-        "traits_count": len(updated_profile.traits),
-        "completion_percentage": updated_profile.calculate_completion_percentage()
-    }
+        updated_profile = await job_profile_repo.get(session_id)
+        return {
+            "success": True,
+            "trait": trait.model_dump(),
+            "traits_count": len(updated_profile.traits),
+            "completion_percentage": updated_profile.calculate_completion_percentage()
+        }
 
 
 @router.patch("/{session_id}/traits/{trait_id}")
 async def update_trait(session_id: str, trait_id: str, request: dict):
     """Update a candidate trait."""
-    profile = await job_profile_repo.get(session_id)
-    if not profile:
-        raise HTTPException(404, "Session not found")
-
-    # Find the trait by ID
-    trait = next((t for t in profile.traits if t.id == trait_id), None)
-    if not trait:
-        raise HTTPException(404, "Trait not found")
-
-    # Update trait fields
-    if "name" in request:
-        trait.name = request["name"]
-    if "description" in request:
-        trait.description = request["description"]
-    if "priority" in request:
-        from models.voice_ingest.enums import TraitPriority
-        trait.priority = TraitPriority(request["priority"])
-    if "signals" in request:
-        trait.signals = request["signals"]
-
-    # Save updated profile
-    await job_profile_repo.save(profile)
+    async with profile_cache.exclusive(session_id):
+        profile = await job_profile_repo.get(session_id)
+        if not profile:
+            raise HTTPException(404, "Session not found")
+
+        # Find the trait by ID
+        trait = next((t for t in profile.traits if t.id == trait_id), None)
+        if not trait:
+            raise HTTPException(404, "Trait not found")
+
+        # Update trait fields
+        if "name" in request:
+            trait.name = request["name"]
+        if "description" in request:
+            trait.description = request["description"]
+        if "priority" in request:
+            from models.voice_ingest.enums import TraitPriority
+            trait.priority = TraitPriority(request["priority"])
+        if "signals" in request:
+            trait.signals = request["signals"]
+
+        # Save updated profile
+        await job_profile_repo.save(profile)
 
-    return {
-        "success": True,
-        "trait": trait.model_dump(),
-        "completion_percentage": profile.calculate_completion_percentage()
-    }
+        return {
+            "success": True,
+            "trait": trait.model_dump(),
+            "completion_percentage": profile.calculate_completion_percentage()
+        }
 
 
 @router.delete("/{session_id}/traits/{trait_id}")
 async def delete_trait(session_id: str, trait_id: str):
     """Delete a candidate trait."""
-    profile = await job_profile_repo.get(session_id)
-    if not profile:
-        raise HTTPException(404, "Session not found")
+    async with profile_cache.exclusive(session_id):
+        profile = await job_profile_repo.get(session_id)
+        if not profile:
+            raise HTTPException(404, "Session not found")
 
-    # Try to delete by ID first, fallback to name
-    success = await job_profile_repo.delete_trait(session_id, trait_id)
-    if not success:
-        raise HTTPException(404, "Trait not found")
+        # Try to delete by ID first, fallback to name
+        success = await job_profile_repo.delete_trait(session_id, trait_id)
+        if not success:
+            raise HTTPException(404, "Trait not found")
 
-    updated_profile = await job_profile_repo.get(session_id)
-    return {
-        "success": True,
-        "traits_count": len(updated_profile.traits),
-        "completion_percentage": updated_profile.calculate_completion_percentage()
-    }
+        updated_profile = await job_profile_repo.get(session_id)
+        return {
+            "success": True,
+            "traits_count": len(updated_profile.traits),
+            "completion_percentage": updated_profile.calculate_completion_percentage()
+        }
 
 
 @router.post("/{session_id}/interview-stages")
 async def create_interview_stage(session_id: str, request: CreateInterviewStageRequest):
     """Add an interview stage."""
-    profile = await job_profile_repo.get(session_id)
-    if not profile:
-        raise HTTPException(404, "Session not found")
+    async with profile_cache.exclusive(session_id):
+        profile = await job_profile_repo.get(session_id)
+        if not profile:
+            raise HTTPException(404, "Session not found")
 
-    stage = InterviewStage(
-        name=request.name,
-        description=request.description,
-        order=len(profile.interview_stages) + 1,
-        duration_minutes=request.duration_minutes,
-        interviewer_role=request.interviewer_role,
-        actions=request.actions,
-    )
+        stage = InterviewStage(
+            name=request.name,
+            description=request.description,
+            order=len(profile.interview_stages) + 1,
+            duration_minutes=request.duration_minutes,
+            interviewer_role=request.interviewer_role,
+            actions=request.actions,
+        )
 
-    success = await job_profile_repo.add_interview_stage(session_id, stage)
-    if not success:
-        raise HTTPException(500, "Failed to add interview stage")
+        success = await job_profile_repo.add_interview_stage(session_id, stage)
+        if not success:
+            raise HTTPException(500, "Failed to add interview stage")
 
-    updated_profile = await job_profile_repo.get(session_id)
-    return {
-        "success": True,
-        "stage": stage.model_dump(),
-        "stages_count": len(updated_profile.interview_stages),
-        "completion_percentage": updated_profile.calculate_completion_percentage()
-    }
+        updated_profile = await job_profile_repo.get(session_id)
+        return {
+            "success": True,
+            "stage": stage.model_dump(),
+            "stages_count": len(updated_profile.interview_stages),
+            "completion_percentage": updated_profile.calculate_completion_percentage()
+        }
 
 
 @router.patch("/{session_id}/interview-stages/{stage_id}")
 async def update_interview_stage(session_id: str, stage_id: str, request: dict):
     """Update an interview stage."""
-    profile = await job_profile_repo.get(session_id)
-    if not profile:
-        raise HTTPException(404, "Session not found")
-
-    # Find the stage by ID
-    stage = next((s for s in profile.interview_stages if s.id == stage_id), None)
-    if not stage:
-        raise HTTPException(404, "Interview stage not found")
-
-    # Update stage fields
-    if "name" in request:
-        stage.name = request["name"]
-    if "description" in request:
-        stage.description = request["description"]
-    if "duration_minutes" in request:
-        stage.duration_minutes = request["duration_minutes"]
-    if "interviewer_role" in request:
-        stage.interviewer_role = request["interviewer_role"]
-    if "order" in request:
-        stage.order = request["order"]
-
-    # Save updated profile
-    await job_profile_repo.save(profile)
+    async with profile_cache.exclusive(session_id):
+        profile = await job_profile_repo.get(session_id)
+        if not profile:
+            raise HTTPException(404, "Session not found")
+
+        # Find the stage by ID
+        stage = next((s for s in profile.interview_stages if s.id == stage_id), None)
+        if not stage:
+            raise HTTPException(404, "Interview stage not found")
+
+        # Update stage fields
+        if "name" in request:
+            stage.name = request["name"]
+        if "description" in request:
+            stage.description = request["description"]
+        if "duration_minutes" in request:
+            stage.duration_minutes = request["duration_minutes"]
+        if "interviewer_role" in request:
+            stage.interviewer_role = request["interviewer_role"]
+        if "order" in request:
+            stage.order = request["order"]
+
+        # Save updated profile
+        await job_profile_repo.save(profile)
 
-    return {
-        "success": True,
-        "stage": stage.model_dump(),
-        "completion_percentage": profile.calculate_completion_percentage()
-    }
+        return {
+            "success": True,
+            "stage": stage.model_dump(),
+            "completion_percentage": profile.calculate_completion_percentage()
+        }
 
 
 @router.delete("/{session_id}/interview-stages/{stage_id}")
 async def delete_interview_stage(session_id: str, stage_id: str):
     """Delete an interview stage."""
-    profile = await job_profile_repo.get(session_id)
-    if not profile:
-        raise HTTPException(404, "Session not found")
+    async with profile_cache.exclusive(session_id):
+        profile = await job_profile_repo.get(session_id)
+        if not profile:
+            raise HTTPException(404, "Session not found")
 
-    # Try to delete by ID first, fallback to name
-    success = await job_profile_repo.delete_interview_stage(session_id, stage_id)
-    if not success:
-        raise HTTPException(404, "Interview stage not found")
+        # Try to delete by ID first, fallback to name
+        success = await job_profile_repo.delete_interview_stage(session_id, stage_id)
+        if not success:
+            raise HTTPException(404, "Interview stage not found")
 
-    updated_profile = await job_profile_repo.get(session_id)
-    return {
-        "success": True,
-        "stages_count": len(updated_profile.interview_stages),
-        "completion_percentage": updated_profile.calculate_completion_percentage()
-    }
+        updated_profile = await job_profile_repo.get(session_id)
+        return {
+            "success": True,
+            "stages_count": len(updated_profile.interview_stages),
+            "completion_percentage": updated_profile.calculate_completion_percentage()
+        }
 
 
 @router.patch("/{session_id}/outreach")
 async def update_outreach(session_id: str, request: UpdateOutreachRequest):
     """Update outreach configuration."""
-    profile = await job_profile_repo.get(session_id)
-    if not profile:
-        raise HTTPException(404, "Session not found")
-
-    # Update outreach fields
-    outreach = profile.outreach
-
-    if request.tone:
-        from models.voice_ingest.enums import OutreachTone
-        outreach.tone = OutreachTone(request.tone)
-    if request.key_hook is not None:
-        outreach.key_hook = request.key_hook
-    if request.selling_points is not None:
-        outreach.selling_points = request.selling_points
-    if request.subject_line is not None:
-        outreach.subject_line = request.subject_line
-    if request.email_body is not None:
-        outreach.email_body = request.email_body
-
-    # Save updated profile
-    profile.outreach = outreach
-    await job_profile_repo.update(session_id, profile)
-
-    return {
-        "success": True,
-        "outreach": outreach.model_dump()
-    }
+    async with profile_cache.exclusive(session_id):
+        profile = await job_profile_repo.get(session_id)
+        if not profile:
+            raise HTTPException(404, "Session not found")
+
+        # Update outreach fields
+        outreach = profile.outreach
+
+        if request.tone:
+            from models.voice_ingest.enums import OutreachTone
+            outreach.tone = OutreachTone(request.tone)
+        if request.key_hook is not None:
+            outreach.key_hook = request.key_hook
+        if request.selling_points is not None:
+            outreach.selling_points = request.selling_points
+        if request.subject_line is not None:
+            outreach.subject_line = request.subject_line
+        if request.email_body is not None:
+            outreach.email_body = request.email_body
+
+        # Save updated profile
+        profile.outreach = outreach
+        await job_profile_repo.update(session_id, profile)
+
+        return {
+            "success": True,
+            "outreach": outreach.model_dump()
+        }
 
 
 @router.post("/{session_id}/complete")
 async def mark_complete(session_id: str):
     """Mark the job profile as complete."""
-    profile = await job_profile_repo.get(session_id)
-    if not profile:
-        raise HTTPException(404, "Session not found")
+    async with profile_cache.exclusive(session_id):
+        profile = await job_profile_repo.get(session_id)
+        if not profile:
+            raise HTTPException(404, "Session not found")
 
-    # Check if actually complete
-    missing = profile.get_missing_fields()
-    if missing:
-        raise HTTPException(
-            400,
-            f"Profile is not complete. Missing: {', '.join(missing)}"
-        )
+        # Check if actually complete
+        missing = profile.get_missing_fields()
+        if missing:
+            raise HTTPException(
+                400,
+                f"Profile is not complete. Missing: {', '.join(missing)}"
+            )
 
-    success = await job_profile_repo.mark_complete(session_id)
-    if not success:
-        raise HTTPException(500, "Failed to mark profile as complete")
+        success = await job_profile_repo.mark_complete(session_id)
+        if not success:
+            raise HTTPException(500, "Failed to mark profile as complete")
 
-    return {
-        "success": True,
-        "message": "Profile marked as complete",
-        "profile_id": session_id
-    }
+        return {
+            "success": True,
+            "message": "Profile marked as complete",
+            "profile_id": session_id
+        }
 
 
 @router.get("/{session_id}/job-description")
 async def get_job_description(session_id: str):
     """Generate a human-readable job description from the profile."""
-    profile = await job_profile_repo.get(session_id)
+    profile = await profile_cache.get(session_id)
     if not profile:
         raise HTTPException(404, "Session not found")
 
@@ -714,7 +726,7 @@ async def create_vapi_call(session_id: str):
     for the frontend to initiate the call with full context.
     """
     # Validate session exists
-    profile = await job_profile_repo.get(session_id)
+    profile = await profile_cache.get(session_id)
     if not profile:
         raise HTTPException(404, "Session not found")
 
@@ -1189,7 +1201,7 @@ async def websocket_endpoint(websocket: WebSocket, session_id: str):
     - onboarding_complete: Profile is complete
     """
     # Validate session exists before accepting
-    profile = await job_profile_repo.get(session_id)
+    profile = await profile_cache.get(session_id)
     if not profile:
         await websocket.close(code=4004, reason="Session not found")
         return
@@ -1221,7 +1233,7 @@ async def websocket_endpoint(websocket: WebSocket, session_id: str):
 
                 # Handle profile refresh request
                 elif data == "refresh":
-                    current_profile = await job_profile_repo.get(session_id)
+                    current_profile = await profile_cache.get(session_id)
                     if current_profile:
                         await websocket.send_json({
                             "type": "profile_refresh",
@@ -1348,7 +1360,9 @@ async def _handle_tool_calls(request: Dict[str, Any]) -> Dict[str, Any]:
 
         # Route to appropriate handler
         try:
+            tool_start = time.perf_counter()
             result = await _execute_tool(tool_name, tool_args, session_id)
+            logger.info(f"Tool {tool_name} executed in {(time.perf_counter() - tool_start) * 1000:.1f}ms")
             results.append({
                 "toolCallId": tool_call_id,
                 "result": json.dumps(result)
@@ -1364,13 +1378,23 @@ async def _handle_tool_calls(request: Dict[str, Any]) -> Dict[str, Any]:
 
 
 async def _execute_tool(tool_name: str, args: Dict[str, Any], session_id: str) -> Dict[str, Any]:
-    """Execute a tool and broadcast updates via WebSocket."""
+    """Execute a tool against the cached session profile."""
+    async with profile_cache.session(session_id) as profile:
+        if not profile:
+            return {"error": "Session not found"}
 
-    # Get current profile
-    profile = await job_profile_repo.get(session_id)
-    if not profile:
-        return {"error": "Session not found"}
+        result = await _apply_tool(tool_name, args, session_id, profile)
 
+        # Persist write-behind after any update
+        if result.get("success"):
+            profile.update_completion_status()
+            await profile_cache.mark_dirty(session_id)
+
+    return result
+
+
+async def _apply_tool(tool_name: str, args: Dict[str, Any], session_id: str, profile: JobProfile) -> Dict[str, Any]:
+    """Apply a tool call to the profile in place and broadcast updates via WebSocket."""
     result = {"success": False, "message": "Unknown tool"}
 
     # =========================================================================
@@ -1668,7 +1692,6 @@ async def _execute_tool(tool_name: str, args: Dict[str, Any], session_id: str) -
 
             # Optionally capture as a nuance if there's a reason
             if reason:
-                from models.voice_ingest import NuanceCapture
                 from models.voice_ingest.enums import NuanceCategory
                 nuance = NuanceCapture(
                     category=NuanceCategory.OTHER,
@@ -1691,11 +1714,6 @@ async def _execute_tool(tool_name: str, args: Dict[str, Any], session_id: str) -
             "count": len(profile.skipped_fields)
         }
 
-    # Save profile after any update
-    if result.get("success"):
-        profile.update_completion_status()
-        await job_profile_repo.save(profile)
-
     return result
 
 
@@ -1750,11 +1768,15 @@ async def _handle_end_of_call(request: Dict[str, Any]) -> Dict[str, Any]:
 
     if session_id:
         # Mark profile as potentially complete
-        profile = await job_profile_repo.get(session_id)
-        if profile:
-            profile.update_completion_status()
-            await job_profile_repo.save(profile)
+        async with profile_cache.session(session_id) as profile:
+            if profile:
+                profile.update_completion_status()
+                await profile_cache.mark_dirty(session_id)
+
+        # Flush pending tool-call writes and release the hot copy
+        await profile_cache.end_session(session_id)
 
+        if profile:
             # Notify frontend
             await ws_hub.send_update(session_id, "call_ended", {
                 "is_complete": profile.is_complete,
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark password hashing and token verification under load.
+
+Login storm: verifies N passwords concurrently, once with bcrypt called inline
+(as the handlers used to) and once on the bcrypt worker pool, while a ticker
+coroutine measures how long the event loop is blocked. Authenticated requests:
+decodes the same tokens repeatedly with the verified-token cache off and on.
+
+Usage: python scripts/bench_auth.py [--logins 32] [--rounds 12] [--requests 20000] [--users 50]
+"""
+import sys
+import os
+import argparse
+import asyncio
+import time
+import uuid
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services import auth_service
+from services.auth_service import (
+    create_access_token,
+    decode_access_token,
+    verify_password,
+    verify_password_async,
+)
+
+
+async def _ticker(stop: asyncio.Event, interval: float, lags: list) -> None:
+    """Sleeps in short steps and records how late each wake-up is."""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - start - interval)
+
+
+async def _login_storm(label: str, verify, password: str, password_hash: str, n: int) -> None:
+    stop = asyncio.Event()
+    lags: list = []
+    ticker = asyncio.create_task(_ticker(stop, 0.005, lags))
+    await asyncio.sleep(0.01)
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(verify(password, password_hash) for _ in range(n)))
+    wall_s = time.perf_counter() - start
+
+    stop.set()
+    await ticker
+    assert all(results)
+    print(
+        f"{label:<8} logins={n:>3}  wall={wall_s:6.2f}s  "
+        f"max_loop_stall={max(lags) * 1000:7.1f}ms  ticks={len(lags)}"
+    )
+
+
+async def _inline(password: str, password_hash: str) -> bool:
+    return verify_password(password, password_hash)
+
+
+def _requests(label: str, tokens: list, n: int) -> None:
+    start = time.perf_counter()
+    for i in range(n):
+        assert decode_access_token(tokens[i % len(tokens)]) is not None
+    wall_s = time.perf_counter() - start
+    print(f"{label:<8} requests={n}  per_request={wall_s / n * 1e6:6.1f}us")
+
+
+async def main(args) -> None:
+    auth_service.BCRYPT_ROUNDS = args.rounds
+    password = "correct horse battery staple"
+    password_hash = auth_service.hash_password(password)
+    print(f"bcrypt cost {args.rounds}, {auth_service.AUTH_HASH_WORKERS} hash workers")
+    await _login_storm("inline", _inline, password, password_hash, args.logins)
+    await _login_storm("pool", verify_password_async, password, password_hash, args.logins)
+
+    tokens = [
+        create_access_token(str(uuid.uuid4()), str(uuid.uuid4()), f"user{i}@example.com", "recruiter", f"User {i}")
+        for i in range(args.users)
+    ]
+    auth_service.token_cache.max_entries = 0
+    _requests("no-cache", tokens, args.requests)
+    auth_service.token_cache.max_entries = auth_service.AUTH_TOKEN_CACHE_SIZE
+    _requests("cached", tokens, args.requests)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--logins", type=int, default=32, help="Concurrent password checks")
+    parser.add_argument("--rounds", type=int, default=auth_service.BCRYPT_ROUNDS, help="bcrypt cost factor")
+    parser.add_argument("--requests", type=int, default=20000, help="Authenticated requests to decode")
+    parser.add_argument("--users", type=int, default=50, help="Distinct tokens in rotation")
+    asyncio.run(main(parser.parse_args()))
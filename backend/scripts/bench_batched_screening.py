@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Benchmark packed screening against one call per candidate.
+
+Screens the same synthetic candidates with pack sizes 1 (the single-candidate
+path) and K, reporting prompt tokens, calls and wall time per candidate. By
+default the LLM is simulated: tokens are estimated from prompt length and each
+call sleeps for a latency modelled on its input and output size. Pass --live
+to call the configured OpenRouter model instead (costs real tokens).
+
+Usage: python scripts/bench_batched_screening.py [--candidates 20] [--pack-sizes 1 4 8] [--live]
+"""
+import sys
+import os
+import argparse
+import asyncio
+import re
+import time
+from types import SimpleNamespace
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# The simulated run never sends a request, but the client is built at import
+os.environ.setdefault("OPENROUTER_API_KEY", "bench")
+
+from models.streamlined.job import ExtractedRequirements, WeightedAttribute
+from services import candidate_screening
+from services.candidate_screening import (
+    ExtractedProfile,
+    PackedScreeningItem,
+    PackedScreeningResponse,
+    ScreeningResult,
+    screen_candidates_batch,
+)
+
+CANDIDATE_REF = re.compile(r"=== CANDIDATE (C\d+) ===")
+
+JOB_DESCRIPTION = (
+    "We are hiring a Senior Backend Engineer to own our payments platform. "
+    "You will design APIs, run Postgres at scale and mentor engineers. "
+) * 30
+
+
+def _requirements() -> ExtractedRequirements:
+    attrs = lambda *values: [WeightedAttribute(value=v, weight=0.8) for v in values]
+    return ExtractedRequirements(
+        years_experience="5+",
+        location="Remote",
+        required_skills=attrs("Python", "PostgreSQL", "Distributed systems", "API design"),
+        preferred_skills=attrs("Kafka", "Kubernetes", "Payments"),
+        success_signals=attrs("Led a platform migration", "Owned on-call for a critical service"),
+        red_flags=attrs("Frequent short tenures", "No production ownership"),
+        behavioral_traits=attrs("Ownership", "Clear written communication"),
+        cultural_indicators=attrs("Startup experience"),
+        deal_breakers=attrs("No backend experience"),
+        ideal_background="Backend engineer from a fintech or infrastructure company",
+    )
+
+
+def _candidates(n: int) -> list:
+    return [
+        {
+            "candidate_id": f"cand-{i}",
+            "person_id": f"person-{i}",
+            "enrichment_data": {
+                "full_name": f"Candidate {i}",
+                "headline": "Backend Engineer",
+                "experiences": [
+                    {"title": "Software Engineer", "company": f"Company {j}", "description": "Built APIs. " * 20}
+                    for j in range(4)
+                ],
+                "skills": ["Python", "Go", "PostgreSQL", "Kafka", "AWS"],
+            },
+        }
+        for i in range(n)
+    ]
+
+
+def _tokens(text: str) -> int:
+    # Rough BPE estimate; good enough to compare the two paths
+    return max(len(text) // 4, 1)
+
+
+class SimulatedCompletions:
+    """Stands in for the structured-output API: counts tokens and sleeps like a model would."""
+
+    def __init__(self, base_ms: float, input_ms_per_1k: float, output_ms_per_token: float, output_tokens: int):
+        self.base_ms = base_ms
+        self.input_ms_per_1k = input_ms_per_1k
+        self.output_ms_per_token = output_ms_per_token
+        self.output_tokens = output_tokens
+        self.calls = 0
+        self.prompt_tokens = 0
+
+    async def parse(self, model, messages, response_format, temperature):
+        prompt_tokens = sum(_tokens(m["content"]) for m in messages)
+        refs = CANDIDATE_REF.findall(messages[-1]["content"]) or ["C1"]
+        self.calls += 1
+        self.prompt_tokens += prompt_tokens
+
+        latency_ms = (
+            self.base_ms
+            + prompt_tokens / 1000 * self.input_ms_per_1k
+            + len(refs) * self.output_tokens * self.output_ms_per_token
+        )
+        await asyncio.sleep(latency_ms / 1000)
+
+        result = ScreeningResult(
+            profile=ExtractedProfile(name="Candidate"),
+            overall_score=70,
+            recommendation="Good Fit",
+            fit_summary="Simulated",
+        )
+        if response_format is ScreeningResult:
+            parsed = result
+        else:
+            parsed = PackedScreeningResponse(
+                results=[PackedScreeningItem(candidate_ref=ref, result=result) for ref in refs]
+            )
+        usage = SimpleNamespace(prompt_tokens=prompt_tokens)
+        return SimpleNamespace(usage=usage, choices=[SimpleNamespace(message=SimpleNamespace(parsed=parsed))])
+
+
+class LiveCompletions:
+    """Wraps the real client to count calls and reported prompt tokens."""
+
+    def __init__(self, completions):
+        self.completions = completions
+        self.calls = 0
+        self.prompt_tokens = 0
+
+    async def parse(self, **kwargs):
+        completion = await self.completions.parse(**kwargs)
+        self.calls += 1
+        usage = getattr(completion, "usage", None)
+        self.prompt_tokens += getattr(usage, "prompt_tokens", 0) or 0
+        return completion
+
+
+async def _run(pack_size: int, candidates: list, concurrency: int, args) -> None:
+    if args.live:
+        completions = LiveCompletions(candidate_screening.client.beta.chat.completions)
+    else:
+        completions = SimulatedCompletions(args.base_ms, args.input_ms_per_1k, args.output_ms_per_token, args.output_tokens)
+    candidate_screening.client = SimpleNamespace(beta=SimpleNamespace(chat=SimpleNamespace(completions=completions)))
+
+    start = time.perf_counter()
+    await screen_candidates_batch(
+        candidates,
+        "Senior Backend Engineer",
+        JOB_DESCRIPTION,
+        _requirements(),
+        batch_size=concurrency,
+        pack_size=pack_size,
+    )
+    wall_s = time.perf_counter() - start
+
+    n = len(candidates)
+    print(
+        f"pack={pack_size:>2}  calls={completions.calls:>3}  "
+        f"prompt_tokens/cand={completions.prompt_tokens / n:7.0f}  "
+        f"wall={wall_s:6.2f}s  wall/cand={wall_s / n * 1000:7.1f}ms"
+    )
+
+
+async def main(args) -> None:
+    real_client = candidate_screening.client
+    candidates = _candidates(args.candidates)
+    mode = "live" if args.live else "simulated"
+    print(f"{args.candidates} candidates, concurrency {args.concurrency} calls, {mode} LLM")
+    for pack_size in args.pack_sizes:
+        candidate_screening.client = real_client
+        await _run(pack_size, candidates, args.concurrency, args)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--candidates", type=int, default=20)
+    parser.add_argument("--pack-sizes", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--concurrency", type=int, default=5, help="LLM calls in flight at once")
+    parser.add_argument("--live", action="store_true", help="Call the configured model instead of simulating")
+    parser.add_argument("--base-ms", type=float, default=400, help="Simulated per-call overhead")
+    parser.add_argument("--input-ms-per-1k", type=float, default=60, help="Simulated prefill cost per 1k prompt tokens")
+    parser.add_argument("--output-ms-per-token", type=float, default=2, help="Simulated decode cost per output token")
+    parser.add_argument("--output-tokens", type=int, default=900, help="Simulated output tokens per candidate")
+    asyncio.run(main(parser.parse_args()))
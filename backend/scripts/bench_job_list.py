@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Benchmark job list latency: full Job rows vs the JobSummary projection.
+
+Builds N jobs carrying realistic extracted_requirements, company_context and
+scoring_criteria blobs (a quarter in the legacy string-list format) behind an
+in-memory stand-in for the Supabase client. The stand-in applies the selected
+columns and round-trips rows through JSON, as PostgREST would, so payload
+size is part of what's measured. Lists with fields=full and fields=summary.
+
+Usage: python scripts/bench_job_list.py [--jobs 500] [--repeat 20]
+"""
+import sys
+import os
+import argparse
+import json
+import statistics
+import time
+import uuid
+from types import SimpleNamespace
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from repositories.streamlined import job_repo as job_repo_module
+from repositories.streamlined.job_repo import JobRepository
+
+ORG_ID = str(uuid.uuid4())
+SKILLS = ["Python", "PostgreSQL", "Kubernetes", "React", "TypeScript", "AWS", "Kafka", "Terraform", "Go", "GraphQL"]
+
+
+def _weighted(prefix: str, n: int, legacy: bool) -> list:
+    items = [f"{prefix} {SKILLS[i % len(SKILLS)]} in production systems at scale ({i})" for i in range(n)]
+    return items if legacy else [{"value": item, "weight": round(0.5 + (i % 5) / 10, 1)} for i, item in enumerate(items)]
+
+
+def _job(i: int) -> dict:
+    legacy = i % 4 == 0
+    return {
+        "id": str(uuid.uuid4()),
+        "organization_id": ORG_ID,
+        "title": f"Senior Engineer {i}",
+        "description": "We are hiring an engineer to own our data platform. " * 60,
+        "status": "active" if i % 3 else "draft",
+        "recruiter_id": str(uuid.uuid4()),
+        "interview_stages": ["Phone Screen", "Technical", "Onsite"],
+        "created_at": "2026-05-01T09:00:00",
+        "updated_at": "2026-05-02T09:00:00",
+        "deleted_at": None,
+        "red_flags": ["Job hopping", "No ownership examples"],
+        "extracted_requirements": {
+            "years_experience": "5+ years",
+            "education": "BS Computer Science or equivalent",
+            "location": "Remote (US)",
+            "work_type": "remote",
+            "salary_range": "$170k-$210k",
+            "required_skills": _weighted("Hands-on", 12, legacy),
+            "preferred_skills": _weighted("Exposure to", 8, legacy),
+            "certifications": ["AWS Solutions Architect"],
+            "success_signals": _weighted("Led", 6, legacy),
+            "red_flags": _weighted("Unable to explain", 4, legacy),
+            "behavioral_traits": _weighted("Ownership of", 5, legacy),
+            "cultural_indicators": _weighted("Mentoring on", 4, legacy),
+            "deal_breakers": _weighted("No experience with", 3, legacy),
+            "ideal_background": "Backend engineer from a high-growth B2B SaaS company. " * 4,
+            "formatted_description": "## About the role\n" + "Own services end to end. " * 80,
+            "category_weights": {"technical": 0.5, "experience": 0.3, "cultural": 0.2},
+            "missing_fields": [],
+            "extraction_confidence": 0.92,
+        },
+        "company_context_enriched": {
+            "company_name": "Acme Analytics",
+            "company_description": "Acme builds analytics tooling for finance teams. " * 10,
+            "team_size": "12 engineers",
+            "team_culture": "Async-first, writing-heavy, high ownership.",
+            "reporting_to": "Head of Platform",
+            "growth_stage": "Series C",
+            "key_projects": [f"Project {p}: migrate the ingestion pipeline to streaming" for p in range(5)],
+        },
+        "scoring_criteria": {
+            "must_haves": SKILLS[:5],
+            "nice_to_haves": SKILLS[5:],
+            "cultural_fit_traits": ["Ownership", "Clear writing", "Curiosity"],
+            "technical_competencies": SKILLS,
+            "weight_technical": 0.5,
+            "weight_experience": 0.3,
+            "weight_cultural": 0.2,
+        },
+    }
+
+
+class FakeQuery:
+    def __init__(self, client, table):
+        self.client = client
+        self.table = table
+        self.columns = "*"
+        self.filters = []
+
+    def select(self, columns, **kwargs):
+        self.columns = columns
+        return self
+
+    def eq(self, column, value):
+        self.filters.append(lambda row: row.get(column) == value)
+        return self
+
+    def in_(self, column, values):
+        values = set(values)
+        self.filters.append(lambda row: row.get(column) in values)
+        return self
+
+    def is_(self, column, value):
+        self.filters.append(lambda row: row.get(column) is None)
+        return self
+
+    def gt(self, column, value):
+        self.filters.append(lambda row: row.get(column) > value)
+        return self
+
+    def order(self, *args, **kwargs):
+        return self
+
+    def execute(self):
+        rows = [r for r in self.client.tables[self.table] if all(f(r) for f in self.filters)]
+        if self.columns != "*":
+            names = [c.strip() for c in self.columns.split(",")]
+            rows = [{name: row.get(name) for name in names} for row in rows]
+        payload = json.dumps(rows)
+        self.client.bytes_sent += len(payload)
+        return SimpleNamespace(data=json.loads(payload))
+
+
+class FakeClient:
+    def __init__(self, n_jobs: int):
+        jobs = [_job(i) for i in range(n_jobs)]
+        counts = [
+            {"job_posting_id": job["id"], "pipeline_status": status, "count": n}
+            for job in jobs
+            for status, n in (("new", 40), ("stage_0", 12), ("stage_1", 5), ("decision_pending", 2))
+        ]
+        self.tables = {"job_postings": jobs, "job_pipeline_counts": counts}
+        self.bytes_sent = 0
+
+    def table(self, name):
+        return FakeQuery(self, name)
+
+
+def _run(label: str, client: FakeClient, fields: str, repeat: int) -> None:
+    repo = JobRepository()
+    timings = []
+    client.bytes_sent = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        jobs = repo.list_all_for_org_sync(ORG_ID, fields=fields)
+        timings.append(time.perf_counter() - start)
+    print(
+        f"{label:<8} jobs={len(jobs)}  median={statistics.median(timings) * 1000:7.1f}ms  "
+        f"p95={sorted(timings)[int(len(timings) * 0.95) - 1] * 1000:7.1f}ms  "
+        f"payload={client.bytes_sent / repeat / 1024:7.0f}KiB"
+    )
+
+
+def main(args) -> None:
+    client = FakeClient(args.jobs)
+    job_repo_module.get_db = lambda: client
+    _run("full", client, "full", args.repeat)
+    _run("summary", client, "summary", args.repeat)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--jobs", type=int, default=500, help="Jobs in the organization")
+    parser.add_argument("--repeat", type=int, default=20, help="List calls per mode")
+    main(parser.parse_args())
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Benchmark LocalJobProfileRepository get/update/list latency by store size.
+
+Seeds 100, 1,000 and 10,000 profiles and times single-profile reads and
+writes plus a first-page list. For comparison it also times the old
+single-file layout's per-operation cost (load and dump of every profile).
+
+Usage: python scripts/bench_job_profile_storage.py [--sizes 100 1000 10000] [--ops 200]
+"""
+import sys
+import os
+import argparse
+import asyncio
+import json
+import random
+import shutil
+import statistics
+import tempfile
+import time
+import uuid
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.voice_ingest import JobProfile, CompanyIntelligence, HardRequirements
+from repositories.job_profile_local import LocalJobProfileRepository
+
+
+def _profile(i: int) -> JobProfile:
+    return JobProfile(
+        id=str(uuid.uuid4()),
+        recruiter_first_name="Bench",
+        recruiter_last_name=f"User{i}",
+        company=CompanyIntelligence(
+            name=f"Company {i}",
+            website=f"https://company{i}.example.com",
+            interesting_facts=["Fact " * 40] * 10,
+        ),
+        requirements=HardRequirements(job_title=f"Engineer {i}"),
+    )
+
+
+def _time_ms(samples: list) -> str:
+    ordered = sorted(samples)
+    p95 = ordered[max(int(len(ordered) * 0.95) - 1, 0)]
+    return f"p50={statistics.median(ordered):7.3f}ms p95={p95:7.3f}ms"
+
+
+async def _bench_size(size: int, ops: int) -> None:
+    data_dir = tempfile.mkdtemp(prefix="bench_profiles_")
+    try:
+        repo = LocalJobProfileRepository(data_dir=data_dir)
+        seed_start = time.perf_counter()
+        ids = []
+        for i in range(size):
+            profile = _profile(i)
+            await repo.create(profile)
+            ids.append(profile.id)
+        seed_s = time.perf_counter() - seed_start
+
+        gets, updates, lists = [], [], []
+        for _ in range(ops):
+            profile_id = random.choice(ids)
+
+            start = time.perf_counter()
+            profile = await repo.get(profile_id)
+            gets.append((time.perf_counter() - start) * 1000)
+
+            profile.requirements.job_title = "Updated"
+            start = time.perf_counter()
+            await repo.update(profile_id, profile)
+            updates.append((time.perf_counter() - start) * 1000)
+
+        for _ in range(min(ops, 20)):
+            start = time.perf_counter()
+            await repo.list_all(limit=20)
+            lists.append((time.perf_counter() - start) * 1000)
+
+        # Cost of the old layout: every operation loads and rewrites all profiles
+        legacy = {pid: repo._read_profile(pid) for pid in ids}
+        legacy_file = os.path.join(data_dir, "legacy.json")
+        legacy_ops = []
+        for _ in range(min(ops, 5)):
+            start = time.perf_counter()
+            with open(legacy_file, "w") as f:
+                json.dump(legacy, f, indent=2, default=str)
+            with open(legacy_file) as f:
+                json.load(f)
+            legacy_ops.append((time.perf_counter() - start) * 1000)
+
+        print(f"\n{size:>6} profiles (seeded in {seed_s:.1f}s)")
+        print(f"  get              {_time_ms(gets)}")
+        print(f"  update           {_time_ms(updates)}")
+        print(f"  list_all(20)     {_time_ms(lists)}")
+        print(f"  legacy load+dump {_time_ms(legacy_ops)}")
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+async def main(sizes: list, ops: int) -> None:
+    for size in sizes:
+        await _bench_size(size, ops)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--ops", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.sizes, args.ops))
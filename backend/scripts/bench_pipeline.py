@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Benchmark AI pipeline throughput end to end, offline.
+
+The LLM is served by scripts/mock_openrouter.py (started in-process unless
+--llm-url is given) and the database by the SQLite stand-in in
+db/local_client.py, so no tokens are spent and no Supabase project is needed.
+Pipelines:
+
+  upload       POST candidates.csv to /api/jobs/{id}/candidates/upload, then
+               drain the queued screening tasks with a TaskWorker
+  pluto        pluto_processor.process_csv_file on candidates.csv
+               (semantic extraction + AI scoring)
+  transcripts  parse each sample_transcripts/ file and generate interview
+               analytics for it
+
+Each pipeline reports items/sec and p50/p95 latency per item, measured from
+when the item was submitted (the start of the run for upload and pluto) to
+when its result was saved, plus the mock's LLM call counts and 429s.
+
+Usage: python scripts/bench_pipeline.py [--pipelines upload pluto transcripts] [--copies 5]
+                                        [--latency lognormal:800:0.5] [--ms-per-token 2]
+                                        [--rate-429 0.02] [--max-concurrency 0] [--db-latency-ms 5]
+"""
+import sys
+import os
+import argparse
+import asyncio
+import csv
+import io
+import json
+import statistics
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+REPO_ROOT = SCRIPTS_DIR.parent.parent
+
+# Add backend to path
+sys.path.insert(0, str(SCRIPTS_DIR.parent))
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+from mock_openrouter import LatencyModel, create_app, start_mock_server
+
+ORG_ID = str(uuid.uuid4())
+RECRUITER_ID = str(uuid.uuid4())
+
+JOB_DESCRIPTION = """Founding Account Executive - AI SaaS Marketplace
+
+We sell AI-powered financial workflow software to CFOs and finance teams at
+mid-market and enterprise companies. You will own the full sales cycle from
+prospecting to close, run discovery with finance leaders, build pipeline from
+scratch and help shape our sales playbook. 5+ years of B2B SaaS closing
+experience selling to finance buyers, a track record of $50k+ ACV deals and
+startup experience are required. MEDDIC experience is a plus."""
+
+csv.field_size_limit(sys.maxsize)
+
+
+def _configure(args) -> None:
+    """Point the backend at the mock LLM, the local database and a scratch task queue."""
+    if args.llm_url:
+        base_url = args.llm_url
+    else:
+        app = create_app(
+            LatencyModel(args.latency, args.ms_per_token, args.seed),
+            rate_429=args.rate_429,
+            max_concurrency=args.max_concurrency,
+            seed=args.seed,
+        )
+        base_url, _ = start_mock_server(app)
+        args.mock_app = app
+
+    scratch = tempfile.mkdtemp(prefix="bench_pipeline_")
+    os.environ.update({
+        "OPENROUTER_BASE_URL": base_url,
+        "OPENROUTER_API_KEY": os.environ.get("OPENROUTER_API_KEY") if args.llm_url else "bench",
+        "DB_BACKEND": "local",
+        "LOCAL_DB_PATH": os.path.join(scratch, "db.sqlite"),
+        "LOCAL_DB_LATENCY_MS": str(args.db_latency_ms),
+        "TASK_QUEUE_DB_PATH": os.path.join(scratch, "tasks.db"),
+    })
+    args.scratch = Path(scratch)
+
+
+def _csv_copies(path: Path, copies: int) -> bytes:
+    """
+    The CSV repeated `copies` times with every row a distinct person.
+
+    Person resolution falls back to matching by name, which would merge the
+    export's many "Unknown User" rows into one candidate.
+    """
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        fields, rows = reader.fieldnames, list(reader)
+
+    out = io.StringIO()
+    writer = csv.DictWriter(out, fieldnames=fields)
+    writer.writeheader()
+    for k in range(copies):
+        for i, row in enumerate(rows):
+            row = dict(row)
+            if k or row["name"] == "Unknown User":
+                row["name"] = f"{row['name']} #{k}.{i}"
+            if k:
+                row["id"] = str(uuid.uuid4())
+                row["crustdata_enrichment_data"] = row.get("crustdata_enrichment_data", "")\
+                    .replace("linkedin.com/in/", f"linkedin.com/in/bench{k}-")
+            writer.writerow(row)
+    return out.getvalue().encode("utf-8")
+
+
+def _report(name: str, unit: str, submitted: dict, finished: dict, wall: float) -> None:
+    latencies = sorted(finished[k] - submitted[k] for k in finished)
+    failed = len(submitted) - len(finished)
+    if not latencies:
+        print(f"{name:<12} no {unit} completed ({failed} failed)")
+        return
+    p95 = latencies[max(0, int(len(latencies) * 0.95) - 1)]
+    print(
+        f"{name:<12} {len(latencies):4d} {unit:<11} {len(latencies) / wall:7.2f} {unit}/s  "
+        f"p50={statistics.median(latencies):6.2f}s  p95={p95:6.2f}s  wall={wall:6.2f}s"
+        + (f"  failed={failed}" if failed else "")
+    )
+
+
+async def _seed_job(db) -> str:
+    """Create a job whose requirements come from JD extraction (via the LLM)."""
+    from services.jd_extractor import extract_requirements_for_streamlined
+
+    requirements = await extract_requirements_for_streamlined(JOB_DESCRIPTION)
+    if not db.rows("organizations"):
+        db.seed("organizations", [{"id": ORG_ID, "name": "Bench Org"}])
+    return db.seed("job_postings", [{
+        "organization_id": ORG_ID,
+        "recruiter_id": RECRUITER_ID,
+        "title": "Founding Account Executive",
+        "raw_description": JOB_DESCRIPTION,
+        "description": JOB_DESCRIPTION,
+        "status": "active",
+        "interview_stages": ["Screen", "Hiring Manager", "Final"],
+        "extracted_requirements": requirements.model_dump(mode="json") if requirements else None,
+        "deleted_at": None,
+    }])[0]["id"]
+
+
+async def bench_upload(args, db) -> None:
+    import httpx
+    from main import app
+    from middleware.auth_middleware import get_current_user
+    from models.auth import CurrentUser
+    from services import candidate_screening
+    from services.task_queue import task_queue, TaskWorker
+    import services.task_handlers  # noqa: F401  (registers handlers)
+
+    job_id = await _seed_job(db)
+    content = _csv_copies(REPO_ROOT / "candidates.csv", args.copies)
+    app.dependency_overrides[get_current_user] = lambda: CurrentUser(
+        recruiter_id=RECRUITER_ID, organization_id=ORG_ID, email="bench@example.com", role="admin", name="Bench",
+    )
+
+    finished = {}
+    apply_result = candidate_screening.apply_screening_result
+
+    async def timed_apply(candidate_id, *a, **kw):
+        result = await apply_result(candidate_id, *a, **kw)
+        finished[str(candidate_id)] = time.perf_counter()
+        return result
+
+    candidate_screening.apply_screening_result = timed_apply
+
+    start = time.perf_counter()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        response = await client.post(
+            f"/api/jobs/{job_id}/candidates/upload",
+            files={"file": ("candidates.csv", content, "text/csv")},
+        )
+    response.raise_for_status()
+
+    worker = TaskWorker(task_queue, concurrency=args.workers)
+    run = asyncio.create_task(worker.run())
+    while any(task_queue.stats().get(kind, {}).get(status) for kind in task_queue.stats() for status in ("queued", "running")):
+        await asyncio.sleep(0.05)
+    wall = time.perf_counter() - start
+    worker.stop()
+    await run
+
+    submitted = {row["id"]: start for row in db.rows("candidates")}
+    _report("upload", "candidates", submitted, finished, wall)
+
+
+async def bench_pluto(args, db) -> None:
+    from services import candidate_store, pluto_processor
+
+    # Keep the JSON candidate store out of backend/data
+    candidate_store.DATA_DIR = args.scratch
+    candidate_store.CANDIDATES_FILE = args.scratch / "candidates.json"
+
+    finished = {}
+    process_single = pluto_processor.process_single_candidate
+
+    async def timed_process(candidate_data, *a, **kw):
+        result = await process_single(candidate_data, *a, **kw)
+        finished[f"{candidate_data['id']}:{candidate_data['name']}"] = time.perf_counter()
+        return result
+
+    pluto_processor.process_single_candidate = timed_process
+
+    content = _csv_copies(REPO_ROOT / "candidates.csv", args.copies)
+    start = time.perf_counter()
+    results = await pluto_processor.process_csv_file(content, job_description=JOB_DESCRIPTION)
+    wall = time.perf_counter() - start
+
+    submitted = {f"{c['id']}:{c['name']}": start for c in results}
+    _report("pluto", "candidates", submitted, finished, wall)
+
+
+async def bench_transcripts(args, db) -> None:
+    from services.analytics_generator import generate_analytics
+    from services.transcript_parser import get_transcript_parser
+
+    job_id = await _seed_job(db)
+    files = sorted((REPO_ROOT / "sample_transcripts").glob("*.txt"))
+    person = db.seed("persons", [{"name": "Darrell Sung", "email": "darrell@example.com"}])[0]
+    candidate = db.seed("candidates", [{
+        "person_id": person["id"], "job_posting_id": job_id, "name": "Darrell Sung", "pipeline_status": "stage_0",
+    }])[0]
+    items = [
+        (path.read_text(), db.seed("interviews", [{
+            "candidate_id": candidate["id"], "job_posting_id": job_id, "stage": "round_1",
+            "interview_type": "ai_candidate", "status": "completed", "transcript": path.read_text(),
+        }])[0]["id"])
+        for _ in range(args.copies) for path in files
+    ]
+
+    parser = get_transcript_parser()
+    sem = asyncio.Semaphore(args.workers)
+    submitted, finished = {}, {}
+
+    async def run(transcript: str, interview_id: str) -> None:
+        async with sem:
+            submitted[interview_id] = time.perf_counter()
+            try:
+                await parser.parse_transcript(transcript, candidate_name="Darrell Sung")
+                await generate_analytics(uuid.UUID(interview_id))
+                finished[interview_id] = time.perf_counter()
+            except Exception as e:
+                print(f"  transcript {interview_id} failed: {e}")
+
+    start = time.perf_counter()
+    await asyncio.gather(*(run(text, interview_id) for text, interview_id in items))
+    _report("transcripts", "interviews", submitted, finished, time.perf_counter() - start)
+
+
+async def main(args) -> None:
+    from db.client import get_db
+
+    db = get_db()
+    print(
+        f"LLM: {os.environ['OPENROUTER_BASE_URL']} latency={args.latency} +{args.ms_per_token}ms/token "
+        f"429={args.rate_429:.0%} | DB latency={args.db_latency_ms}ms | copies={args.copies} workers={args.workers}"
+    )
+    for name in args.pipelines:
+        await {"upload": bench_upload, "pluto": bench_pluto, "transcripts": bench_transcripts}[name](args, db)
+
+    app = getattr(args, "mock_app", None)
+    if app is not None:
+        stats = dict(sorted(app.state.stats.items()))
+        print("LLM calls:", json.dumps(stats))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pipelines", nargs="+", default=["upload", "pluto", "transcripts"],
+                        choices=["upload", "pluto", "transcripts"])
+    parser.add_argument("--copies", type=int, default=5, help="Repeat the CSV / transcripts this many times")
+    parser.add_argument("--workers", type=int, default=8, help="Task worker / transcript concurrency")
+    parser.add_argument("--latency", default="lognormal:800:0.5", help="Mock LLM latency distribution (ms)")
+    parser.add_argument("--ms-per-token", type=float, default=2.0, help="Mock LLM latency per output token")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="Fraction of LLM calls rate limited")
+    parser.add_argument("--max-concurrency", type=int, default=0, help="Mock LLM concurrent call limit (429 above)")
+    parser.add_argument("--db-latency-ms", type=float, default=0.0, help="Simulated database round trip")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--llm-url", default=None, help="Use an already running LLM endpoint instead")
+    args = parser.parse_args()
+
+    _configure(args)
+    asyncio.run(main(args))
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Benchmark resume text extraction.
+
+Generates N multi-page PDF resumes, then extracts them concurrently: once
+parsed inline on the event loop (as the application processor used to), once
+on the resume parsing process pool, and once more with the text cache warm.
+A ticker coroutine measures how long the event loop is blocked in each run.
+
+Usage: python scripts/bench_resume_extraction.py [--files 24] [--pages 4] [--workers 2]
+"""
+import sys
+import os
+import argparse
+import asyncio
+import tempfile
+import time
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.resume_text import ResumeTextExtractor, parse_resume_bytes
+
+
+def make_pdf(pages: list) -> bytes:
+    """Minimal PDF with one Helvetica text block per page (no PDF library needed)."""
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for lines in pages:
+        body = "BT /F1 10 Tf 50 780 Td 12 TL " + " ".join(
+            "(" + line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)") + ") Tj T*" for line in lines
+        ) + " ET"
+        stream = body.encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % (len(objects))
+        )
+        kids.append(len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % k for k in kids), len(kids)
+    )
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, obj)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+def _resume_pages(index: int, n_pages: int) -> list:
+    return [
+        [f"Candidate {index} - page {page + 1}"]
+        + [f"{2010 + line % 14}: Built data pipelines and services in Python, SQL and Go ({index}.{line})" for line in range(55)]
+        for page in range(n_pages)
+    ]
+
+
+async def _ticker(stop: asyncio.Event, interval: float, lags: list) -> None:
+    """Sleeps in short steps and records how late each wake-up is."""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - start - interval)
+
+
+async def _run(label: str, extract, paths: list) -> None:
+    stop = asyncio.Event()
+    lags: list = [0.0]
+    ticker = asyncio.create_task(_ticker(stop, 0.005, lags))
+    await asyncio.sleep(0.01)
+
+    start = time.perf_counter()
+    texts = await asyncio.gather(*(extract(path) for path in paths))
+    wall_s = time.perf_counter() - start
+
+    stop.set()
+    await ticker
+    assert all(texts)
+    print(
+        f"{label:<8} files={len(paths):>3}  wall={wall_s:6.2f}s  "
+        f"max_loop_stall={max(lags) * 1000:7.1f}ms  chars={sum(len(t) for t in texts)}"
+    )
+
+
+async def _inline(path: str) -> str:
+    with open(path, "rb") as f:
+        return parse_resume_bytes(f.read(), ".pdf")
+
+
+async def main(args) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for i in range(args.files):
+            path = os.path.join(tmp, f"resume_{i}.pdf")
+            with open(path, "wb") as f:
+                f.write(make_pdf(_resume_pages(i, args.pages)))
+            paths.append(path)
+
+        extractor = ResumeTextExtractor(workers=args.workers, cache_dir=os.path.join(tmp, "cache"))
+        print(f"{args.files} PDFs x {args.pages} pages, {args.workers} parser processes")
+        await _run("inline", _inline, paths)
+        # Start the pool up front so process spawn isn't counted against the first run
+        await asyncio.get_running_loop().run_in_executor(extractor._get_pool(), parse_resume_bytes, b"", ".txt")
+        await _run("pool", extractor.extract, paths)
+        await _run("cached", extractor.extract, paths)
+        extractor.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=24, help="Resumes to extract concurrently")
+    parser.add_argument("--pages", type=int, default=4, help="Pages per generated resume")
+    parser.add_argument("--workers", type=int, default=2, help="Parser processes")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Benchmark API cold start per deployment role, with an import-time profile.
+
+Each run is a fresh interpreter (as on a newly scheduled pod) that imports
+main, runs the startup events and serves GET /health once. Runs use the
+SQLite database stand-in and a temporary task queue, so nothing external is
+contacted. Reported per role (API_ROLES), as medians over --runs:
+
+  import      import main (module imports plus router registration)
+  startup     startup events (inline task worker, scheduled jobs)
+  first       the first GET /health
+  routes      routes registered, and whether openai / supabase / pandas
+              were imported before the first request
+
+--profile ROLE prints `python -X importtime` totals for `import main` under
+that role: the slowest top-level packages and first-party modules.
+
+Usage: python scripts/bench_startup.py [--roles all public voice recruiter] [--runs 5]
+                                       [--profile all] [--top 20]
+"""
+import sys
+import os
+import argparse
+import json
+import statistics
+import subprocess
+import tempfile
+from collections import defaultdict
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+HEAVY_MODULES = ("openai", "supabase", "pandas", "pypdf")
+
+# Runs in the child interpreter; prints one JSON line
+PROBE = """
+import asyncio, json, sys, time
+t0 = time.perf_counter()
+import main
+t1 = time.perf_counter()
+import httpx
+
+async def serve():
+    await main.app.router.startup()
+    t2 = time.perf_counter()
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        status = (await client.get("/health")).status_code
+    t3 = time.perf_counter()
+    await main.app.router.shutdown()
+    return t2, t3, status
+
+t2, t3, status = asyncio.run(serve())
+print(json.dumps({
+    "import": t1 - t0, "startup": t2 - t1, "first": t3 - t2, "status": status,
+    "routes": len(main.app.routes),
+    "heavy": [m for m in %r if m in sys.modules],
+}))
+""" % (HEAVY_MODULES,)
+
+
+def _env(role: str, tmp: str) -> dict:
+    env = dict(os.environ)
+    env.update({
+        "API_ROLES": role,
+        "DB_BACKEND": "local",
+        "TASK_QUEUE_DB_PATH": os.path.join(tmp, "task_queue.db"),
+    })
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    return env
+
+
+def _probe(role: str, tmp: str) -> dict:
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE], cwd=BACKEND_DIR, env=_env(role, tmp),
+        capture_output=True, text=True, check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def bench(roles, runs: int) -> None:
+    print(f"{'role':<12}{'import ms':>10}{'startup ms':>12}{'first ms':>10}{'total ms':>10}{'routes':>8}  heavy imports")
+    for role in roles:
+        with tempfile.TemporaryDirectory() as tmp:
+            _probe(role, tmp)  # warm the bytecode cache so runs compare imports, not compiles
+            samples = [_probe(role, tmp) for _ in range(runs)]
+        med = {k: statistics.median(s[k] for s in samples) * 1000 for k in ("import", "startup", "first")}
+        total = med["import"] + med["startup"] + med["first"]
+        heavy = ", ".join(samples[-1]["heavy"]) or "-"
+        print(f"{role:<12}{med['import']:>10.0f}{med['startup']:>12.0f}{med['first']:>10.1f}{total:>10.0f}"
+              f"{samples[-1]['routes']:>8}  {heavy}")
+
+
+def profile(role: str, top: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", "import main"], cwd=BACKEND_DIR,
+            env=_env(role, tmp), capture_output=True, text=True, check=True,
+        )
+
+    packages = defaultdict(int)  # top-level package -> cumulative us of its outermost imports
+    first_party = []
+    main_self = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|")
+            self_us, cumulative_us = int(self_us), int(cumulative_us)
+        except ValueError:
+            continue  # header line
+        depth = (len(name) - len(name.lstrip())) // 2
+        name = name.strip()
+        if name == "main":
+            main_self = self_us
+            continue
+        root = name.split(".")[0]
+        if root in ("routers", "services", "repositories", "middleware", "models", "db", "config"):
+            first_party.append((cumulative_us, name))
+        elif depth <= 1:
+            packages[root] += cumulative_us
+
+    print(f"\nimport main under API_ROLES={role}: main's own body (router registration) {main_self / 1000:.0f} ms")
+    print("\nSlowest third-party packages (cumulative ms):")
+    for name, us in sorted(packages.items(), key=lambda kv: kv[1], reverse=True)[:top]:
+        print(f"  {us / 1000:>8.1f}  {name}")
+    print("\nSlowest first-party modules (cumulative ms, includes what they import):")
+    for us, name in sorted(first_party, reverse=True)[:top]:
+        print(f"  {us / 1000:>8.1f}  {name}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--roles", nargs="+", default=["all", "public", "voice", "recruiter"])
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per role")
+    parser.add_argument("--profile", default=None, metavar="ROLE", help="Also print an import-time profile for this role")
+    parser.add_argument("--top", type=int, default=15, help="Rows per profile table")
+    args = parser.parse_args()
+
+    bench(args.roles, args.runs)
+    if args.profile:
+        profile(args.profile, args.top)
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Benchmark Vapi tool-call webhook latency for voice ingest.
+
+Replays a realistic sequence of tool calls against /vapi-webhook with the
+local JSON repository, once with the session cache disabled (every call
+re-reads and re-writes the profile on disk) and once with write-behind on.
+
+Usage: python scripts/bench_voice_ingest_tools.py [--profiles 50] [--calls 200]
+"""
+import sys
+import os
+import argparse
+import asyncio
+import shutil
+import statistics
+import tempfile
+import time
+import uuid
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("USE_SUPABASE", "false")
+
+from models.voice_ingest import JobProfile, CompanyIntelligence, HardRequirements
+from repositories.job_profile_local import LocalJobProfileRepository
+from services.profile_cache import profile_cache
+from routers import voice_ingest
+
+
+TOOL_SEQUENCE = [
+    ("update_job_title", {"job_title": "Senior Backend Engineer"}),
+    ("update_location", {"location_type": "hybrid", "city": "San Francisco", "onsite_days": 3}),
+    ("update_experience", {"min_years": 5, "max_years": 10}),
+    ("update_compensation", {"salary_min": 180000, "salary_max": 230000, "equity_offered": True}),
+    ("add_trait", {"name": "Distributed Systems", "description": "Built systems at scale", "signals": ["Kafka"]}),
+    ("capture_nuance", {"category": "culture", "insight": "Team values async written communication"}),
+    ("add_deal_breaker", {"deal_breaker": "No remote-only candidates"}),
+    ("get_missing_fields", {}),
+]
+
+
+def _payload(session_id: str, tool_name: str, args: dict) -> dict:
+    return {
+        "message": {
+            "type": "tool-calls",
+            "call": {"metadata": {"sessionId": session_id}},
+            "toolCalls": [{
+                "id": str(uuid.uuid4()),
+                "function": {"name": tool_name, "arguments": args},
+            }],
+        }
+    }
+
+
+async def _seed(repo: LocalJobProfileRepository, count: int) -> str:
+    session_id = None
+    for i in range(count):
+        profile = JobProfile(
+            id=str(uuid.uuid4()),
+            recruiter_first_name="Bench",
+            recruiter_last_name=f"User{i}",
+            company=CompanyIntelligence(
+                name=f"Company {i}",
+                website=f"https://company{i}.example.com",
+                interesting_facts=["Fact " * 40] * 10,
+                tech_stack_hints=["Python", "Go", "Postgres", "Kafka"] * 5,
+            ),
+            requirements=HardRequirements(),
+        )
+        await repo.create(profile)
+        session_id = profile.id
+    return session_id
+
+
+async def _run(repo: LocalJobProfileRepository, session_id: str, calls: int, enabled: bool) -> list:
+    profile_cache.repo = repo
+    profile_cache.enabled = enabled
+    latencies = []
+    for i in range(calls):
+        tool_name, args = TOOL_SEQUENCE[i % len(TOOL_SEQUENCE)]
+        start = time.perf_counter()
+        await voice_ingest.vapi_webhook(_payload(session_id, tool_name, args))
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    end_start = time.perf_counter()
+    await voice_ingest.vapi_webhook({
+        "message": {"type": "end-of-call-report", "call": {"metadata": {"sessionId": session_id}}}
+    })
+    print(f"    end-of-call flush: {(time.perf_counter() - end_start) * 1000:.1f}ms")
+    return latencies
+
+
+def _report(label: str, latencies: list) -> None:
+    ordered = sorted(latencies)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    print(f"  {label:<22} p50={statistics.median(ordered):7.2f}ms  p95={p95:7.2f}ms  max={ordered[-1]:7.2f}ms")
+
+
+async def main(profiles: int, calls: int) -> None:
+    data_dir = tempfile.mkdtemp(prefix="bench_voice_ingest_")
+    try:
+        repo = LocalJobProfileRepository(data_dir=data_dir)
+        session_id = await _seed(repo, profiles)
+        size_kb = sum(f.stat().st_size for f in repo.profiles_dir.glob("*.json")) / 1024
+        print(f"Seeded {profiles} profiles ({size_kb:.0f} KB), replaying {calls} tool calls\n")
+
+        print("  write-through (cache disabled)")
+        before = await _run(repo, session_id, calls, enabled=False)
+        print("  write-behind (cache enabled)")
+        after = await _run(repo, session_id, calls, enabled=True)
+
+        print()
+        _report("write-through", before)
+        _report("write-behind", after)
+        speedup = statistics.median(before) / max(statistics.median(after), 1e-6)
+        print(f"\n  p50 speedup: {speedup:.1f}x")
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--profiles", type=int, default=50)
+    parser.add_argument("--calls", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.profiles, args.calls))
@@ -0,0 +1,461 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the OpenRouter chat completions API.
+
+Answers POST /chat/completions with JSON shaped for the prompt that was sent,
+so AI pipelines can run end to end without spending tokens:
+
+- Structured-output calls (response_format json_schema, as sent by
+  client.beta.chat.completions.parse) get an object synthesized from the
+  schema. Packed screening answers every "=== CANDIDATE <ref> ===" in the
+  prompt.
+- json_object calls get the JSON template embedded in the prompt ("Return a
+  JSON object with this exact structure: {...}") filled in: placeholders such
+  as <0-100>, true/false and "number or null" become values, comments and
+  "a" or "b" alternatives are dropped. Transcript parsing returns one turn
+  per speaker line of the transcript.
+
+Latency is drawn from a distribution (fixed, uniform, normal or lognormal, in
+ms) plus a per-output-token cost. Rate limiting is simulated with a 429 rate
+and/or a concurrency cap. GET /stats reports calls per prompt family.
+
+Point the backend at it with OPENROUTER_BASE_URL=http://127.0.0.1:8787.
+
+Usage: python scripts/mock_openrouter.py [--port 8787] [--latency lognormal:800:0.5]
+                                         [--ms-per-token 2] [--rate-429 0.05] [--max-concurrency 50]
+"""
+import sys
+import os
+import argparse
+import asyncio
+import json
+import random
+import re
+import socket
+import threading
+import time
+import uuid
+from collections import Counter
+from typing import Any, List, Optional, Tuple
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+# Prompt families, matched in order against the system + user messages
+PROMPT_FAMILIES = [
+    ("screening_packed", "== CANDIDATES TO SCREEN"),
+    ("screening", "comprehensive candidate screening"),
+    ("pluto_extraction", "Analyze this LinkedIn profile"),
+    ("pluto_scoring", "expert executive recruiter evaluating candidates"),
+    ("pluto_deep_analytics", "post-interview analysis"),
+    ("transcript_parse", "## Raw Transcript:"),
+    ("interview_analytics", "competency_scores"),
+    ("jd_extraction", "job description"),
+    ("coach", "coach"),
+    ("prebrief", "pre-interview"),
+]
+
+_RANGE = re.compile(r"(-?\d+(?:\.\d+)?)\s*-\s*(-?\d+(?:\.\d+)?)")
+_NUMBER = re.compile(r"^-?\d+(\.\d+)?$")
+_SPEAKER_LINE = re.compile(r"^\s*(?:\[[\d:]+\]\s*)?([A-Za-z][\w .'-]{0,40}):\s+(.+)$")
+_CANDIDATE_HEADER = re.compile(r"=== CANDIDATE (\S+) ===")
+
+
+class LatencyModel:
+    """Per-call delay: a base distribution in ms plus a cost per output token."""
+
+    def __init__(self, spec: str = "fixed:0", ms_per_token: float = 0.0, seed: Optional[int] = None):
+        kind, *params = spec.split(":")
+        if kind not in ("fixed", "uniform", "normal", "lognormal"):
+            raise ValueError(f"Unknown latency distribution: {kind}")
+        self.kind = kind
+        self.params = [float(p) for p in params]
+        self.ms_per_token = ms_per_token
+        self.rng = random.Random(seed)
+
+    def sample(self, output_tokens: int = 0) -> float:
+        """Seconds to wait before answering."""
+        p = self.params
+        if self.kind == "fixed":
+            base = p[0] if p else 0.0
+        elif self.kind == "uniform":
+            base = self.rng.uniform(p[0], p[1])
+        elif self.kind == "normal":
+            base = max(0.0, self.rng.gauss(p[0], p[1]))
+        else:  # lognormal: median, sigma
+            base = p[0] * self.rng.lognormvariate(0.0, p[1] if len(p) > 1 else 0.5)
+        return (base + self.ms_per_token * output_tokens) / 1000
+
+
+# ============================================================================
+# Response synthesis
+# ============================================================================
+
+def _options_from_description(description: str) -> Optional[List[str]]:
+    """'Strong Fit, Good Fit, or Not a Fit' -> the three options."""
+    parts = [p.strip(" .") for p in re.split(r",\s*(?:or\s+)?|\s+or\s+", description or "")]
+    if len(parts) >= 2 and all(p and len(p.split()) <= 3 and p[0].isupper() for p in parts):
+        return parts
+    return None
+
+
+def synthesize_from_schema(schema: dict, rng: random.Random, prompt: str = "") -> Any:
+    """Build a value that validates against a (pydantic-generated) JSON schema."""
+    defs = schema.get("$defs", {})
+
+    def build(node: dict, name: str = "") -> Any:
+        if "$ref" in node:
+            node = defs[node["$ref"].split("/")[-1]]
+        if "enum" in node:
+            return rng.choice(node["enum"])
+        if "const" in node:
+            return node["const"]
+        for key in ("anyOf", "oneOf"):
+            if key in node:
+                options = [o for o in node[key] if o.get("type") != "null"]
+                return build(options[0] if options else node[key][0], name)
+
+        kind = node.get("type")
+        if isinstance(kind, list):
+            kind = next((k for k in kind if k != "null"), "null")
+        if kind == "object" or "properties" in node:
+            props = node.get("properties", {})
+            if name == "" and "results" in props:
+                item = props["results"].get("items", {})
+                item = defs[item["$ref"].split("/")[-1]] if "$ref" in item else item
+                if "candidate_ref" in item.get("properties", {}):
+                    return {"results": [
+                        {**build(item, "results"), "candidate_ref": ref}
+                        for ref in _CANDIDATE_HEADER.findall(prompt)
+                    ]}
+            return {k: build(v, k) for k, v in props.items()}
+        if kind == "array":
+            count = max(node.get("minItems", 0), rng.randint(1, 3))
+            return [build(node.get("items", {}), name) for _ in range(count)]
+        if kind == "integer":
+            return rng.randint(int(node.get("minimum", 0)), int(node.get("maximum", 100 if "score" in name else 10)))
+        if kind == "number":
+            low, high = node.get("minimum", 0.0), node.get("maximum", 1.0)
+            return round(rng.uniform(low, high), 2)
+        if kind == "boolean":
+            return rng.random() < 0.2
+        if kind == "null":
+            return None
+        options = _options_from_description(node.get("description", ""))
+        if options:
+            return rng.choice(options)
+        return f"Mock {(name or 'text').replace('_', ' ')}"
+
+    return build(schema)
+
+
+class _TemplateParser:
+    """Lenient parser for the JSON-ish response templates embedded in prompts."""
+
+    def __init__(self, text: str, rng: random.Random):
+        self.text = text
+        self.i = 0
+        self.rng = rng
+
+    def _skip(self) -> None:
+        while self.i < len(self.text):
+            if self.text[self.i].isspace():
+                self.i += 1
+            elif self.text.startswith("//", self.i):
+                end = self.text.find("\n", self.i)
+                self.i = len(self.text) if end < 0 else end
+            else:
+                return
+
+    def _junk(self) -> None:
+        """Skip to the next ',', '}' or ']' (drops comments and 'or "b"' alternatives)."""
+        while self.i < len(self.text) and self.text[self.i] not in ",}]":
+            if self.text[self.i] == '"':
+                self._string()
+            elif self.text.startswith("//", self.i):
+                self._skip()
+            else:
+                self.i += 1
+
+    def _string(self) -> str:
+        self.i += 1
+        out = []
+        while self.i < len(self.text) and self.text[self.i] != '"':
+            if self.text[self.i] == "\\" and self.i + 1 < len(self.text):
+                self.i += 1
+            out.append(self.text[self.i])
+            self.i += 1
+        self.i += 1
+        return "".join(out)
+
+    def _bare(self, token: str) -> Any:
+        token = token.strip()
+        lowered = token.lower()
+        if lowered.startswith("true"):
+            return self.rng.random() < 0.8 if "/" in lowered else True
+        if lowered.startswith("false"):
+            return False
+        if lowered == "null":
+            return None
+        if _NUMBER.match(token):
+            return float(token) if "." in token else int(token)
+        match = _RANGE.search(token)
+        if match:
+            low, high = float(match.group(1)), float(match.group(2))
+            return self.rng.randint(int(low), int(high)) if low.is_integer() and high.is_integer() else round(self.rng.uniform(low, high), 2)
+        if lowered.startswith(("number", "int", "float")):
+            return self.rng.randint(1, 10)
+        return token
+
+    def value(self) -> Any:
+        self._skip()
+        ch = self.text[self.i]
+        if ch == "{":
+            self.i += 1
+            obj = {}
+            while True:
+                self._skip()
+                start = self.i
+                if self.text[self.i] == "}":
+                    self.i += 1
+                    return obj
+                if self.text[self.i] == '"':
+                    key = self._string()
+                    self._skip()
+                    if self.text[self.i] != ":":
+                        raise ValueError("Expected ':'")
+                    self.i += 1
+                    obj[key] = self.value()
+                self._junk()
+                if self.text[self.i] == ",":
+                    self.i += 1
+                elif self.i == start:
+                    raise ValueError(f"Unexpected {self.text[self.i]!r}")
+        if ch == "[":
+            self.i += 1
+            items = []
+            while True:
+                self._skip()
+                start = self.i
+                if self.text[self.i] == "]":
+                    self.i += 1
+                    return items
+                if not self.text.startswith("...", self.i):
+                    items.append(self.value())
+                self._junk()
+                if self.text[self.i] == ",":
+                    self.i += 1
+                elif self.i == start:
+                    raise ValueError(f"Unexpected {self.text[self.i]!r}")
+        if ch == '"':
+            return self._string()
+        if ch == "<":
+            end = self.text.index(">", self.i)
+            token, self.i = self.text[self.i + 1:end], end + 1
+            return self._bare(token) if _RANGE.search(token) or token.lower().startswith(("number", "true")) else token
+        start = self.i
+        while self.i < len(self.text) and self.text[self.i] not in ",}]\n":
+            self.i += 1
+        return self._bare(self.text[start:self.i])
+
+
+def _top_level_blocks(text: str) -> List[str]:
+    blocks, depth, start = [], 0, 0
+    for i, ch in enumerate(text):
+        if ch == "{":
+            if depth == 0:
+                start = i
+            depth += 1
+        elif ch == "}" and depth:
+            depth -= 1
+            if depth == 0:
+                blocks.append(text[start:i + 1])
+    return blocks
+
+
+def fill_template(prompt: str, rng: random.Random) -> Optional[dict]:
+    """Fill in the last JSON template of a prompt, or None if it has none."""
+    for block in reversed(_top_level_blocks(prompt)):
+        try:
+            value = _TemplateParser(block, rng).value()
+        except (ValueError, IndexError):
+            continue
+        if isinstance(value, dict) and value:
+            return value
+    return None
+
+
+def parse_transcript_turns(prompt: str) -> dict:
+    """Answer a transcript parsing prompt with one turn per speaker line."""
+    transcript = prompt.split("## Raw Transcript:", 1)[-1].split("Respond with a JSON object", 1)[0]
+    # Exports often start with a "Candidate: ... / Interviewer: ..." header block
+    header, _, body = transcript.partition("\n---")
+    if not body:
+        header, body = "", transcript
+    names = {
+        m.group(1).strip().lower(): m.group(2).split("(")[0].strip()
+        for m in map(_SPEAKER_LINE.match, header.splitlines()) if m
+    }
+
+    candidate_labels = {"candidate", *names.get("candidate", "").lower().split()[:1]}
+    if len(candidate_labels) == 1:
+        # No known candidate name: anyone not labelled as an interviewer answers
+        candidate_labels = {
+            m.group(1).strip().lower() for m in map(_SPEAKER_LINE.match, body.splitlines())
+            if m and "interviewer" not in m.group(1).lower()
+        }
+
+    turns = []
+    for line in body.splitlines():
+        match = _SPEAKER_LINE.match(line)
+        if match:
+            label, text = match.group(1).strip(), match.group(2).strip()
+            role = "candidate" if label.lower() in candidate_labels else "interviewer"
+            turns.append({
+                "speaker": role,
+                "speaker_name": None if label.isupper() else label,
+                "text": text,
+                "is_question": role == "interviewer" and text.rstrip().endswith("?"),
+                "cleaned_text": None,
+            })
+        elif turns and line.strip():
+            turns[-1]["text"] += "\n" + line.strip()
+    return {
+        "turns": turns,
+        "interviewer_name": names.get("interviewer") or names.get("interviewers"),
+        "candidate_name": names.get("candidate"),
+        "parsing_notes": None,
+    }
+
+
+def classify_prompt(text: str) -> str:
+    lowered = text.lower()
+    for family, marker in PROMPT_FAMILIES:
+        if marker.lower() in lowered:
+            return family
+    return "other"
+
+
+def build_content(body: dict, rng: random.Random) -> Tuple[str, str]:
+    """Return (prompt family, message content) for a chat completion request."""
+    messages = body.get("messages", [])
+    text = "\n".join(m.get("content") or "" for m in messages if isinstance(m.get("content"), str))
+    prompt = next((m.get("content") or "" for m in reversed(messages) if m.get("role") == "user"), text)
+    family = classify_prompt(text)
+    response_format = body.get("response_format") or {}
+
+    if response_format.get("type") == "json_schema":
+        schema = response_format.get("json_schema", {}).get("schema", {})
+        return family, json.dumps(synthesize_from_schema(schema, rng, prompt))
+    if family == "transcript_parse":
+        return family, json.dumps(parse_transcript_turns(prompt))
+
+    data = fill_template(prompt, rng)
+    if data is None:
+        data = {} if response_format.get("type") == "json_object" else None
+    return family, json.dumps(data) if data is not None else "Mock response."
+
+
+# ============================================================================
+# Server
+# ============================================================================
+
+def create_app(
+    latency: Optional[LatencyModel] = None,
+    rate_429: float = 0.0,
+    max_concurrency: int = 0,
+    seed: Optional[int] = None,
+) -> FastAPI:
+    """Build the mock API. State and counters live on app.state."""
+    app = FastAPI(title="Mock OpenRouter")
+    app.state.latency = latency or LatencyModel()
+    app.state.rng = random.Random(seed)
+    app.state.in_flight = 0
+    app.state.stats = Counter()
+
+    def rate_limited(reason: str) -> JSONResponse:
+        app.state.stats["429"] += 1
+        return JSONResponse(
+            status_code=429,
+            headers={"Retry-After": "1"},
+            content={"error": {"message": f"Rate limit exceeded: {reason}", "code": 429}},
+        )
+
+    @app.post("/chat/completions")
+    @app.post("/api/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        if max_concurrency and app.state.in_flight >= max_concurrency:
+            return rate_limited("too many concurrent requests")
+        if rate_429 and app.state.rng.random() < rate_429:
+            return rate_limited("injected")
+
+        app.state.in_flight += 1
+        try:
+            family, content = build_content(body, app.state.rng)
+            prompt_tokens = sum(len(m.get("content") or "") for m in body.get("messages", [])) // 4
+            completion_tokens = len(content) // 4
+            await asyncio.sleep(app.state.latency.sample(completion_tokens))
+        finally:
+            app.state.in_flight -= 1
+
+        app.state.stats[family] += 1
+        app.state.stats["prompt_tokens"] += prompt_tokens
+        app.state.stats["completion_tokens"] += completion_tokens
+        return {
+            "id": f"gen-mock-{uuid.uuid4().hex[:12]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "mock"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content, "refusal": None},
+                "finish_reason": "stop",
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        }
+
+    @app.get("/stats")
+    async def stats():
+        return dict(app.state.stats)
+
+    return app
+
+
+def start_mock_server(app: FastAPI, port: int = 0):
+    """Serve app on 127.0.0.1 in a daemon thread. Returns (base_url, uvicorn server)."""
+    import uvicorn
+
+    if not port:
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return f"http://127.0.0.1:{port}", server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--latency", default="lognormal:800:0.5",
+                        help="fixed:MS | uniform:LO:HI | normal:MEAN:SD | lognormal:MEDIAN:SIGMA")
+    parser.add_argument("--ms-per-token", type=float, default=2.0, help="Extra latency per output token")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="Fraction of requests answered with 429")
+    parser.add_argument("--max-concurrency", type=int, default=0, help="Answer 429 above this many in-flight calls")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    import uvicorn
+    app = create_app(LatencyModel(args.latency, args.ms_per_token, args.seed), args.rate_429, args.max_concurrency, args.seed)
+    print(f"Mock OpenRouter on http://127.0.0.1:{args.port} (set OPENROUTER_BASE_URL to this)")
+    uvicorn.run(app, host="127.0.0.1", port=args.port, log_level="warning")
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Run the backend locally as separate processes, one per role.
+
+Starts `serve.py api`, `serve.py realtime` and --workers `serve.py worker`
+processes sharing the same .env and task queue, then serves a front door on
+--port that sends each request (and WebSocket) to the process that owns it,
+so the frontend keeps using a single http://localhost:8000. Requests matching
+a realtime route (voice ingest, Vapi interviews, rooms, coach, prebrief and
+every webhook) go to the realtime process; everything else to the api process.
+
+Child output is prefixed with the process name. Ctrl-C stops everything, as
+does any child exiting.
+
+Usage: python scripts/run_local.py [--port 8000] [--api-port 8010] [--realtime-port 8011]
+                                   [--workers 1] [--worker-concurrency 4]
+"""
+import sys
+import os
+import argparse
+import asyncio
+import subprocess
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from serve import ROLES, role_env  # noqa: E402
+
+# Not forwarded either way: they describe one connection, not the request
+HOP_BY_HOP = {b"connection", b"keep-alive", b"transfer-encoding", b"upgrade", b"host",
+              b"proxy-connection", b"te", b"trailer"}
+
+
+def realtime_routes() -> list:
+    """The routes the realtime role serves, to match incoming requests against."""
+    from fastapi import FastAPI
+    import main
+
+    app = FastAPI(openapi_url=None, docs_url=None, redoc_url=None)
+    main.include_routers(app, ROLES["realtime"].api_roles.split(","))
+    return app.routes
+
+
+class FrontDoor:
+    """ASGI app forwarding each request to the api or realtime process."""
+
+    def __init__(self, routes: list, api_url: str, realtime_url: str):
+        self.routes = routes
+        self.api_url = api_url
+        self.realtime_url = realtime_url
+        self.client = None
+
+    def upstream(self, scope) -> str:
+        from starlette.routing import Match
+
+        for route in self.routes:
+            match, _ = route.matches(scope)
+            if match != Match.NONE:
+                return self.realtime_url
+        return self.api_url
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        base = self.upstream(scope)
+        path = scope.get("raw_path") or scope["path"].encode()
+        target = (path + (b"?" + scope["query_string"] if scope["query_string"] else b"")).decode()
+        if scope["type"] == "http":
+            await self._proxy_http(scope, receive, send, base + target)
+        else:
+            await self._proxy_websocket(scope, receive, send, "ws" + base[len("http"):] + target)
+
+    async def _lifespan(self, receive, send):
+        import httpx
+
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                self.client = httpx.AsyncClient(timeout=None)
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self.client.aclose()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _proxy_http(self, scope, receive, send, url: str):
+        import httpx
+
+        body = b""
+        more_body = True
+        while more_body:
+            message = await receive()
+            body += message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+        headers = [(k, v) for k, v in scope["headers"] if k.lower() not in HOP_BY_HOP]
+        request = self.client.build_request(scope["method"], url, headers=headers, content=body)
+        try:
+            response = await self.client.send(request, stream=True)
+        except httpx.TransportError as e:
+            await send({"type": "http.response.start", "status": 502, "headers": [(b"content-type", b"text/plain")]})
+            await send({"type": "http.response.body", "body": f"Upstream unavailable: {e}\n".encode()})
+            return
+        try:
+            await send({
+                "type": "http.response.start",
+                "status": response.status_code,
+                "headers": [(k, v) for k, v in response.headers.raw if k.lower() not in HOP_BY_HOP],
+            })
+            async for chunk in response.aiter_raw():
+                await send({"type": "http.response.body", "body": chunk, "more_body": True})
+            await send({"type": "http.response.body", "body": b""})
+        finally:
+            await response.aclose()
+
+    async def _proxy_websocket(self, scope, receive, send, url: str):
+        import websockets
+
+        await receive()  # websocket.connect
+        try:
+            upstream = await websockets.connect(url, subprotocols=scope.get("subprotocols") or None)
+        except (OSError, websockets.WebSocketException):
+            await send({"type": "websocket.close", "code": 1011})
+            return
+        await send({"type": "websocket.accept", "subprotocol": upstream.subprotocol})
+
+        async def client_to_upstream():
+            while True:
+                message = await receive()
+                if message["type"] == "websocket.disconnect":
+                    return
+                await upstream.send(message["bytes"] if message.get("bytes") is not None else message["text"])
+
+        async def upstream_to_client():
+            try:
+                async for data in upstream:
+                    key = "bytes" if isinstance(data, bytes) else "text"
+                    await send({"type": "websocket.send", key: data})
+            except websockets.ConnectionClosed:
+                pass
+            await send({"type": "websocket.close", "code": upstream.close_code or 1000})
+
+        tasks = [asyncio.create_task(client_to_upstream()), asyncio.create_task(upstream_to_client())]
+        try:
+            await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await upstream.close()
+
+
+def _pipe(name: str, process: subprocess.Popen) -> None:
+    for line in process.stdout:
+        sys.stdout.write(f"{name:<10}| {line}")
+    sys.stdout.flush()
+
+
+def spawn(name: str, args: List[str]) -> subprocess.Popen:
+    env = {k: v for k, v in os.environ.items() if k not in role_env("realtime")}
+    env["PYTHONUNBUFFERED"] = "1"
+    process = subprocess.Popen(
+        [sys.executable, "serve.py", *args], cwd=BACKEND_DIR, env=env,
+        stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True,
+    )
+    threading.Thread(target=_pipe, args=(name, process), daemon=True).start()
+    return process
+
+
+def wait_healthy(urls: List[str], processes: Dict[str, subprocess.Popen], timeout: float = 60.0) -> None:
+    import httpx
+
+    deadline = time.monotonic() + timeout
+    pending = list(urls)
+    while pending:
+        for name, process in processes.items():
+            if process.poll() is not None:
+                raise SystemExit(f"{name} exited with code {process.returncode} during startup")
+        if time.monotonic() > deadline:
+            raise SystemExit(f"Timed out waiting for {', '.join(pending)}")
+        try:
+            if httpx.get(pending[0] + "/health", timeout=1.0).status_code == 200:
+                pending.pop(0)
+                continue
+        except httpx.TransportError:
+            pass
+        time.sleep(0.2)
+
+
+def main(args) -> None:
+    import uvicorn
+
+    api_url = f"http://127.0.0.1:{args.api_port}"
+    realtime_url = f"http://127.0.0.1:{args.realtime_port}"
+    processes = {
+        "api": spawn("api", ["api", "--port", str(args.api_port)]),
+        "realtime": spawn("realtime", ["realtime", "--port", str(args.realtime_port)]),
+    }
+    for i in range(args.workers):
+        worker_args = ["worker"] + (["--concurrency", str(args.worker_concurrency)] if args.worker_concurrency else [])
+        processes[f"worker-{i + 1}"] = spawn(f"worker-{i + 1}", worker_args)
+
+    server = None
+    try:
+        wait_healthy([api_url, realtime_url], processes)
+        app = FrontDoor(realtime_routes(), api_url, realtime_url)
+        server = uvicorn.Server(uvicorn.Config(app, host="0.0.0.0", port=args.port, log_level="warning"))
+
+        def watch():
+            while not server.should_exit:
+                for name, process in processes.items():
+                    if process.poll() is not None:
+                        print(f"{name} exited with code {process.returncode}; stopping")
+                        server.should_exit = True
+                time.sleep(0.5)
+
+        threading.Thread(target=watch, daemon=True).start()
+        print(f"Serving on http://localhost:{args.port} (api {api_url}, realtime {realtime_url}, "
+              f"{args.workers} worker process(es))")
+        server.run()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if server is not None:
+            server.should_exit = True
+        for process in processes.values():
+            if process.poll() is None:
+                process.terminate()
+        for process in processes.values():
+            try:
+                process.wait(timeout=15)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+
+if __name__ == "__main__":
+    # This process imports main only to match realtime routes; children get their own role
+    os.environ.update(role_env("realtime"))
+    import config
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8000, help="Front door port (what the frontend calls)")
+    parser.add_argument("--api-port", type=int, default=8010)
+    parser.add_argument("--realtime-port", type=int, default=8011)
+    parser.add_argument("--workers", type=int, default=config.WORKER_PROCESSES, help="Task worker processes")
+    parser.add_argument("--worker-concurrency", type=int, default=None, help="Tasks at once per worker process")
+    main(parser.parse_args())
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Common entry point for the backend's process roles.
+
+  api       CRUD, uploads, dashboards and public career pages
+  realtime  live-call traffic: voice ingest (incl. /ws), Vapi interviews,
+            rooms, coach, prebrief, and every Vapi webhook
+  worker    queued screening, resume, JD extraction and analytics tasks
+  all       everything in one process with an inline task worker (development)
+
+All roles read the same config (.env); each has its own port, process count
+and connection limit (API_*, REALTIME_*, TASK_WORKER_CONCURRENCY). The api and
+realtime roles never run queued tasks themselves, so a large CSV upload is
+screened by the workers rather than next to live calls. Route realtime paths
+(see ROLES) to the realtime role and everything else to the api role;
+scripts/run_local.py does this locally.
+
+Anything but a single `all` process shares per-process state through SQLite
+files in backend/data, so every process must run on the same host:
+Idempotency-Key claims, and invalidations of the job analytics, offer-prep
+and ownership caches. A write in one process (e.g. post-call analytics in a
+worker) reaches the others' caches within CACHE_INVALIDATION_POLL_INTERVAL
+(1 s); the caches' TTLs only bound staleness if that is turned off (see the
+MULTI_PROCESS note in config.py).
+
+Usage: python serve.py api|realtime|worker|all [--port 8000] [--workers 2] [--reload]
+       python serve.py worker [--concurrency 4] [--kinds screening application]
+"""
+import argparse
+import asyncio
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class ProcessRole:
+    """An HTTP process role: the API_ROLES it serves and where its settings live."""
+    api_roles: str
+    settings_prefix: Optional[str]  # API / REALTIME -> <prefix>_PORT, _WORKERS, _LIMIT_CONCURRENCY
+    task_worker_mode: str
+
+
+ROLES = {
+    "api": ProcessRole("recruiter,public", "API", "external"),
+    "realtime": ProcessRole("voice,webhooks", "REALTIME", "external"),
+    "all": ProcessRole("all", None, "inline"),
+}
+
+
+def role_env(role: str) -> dict:
+    """Environment overrides that make main.py serve a process role."""
+    spec = ROLES[role]
+    return {"API_ROLES": spec.api_roles, "TASK_WORKER_MODE": spec.task_worker_mode}
+
+
+def serve_http(role: str, port: Optional[int], workers: Optional[int], reload: bool) -> None:
+    prefix = ROLES[role].settings_prefix or "API"
+    # Before config is imported, so main.py (and uvicorn's worker processes) see the
+    # role and process count (which decide whether per-process state is shared)
+    os.environ.update(role_env(role))
+    if workers and not reload:
+        os.environ[f"{prefix}_WORKERS"] = str(workers)
+    import config
+    import uvicorn
+
+    limit = getattr(config, f"{prefix}_LIMIT_CONCURRENCY")
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=port or getattr(config, f"{prefix}_PORT"),
+        workers=None if reload else (workers or getattr(config, f"{prefix}_WORKERS")),
+        limit_concurrency=limit or None,
+        reload=reload,
+    )
+
+
+def serve_worker(concurrency: Optional[int], kinds: list) -> None:
+    import worker  # before config: it marks this process as the external task worker
+    import config
+
+    asyncio.run(worker.main(concurrency or config.TASK_WORKER_CONCURRENCY, kinds))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("role", choices=[*ROLES, "worker"])
+    parser.add_argument("--port", type=int, default=None, help="HTTP roles; defaults to <ROLE>_PORT")
+    parser.add_argument("--workers", type=int, default=None, help="HTTP roles; uvicorn processes, defaults to <ROLE>_WORKERS")
+    parser.add_argument("--reload", action="store_true", help="HTTP roles; restart on code changes (single process)")
+    parser.add_argument("--concurrency", type=int, default=None, help="worker; tasks at once, defaults to TASK_WORKER_CONCURRENCY")
+    parser.add_argument("--kinds", nargs="*", default=[], help="worker; only run these task kinds")
+    args = parser.parse_args()
+
+    if args.role == "worker":
+        serve_worker(args.concurrency, args.kinds)
+    else:
+        serve_http(args.role, args.port, args.workers, args.reload)
@@ -1,21 +1,32 @@
 # Services package
+#
+# Names below are imported on first access (PEP 562), so importing one service
+# module doesn't load the company research pipeline and its dependencies.
 
-from .parallel_ai import ParallelAIService, parallel_service
-from .company_extractor import CompanyExtractor, company_extractor
-from .research_pipeline import research_company, research_company_with_fallback, quick_research
-from .jd_extractor import JDExtractor, jd_extractor
-from .smart_questions import generate_smart_questions, generate_gap_fill_questions
+import importlib
 
-__all__ = [
-    "ParallelAIService",
-    "parallel_service",
-    "CompanyExtractor",
-    "company_extractor",
-    "research_company",
-    "research_company_with_fallback",
-    "quick_research",
-    "JDExtractor",
-    "jd_extractor",
-    "generate_smart_questions",
-    "generate_gap_fill_questions",
-]
+_EXPORTS = {
+    "ParallelAIService": ".parallel_ai",
+    "parallel_service": ".parallel_ai",
+    "CompanyExtractor": ".company_extractor",
+    "company_extractor": ".company_extractor",
+    "CompanyIntelCache": ".company_intel_cache",
+    "company_intel_cache": ".company_intel_cache",
+    "normalize_company_domain": ".company_intel_cache",
+    "research_company": ".research_pipeline",
+    "research_company_with_fallback": ".research_pipeline",
+    "quick_research": ".research_pipeline",
+    "JDExtractor": ".jd_extractor",
+    "jd_extractor": ".jd_extractor",
+    "generate_smart_questions": ".smart_questions",
+    "generate_gap_fill_questions": ".smart_questions",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(module, __name__), name)
@@ -3,11 +3,246 @@ Access Control Service - Organization-based access verification.
 
 Phase 4: Provides helper functions to verify that resources belong
 to the authenticated user's organization.
+
+Ownership (job, candidate or interview id -> organization id) is resolved by
+OwnershipResolver, which selects only the id and org columns, batches lookups
+for list views and caches the answer with a TTL. Jobs, candidates and
+interviews never change organization, so entries only need dropping when the
+entity is deleted or archived, which services/cache_invalidation.py passes on
+to the other processes on the host. Inside ownership_scope() (one per request, see
+OwnershipScopeMiddleware) results are also memoised, so a request never repeats
+the same check even with the cache disabled.
 """
 
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterable, List, Optional, Tuple
 from uuid import UUID
+
 from fastapi import HTTPException, status
+
+from config import OWNERSHIP_CACHE_TTL, OWNERSHIP_CACHE_SIZE
 from db.client import get_db
+from services.cache_invalidation import invalidation_log
+
+JOB = "job"
+CANDIDATE = "candidate"
+INTERVIEW = "interview"
+
+# Per-request memo of (kind, id) -> org id (None = not found); see ownership_scope()
+_request_memo: ContextVar[Optional[Dict[Tuple[str, str], Optional[str]]]] = ContextVar(
+    "ownership_request_memo", default=None
+)
+
+
+@contextmanager
+def ownership_scope():
+    """Memoise ownership lookups for the duration of the block (one request)."""
+    token = _request_memo.set({})
+    try:
+        yield
+    finally:
+        _request_memo.reset(token)
+
+
+class OwnershipResolver:
+    """Bounded, TTL'd entity -> organization cache with batched lookups."""
+
+    def __init__(
+        self,
+        ttl: float = OWNERSHIP_CACHE_TTL,
+        max_entries: int = OWNERSHIP_CACHE_SIZE,
+        chunk_size: int = 200,
+        channel: Optional[str] = None,
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.chunk_size = chunk_size
+        # (kind, id) -> (stored_at, org_id, job_id); job_id lets a job's children be dropped with it
+        self._owners: "OrderedDict[Tuple[str, str], Tuple[float, str, Optional[str]]]" = OrderedDict()
+        # Lookups run in worker threads via asyncio.to_thread
+        self._lock = threading.Lock()
+        # Invalidations are shared with other processes under this name
+        self._channel = channel
+        self._invalidations = invalidation_log if channel else None
+        if channel:
+            self._invalidations.subscribe(channel, self)
+
+    def org_id(self, kind: str, entity_id) -> Optional[str]:
+        """Organization owning an entity, or None if it doesn't exist."""
+        return self.org_ids(kind, [entity_id]).get(str(entity_id))
+
+    def org_ids(self, kind: str, entity_ids: Iterable) -> Dict[str, str]:
+        """Map each existing entity id to its organization id (missing ids are left out)."""
+        ids = list(dict.fromkeys(str(i) for i in entity_ids))
+        memo = _request_memo.get()
+        found: Dict[str, str] = {}
+        missing = []
+
+        for entity_id in ids:
+            if memo is not None and (kind, entity_id) in memo:
+                if memo[(kind, entity_id)]:
+                    found[entity_id] = memo[(kind, entity_id)]
+                continue
+            cached = self._get(kind, entity_id)
+            if cached:
+                found[entity_id] = cached
+            else:
+                missing.append(entity_id)
+
+        if missing:
+            fetched = self._fetch(kind, missing)
+            for entity_id, (org_id, job_id) in fetched.items():
+                self.remember(kind, entity_id, org_id, job_id)
+                found[entity_id] = org_id
+
+        if memo is not None:
+            for entity_id in ids:
+                memo[(kind, entity_id)] = found.get(entity_id)
+        return found
+
+    def remember(self, kind: str, entity_id, org_id, job_id=None) -> None:
+        """Record an ownership learned elsewhere (e.g. from a row already loaded)."""
+        if self.ttl <= 0 or not org_id:
+            return
+        key = (kind, str(entity_id))
+        with self._lock:
+            self._owners[key] = (time.time(), str(org_id), str(job_id) if job_id else None)
+            self._owners.move_to_end(key)
+            while len(self._owners) > self.max_entries:
+                self._owners.popitem(last=False)
+
+    def invalidate(self, kind: str, entity_id) -> None:
+        """Forget an entity; forgetting a job also forgets its candidates and interviews."""
+        entity_id = str(entity_id)
+        if self._invalidations:
+            self._invalidations.publish(self._channel, "invalidate", kind, entity_id)
+        with self._lock:
+            self._owners.pop((kind, entity_id), None)
+            if kind == JOB:
+                for key in [k for k, v in self._owners.items() if v[2] == entity_id]:
+                    del self._owners[key]
+        memo = _request_memo.get()
+        if memo is not None:
+            memo.clear()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._owners.clear()
+
+    def _get(self, kind: str, entity_id: str) -> Optional[str]:
+        if self.ttl <= 0:
+            return None
+        if self._invalidations:
+            self._invalidations.poll()
+        key = (kind, entity_id)
+        with self._lock:
+            cached = self._owners.get(key)
+            if cached is None:
+                return None
+            stored_at, org_id, _ = cached
+            if time.time() - stored_at >= self.ttl:
+                del self._owners[key]
+                return None
+            self._owners.move_to_end(key)
+            return org_id
+
+    def _fetch(self, kind: str, ids: List[str]) -> Dict[str, Tuple[str, Optional[str]]]:
+        """Look up (org_id, job_id) for uncached ids, one query per chunk."""
+        db = get_db()
+        owners: Dict[str, Tuple[str, Optional[str]]] = {}
+
+        for start in range(0, len(ids), self.chunk_size):
+            chunk = ids[start:start + self.chunk_size]
+
+            if kind == JOB:
+                rows = db.table("job_postings")\
+                    .select("id, organization_id")\
+                    .in_("id", chunk)\
+                    .execute().data or []
+                for row in rows:
+                    if row.get("organization_id"):
+                        owners[row["id"]] = (row["organization_id"], None)
+
+            elif kind == CANDIDATE:
+                rows = db.table("candidates")\
+                    .select("id, job_posting_id, job_postings!job_posting_id(organization_id)")\
+                    .in_("id", chunk)\
+                    .execute().data or []
+                for row in rows:
+                    org_id = (row.get("job_postings") or {}).get("organization_id")
+                    if org_id:
+                        owners[row["id"]] = (org_id, row.get("job_posting_id"))
+                        self.remember(JOB, row["job_posting_id"], org_id)
+
+            elif kind == INTERVIEW:
+                rows = db.table("interviews")\
+                    .select("id, candidate_id")\
+                    .in_("id", chunk)\
+                    .execute().data or []
+                candidate_ids = [row["candidate_id"] for row in rows if row.get("candidate_id")]
+                candidate_orgs = self.org_ids(CANDIDATE, candidate_ids)
+                for row in rows:
+                    org_id = candidate_orgs.get(str(row.get("candidate_id")))
+                    if org_id:
+                        owners[row["id"]] = (org_id, self._job_of(str(row["candidate_id"])))
+
+            else:
+                raise ValueError(f"Unknown ownership kind: {kind}")
+
+        return owners
+
+    def _job_of(self, candidate_id: str) -> Optional[str]:
+        with self._lock:
+            cached = self._owners.get((CANDIDATE, candidate_id))
+        return cached[2] if cached else None
+
+
+# Global instance
+ownership_resolver = OwnershipResolver(channel="ownership")
+
+
+def forget_owner(kind: str, entity_id) -> None:
+    """Drop a cached organization ownership after a delete or archive."""
+    ownership_resolver.invalidate(kind, entity_id)
+
+
+def _require(kind: str, entity_id, organization_id: UUID, detail: str) -> None:
+    if ownership_resolver.org_id(kind, entity_id) != str(organization_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=detail
+        )
+
+
+def require_job_access(job_id: UUID, organization_id: UUID) -> None:
+    """Raise 404 unless the job belongs to the organization (no row is loaded)."""
+    _require(JOB, job_id, organization_id, "Job not found")
+
+
+def require_candidate_access(candidate_id: UUID, organization_id: UUID) -> None:
+    """Raise 404 unless the candidate's job belongs to the organization."""
+    _require(CANDIDATE, candidate_id, organization_id, "Candidate not found")
+
+
+def require_interview_access(interview_id: UUID, organization_id: UUID) -> None:
+    """Raise 404 unless the interview's candidate belongs to the organization."""
+    _require(INTERVIEW, interview_id, organization_id, "Interview not found")
+
+
+def filter_accessible(kind: str, entity_ids: Iterable, organization_id: UUID) -> List[str]:
+    """
+    Keep only the ids that belong to the organization, in their original order.
+
+    Resolves the whole list in batched queries, for list views that would
+    otherwise check each row.
+    """
+    ids = [str(i) for i in entity_ids]
+    owners = ownership_resolver.org_ids(kind, ids)
+    return [i for i in ids if owners.get(i) == str(organization_id)]
 
 
 def verify_job_access(job_id: UUID, organization_id: UUID) -> dict:
@@ -24,6 +259,7 @@ def verify_job_access(job_id: UUID, organization_id: UUID) -> dict:
     Raises:
         HTTPException 404 if not found or doesn't belong to org
     """
+    require_job_access(job_id, organization_id)
     db = get_db()
 
     result = db.table("job_postings")\
@@ -33,6 +269,7 @@ def verify_job_access(job_id: UUID, organization_id: UUID) -> dict:
         .execute()
 
     if not result.data:
+        ownership_resolver.invalidate(JOB, job_id)
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Job not found"
@@ -55,30 +292,22 @@ def verify_candidate_access(candidate_id: UUID, organization_id: UUID) -> dict:
     Raises:
         HTTPException 404 if not found or doesn't belong to org
     """
+    require_candidate_access(candidate_id, organization_id)
     db = get_db()
 
-    # Get candidate with job info
     result = db.table("candidates")\
         .select("*, job_postings!job_posting_id(organization_id)")\
         .eq("id", str(candidate_id))\
         .execute()
 
     if not result.data:
+        ownership_resolver.invalidate(CANDIDATE, candidate_id)
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Candidate not found"
         )
 
-    candidate = result.data[0]
-    job = candidate.get("job_postings", {})
-
-    if job.get("organization_id") != str(organization_id):
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Candidate not found"
-        )
-
-    return candidate
+    return result.data[0]
 
 
 def verify_interview_access(interview_id: UUID, organization_id: UUID) -> dict:
@@ -95,34 +324,22 @@ def verify_interview_access(interview_id: UUID, organization_id: UUID) -> dict:
     Raises:
         HTTPException 404 if not found or doesn't belong to org
     """
+    require_interview_access(interview_id, organization_id)
     db = get_db()
 
-    # Get interview with candidate and job info
     result = db.table("interviews")\
         .select("*")\
         .eq("id", str(interview_id))\
         .execute()
 
     if not result.data:
+        ownership_resolver.invalidate(INTERVIEW, interview_id)
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Interview not found"
         )
 
-    interview = result.data[0]
-
-    # Get candidate to verify org access
-    candidate_id = interview.get("candidate_id")
-    if candidate_id:
-        try:
-            verify_candidate_access(UUID(candidate_id), organization_id)
-        except HTTPException:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Interview not found"
-            )
-
-    return interview
+    return result.data[0]
 
 
 def get_org_job_ids(organization_id: UUID) -> list:
@@ -142,4 +359,7 @@ def get_org_job_ids(organization_id: UUID) -> list:
         .eq("organization_id", str(organization_id))\
         .execute()
 
-    return [row["id"] for row in result.data]
+    job_ids = [row["id"] for row in result.data]
+    for job_id in job_ids:
+        ownership_resolver.remember(JOB, job_id, organization_id)
+    return job_ids
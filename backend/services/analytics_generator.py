@@ -13,7 +13,8 @@ import re
 from typing import Dict, Any, Optional, List
 from uuid import UUID
 
-from config import OPENROUTER_API_KEY, LLM_MODEL
+from config import OPENROUTER_API_KEY, OPENROUTER_BASE_URL, LLM_MODEL
+from services.telemetry import llm_event_hooks
 from models.streamlined.job import Job, ScoringCriteria
 from models.streamlined.candidate import Candidate
 from models.streamlined.interview import Interview
@@ -27,7 +28,7 @@ from repositories.streamlined.job_repo import JobRepository
 
 logger = logging.getLogger(__name__)
 
-OPENROUTER_URL = "https://openrouter.ai/api/v1/chat/completions"
+OPENROUTER_URL = f"{OPENROUTER_BASE_URL}/chat/completions"
 
 # Default competencies if job doesn't have specific ones
 DEFAULT_COMPETENCIES = [
@@ -191,7 +192,7 @@ async def call_llm_for_analytics(prompt: str, model: str = None) -> str:
         "X-Title": "Briefing Room Analytics",
     }
 
-    async with httpx.AsyncClient(timeout=120.0) as client:
+    async with httpx.AsyncClient(timeout=120.0, event_hooks=llm_event_hooks("interview_analytics")) as client:
         response = await client.post(
             OPENROUTER_URL,
             headers=headers,
@@ -223,7 +224,7 @@ def call_llm_for_analytics_sync(prompt: str, model: str = None) -> str:
         "X-Title": "Briefing Room Analytics",
     }
 
-    with httpx.Client(timeout=120.0) as client:
+    with httpx.Client(timeout=120.0, event_hooks=llm_event_hooks("interview_analytics", sync=True)) as client:
         response = client.post(
             OPENROUTER_URL,
             headers=headers,
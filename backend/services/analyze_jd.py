@@ -4,18 +4,15 @@ Analyzes a job description and extracts suggested extraction criteria.
 """
 import json
 import logging
-from openai import OpenAI
 from pydantic import BaseModel
 from typing import Optional
-from config import OPENROUTER_API_KEY, LLM_MODEL
+from config import LLM_MODEL
+from services.llm_clients import LazyOpenAIClient
 
 logger = logging.getLogger(__name__)
 
 # Use same client config as pluto_processor
-client = OpenAI(
-    base_url="https://openrouter.ai/api/v1",
-    api_key=OPENROUTER_API_KEY,
-)
+client = LazyOpenAIClient("jd_analysis", sync=True)
 
 ANALYZER_MODEL = LLM_MODEL  # Controlled via LLM_MODEL env var
 
@@ -8,17 +8,16 @@ Handles the processing of new public applications:
 4. Triggers AI screening and scoring
 """
 
-import os
 import logging
 from uuid import UUID
 import asyncio
-from typing import Optional
 
 from pydantic import BaseModel
 
 from repositories.streamlined.job_repo import JobRepository
 from repositories.streamlined.candidate_repo import CandidateRepository
 from services.resume_processor import extract_resume_data
+from services.resume_text import resume_text_extractor
 from services.candidate_screening import process_candidate_screening
 
 logger = logging.getLogger(__name__)
@@ -49,7 +48,7 @@ async def process_new_application(candidate_id: UUID, resume_path: str):
             return
 
         # 2. Extract Text from Resume
-        resume_text = await _extract_text_from_file(resume_path)
+        resume_text = await resume_text_extractor.extract(resume_path)
         
         if not resume_text:
             logger.warning(f"Failed to extract text from resume: {resume_path}")
@@ -105,46 +104,4 @@ async def process_new_application(candidate_id: UUID, resume_path: str):
 
     except Exception as e:
         logger.error(f"Error processing application {candidate_id}: {e}")
-
-
-async def _extract_text_from_file(file_path: str) -> Optional[str]:
-    """Read PDF or DOCX file and return text content."""
-    if not os.path.exists(file_path):
-        return None
-        
-    ext = os.path.splitext(file_path)[1].lower()
-    
-    try:
-        if ext == ".pdf":
-            return _extract_from_pdf(file_path)
-        elif ext in [".docx", ".doc"]:
-            return _extract_from_docx(file_path)
-        else:
-            # Try parsing as plain text
-            with open(file_path, "r", errors="ignore") as f:
-                return f.read()
-    except Exception as e:
-        logger.error(f"Text extraction failed for {file_path}: {e}")
-        return None
-
-def _extract_from_pdf(file_path: str) -> str:
-    from pypdf import PdfReader
-    text = ""
-    try:
-        reader = PdfReader(file_path)
-        for page in reader.pages:
-            text += page.extract_text() + "\n"
-    except Exception as e:
-        logger.error(f"PDF extraction error: {e}")
-    return text
-
-def _extract_from_docx(file_path: str) -> str:
-    import docx
-    text = ""
-    try:
-        doc = docx.Document(file_path)
-        for para in doc.paragraphs:
-            text += para.text + "\n"
-    except Exception as e:
-        logger.error(f"DOCX extraction error: {e}")
-    return text
+        raise
@@ -1,11 +1,21 @@
 """
 Authentication service for password hashing and JWT management.
+
+bcrypt is deliberately slow, so the async helpers run it on a dedicated
+worker pool instead of the event loop. Verified tokens are kept in a small
+LRU keyed by token hash so authenticated requests skip the JWT decode.
 """
 
+import asyncio
 import bcrypt
+import hashlib
 import jwt
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
 import os
 from pathlib import Path
 
@@ -24,10 +34,18 @@ JWT_SECRET = os.getenv("JWT_SECRET", "briefing-room-secret-key-change-in-product
 JWT_ALGORITHM = "HS256"
 JWT_EXPIRATION_HOURS = 24
 
+# Password hashing
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))  # cost factor for new hashes; existing hashes keep theirs
+AUTH_HASH_WORKERS = int(os.getenv("AUTH_HASH_WORKERS", "4"))  # bcrypt threads (bcrypt releases the GIL)
+AUTH_TOKEN_CACHE_SIZE = int(os.getenv("AUTH_TOKEN_CACHE_SIZE", "1024"))  # verified tokens held; 0 disables
+
+# Kept separate from the default executor so a login storm can't starve other to_thread work
+_hash_executor = ThreadPoolExecutor(max_workers=AUTH_HASH_WORKERS, thread_name_prefix="bcrypt")
+
 
 def hash_password(password: str) -> str:
     """Hash a password using bcrypt."""
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=BCRYPT_ROUNDS)
     hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
     return hashed.decode('utf-8')
 
@@ -43,6 +61,18 @@ def verify_password(password: str, password_hash: str) -> bool:
         return False
 
 
+async def hash_password_async(password: str) -> str:
+    """hash_password on the bcrypt worker pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_hash_executor, hash_password, password)
+
+
+async def verify_password_async(password: str, password_hash: str) -> bool:
+    """verify_password on the bcrypt worker pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_hash_executor, verify_password, password, password_hash)
+
+
 def create_access_token(
     recruiter_id: str,
     organization_id: str,
@@ -66,17 +96,69 @@ def create_access_token(
     return jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
 
 
+class TokenCache:
+    """Bounded LRU of verified tokens -> CurrentUser, honouring each token's exp."""
+
+    def __init__(self, max_entries: int = AUTH_TOKEN_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._users: "OrderedDict[str, Tuple[float, CurrentUser]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(token: str) -> str:
+        # Don't keep raw bearer tokens in memory longer than the request
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def get(self, token: str) -> Optional[CurrentUser]:
+        if self.max_entries <= 0:
+            return None
+        key = self._key(token)
+        with self._lock:
+            cached = self._users.get(key)
+            if cached is None:
+                return None
+            expires_at, user = cached
+            if time.time() >= expires_at:
+                del self._users[key]
+                return None
+            self._users.move_to_end(key)
+            return user
+
+    def put(self, token: str, expires_at: float, user: CurrentUser) -> None:
+        if self.max_entries <= 0:
+            return
+        key = self._key(token)
+        with self._lock:
+            self._users[key] = (expires_at, user)
+            self._users.move_to_end(key)
+            while len(self._users) > self.max_entries:
+                self._users.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._users.clear()
+
+
+# Global instance
+token_cache = TokenCache()
+
+
 def decode_access_token(token: str) -> Optional[CurrentUser]:
     """Decode and validate a JWT token."""
+    user = token_cache.get(token)
+    if user is not None:
+        return user
     try:
         payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
-        return CurrentUser(
+        user = CurrentUser(
             recruiter_id=payload["recruiter_id"],
             organization_id=payload["organization_id"],
             email=payload["email"],
             role=payload["role"],
             name=payload.get("name", "")
         )
+        token_cache.put(token, float(payload["exp"]), user)
+        return user
     except jwt.ExpiredSignatureError:
         return None
     except jwt.InvalidTokenError:
@@ -0,0 +1,183 @@
+"""
+Cache Invalidation Log.
+Carries invalidations of the in-process caches (job analytics summaries,
+candidate intel snapshots, organization ownership) to the other processes on
+the host.
+
+With the process roles split (see serve.py), a write in one process, such as
+post-call analytics in a worker, only drops entries from that process's
+caches. With the sqlite backend each invalidation is also appended to a local
+SQLite table, and every process replays the entries other processes appended
+before it reads one of these caches, checking at most once per
+CACHE_INVALIDATION_POLL_INTERVAL. Another process's write is therefore visible
+within that interval; the caches' TTLs remain as a backstop for processes
+that don't share the table (e.g. on another host).
+
+Pick the backend with CACHE_INVALIDATION_BACKEND: "memory" keeps
+invalidations in the process, "sqlite" shares them on the host.
+"""
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from config import (
+    CACHE_INVALIDATION_BACKEND,
+    CACHE_INVALIDATION_DB_PATH,
+    CACHE_INVALIDATION_POLL_INTERVAL,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class CacheInvalidationLog:
+    """Host-local log of cache invalidations, replayed by every process that reads the caches."""
+
+    # Entries outlive every cache TTL, so a process that was idle longer has nothing left to drop
+    RETENTION_SECONDS = 3600
+    # Prune old entries every N appends rather than on each one
+    PRUNE_EVERY = 100
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        enabled: bool = CACHE_INVALIDATION_BACKEND == "sqlite",
+        poll_interval: float = CACHE_INVALIDATION_POLL_INTERVAL,
+    ):
+        if db_path is None:
+            db_path = CACHE_INVALIDATION_DB_PATH or Path(__file__).parent.parent / "data" / "cache_invalidation.db"
+        self.db_path = Path(db_path)
+        self.enabled = enabled
+        self.poll_interval = poll_interval
+        self._caches: Dict[str, Any] = {}
+        self._last_seq: Optional[int] = None
+        self._next_poll = 0.0
+        self._appends = 0
+        self._initialized = False
+        # One thread replays at a time; the others read their cache as it is
+        self._poll_lock = threading.Lock()
+        self._replaying = threading.local()
+
+    def subscribe(self, channel: str, cache: Any) -> None:
+        """Replay invalidations logged on a channel by calling the same method on cache."""
+        self._caches[channel] = cache
+
+    def publish(self, channel: str, op: str, *args) -> None:
+        """Log cache.op(*args) for the other processes (no-op when disabled or replaying)."""
+        if not self.enabled or getattr(self._replaying, "active", False):
+            return
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT INTO cache_invalidations (channel, op, args, writer, created_at) VALUES (?, ?, ?, ?, ?)",
+                    (channel, op, json.dumps(args, default=str), self._writer(), time.time()),
+                )
+                self._after_append(conn)
+        except sqlite3.Error as e:
+            # Other processes fall back to the TTL for this entry
+            logger.warning(f"Could not log {channel}.{op} invalidation: {e}")
+
+    def poll(self) -> None:
+        """Replay the invalidations other processes logged since the last poll (throttled)."""
+        if not self.enabled or time.monotonic() < self._next_poll:
+            return
+        if not self._poll_lock.acquire(blocking=False):
+            return
+        try:
+            self._next_poll = time.monotonic() + self.poll_interval
+            try:
+                rows = self._read_new()
+            except sqlite3.Error as e:
+                logger.warning(f"Could not read cache invalidations: {e}")
+                return
+            self._replaying.active = True
+            try:
+                for channel, op, args in rows:
+                    cache = self._caches.get(channel)
+                    if cache is None:
+                        continue
+                    try:
+                        getattr(cache, op)(*json.loads(args))
+                    except Exception as e:
+                        logger.warning(f"Could not replay {channel}.{op} invalidation: {e}")
+            finally:
+                self._replaying.active = False
+        finally:
+            self._poll_lock.release()
+
+    def _read_new(self) -> list:
+        with self._connect() as conn:
+            if self._last_seq is None:
+                # Nothing is cached yet, so only later invalidations matter
+                (self._last_seq,) = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM cache_invalidations").fetchone()
+                return []
+            rows = conn.execute(
+                "SELECT seq, channel, op, args, writer FROM cache_invalidations WHERE seq > ? ORDER BY seq",
+                (self._last_seq,),
+            ).fetchall()
+        if rows:
+            self._last_seq = rows[-1][0]
+        me = self._writer()
+        return [(channel, op, args) for _, channel, op, args, writer in rows if writer != me]
+
+    def _writer(self) -> str:
+        """Tags this log's own entries, which its caches have already applied."""
+        return f"{os.getpid()}:{id(self)}"
+
+    @contextmanager
+    def _connect(self):
+        """One connection per operation; safe across threads and processes."""
+        if not self._initialized:
+            self._init_db()
+        conn = sqlite3.connect(str(self.db_path), timeout=30, isolation_level=None)
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            yield conn
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def _init_db(self) -> None:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.db_path), timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS cache_invalidations (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    channel TEXT NOT NULL,
+                    op TEXT NOT NULL,
+                    args TEXT NOT NULL,
+                    writer TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_cache_invalidations_created
+                    ON cache_invalidations (created_at);
+                """
+            )
+            conn.commit()
+        finally:
+            conn.close()
+        self._initialized = True
+
+    def _after_append(self, conn) -> None:
+        self._appends += 1
+        if self._appends % self.PRUNE_EVERY:
+            return
+        conn.execute(
+            "DELETE FROM cache_invalidations WHERE created_at < ?",
+            (time.time() - self.RETENTION_SECONDS,),
+        )
+
+
+# Global instance
+invalidation_log = CacheInvalidationLog()
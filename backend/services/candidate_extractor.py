@@ -14,10 +14,11 @@ import asyncio
 import logging
 from typing import Any, Dict, List, Optional
 
-from openai import AsyncOpenAI
 from pydantic import BaseModel, Field
 
-from config import OPENROUTER_API_KEY, LLM_MODEL
+from config import LLM_MODEL
+from services.llm_clients import LazyOpenAIClient
+from services.telemetry import record_llm_retry
 
 # Configure logging
 logging.basicConfig(
@@ -28,16 +29,12 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 # OpenRouter configuration
-OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
 EXTRACTION_MODEL = LLM_MODEL
 MAX_RETRIES = 2
 RATE_LIMIT_RETRY_DELAY = 1.0
 
-# Initialize OpenRouter client
-client = AsyncOpenAI(
-    base_url=OPENROUTER_BASE_URL,
-    api_key=OPENROUTER_API_KEY,
-)
+# OpenRouter client (built on the first call)
+client = LazyOpenAIClient("candidate_extraction")
 
 
 # ============================================================================
@@ -241,6 +238,7 @@ async def extract_candidate_profile(
             if is_rate_limit and attempt < MAX_RETRIES:
                 delay = RATE_LIMIT_RETRY_DELAY * (2 ** attempt)
                 logger.warning(f"Rate limit hit, retrying in {delay}s (attempt {attempt + 1}/{MAX_RETRIES})")
+                record_llm_retry("candidate_extraction")
                 await asyncio.sleep(delay)
                 continue
 
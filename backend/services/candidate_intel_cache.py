@@ -0,0 +1,110 @@
+"""
+Candidate Intel Cache.
+Holds the aggregated offer-prep intelligence snapshot per candidate so the
+intelligence, context and coaching endpoints don't re-fetch and re-aggregate
+every interview on each call.
+
+Snapshots are dropped when analytics or transcripts for one of the
+candidate's interviews are written, or an interview changes status, in this
+process and (through services/cache_invalidation.py) in the other processes on
+the host, and expire after a TTL as a backstop.
+"""
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from config import CANDIDATE_INTEL_CACHE_TTL, CANDIDATE_INTEL_CACHE_SIZE
+from services.cache_invalidation import invalidation_log
+
+logger = logging.getLogger(__name__)
+
+
+class CandidateIntelCache:
+    """Bounded, TTL'd per-candidate snapshot cache with interview-level invalidation."""
+
+    def __init__(
+        self,
+        ttl: float = CANDIDATE_INTEL_CACHE_TTL,
+        max_entries: int = CANDIDATE_INTEL_CACHE_SIZE,
+        channel: Optional[str] = None,
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._snapshots: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._candidate_by_interview: Dict[str, str] = {}
+        self._interviews_by_candidate: Dict[str, List[str]] = {}
+        # Repositories invalidate from sync code that may run in worker threads
+        self._lock = threading.Lock()
+        # Invalidations are shared with other processes under this name
+        self._channel = channel
+        self._invalidations = invalidation_log if channel else None
+        if channel:
+            self._invalidations.subscribe(channel, self)
+
+    def get(self, candidate_id: str) -> Optional[Any]:
+        """Cached snapshot for a candidate, or None if missing or expired."""
+        if self.ttl <= 0:
+            return None
+        if self._invalidations:
+            self._invalidations.poll()
+        with self._lock:
+            cached = self._snapshots.get(candidate_id)
+            if cached is None:
+                return None
+            stored_at, snapshot = cached
+            if time.time() - stored_at >= self.ttl:
+                self._drop(candidate_id)
+                return None
+            self._snapshots.move_to_end(candidate_id)
+            return snapshot
+
+    def put(self, candidate_id: str, snapshot: Any, interview_ids: Iterable[str] = ()) -> None:
+        """Store a snapshot, remembering which interviews it was built from."""
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._drop(candidate_id)
+            self._snapshots[candidate_id] = (time.time(), snapshot)
+            self._interviews_by_candidate[candidate_id] = [str(i) for i in interview_ids]
+            for interview_id in self._interviews_by_candidate[candidate_id]:
+                self._candidate_by_interview[interview_id] = candidate_id
+            while len(self._snapshots) > self.max_entries:
+                oldest = next(iter(self._snapshots))
+                self._drop(oldest)
+
+    def invalidate(self, candidate_id: str) -> None:
+        """Forget the snapshot for a candidate."""
+        self._publish("invalidate", candidate_id)
+        with self._lock:
+            self._drop(candidate_id)
+
+    def invalidate_interview(self, interview_id: Optional[str], candidate_id: Optional[str] = None) -> None:
+        """Forget the snapshot built from an interview (e.g. after new analytics)."""
+        self._publish("invalidate_interview", interview_id, candidate_id)
+        with self._lock:
+            owner = candidate_id or self._candidate_by_interview.get(str(interview_id))
+            if owner:
+                logger.debug(f"Invalidating candidate intel for {owner} (interview {interview_id})")
+                self._drop(owner)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._snapshots.clear()
+            self._candidate_by_interview.clear()
+            self._interviews_by_candidate.clear()
+
+    def _drop(self, candidate_id: str) -> None:
+        self._snapshots.pop(candidate_id, None)
+        for interview_id in self._interviews_by_candidate.pop(candidate_id, []):
+            if self._candidate_by_interview.get(interview_id) == candidate_id:
+                del self._candidate_by_interview[interview_id]
+
+    def _publish(self, op: str, *args) -> None:
+        if self._invalidations:
+            self._invalidations.publish(self._channel, op, *args)
+
+
+# Global instance
+candidate_intel_cache = CandidateIntelCache(channel="candidate_intel")
@@ -9,13 +9,14 @@ success_signals, behavioral_traits, cultural_indicators, deal_breakers).
 import json
 import asyncio
 import logging
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from uuid import UUID
 
-from openai import AsyncOpenAI
 from pydantic import BaseModel, Field
 
-from config import OPENROUTER_API_KEY, LLM_MODEL
+from config import LLM_MODEL, SCREENING_PACK_SIZE
+from services.llm_clients import LazyOpenAIClient
+from services.telemetry import record_llm_retry
 from models.streamlined.job import ExtractedRequirements, WeightedAttribute
 
 # Configure logging
@@ -27,16 +28,19 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 # OpenRouter configuration
-OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
 SCREENING_MODEL = LLM_MODEL
 MAX_RETRIES = 2
 RATE_LIMIT_RETRY_DELAY = 1.0
 
-# Initialize OpenRouter client
-client = AsyncOpenAI(
-    base_url=OPENROUTER_BASE_URL,
-    api_key=OPENROUTER_API_KEY,
-)
+# Recommendations a valid screening result may carry
+SCREENING_RECOMMENDATIONS = {"Strong Fit", "Good Fit", "Potential Fit", "Not a Fit"}
+
+SCREENING_SYSTEM_PROMPT = """You are an expert recruiter performing comprehensive candidate screening.
+Evaluate candidates against ALL weighted requirements. Return precise, evidence-based JSON.
+Be thorough in evaluating each weighted attribute and calculating scores."""
+
+# OpenRouter client (built on the first call)
+client = LazyOpenAIClient("screening")
 
 
 # ============================================================================
@@ -138,6 +142,17 @@ class ScreeningResult(BaseModel):
     interview_questions: List[str] = Field(default_factory=list, description="3-5 tailored interview questions")
 
 
+class PackedScreeningItem(BaseModel):
+    """One candidate's result within a packed (multi-candidate) screening call."""
+    candidate_ref: str = Field(description="The ref from the candidate's header, e.g. C3")
+    result: ScreeningResult
+
+
+class PackedScreeningResponse(BaseModel):
+    """Results for every candidate in a packed screening call."""
+    results: List[PackedScreeningItem] = Field(description="Exactly one entry per candidate")
+
+
 # ============================================================================
 # Screening Functions
 # ============================================================================
@@ -153,16 +168,23 @@ def format_weighted_attributes(attrs: List[WeightedAttribute], name: str) -> str
     return "\n".join(lines)
 
 
-def build_screening_prompt(
-    enrichment_data: Dict[str, Any],
+def format_enrichment_data(enrichment_data: Dict[str, Any]) -> str:
+    """Format a candidate's raw enrichment data for the prompt."""
+    return json.dumps(enrichment_data, indent=2, default=str)[:10000]
+
+
+def build_job_context_prompt(
     job_title: str,
     job_description: str,
     extracted_requirements: Optional[ExtractedRequirements] = None,
 ) -> str:
-    """Build the combined extraction + scoring prompt with weighted attributes."""
+    """
+    Build the job half of the screening prompt: job info, weighted requirements
+    and scoring instructions.
 
-    # Format enrichment data for the prompt
-    enrichment_str = json.dumps(enrichment_data, indent=2, default=str)[:10000]
+    Kept byte-identical for every candidate of a job and placed before any
+    candidate data, so single and packed calls share a cacheable prefix.
+    """
 
     # Build requirements section from ExtractedRequirements
     requirements_section = ""
@@ -243,9 +265,6 @@ Description:
 
 {category_weights_section}
 
-== CANDIDATE RAW DATA ==
-{enrichment_str}
-
 == SCORING INSTRUCTIONS ==
 
 1. EXTRACT the candidate's profile from the raw data:
@@ -315,6 +334,57 @@ Description:
 Return ONLY valid JSON matching the exact schema provided."""
 
 
+def build_screening_prompt(
+    enrichment_data: Dict[str, Any],
+    job_title: str,
+    job_description: str,
+    extracted_requirements: Optional[ExtractedRequirements] = None,
+) -> str:
+    """Build the combined extraction + scoring prompt with weighted attributes."""
+    job_context = build_job_context_prompt(job_title, job_description, extracted_requirements)
+    return f"""{job_context}
+
+== CANDIDATE RAW DATA ==
+{format_enrichment_data(enrichment_data)}"""
+
+
+def build_packed_screening_prompt(job_context: str, candidates: List[Tuple[str, Dict[str, Any]]]) -> str:
+    """Build a prompt screening several (ref, enrichment_data) candidates after one job context."""
+    sections = "\n\n".join(
+        f"=== CANDIDATE {ref} ===\n{format_enrichment_data(enrichment_data)}"
+        for ref, enrichment_data in candidates
+    )
+    return f"""{job_context}
+
+== CANDIDATES TO SCREEN ({len(candidates)}) ==
+Screen EACH candidate below independently against the job above, applying the
+instructions to each one on its own. Do not compare or rank candidates against
+each other. Return exactly one entry in `results` per candidate, with
+`candidate_ref` set to the ref in that candidate's header.
+
+{sections}"""
+
+
+def _resolve_requirements(
+    extracted_requirements: Optional[ExtractedRequirements],
+    required_skills: Optional[List[str]],
+) -> Optional[ExtractedRequirements]:
+    """Build minimal ExtractedRequirements from the legacy required_skills list if needed."""
+    if not extracted_requirements and required_skills:
+        return ExtractedRequirements(
+            required_skills=[
+                WeightedAttribute(value=skill, weight=1.0)
+                for skill in required_skills
+            ]
+        )
+    return extracted_requirements
+
+
+def _is_rate_limit(error: Exception) -> bool:
+    error_str = str(error).lower()
+    return "rate" in error_str or "limit" in error_str or "429" in error_str
+
+
 async def screen_candidate(
     enrichment_data: Dict[str, Any],
     job_title: str,
@@ -337,14 +407,7 @@ async def screen_candidate(
     """
     # If we have extracted_requirements, use full screening
     # Otherwise fall back to legacy behavior
-    if not extracted_requirements and required_skills:
-        # Create minimal ExtractedRequirements from legacy required_skills
-        extracted_requirements = ExtractedRequirements(
-            required_skills=[
-                WeightedAttribute(value=skill, weight=1.0)
-                for skill in required_skills
-            ]
-        )
+    extracted_requirements = _resolve_requirements(extracted_requirements, required_skills)
 
     prompt = build_screening_prompt(
         enrichment_data=enrichment_data,
@@ -358,12 +421,7 @@ async def screen_candidate(
             completion = await client.beta.chat.completions.parse(
                 model=SCREENING_MODEL,
                 messages=[
-                    {
-                        "role": "system",
-                        "content": """You are an expert recruiter performing comprehensive candidate screening.
-Evaluate candidates against ALL weighted requirements. Return precise, evidence-based JSON.
-Be thorough in evaluating each weighted attribute and calculating scores."""
-                    },
+                    {"role": "system", "content": SCREENING_SYSTEM_PROMPT},
                     {"role": "user", "content": prompt},
                 ],
                 response_format=ScreeningResult,
@@ -375,12 +433,10 @@ Be thorough in evaluating each weighted attribute and calculating scores."""
             return result
 
         except Exception as e:
-            error_str = str(e).lower()
-            is_rate_limit = "rate" in error_str or "limit" in error_str or "429" in error_str
-
-            if is_rate_limit and attempt < MAX_RETRIES:
+            if _is_rate_limit(e) and attempt < MAX_RETRIES:
                 delay = RATE_LIMIT_RETRY_DELAY * (2 ** attempt)
                 logger.warning(f"Rate limit hit, retrying in {delay}s (attempt {attempt + 1}/{MAX_RETRIES})")
+                record_llm_retry("screening")
                 await asyncio.sleep(delay)
                 continue
 
@@ -436,6 +492,7 @@ async def screen_candidates_batch(
     required_skills: List[str] = None,
     batch_size: int = 5,
     progress_callback=None,
+    pack_size: int = 1,
 ) -> List[Dict[str, Any]]:
     """
     Screen multiple candidates in batches.
@@ -448,10 +505,23 @@ async def screen_candidates_batch(
         required_skills: Legacy parameter
         batch_size: Number of concurrent LLM calls
         progress_callback: Optional async callback(current, total, result)
+        pack_size: Candidates per LLM call; above 1 uses packed screening
 
     Returns:
         List of dicts with candidate_id and screening result
     """
+    if pack_size > 1:
+        return await screen_candidates_packed(
+            candidates,
+            job_title,
+            job_description,
+            extracted_requirements=extracted_requirements,
+            required_skills=required_skills,
+            pack_size=pack_size,
+            concurrency=batch_size,
+            progress_callback=progress_callback,
+        )
+
     results = []
     total = len(candidates)
 
@@ -506,6 +576,180 @@ async def screen_candidates_batch(
     return results
 
 
+# ============================================================================
+# Packed Screening (several candidates per call)
+# ============================================================================
+
+def _validate_packed(response: Optional[PackedScreeningResponse], expected: List[str]) -> Dict[str, ScreeningResult]:
+    """
+    Keep the results that can be trusted: refs from this pack, answered once,
+    with a recognised recommendation. Everything else is treated as missing.
+    """
+    if response is None:
+        return {}
+
+    seen: Dict[str, List[ScreeningResult]] = {}
+    for item in response.results:
+        ref = item.candidate_ref.strip().upper()
+        if ref in expected:
+            seen.setdefault(ref, []).append(item.result)
+
+    valid = {}
+    for ref, results in seen.items():
+        if len(results) != 1:
+            logger.warning(f"Packed screening answered {ref} {len(results)} times, discarding")
+            continue
+        if results[0].recommendation not in SCREENING_RECOMMENDATIONS:
+            logger.warning(f"Packed screening gave {ref} unknown recommendation '{results[0].recommendation}'")
+            continue
+        valid[ref] = results[0]
+    return valid
+
+
+async def _request_pack(
+    pack: List[Tuple[str, Dict[str, Any]]],
+    job_context: str,
+) -> Dict[str, ScreeningResult]:
+    """Run one packed structured-output call, retrying rate limits. Returns valid results by ref."""
+    prompt = build_packed_screening_prompt(job_context, pack)
+
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            completion = await client.beta.chat.completions.parse(
+                model=SCREENING_MODEL,
+                messages=[
+                    {"role": "system", "content": SCREENING_SYSTEM_PROMPT},
+                    {"role": "user", "content": prompt},
+                ],
+                response_format=PackedScreeningResponse,
+                temperature=0.3,
+            )
+            return _validate_packed(completion.choices[0].message.parsed, [ref for ref, _ in pack])
+
+        except Exception as e:
+            if _is_rate_limit(e) and attempt < MAX_RETRIES:
+                delay = RATE_LIMIT_RETRY_DELAY * (2 ** attempt)
+                logger.warning(f"Rate limit hit, retrying in {delay}s (attempt {attempt + 1}/{MAX_RETRIES})")
+                record_llm_retry("screening")
+                await asyncio.sleep(delay)
+                continue
+            raise
+
+    return {}
+
+
+async def _screen_pack(
+    pack: List[Tuple[str, Dict[str, Any]]],
+    job_context: str,
+    job_title: str,
+    job_description: str,
+    extracted_requirements: Optional[ExtractedRequirements],
+) -> Dict[str, ScreeningResult]:
+    """
+    Screen a pack of (ref, enrichment_data) candidates, splitting on failure.
+
+    A failed or unparseable call splits the pack in half; a partial answer
+    re-packs only the candidates that are missing. Every retry is smaller than
+    the pack before it, ending at the single-candidate path.
+    """
+    if len(pack) == 1:
+        ref, enrichment_data = pack[0]
+        result = await screen_candidate(
+            enrichment_data=enrichment_data,
+            job_title=job_title,
+            job_description=job_description,
+            extracted_requirements=extracted_requirements,
+        )
+        return {ref: result}
+
+    results: Dict[str, ScreeningResult] = {}
+    try:
+        results = await _request_pack(pack, job_context)
+    except Exception as e:
+        logger.warning(f"Packed screening of {len(pack)} candidates failed: {e}")
+
+    missing = [item for item in pack if item[0] not in results]
+    if not missing:
+        return results
+
+    if len(missing) == len(pack):
+        mid = len(pack) // 2
+        retries = [pack[:mid], pack[mid:]]
+    else:
+        logger.warning(f"Packed screening returned {len(results)}/{len(pack)} valid results, retrying the rest")
+        retries = [missing]
+
+    for retried in await asyncio.gather(*(
+        _screen_pack(retry, job_context, job_title, job_description, extracted_requirements)
+        for retry in retries
+    )):
+        results.update(retried)
+    return results
+
+
+async def screen_candidates_packed(
+    candidates: List[Dict[str, Any]],
+    job_title: str,
+    job_description: str,
+    extracted_requirements: Optional[ExtractedRequirements] = None,
+    required_skills: List[str] = None,
+    pack_size: int = SCREENING_PACK_SIZE,
+    concurrency: int = 5,
+    progress_callback=None,
+) -> List[Dict[str, Any]]:
+    """
+    Screen candidates several to a call against one shared job-context prefix.
+
+    The job description, weighted requirements and scoring instructions are
+    sent once per pack instead of once per candidate. Each candidate's result
+    is validated separately; failed packs are split and retried, so a bad
+    response costs a smaller call rather than the whole pack.
+
+    Args:
+        candidates: List of dicts with 'enrichment_data' and 'candidate_id'
+        job_title: The job title
+        job_description: Full job description text
+        extracted_requirements: Full ExtractedRequirements with weighted attributes
+        required_skills: Legacy parameter
+        pack_size: Candidates per LLM call
+        concurrency: Number of packs screened at once
+        progress_callback: Optional async callback(current, total, result)
+
+    Returns:
+        List of dicts with candidate_id and screening result, in input order
+    """
+    extracted_requirements = _resolve_requirements(extracted_requirements, required_skills)
+    job_context = build_job_context_prompt(job_title, job_description, extracted_requirements)
+
+    refs = [f"C{i + 1}" for i in range(len(candidates))]
+    items = [(ref, c.get("enrichment_data", {})) for ref, c in zip(refs, candidates)]
+    packs = [items[i:i + max(pack_size, 1)] for i in range(0, len(items), max(pack_size, 1))]
+
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+    screened: Dict[str, ScreeningResult] = {}
+    total = len(candidates)
+
+    async def run_pack(pack):
+        async with semaphore:
+            results = await _screen_pack(pack, job_context, job_title, job_description, extracted_requirements)
+        for ref, _ in pack:
+            screened[ref] = results[ref]
+            if progress_callback:
+                await progress_callback(len(screened), total, results[ref])
+
+    await asyncio.gather(*(run_pack(pack) for pack in packs))
+    logger.info(f"Screened {total} candidates in {len(packs)} packs of up to {pack_size}")
+
+    return [
+        {
+            "candidate_id": candidate.get("candidate_id"),
+            "person_id": candidate.get("person_id"),
+            "result": screened[ref],
+        }
+        for ref, candidate in zip(refs, candidates)
+    ]
+
+
 # ============================================================================
 # Background Task for Upload Integration
 # ============================================================================
@@ -524,14 +768,6 @@ async def process_candidate_screening(
 
     This is called after a candidate is created during CSV upload.
     """
-    from repositories.streamlined.candidate_repo import CandidateRepository
-    from repositories.streamlined.person_repo import PersonRepository
-    from models.streamlined.candidate import CandidateUpdate
-    from models.streamlined.person import PersonUpdate
-
-    candidate_repo = CandidateRepository()
-    person_repo = PersonRepository()
-
     try:
         # Run the screening with full weighted attributes
         result = await screen_candidate(
@@ -541,109 +777,131 @@ async def process_candidate_screening(
             extracted_requirements=extracted_requirements,
             required_skills=required_skills,
         )
-
-        # Update Person with extracted profile data
-        person_update = PersonUpdate(
-            name=result.profile.name if result.profile.name != "Unknown" else None,
-            headline=result.profile.headline,
-            summary=result.profile.summary,
-            current_title=result.profile.current_title,
-            current_company=result.profile.current_company,
-            location=result.profile.location,
-            years_experience=result.profile.years_experience,
-            skills=result.profile.skills if result.profile.skills else None,
-        )
-        person_repo.update_sync(person_id, person_update)
-
-        # Build comprehensive screening notes
-        screening_data = {
-            "fit_summary": result.fit_summary,
-            "recommendation": result.recommendation,
-            # Category-level scores
-            "category_scores": [cs.model_dump() for cs in result.category_scores],
-            # Skill analysis
-            "skill_matches": [m.model_dump() for m in result.skill_matches],
-            # Flags
-            "green_flags": [g.model_dump() for g in result.green_flags],
-            "red_flags": [r.model_dump() for r in result.red_flags],
-            # Deal breakers
-            "deal_breakers_triggered": result.deal_breakers_triggered,
-            "has_deal_breaker": result.has_deal_breaker,
-            # Assessments
-            "behavioral_assessment": result.behavioral_assessment,
-            "cultural_fit_assessment": result.cultural_fit_assessment,
-            # Interview guidance
-            "interview_questions": result.interview_questions,
-        }
-
-        candidate_update = CandidateUpdate(
-            combined_score=result.overall_score,
-            screening_notes=json.dumps(screening_data),
-        )
-        candidate_repo.update_sync(candidate_id, candidate_update)
-
-        logger.info(f"Screening complete for candidate {candidate_id}: Score {result.overall_score}")
-
-        # Send email if Strong Fit AND voice screening is enabled for this job
-        if result.recommendation == "Strong Fit" and enrichment_data.get("email"):
-            from services.email_service import EmailService
-            from repositories.interview_repository import InterviewRepository
-            from repositories.streamlined.job_repo import JobRepository
-            from config import FRONTEND_URL
-            import secrets
-            
-            # Get job details to check if voice screening is enabled
-            from repositories.streamlined.candidate_repo import CandidateRepository as StreamlinedCandidateRepo
-            streamlined_candidate_repo = StreamlinedCandidateRepo()
-            candidate = streamlined_candidate_repo.get_by_id_sync(candidate_id)
-            job_id = str(candidate.job_id) if candidate else None
-            
-            # Check voice_screening_enabled flag on the job
-            voice_screening_enabled = True  # Default to True
-            if job_id:
-                job_repo = JobRepository()
-                job = job_repo.get_by_id_sync(job_id)
-                if job:
-                    voice_screening_enabled = getattr(job, 'voice_screening_enabled', True)
-            
-            if not voice_screening_enabled:
-                logger.info(f"Candidate {candidate_id} is a Strong Fit, but voice screening is DISABLED for this job. Skipping interview email.")
-                return  # Skip the voice interview email
-            
-            logger.info(f"Candidate {candidate_id} is a Strong Fit. Creating interview and generating email...")
-            
-            # Create an interview record with a secure access token
-            interview_repo = InterviewRepository()
-            access_token = f"tok_{secrets.token_urlsafe(24)}"
-            
-            interview_data = {
-                "candidate_id": str(candidate_id),
-                "stage": "round_1",
-                "status": "scheduled",
-                "job_posting_id": job_id,
-                "access_token": access_token,
-            }
-            
-            interview = interview_repo.create(interview_data)
-            interview_id = interview["id"] if interview else None
-            
-            # 2. Build the interview link
-            interview_link = f"{FRONTEND_URL}/interview/{access_token}" if interview_id else None
-            
-            # 3. Generate email content with the link
-            email_content = await EmailService.generate_strong_fit_email(
-                candidate_name=result.profile.name,
-                job_title=job_title,
-                fit_summary=result.fit_summary,
-                green_flags=[g.model_dump() for g in result.green_flags],
-                interview_link=interview_link
-            )
-            
-            await EmailService.send_email(
-                to_email=enrichment_data.get("email"),
-                subject=email_content["subject"],
-                body=email_content["body"]
-            )
+        await apply_screening_result(candidate_id, person_id, enrichment_data, job_title, result)
 
     except Exception as e:
         logger.error(f"Background screening failed for candidate {candidate_id}: {e}")
+        raise
+
+
+async def apply_screening_result(
+    candidate_id: UUID,
+    person_id: UUID,
+    enrichment_data: Dict[str, Any],
+    job_title: str,
+    result: ScreeningResult,
+):
+    """
+    Save a screening result to the person and candidate records, and invite
+    Strong Fit candidates to a voice interview.
+    """
+    from repositories.streamlined.candidate_repo import CandidateRepository
+    from repositories.streamlined.person_repo import PersonRepository
+    from models.streamlined.candidate import CandidateUpdate
+    from models.streamlined.person import PersonUpdate
+
+    candidate_repo = CandidateRepository()
+    person_repo = PersonRepository()
+
+    # Update Person with extracted profile data
+    person_update = PersonUpdate(
+        name=result.profile.name if result.profile.name != "Unknown" else None,
+        headline=result.profile.headline,
+        summary=result.profile.summary,
+        current_title=result.profile.current_title,
+        current_company=result.profile.current_company,
+        location=result.profile.location,
+        years_experience=result.profile.years_experience,
+        skills=result.profile.skills if result.profile.skills else None,
+    )
+    person_repo.update_sync(person_id, person_update)
+
+    # Build comprehensive screening notes
+    screening_data = {
+        "fit_summary": result.fit_summary,
+        "recommendation": result.recommendation,
+        # Category-level scores
+        "category_scores": [cs.model_dump() for cs in result.category_scores],
+        # Skill analysis
+        "skill_matches": [m.model_dump() for m in result.skill_matches],
+        # Flags
+        "green_flags": [g.model_dump() for g in result.green_flags],
+        "red_flags": [r.model_dump() for r in result.red_flags],
+        # Deal breakers
+        "deal_breakers_triggered": result.deal_breakers_triggered,
+        "has_deal_breaker": result.has_deal_breaker,
+        # Assessments
+        "behavioral_assessment": result.behavioral_assessment,
+        "cultural_fit_assessment": result.cultural_fit_assessment,
+        # Interview guidance
+        "interview_questions": result.interview_questions,
+    }
+
+    candidate_update = CandidateUpdate(
+        combined_score=result.overall_score,
+        screening_notes=json.dumps(screening_data),
+    )
+    candidate_repo.update_sync(candidate_id, candidate_update)
+
+    logger.info(f"Screening complete for candidate {candidate_id}: Score {result.overall_score}")
+
+    # Send email if Strong Fit AND voice screening is enabled for this job
+    if result.recommendation == "Strong Fit" and enrichment_data.get("email"):
+        from services.email_service import EmailService
+        from repositories.interview_repository import InterviewRepository
+        from repositories.streamlined.job_repo import JobRepository
+        from config import FRONTEND_URL
+        import secrets
+        
+        # Get job details to check if voice screening is enabled
+        from repositories.streamlined.candidate_repo import CandidateRepository as StreamlinedCandidateRepo
+        streamlined_candidate_repo = StreamlinedCandidateRepo()
+        candidate = streamlined_candidate_repo.get_by_id_sync(candidate_id)
+        job_id = str(candidate.job_id) if candidate else None
+        
+        # Check voice_screening_enabled flag on the job
+        voice_screening_enabled = True  # Default to True
+        if job_id:
+            job_repo = JobRepository()
+            job = job_repo.get_by_id_sync(job_id)
+            if job:
+                voice_screening_enabled = getattr(job, 'voice_screening_enabled', True)
+        
+        if not voice_screening_enabled:
+            logger.info(f"Candidate {candidate_id} is a Strong Fit, but voice screening is DISABLED for this job. Skipping interview email.")
+            return  # Skip the voice interview email
+        
+        logger.info(f"Candidate {candidate_id} is a Strong Fit. Creating interview and generating email...")
+        
+        # Create an interview record with a secure access token
+        interview_repo = InterviewRepository()
+        access_token = f"tok_{secrets.token_urlsafe(24)}"
+        
+        interview_data = {
+            "candidate_id": str(candidate_id),
+            "stage": "round_1",
+            "status": "scheduled",
+            "job_posting_id": job_id,
+            "access_token": access_token,
+        }
+        
+        interview = interview_repo.create(interview_data)
+        interview_id = interview["id"] if interview else None
+        
+        # 2. Build the interview link
+        interview_link = f"{FRONTEND_URL}/interview/{access_token}" if interview_id else None
+        
+        # 3. Generate email content with the link
+        email_content = await EmailService.generate_strong_fit_email(
+            candidate_name=result.profile.name,
+            job_title=job_title,
+            fit_summary=result.fit_summary,
+            green_flags=[g.model_dump() for g in result.green_flags],
+            interview_link=interview_link
+        )
+        
+        await EmailService.send_email(
+            to_email=enrichment_data.get("email"),
+            subject=email_content["subject"],
+            body=email_content["body"]
+        )
@@ -8,13 +8,14 @@ import json
 import logging
 from typing import Dict, Any, Optional
 
-from config import OPENROUTER_API_KEY, LLM_MODEL
+from config import OPENROUTER_API_KEY, OPENROUTER_BASE_URL, LLM_MODEL
+from services.telemetry import llm_event_hooks
 from models.voice_ingest import CompanyIntelligence
 from models.voice_ingest.enums import FundingStage
 
 logger = logging.getLogger(__name__)
 
-OPENROUTER_URL = "https://openrouter.ai/api/v1/chat/completions"
+OPENROUTER_URL = f"{OPENROUTER_BASE_URL}/chat/completions"
 
 
 class CompanyExtractor:
@@ -73,7 +74,7 @@ class CompanyExtractor:
             )
 
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with httpx.AsyncClient(timeout=self.timeout, event_hooks=llm_event_hooks("company_extraction")) as client:
                 response = await client.post(
                     OPENROUTER_URL,
                     headers=self._get_headers(),
@@ -0,0 +1,224 @@
+"""
+Company Intel Cache service.
+Caches Parallel.ai company research and the extracted CompanyIntelligence
+by normalised company domain, so repeat sessions for a known company skip
+the 30-60s search + LLM extraction.
+
+Freshness:
+    age < fresh TTL             served from cache
+    fresh TTL <= age < stale    served from cache, refreshed in background
+    age >= stale TTL            researched again before returning
+
+Concurrent requests for the same domain share one in-flight research.
+"""
+import asyncio
+import json
+import logging
+import os
+import re
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+
+from config import COMPANY_INTEL_FRESH_TTL, COMPANY_INTEL_STALE_TTL
+from models.voice_ingest import CompanyIntelligence
+from services.parallel_ai import parallel_service
+from services.company_extractor import company_extractor
+from services.single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_company_domain(website: Optional[str], company_name: Optional[str] = None) -> str:
+    """
+    Normalise a company website to a cache key.
+
+    'https://www.Stripe.com/jobs?x=1' -> 'stripe.com'. Falls back to a
+    slug of the company name when no usable website is given.
+    """
+    if website:
+        candidate = website.strip().lower()
+        if "://" not in candidate:
+            candidate = f"http://{candidate}"
+        host = urlparse(candidate).hostname or ""
+        if host.startswith("www."):
+            host = host[4:]
+        if host and "." in host:
+            return host
+
+    slug = re.sub(r"[^a-z0-9]+", "-", (company_name or "").lower()).strip("-")
+    return f"name-{slug}" if slug else "unknown"
+
+
+@dataclass
+class CompanyResearch:
+    """Cached research for one company domain."""
+    domain: str
+    raw_results: Dict[str, Any]
+    intel: Optional[CompanyIntelligence] = None
+    fetched_at: float = field(default_factory=time.time)
+
+    def age(self) -> float:
+        return time.time() - self.fetched_at
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "domain": self.domain,
+            "raw_results": self.raw_results,
+            "intel": self.intel.model_dump(mode="json") if self.intel else None,
+            "fetched_at": self.fetched_at,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CompanyResearch":
+        return cls(
+            domain=data["domain"],
+            raw_results=data.get("raw_results", {}),
+            intel=CompanyIntelligence(**data["intel"]) if data.get("intel") else None,
+            fetched_at=data.get("fetched_at", 0.0),
+        )
+
+
+class CompanyIntelCache:
+    """Domain-keyed research cache with TTLs, single-flight and stale-while-revalidate."""
+
+    def __init__(
+        self,
+        search_service=None,
+        extractor=None,
+        data_dir: Optional[str] = None,
+        fresh_ttl: float = COMPANY_INTEL_FRESH_TTL,
+        stale_ttl: float = COMPANY_INTEL_STALE_TTL,
+    ):
+        self.search_service = search_service or parallel_service
+        self.extractor = extractor or company_extractor
+        if data_dir is None:
+            data_dir = Path(__file__).parent.parent / "data" / "company_intel"
+        self.data_dir = Path(data_dir)
+        self.fresh_ttl = fresh_ttl
+        self.stale_ttl = stale_ttl
+        self._entries: Dict[str, CompanyResearch] = {}
+        self._flights = SingleFlight("company research")
+
+    # ==========================================================================
+    # Public API
+    # ==========================================================================
+
+    async def get_intelligence(self, company_name: str, website: str) -> CompanyIntelligence:
+        """Structured company intel (search + LLM extraction), cached by domain."""
+        research = await self._get(company_name, website, extract=True)
+        # Callers mutate profile.company during calls; never hand out the cached object
+        return research.intel.model_copy(deep=True)
+
+    async def get_raw_results(self, company_name: str, website: str) -> Dict[str, Any]:
+        """Raw Parallel.ai search results, cached by domain (no LLM extraction)."""
+        research = await self._get(company_name, website, extract=False)
+        return json.loads(json.dumps(research.raw_results))
+
+    def invalidate(self, website: str, company_name: Optional[str] = None) -> None:
+        """Forget cached research for a company."""
+        domain = normalize_company_domain(website, company_name)
+        self._entries.pop(domain, None)
+        self._entry_path(domain).unlink(missing_ok=True)
+
+    # ==========================================================================
+    # Cache Mechanics
+    # ==========================================================================
+
+    async def _get(self, company_name: str, website: str, extract: bool) -> CompanyResearch:
+        domain = normalize_company_domain(website, company_name)
+        entry = self._lookup(domain)
+        usable = entry is not None and (entry.intel is not None or not extract)
+
+        if usable and entry.age() < self.fresh_ttl:
+            logger.info(f"Company intel cache hit for {domain}")
+            return entry
+
+        if usable and entry.age() < self.stale_ttl:
+            logger.info(f"Company intel stale for {domain}, refreshing in background")
+            # Keep the cached extraction current too, whichever caller noticed
+            self._refresh(domain, company_name, website, extract or entry.intel is not None)
+            return entry
+
+        if entry is not None and entry.intel is None and extract and entry.age() < self.fresh_ttl:
+            # Raw results are fresh (e.g. from offer prep); only the extraction is missing
+            research = entry
+        else:
+            research = await self._refresh(domain, company_name, website, extract)
+
+        if extract and research.intel is None:
+            # Joined an in-flight search that skipped extraction
+            research = await self._flights.run(domain, lambda: self._extract_only(research))
+        return research
+
+    def _refresh(self, domain: str, company_name: str, website: str, extract: bool) -> asyncio.Task:
+        """Start (or join) the research for a domain; returns the shared task."""
+        return self._flights.run(domain, lambda: self._research(domain, company_name, website, extract))
+
+    async def _research(self, domain: str, company_name: str, website: str, extract: bool) -> CompanyResearch:
+        logger.info(f"Researching {company_name} ({domain})")
+        raw_results = await self.search_service.research_company(
+            company_name=company_name,
+            website=website
+        )
+        research = CompanyResearch(domain=domain, raw_results=raw_results)
+        if extract:
+            research.intel = await self.extractor.extract(raw_results)
+        self._store(research)
+        return research
+
+    async def _extract_only(self, entry: CompanyResearch) -> CompanyResearch:
+        entry.intel = await self.extractor.extract(entry.raw_results)
+        self._store(entry)
+        return entry
+
+    def _is_cacheable(self, research: CompanyResearch) -> bool:
+        """Don't cache failed searches or fallback extractions; retry those next time."""
+        raw = research.raw_results
+        if not raw.get("search_results") and raw.get("errors"):
+            return False
+        if research.intel is not None:
+            intel = research.intel
+            if not any([intel.tagline, intel.product_description, intel.industry, intel.funding_stage]):
+                return False
+        return True
+
+    # ==========================================================================
+    # Persistence
+    # ==========================================================================
+
+    def _entry_path(self, domain: str) -> Path:
+        return self.data_dir / f"{domain}.json"
+
+    def _lookup(self, domain: str) -> Optional[CompanyResearch]:
+        entry = self._entries.get(domain)
+        if entry is not None:
+            return entry
+        try:
+            with open(self._entry_path(domain), 'r') as f:
+                entry = CompanyResearch.from_dict(json.load(f))
+        except (json.JSONDecodeError, FileNotFoundError, KeyError, ValueError):
+            return None
+        self._entries[domain] = entry
+        return entry
+
+    def _store(self, research: CompanyResearch) -> None:
+        if not self._is_cacheable(research):
+            logger.info(f"Not caching incomplete research for {research.domain}")
+            return
+        self._entries[research.domain] = research
+        try:
+            self.data_dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.data_dir, prefix=".tmp-", suffix=".json")
+            with os.fdopen(fd, 'w') as f:
+                json.dump(research.to_dict(), f, default=str)
+            os.replace(tmp_path, self._entry_path(research.domain))
+        except Exception as e:
+            logger.warning(f"Failed to persist company intel for {research.domain}: {e}")
+
+
+# Global instance
+company_intel_cache = CompanyIntelCache()
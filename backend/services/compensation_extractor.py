@@ -8,12 +8,13 @@ import json
 import logging
 from typing import Dict, Any, Optional
 
-from config import OPENROUTER_API_KEY, LLM_MODEL
+from config import OPENROUTER_API_KEY, OPENROUTER_BASE_URL, LLM_MODEL
+from services.telemetry import llm_event_hooks
 from models.compensation import CompensationData
 
 logger = logging.getLogger(__name__)
 
-OPENROUTER_URL = "https://openrouter.ai/api/v1/chat/completions"
+OPENROUTER_URL = f"{OPENROUTER_BASE_URL}/chat/completions"
 
 
 class CompensationExtractor:
@@ -83,7 +84,7 @@ class CompensationExtractor:
             )
 
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with httpx.AsyncClient(timeout=self.timeout, event_hooks=llm_event_hooks("compensation_extraction")) as client:
                 response = await client.post(
                     OPENROUTER_URL,
                     headers=self._get_headers(),
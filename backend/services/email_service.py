@@ -7,22 +7,18 @@ Handles generating personalized emails using LLM and sending them via Resend.
 import httpx
 import logging
 from typing import Optional, Dict, Any
-from openai import AsyncOpenAI
 
 from config import (
     RESEND_API_KEY, 
     RESEND_API_URL, 
-    OPENROUTER_API_KEY, 
     LLM_MODEL
 )
+from services.llm_clients import LazyOpenAIClient
 
 logger = logging.getLogger(__name__)
 
-# Initialize OpenRouter client for email generation
-client = AsyncOpenAI(
-    base_url="https://openrouter.ai/api/v1",
-    api_key=OPENROUTER_API_KEY,
-)
+# OpenRouter client for email generation (built on the first call)
+client = LazyOpenAIClient("email_draft")
 
 from pydantic import BaseModel, Field
 
@@ -5,14 +5,17 @@ Uses a single LLM call with Pydantic structured output to analyze interview qual
 import json
 import logging
 import os
-from typing import Optional
-from openai import AsyncOpenAI
+from typing import TYPE_CHECKING, Optional
 from models.interviewer_analytics import InterviewerAnalyticsResult
 
 logger = logging.getLogger(__name__)
 
 # Get API key and model from config
-from config import OPENROUTER_API_KEY, LLM_MODEL
+from config import LLM_MODEL
+from services.llm_clients import LazyOpenAIClient
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
 
 
 ANALYSIS_PROMPT = """You are a world-class interview analyst with deep expertise in hiring best practices, behavioral psychology, and organizational development. Analyze this interview transcript with the precision of a forensic examiner.
@@ -129,11 +132,8 @@ Return your analysis as valid JSON with this structure:
 class InterviewerAnalyzer:
     """Analyzes interviewer performance using LLM with structured output."""
 
-    def __init__(self, client: Optional[AsyncOpenAI] = None):
-        self.client = client or AsyncOpenAI(
-            base_url="https://openrouter.ai/api/v1",
-            api_key=OPENROUTER_API_KEY
-        )
+    def __init__(self, client: Optional["AsyncOpenAI"] = None):
+        self.client = client or LazyOpenAIClient("interviewer_analysis")
         self.model = LLM_MODEL
 
     async def analyze_interview(
@@ -9,7 +9,8 @@ import logging
 import uuid
 from typing import Dict, Any, Optional, List, Tuple
 
-from config import OPENROUTER_API_KEY, LLM_MODEL
+from config import OPENROUTER_API_KEY, OPENROUTER_BASE_URL, LLM_MODEL
+from services.telemetry import llm_event_hooks
 from models.voice_ingest import (
     JobProfile,
     CompanyIntelligence,
@@ -27,7 +28,7 @@ from models.voice_ingest.enums import (
 
 logger = logging.getLogger(__name__)
 
-OPENROUTER_URL = "https://openrouter.ai/api/v1/chat/completions"
+OPENROUTER_URL = f"{OPENROUTER_BASE_URL}/chat/completions"
 
 
 class JDExtractor:
@@ -70,7 +71,7 @@ class JDExtractor:
         prompt = self._build_extraction_prompt(jd_text, company_context)
 
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with httpx.AsyncClient(timeout=self.timeout, event_hooks=llm_event_hooks("jd_extraction")) as client:
                 response = await client.post(
                     OPENROUTER_URL,
                     headers=self._get_headers(),
@@ -536,7 +537,7 @@ async def extract_requirements_for_streamlined(
     prompt = _build_streamlined_extraction_prompt(raw_description[:5000])
 
     try:
-        async with httpx.AsyncClient(timeout=60.0) as client:
+        async with httpx.AsyncClient(timeout=60.0, event_hooks=llm_event_hooks("jd_extraction")) as client:
             response = await client.post(
                 OPENROUTER_URL,
                 headers={
@@ -661,3 +662,4 @@ async def trigger_jd_extraction_for_job(job_id: str, raw_description: str):
 
     except Exception as e:
         logger.error(f"Failed to extract requirements for job {job_id}: {e}")
+        raise
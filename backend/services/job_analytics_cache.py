@@ -0,0 +1,119 @@
+"""
+Job Analytics Cache.
+Holds the aggregated analytics summary per job (average score, recommendation
+breakdown, top candidates) so the job dashboard doesn't re-aggregate every
+analytics row on each load.
+
+Summaries are dropped when analytics for one of the job's interviews are
+created, regenerated or deleted, in this process and (through
+services/cache_invalidation.py) in the other processes on the host, and expire
+after a TTL as a backstop.
+"""
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Optional, Tuple
+
+from config import JOB_ANALYTICS_CACHE_TTL, JOB_ANALYTICS_CACHE_SIZE
+from services.cache_invalidation import invalidation_log
+
+logger = logging.getLogger(__name__)
+
+
+def _job_for_interview(interview_id: str) -> Optional[str]:
+    from db.client import get_db
+
+    result = get_db().table("interviews")\
+        .select("job_posting_id")\
+        .eq("id", str(interview_id))\
+        .execute()
+    return result.data[0].get("job_posting_id") if result.data else None
+
+
+class JobAnalyticsCache:
+    """Bounded, TTL'd per-job summary cache with interview-level invalidation."""
+
+    def __init__(
+        self,
+        ttl: float = JOB_ANALYTICS_CACHE_TTL,
+        max_entries: int = JOB_ANALYTICS_CACHE_SIZE,
+        resolve_job: Callable[[str], Optional[str]] = _job_for_interview,
+        channel: Optional[str] = None,
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._resolve_job = resolve_job
+        self._summaries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        # Repositories invalidate from sync code that may run in worker threads
+        self._lock = threading.Lock()
+        # Invalidations are shared with other processes under this name
+        self._channel = channel
+        self._invalidations = invalidation_log if channel else None
+        if channel:
+            self._invalidations.subscribe(channel, self)
+
+    def get(self, job_id: str) -> Optional[Any]:
+        """Cached summary for a job, or None if missing or expired."""
+        if self.ttl <= 0:
+            return None
+        if self._invalidations:
+            self._invalidations.poll()
+        with self._lock:
+            cached = self._summaries.get(str(job_id))
+            if cached is None:
+                return None
+            stored_at, summary = cached
+            if time.time() - stored_at >= self.ttl:
+                del self._summaries[str(job_id)]
+                return None
+            self._summaries.move_to_end(str(job_id))
+            return summary
+
+    def put(self, job_id: str, summary: Any) -> None:
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._summaries[str(job_id)] = (time.time(), summary)
+            self._summaries.move_to_end(str(job_id))
+            while len(self._summaries) > self.max_entries:
+                self._summaries.popitem(last=False)
+
+    def invalidate(self, job_id: str) -> None:
+        """Forget the summary for a job."""
+        self._publish("invalidate", job_id)
+        self._forget(job_id)
+
+    def invalidate_interview(self, interview_id: Optional[str], job_id: Optional[str] = None) -> None:
+        """Forget the summary of the job an interview belongs to (e.g. after new analytics)."""
+        # Before the empty check: the processes serving the dashboard may hold the summary
+        self._publish("invalidate_interview", interview_id, job_id)
+        if not self._summaries:
+            return
+        if not job_id:
+            try:
+                job_id = self._resolve_job(str(interview_id))
+            except Exception as e:
+                # Can't tell which job changed, so don't risk serving a stale summary
+                logger.warning(f"Could not resolve job for interview {interview_id}, clearing summaries: {e}")
+                self.clear()
+                return
+        if job_id:
+            logger.debug(f"Invalidating analytics summary for job {job_id} (interview {interview_id})")
+            self._forget(job_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._summaries.clear()
+
+    def _forget(self, job_id: str) -> None:
+        with self._lock:
+            self._summaries.pop(str(job_id), None)
+
+    def _publish(self, op: str, *args) -> None:
+        if self._invalidations:
+            self._invalidations.publish(self._channel, op, *args)
+
+
+# Global instance
+job_analytics_cache = JobAnalyticsCache(channel="job_analytics")
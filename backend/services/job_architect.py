@@ -2,8 +2,8 @@ import json
 import logging
 from typing import List, Optional, Dict, Literal, Any
 from pydantic import BaseModel, Field
-from openai import AsyncOpenAI
-from config import OPENROUTER_API_KEY, LLM_MODEL
+from config import LLM_MODEL
+from services.llm_clients import LazyOpenAIClient
 from services.market_data import get_market_data_service
 
 logger = logging.getLogger(__name__)
@@ -101,10 +101,7 @@ SYSTEM_PROMPT = """You are an expert Talent Acquisition Architect. Your goal is
 
 class JobArchitect:
     def __init__(self):
-        self.client = AsyncOpenAI(
-            base_url="https://openrouter.ai/api/v1",
-            api_key=OPENROUTER_API_KEY
-        )
+        self.client = LazyOpenAIClient("job_architect")
         self.model = LLM_MODEL
         self.market_service = get_market_data_service()
 
@@ -0,0 +1,46 @@
+"""
+OpenAI SDK clients for OpenRouter, built on first use.
+
+Importing the openai package takes over half a second (mostly its generated
+type modules), so services hold a LazyOpenAIClient from import time and the
+SDK is only imported, and the client built, when the first call is made.
+"""
+import threading
+from typing import Optional
+
+from config import OPENROUTER_API_KEY, OPENROUTER_BASE_URL
+from services.telemetry import llm_http_client
+
+
+def openrouter_client(family: str, sync: bool = False, api_key: Optional[str] = None):
+    """An OpenAI SDK client for OpenRouter with LLM telemetry under a prompt family."""
+    import openai
+
+    client_class = openai.OpenAI if sync else openai.AsyncOpenAI
+    return client_class(
+        base_url=OPENROUTER_BASE_URL,
+        api_key=api_key or OPENROUTER_API_KEY,
+        http_client=llm_http_client(family, sync=sync),
+    )
+
+
+class LazyOpenAIClient:
+    """Stands in for an OpenAI SDK client (client.chat..., client.beta...), building it on first use."""
+
+    def __init__(self, family: str, sync: bool = False, api_key: Optional[str] = None):
+        self.family = family
+        self.sync = sync
+        self.api_key = api_key
+        self._client = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        """The underlying client, built on the first call."""
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = openrouter_client(self.family, sync=self.sync, api_key=self.api_key)
+        return self._client
+
+    def __getattr__(self, name):
+        return getattr(self.get(), name)
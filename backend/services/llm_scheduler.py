@@ -0,0 +1,389 @@
+"""
+Deadline-aware, hedged and prioritised LLM HTTP calls.
+
+LLMTransport wraps the httpx transport of LLM clients (llm_transport() for
+hand-built httpx clients, llm_http_client() for the OpenAI SDK):
+
+- Deadlines: a route sets one with Depends(request_deadline(seconds)) (or
+  llm_deadline() around any block) and every LLM call made while serving it,
+  including SDK retries, must finish within what is left of it. A call past
+  its deadline raises LLMDeadlineExceeded, an httpx.TimeoutException, so
+  existing timeout handling applies. The X-Request-Timeout header (seconds)
+  can shorten a route's deadline, never extend it.
+- Hedging: for families in LLM_HEDGE_FAMILIES, a call still unanswered after
+  the family's recent p95 latency (LLM_HEDGE_PERCENTILE) gets a duplicate,
+  sent to LLM_HEDGE_FALLBACK_MODEL if set. The first usable response wins
+  and the other attempt is cancelled. Hedges cost a second call for the
+  slowest ~5% only. A hedge is admitted by the usage ledger like any call
+  (a refused hedge is simply not sent) and the loser is charged the cost
+  reserved for it.
+- Concurrency: at most LLM_MAX_CONCURRENCY calls per process are in flight.
+  Waiting interactive calls (LLM_INTERACTIVE_FAMILIES) are admitted before
+  bulk ones, and bulk calls never take the last LLM_INTERACTIVE_RESERVED
+  slots, so a screening batch cannot queue a live coaching call behind it.
+
+Latency samples, the limiter and hedge counts are per process; sync clients
+are not scheduled.
+"""
+import asyncio
+import json
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Deque, Dict, Iterable, Optional
+
+import httpx
+from fastapi import Request
+
+from config import (
+    LLM_HEDGE_DEFAULT_DELAY,
+    LLM_HEDGE_FALLBACK_MODEL,
+    LLM_HEDGE_FAMILIES,
+    LLM_HEDGE_MIN_DELAY,
+    LLM_HEDGE_PERCENTILE,
+    LLM_INTERACTIVE_RESERVED,
+    LLM_MAX_CONCURRENCY,
+)
+from services.llm_usage import BULK, INTERACTIVE, usage_ledger
+from services.telemetry import current_llm_family, registry
+
+MIN_LATENCY_SAMPLES = 20
+LATENCY_WINDOW = 200
+
+LLM_QUEUE_SECONDS = registry.histogram(
+    "llm_queue_wait_seconds", "Time LLM calls waited for a concurrency slot",
+    ["lane"], buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+LLM_HEDGES = registry.counter(
+    "llm_hedges_total", "Hedged LLM calls by which attempt answered first",
+    ["family", "winner"],
+)
+LLM_DEADLINE_EXCEEDED = registry.counter(
+    "llm_deadline_exceeded_total", "LLM calls abandoned at their request deadline",
+    ["family"],
+)
+
+_deadline: ContextVar[Optional[float]] = ContextVar("llm_deadline", default=None)
+
+
+class LLMDeadlineExceeded(httpx.TimeoutException):
+    """An LLM call could not finish before its request's deadline."""
+
+
+# =============================================================================
+# Deadlines
+# =============================================================================
+
+def _set_deadline(seconds: float):
+    deadline = time.monotonic() + seconds
+    current = _deadline.get()
+    return _deadline.set(deadline if current is None else min(current, deadline))
+
+
+@contextmanager
+def llm_deadline(seconds: float):
+    """LLM calls made inside the block must finish within seconds (or an earlier enclosing deadline)."""
+    token = _set_deadline(seconds)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def request_deadline(seconds: float):
+    """A route dependency giving the LLM calls made while serving the request a shared deadline."""
+    async def dependency(request: Request) -> None:
+        limit = seconds
+        header = request.headers.get("x-request-timeout")
+        if header:
+            try:
+                limit = min(limit, max(float(header), 0.0))
+            except ValueError:
+                pass
+        _set_deadline(limit)
+
+    return dependency
+
+
+def deadline_remaining() -> Optional[float]:
+    """Seconds left before the current deadline, or None without one."""
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+# =============================================================================
+# Concurrency budget
+# =============================================================================
+
+class LLMConcurrencyLimiter:
+    """Caps LLM calls in flight; interactive calls go first and have reserved slots."""
+
+    def __init__(self, limit: int = LLM_MAX_CONCURRENCY, interactive_reserved: int = LLM_INTERACTIVE_RESERVED):
+        self.limit = limit
+        self.interactive_reserved = min(interactive_reserved, max(limit - 1, 0))
+        self.in_flight = 0
+        self._waiters: Dict[str, Deque[asyncio.Future]] = {INTERACTIVE: deque(), BULK: deque()}
+
+    def _can_start(self, lane: str) -> bool:
+        capacity = self.limit if lane == INTERACTIVE else self.limit - self.interactive_reserved
+        return self.in_flight < capacity
+
+    async def acquire(self, lane: str, timeout: Optional[float] = None) -> None:
+        """Wait for a slot; raises asyncio.TimeoutError after timeout seconds."""
+        if self.limit <= 0:
+            return
+        if self._can_start(lane) and not self._waiters[lane]:
+            self.in_flight += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters[lane].append(waiter)
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(waiter, timeout)
+        except BaseException:
+            if waiter.done() and not waiter.cancelled():
+                self.release()  # granted just as we gave up
+            elif waiter in self._waiters[lane]:
+                self._waiters[lane].remove(waiter)
+            raise
+        finally:
+            LLM_QUEUE_SECONDS.observe(time.perf_counter() - start, lane=lane)
+
+    def release(self) -> None:
+        if self.limit <= 0:
+            return
+        self.in_flight -= 1
+        for lane in (INTERACTIVE, BULK):
+            queue = self._waiters[lane]
+            while queue and self._can_start(lane):
+                waiter = queue.popleft()
+                if not waiter.done():
+                    self.in_flight += 1
+                    waiter.set_result(None)
+
+
+# =============================================================================
+# Latency tracking
+# =============================================================================
+
+class LatencyTracker:
+    """Recent attempt latencies per family, for hedge delays."""
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self._samples: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=window))
+
+    def observe(self, family: str, seconds: float) -> None:
+        self._samples[family].append(seconds)
+
+    def percentile(self, family: str, q: float) -> Optional[float]:
+        samples = sorted(self._samples.get(family, ()))
+        if len(samples) < MIN_LATENCY_SAMPLES:
+            return None
+        return samples[min(int(q * len(samples)), len(samples) - 1)]
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    """A response body that frees the call's concurrency slot when closed."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, release):
+        self._stream = stream
+        self._release = release
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            release, self._release = self._release, None
+            if release is not None:
+                release()
+
+
+# =============================================================================
+# Transport
+# =============================================================================
+
+class LLMScheduler:
+    """Process-wide state shared by every LLMTransport."""
+
+    def __init__(
+        self,
+        limiter: Optional[LLMConcurrencyLimiter] = None,
+        hedge_families: Iterable[str] = LLM_HEDGE_FAMILIES.split(","),
+        hedge_percentile: float = LLM_HEDGE_PERCENTILE,
+        hedge_min_delay: float = LLM_HEDGE_MIN_DELAY,
+        hedge_default_delay: float = LLM_HEDGE_DEFAULT_DELAY,
+        fallback_model: Optional[str] = LLM_HEDGE_FALLBACK_MODEL,
+    ):
+        self.limiter = limiter or LLMConcurrencyLimiter()
+        self.latency = LatencyTracker()
+        self.hedge_families = {f.strip() for f in hedge_families if f.strip()}
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_delay = hedge_min_delay
+        self.hedge_default_delay = hedge_default_delay
+        self.fallback_model = fallback_model
+
+    def hedge_delay(self, family: str) -> float:
+        observed = self.latency.percentile(family, self.hedge_percentile)
+        return max(self.hedge_default_delay if observed is None else observed, self.hedge_min_delay)
+
+
+llm_scheduler = LLMScheduler()
+
+
+def _json_body(request: httpx.Request) -> Optional[dict]:
+    if "json" not in request.headers.get("content-type", ""):
+        return None
+    try:
+        body = json.loads(request.content)
+    except (ValueError, httpx.RequestNotRead):
+        return None
+    return body if isinstance(body, dict) else None
+
+
+def _usable(task: asyncio.Task) -> bool:
+    return task.exception() is None and task.result().status_code < 500 and task.result().status_code != 429
+
+
+class LLMTransport(httpx.AsyncBaseTransport):
+    """httpx transport adding deadlines, hedging and the concurrency budget to LLM calls."""
+
+    def __init__(self, family: str, transport: Optional[httpx.AsyncBaseTransport] = None,
+                 scheduler: Optional[LLMScheduler] = None, limits: Optional[httpx.Limits] = None):
+        self.family = family
+        # httpx ignores a client's limits= once it is given a transport, so the pool gets them here
+        if transport is None:
+            transport = httpx.AsyncHTTPTransport(limits=limits) if limits else httpx.AsyncHTTPTransport()
+        self._transport = transport
+        self._scheduler = scheduler
+
+    @property
+    def scheduler(self) -> LLMScheduler:
+        return self._scheduler or llm_scheduler
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        telemetry = request.extensions.get("telemetry")
+        family = telemetry[1] if telemetry else current_llm_family(self.family)
+        deadline = _deadline.get()
+        try:
+            if family not in self.scheduler.hedge_families:
+                return await self._within_deadline(self._attempt(request, family), deadline)
+            return await self._hedged(request, family, deadline)
+        except asyncio.TimeoutError:
+            LLM_DEADLINE_EXCEEDED.inc(family=family)
+            raise LLMDeadlineExceeded(f"LLM call ({family}) exceeded its request deadline", request=request)
+
+    @staticmethod
+    async def _within_deadline(coro, deadline: Optional[float]):
+        if deadline is None:
+            return await coro
+        return await asyncio.wait_for(coro, max(deadline - time.monotonic(), 0.0))
+
+    async def _attempt(self, request: httpx.Request, family: str) -> httpx.Response:
+        limiter = self.scheduler.limiter
+        await limiter.acquire(usage_ledger.lane(family))
+        start = time.perf_counter()
+        try:
+            response = await self._transport.handle_async_request(request)
+        except asyncio.CancelledError:
+            # Abandoned (deadline or lost hedge): at least this slow
+            self.scheduler.latency.observe(family, time.perf_counter() - start)
+            limiter.release()
+            raise
+        except BaseException:
+            limiter.release()
+            raise
+        if response.status_code < 500:
+            self.scheduler.latency.observe(family, time.perf_counter() - start)
+        if response.is_closed:
+            limiter.release()  # body already in memory
+        else:
+            response.stream = _ReleasingStream(response.stream, limiter.release)
+        return response
+
+    def _hedge_request(self, request: httpx.Request) -> Optional[httpx.Request]:
+        try:
+            content = request.content
+        except httpx.RequestNotRead:
+            return None  # a streamed body cannot be sent twice
+        fallback = self.scheduler.fallback_model
+        body = _json_body(request)
+        if fallback and body is not None:
+            body["model"] = fallback
+            content = json.dumps(body).encode()
+        headers = [(k, v) for k, v in request.headers.raw if k.lower() != b"content-length"]
+        return httpx.Request(request.method, request.url, headers=headers, content=content,
+                             extensions=dict(request.extensions))
+
+    async def _hedge_attempt(self, hedge: httpx.Request, family: str) -> httpx.Response:
+        """Admit the hedge against its organization's limits (like the original call) and send it."""
+        # Copied from the original call; replaced once the hedge is admitted itself
+        if hedge.extensions.pop("telemetry", None):
+            attribution, reserved = await usage_ledger.admit(family, usage_ledger.estimate_cost(_json_body(hedge)))
+            hedge.extensions["telemetry"] = (time.perf_counter(), family, attribution, reserved)
+        return await self._attempt(hedge, family)
+
+    async def _discard(self, task: asyncio.Task, request: httpx.Request, telemetry: Optional[tuple], family: str) -> None:
+        """Cancel or close a losing attempt and charge it what admission reserved."""
+        if not task.done():
+            task.cancel()
+        elif task.cancelled() or task.exception() is not None:
+            return
+        else:
+            await task.result().aclose()
+        if telemetry:
+            start, _, attribution, reserved = telemetry
+            model = (_json_body(request) or {}).get("model")
+            usage_ledger.record_abandoned(family, attribution, model, reserved, time.perf_counter() - start)
+
+    async def _hedged(self, request: httpx.Request, family: str, deadline: Optional[float]) -> httpx.Response:
+        def remaining() -> Optional[float]:
+            return None if deadline is None else max(deadline - time.monotonic(), 0.0)
+
+        primary = asyncio.create_task(self._attempt(request, family))
+        attempts = [primary]
+        hedge = winner = None
+        try:
+            delay = self.scheduler.hedge_delay(family)
+            if deadline is not None:
+                delay = min(delay, remaining())
+            await asyncio.wait(attempts, timeout=delay)
+            hedge = None if primary.done() or remaining() == 0.0 else self._hedge_request(request)
+            if hedge is not None:
+                attempts.append(asyncio.create_task(self._hedge_attempt(hedge, family)))
+
+            pending = {task for task in attempts if not task.done()}
+            while True:
+                winner = next((task for task in attempts if task.done() and _usable(task)), None)
+                if winner is not None or not pending:
+                    break
+                done, pending = await asyncio.wait(pending, timeout=remaining(), return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    raise asyncio.TimeoutError
+            if winner is None:
+                # Every attempt failed: surface the primary's error response or exception
+                winner = next((task for task in attempts if task.exception() is None), primary)
+            if len(attempts) > 1:
+                LLM_HEDGES.inc(family=family, winner="primary" if winner is primary else "hedge")
+            return winner.result()
+        finally:
+            requests = (request, hedge)
+            tickets = [r.extensions.get("telemetry") for r in requests[:len(attempts)]]
+            for task, attempt_request, ticket in zip(attempts, requests, tickets):
+                if task is not winner:
+                    await self._discard(task, attempt_request, ticket, family)
+            if winner is not None and winner is not primary and tickets[1]:
+                # httpx hands the response hook the original request: settle the hedge's reservation
+                request.extensions["telemetry"] = tickets[1]
+
+
+def llm_transport(family: str) -> LLMTransport:
+    """Transport for an httpx.AsyncClient making LLM calls: httpx.AsyncClient(transport=llm_transport(family))."""
+    return LLMTransport(family)
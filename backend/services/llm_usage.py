@@ -0,0 +1,525 @@
+"""
+LLM usage ledger and per-organization limits.
+
+Every LLM call made through the telemetry hooks (llm_event_hooks /
+llm_http_client) is admitted here before it is sent and recorded after its
+response: prompt family, model, input/output/cached tokens, latency, cost and
+whether the provider served part of the prompt from cache. Calls are
+attributed to the organization, job and candidate set with llm_attribution()
+(task handlers) or attribute_request() (the auth dependency); with only a job,
+candidate or interview id the organization is looked up. Records are buffered
+and written to the llm_usage table in batches.
+
+Limits are checked before dispatch, per organization and per lane. Prompt
+families in LLM_INTERACTIVE_FAMILIES (live coaching, room chat, prebriefs)
+use the interactive lane and everything else (screening, extraction, Pluto)
+the bulk lane. Each lane has its own calls-per-minute bucket, so a bulk upload
+cannot use up the interactive lane: bulk calls wait for a slot (up to
+LLM_LIMIT_MAX_WAIT) while interactive calls fail fast. Bulk work may spend
+only LLM_BULK_BUDGET_SHARE of the daily budget, which keeps the rest for
+interactive work. A refused call raises LLMLimitExceeded, which the API
+returns as 429. Admission reserves the call's estimated cost against the
+budget (see estimate_cost()) and the response replaces it with the actual
+cost, so a burst of concurrent calls cannot all pass the same check; an
+attempt that never gets a response keeps its estimate.
+
+Rate buckets and spend are per process; spend is seeded from the ledger once
+per organization per UTC day.
+"""
+import asyncio
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from config import (
+    LLM_BULK_BUDGET_SHARE,
+    LLM_INTERACTIVE_FAMILIES,
+    LLM_LIMIT_MAX_WAIT,
+    LLM_ORG_BULK_RPM,
+    LLM_ORG_DAILY_BUDGET_USD,
+    LLM_ORG_INTERACTIVE_RPM,
+    LLM_ORG_LIMITS,
+    LLM_PRICES,
+    LLM_RESERVE_COMPLETION_TOKENS,
+    LLM_USAGE_FLUSH_INTERVAL,
+    LLM_USAGE_FLUSH_SIZE,
+    LLM_USAGE_LEDGER_ENABLED,
+)
+from services.telemetry import registry
+
+logger = logging.getLogger(__name__)
+
+INTERACTIVE = "interactive"
+BULK = "bulk"
+
+LLM_COST = registry.counter(
+    "llm_cost_usd_total", "Estimated LLM spend in USD",
+    ["family", "model"],
+)
+LLM_LIMITED = registry.counter(
+    "llm_limited_total", "LLM calls refused before dispatch by per-organization limits",
+    ["lane", "reason"],
+)
+
+# USD per 1M tokens: (input, cached input, output); LLM_PRICES adds or overrides models.
+# Used only when the response's usage carries no cost of its own.
+DEFAULT_PRICES: Dict[str, Tuple[float, float, float]] = {
+    "google/gemini-2.5-flash": (0.30, 0.075, 2.50),
+    "google/gemini-2.0-flash-001": (0.10, 0.025, 0.40),
+    "openai/gpt-4o-mini": (0.15, 0.075, 0.60),
+    "openai/gpt-4o": (2.50, 1.25, 10.00),
+    "anthropic/claude-3-haiku": (0.25, 0.03, 1.25),
+}
+
+
+def _json_setting(name: str, raw: str) -> Dict[str, Any]:
+    if not raw:
+        return {}
+    try:
+        value = json.loads(raw)
+    except ValueError:
+        logger.warning(f"{name} is not valid JSON; ignoring it")
+        return {}
+    return value if isinstance(value, dict) else {}
+
+
+# =============================================================================
+# Attribution
+# =============================================================================
+
+ATTRIBUTION_FIELDS = ("organization_id", "job_id", "candidate_id", "interview_id")
+
+_attribution: ContextVar[Optional[Dict[str, str]]] = ContextVar("llm_attribution", default=None)
+
+
+def _merged(ids: Dict[str, Any]) -> Dict[str, str]:
+    merged = dict(_attribution.get() or {})
+    merged.update({k: str(v) for k, v in ids.items() if v and k in ATTRIBUTION_FIELDS})
+    return merged
+
+
+@contextmanager
+def llm_attribution(**ids):
+    """
+    Attribute LLM calls made inside the block to organization_id, job_id and
+    candidate_id (an interview_id is only used to find the organization).
+    Ids not given are inherited from the enclosing block.
+    """
+    token = _attribution.set(_merged(ids))
+    try:
+        yield
+    finally:
+        _attribution.reset(token)
+
+
+def attribute_request(**ids) -> None:
+    """Attribute the rest of the current request's LLM calls (each request runs in its own context)."""
+    _attribution.set(_merged(ids))
+
+
+def _resolve_org_sync(attribution: Dict[str, str]) -> Optional[str]:
+    """Organization for the attribution, looking it up from the job/candidate/interview if needed."""
+    if attribution.get("organization_id"):
+        return attribution["organization_id"]
+    from services.access_control import ownership_resolver, JOB, CANDIDATE, INTERVIEW
+
+    for kind, field in ((JOB, "job_id"), (CANDIDATE, "candidate_id"), (INTERVIEW, "interview_id")):
+        if not attribution.get(field):
+            continue
+        try:
+            org_id = ownership_resolver.org_id(kind, attribution[field])
+        except Exception as e:
+            logger.warning(f"Could not resolve organization for {kind} {attribution[field]}: {e}")
+            return None
+        if org_id:
+            # Memoised for the rest of this attribution scope
+            attribution["organization_id"] = str(org_id)
+            return attribution["organization_id"]
+    return None
+
+
+# =============================================================================
+# Limits
+# =============================================================================
+
+class LLMLimitExceeded(Exception):
+    """An LLM call was refused before dispatch by its organization's rate or budget limit."""
+
+    def __init__(self, organization_id: str, lane: str, reason: str, retry_after: Optional[float] = None):
+        self.organization_id = organization_id
+        self.lane = lane
+        self.reason = reason  # "rate" or "budget"
+        self.retry_after = retry_after
+        super().__init__(f"LLM {reason} limit reached for organization {organization_id} ({lane} calls)")
+
+
+@dataclass
+class OrgLimits:
+    """Per-organization limits; 0 means unlimited."""
+
+    bulk_rpm: float = 0
+    interactive_rpm: float = 0
+    daily_budget_usd: float = 0
+
+    @property
+    def any(self) -> bool:
+        return bool(self.bulk_rpm or self.interactive_rpm or self.daily_budget_usd)
+
+
+class _RateLane:
+    """Calls-per-minute token bucket allowing bursts of ten seconds' worth of calls."""
+
+    def __init__(self, per_minute: float):
+        self.per_minute = per_minute
+        self.rate = per_minute / 60.0
+        self.capacity = max(1.0, per_minute / 6.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, max_wait: float) -> Optional[float]:
+        """Book a slot and return how long to wait for it, or None if that is longer than max_wait."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            wait = 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+            if wait > max_wait:
+                return None
+            self.tokens -= 1
+            return wait
+
+
+def _utc_day() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%d")
+
+
+# =============================================================================
+# Ledger
+# =============================================================================
+
+class UsageLedger:
+    """Admits LLM calls against per-organization limits and records what they used."""
+
+    def __init__(
+        self,
+        enabled: bool = LLM_USAGE_LEDGER_ENABLED,
+        flush_size: int = LLM_USAGE_FLUSH_SIZE,
+        flush_interval: float = LLM_USAGE_FLUSH_INTERVAL,
+        interactive_families: Iterable[str] = LLM_INTERACTIVE_FAMILIES.split(","),
+        default_limits: Optional[OrgLimits] = None,
+        org_limits: Optional[Dict[str, Dict[str, float]]] = None,
+        bulk_budget_share: float = LLM_BULK_BUDGET_SHARE,
+        max_wait: float = LLM_LIMIT_MAX_WAIT,
+        prices: Optional[Dict[str, Tuple[float, float, float]]] = None,
+    ):
+        self.enabled = enabled
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.interactive_families = {f.strip() for f in interactive_families if f.strip()}
+        self.default_limits = default_limits or OrgLimits(
+            LLM_ORG_BULK_RPM, LLM_ORG_INTERACTIVE_RPM, LLM_ORG_DAILY_BUDGET_USD,
+        )
+        self.org_limits = {
+            str(org_id): OrgLimits(**{
+                **vars(self.default_limits),
+                **{k: float(v) for k, v in overrides.items() if k in OrgLimits.__dataclass_fields__},
+            })
+            for org_id, overrides in (
+                org_limits if org_limits is not None else _json_setting("LLM_ORG_LIMITS", LLM_ORG_LIMITS)
+            ).items()
+        }
+        self.bulk_budget_share = bulk_budget_share
+        self.max_wait = max_wait
+        self.prices = prices if prices is not None else {
+            **DEFAULT_PRICES,
+            **{model: tuple(p) for model, p in _json_setting("LLM_PRICES", LLM_PRICES).items()},
+        }
+
+        self._lock = threading.Lock()
+        self._buffer: List[Dict[str, Any]] = []
+        self._last_flush = time.monotonic()
+        self._pending: set = set()
+        self._lanes: Dict[Tuple[str, str], _RateLane] = {}
+        # org -> lane -> USD spent today (this process's view, seeded from the ledger)
+        self._spend_day = _utc_day()
+        self._spend: Dict[str, Dict[str, float]] = {}
+
+    @property
+    def active(self) -> bool:
+        """Whether calls need admitting or recording at all."""
+        return self.enabled or self.default_limits.any or any(l.any for l in self.org_limits.values())
+
+    def lane(self, family: str) -> str:
+        return INTERACTIVE if family in self.interactive_families else BULK
+
+    def limits_for(self, organization_id: Optional[str]) -> OrgLimits:
+        if organization_id is None:
+            return OrgLimits()
+        return self.org_limits.get(str(organization_id), self.default_limits)
+
+    # -- admission ----------------------------------------------------------
+
+    async def admit(self, family: str, estimate: float = 0.0) -> Tuple[Dict[str, str], float]:
+        """
+        Check limits for a call about to be sent (waiting for a bulk slot).
+        Returns its attribution and the USD reserved against the budget, to
+        pass to record().
+        """
+        attribution = _attribution.get() or {}
+        if attribution and not attribution.get("organization_id"):
+            await asyncio.to_thread(_resolve_org_sync, attribution)
+        org_id = attribution.get("organization_id")
+        limits = self.limits_for(org_id)
+        if limits.daily_budget_usd and not self._seeded(org_id):
+            await asyncio.to_thread(self.load_spend_sync, org_id)
+        wait, reserved = self._check(family, org_id, limits, attribution, estimate)
+        if wait:
+            await asyncio.sleep(wait)
+        return dict(attribution), reserved
+
+    def admit_sync(self, family: str, estimate: float = 0.0) -> Tuple[Dict[str, str], float]:
+        """admit() for synchronous clients."""
+        attribution = _attribution.get() or {}
+        if attribution and not attribution.get("organization_id"):
+            _resolve_org_sync(attribution)
+        org_id = attribution.get("organization_id")
+        limits = self.limits_for(org_id)
+        if limits.daily_budget_usd:
+            self.load_spend_sync(org_id)
+        wait, reserved = self._check(family, org_id, limits, attribution, estimate)
+        if wait:
+            time.sleep(wait)
+        return dict(attribution), reserved
+
+    def _check(
+        self, family: str, org_id: Optional[str], limits: OrgLimits, attribution: Dict[str, str], estimate: float,
+    ) -> Tuple[float, float]:
+        """
+        Seconds to wait before sending and USD reserved; raises
+        LLMLimitExceeded if the call may not be sent.
+        """
+        if org_id is None or not limits.any:
+            return 0.0, 0.0
+        lane = self.lane(family)
+
+        reserved = 0.0
+        if limits.daily_budget_usd:
+            # Checked and reserved in one step, so concurrent calls see each other
+            with self._lock:
+                self._roll_day()
+                lanes = self._spend.get(org_id)
+                spent = dict(lanes or {})
+                over = sum(spent.values()) >= limits.daily_budget_usd or (
+                    lane == BULK and spent.get(BULK, 0.0) >= limits.daily_budget_usd * self.bulk_budget_share
+                )
+                if not over and lanes is not None and estimate:
+                    lanes[lane] = lanes.get(lane, 0.0) + estimate
+                    reserved = estimate
+            if over:
+                self._refuse(family, attribution, lane, "budget")
+
+        per_minute = limits.interactive_rpm if lane == INTERACTIVE else limits.bulk_rpm
+        if not per_minute:
+            return 0.0, reserved
+        key = (org_id, lane)
+        with self._lock:
+            bucket = self._lanes.get(key)
+            if bucket is None or bucket.per_minute != per_minute:
+                bucket = self._lanes[key] = _RateLane(per_minute)
+        # Interactive calls fail fast rather than queue behind a busy minute
+        wait = bucket.reserve(self.max_wait if lane == BULK else 0.0)
+        if wait is None:
+            self._add_spend(org_id, lane, -reserved)
+            self._refuse(family, attribution, lane, "rate", retry_after=1.0 / bucket.rate)
+        return wait, reserved
+
+    def _refuse(self, family: str, attribution: Dict[str, str], lane: str, reason: str, retry_after: Optional[float] = None):
+        LLM_LIMITED.inc(lane=lane, reason=reason)
+        self._append(self._row(family, attribution, model=None, outcome="limited"))
+        raise LLMLimitExceeded(attribution["organization_id"], lane, reason, retry_after)
+
+    # -- spend ----------------------------------------------------------------
+
+    def _roll_day(self) -> None:
+        day = _utc_day()
+        if day != self._spend_day:
+            self._spend_day = day
+            self._spend = {}
+
+    def _seeded(self, org_id: Optional[str]) -> bool:
+        with self._lock:
+            self._roll_day()
+            return org_id is None or org_id in self._spend
+
+    def load_spend_sync(self, org_id: str) -> None:
+        """Load today's spend by lane for an organization from the ledger, once per day."""
+        from repositories.llm_usage_repository import LLMUsageRepository
+
+        if self._seeded(org_id):
+            return
+
+        midnight = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+        spent: Dict[str, float] = {}
+        try:
+            for row in LLMUsageRepository().summary_sync(org_id, "lane", midnight):
+                spent[row["key"]] = float(row["cost_usd"] or 0)
+        except Exception as e:
+            logger.warning(f"Could not load today's LLM spend for organization {org_id}: {e}")
+        with self._lock:
+            self._roll_day()
+            self._spend.setdefault(org_id, spent)
+
+    def _add_spend(self, org_id: Optional[str], lane: str, amount: float) -> None:
+        if not org_id or not amount:
+            return
+        with self._lock:
+            self._roll_day()
+            lanes = self._spend.get(org_id)
+            if lanes is not None:
+                lanes[lane] = lanes.get(lane, 0.0) + amount
+
+    def spent_today(self, org_id: str) -> Dict[str, float]:
+        """USD spent today by lane, as this process sees it."""
+        with self._lock:
+            self._roll_day()
+            return dict(self._spend.get(str(org_id), {}))
+
+    # -- recording ------------------------------------------------------------
+
+    def cost(self, model: str, prompt_tokens: int, cached_tokens: int, completion_tokens: int) -> float:
+        """Estimated USD cost from the price table (0 for unknown models)."""
+        price = self.prices.get(model)
+        if price is None:
+            # Providers append version suffixes, e.g. google/gemini-2.5-flash-preview-05-20
+            matches = [m for m in self.prices if model.startswith(m)]
+            if not matches:
+                return 0.0
+            price = self.prices[max(matches, key=len)]
+        input_price, cached_price, output_price = price
+        uncached = max(prompt_tokens - cached_tokens, 0)
+        return (uncached * input_price + cached_tokens * cached_price + completion_tokens * output_price) / 1_000_000
+
+    def estimate_cost(self, body: Optional[dict]) -> float:
+        """
+        USD to reserve for a chat completion request before it is sent:
+        about 4 characters per prompt token and max_tokens (or
+        LLM_RESERVE_COMPLETION_TOKENS) of output.
+        """
+        if not body or not body.get("model"):
+            return 0.0
+        prompt_tokens = len(json.dumps(body.get("messages") or body.get("prompt") or "")) // 4
+        completion_tokens = body.get("max_tokens") or body.get("max_completion_tokens") or LLM_RESERVE_COMPLETION_TOKENS
+        return self.cost(str(body["model"]), prompt_tokens, 0, int(completion_tokens))
+
+    def record(
+        self,
+        family: str,
+        attribution: Optional[Dict[str, str]],
+        status_code: int,
+        body: Optional[dict],
+        latency: float,
+        reserved: float = 0.0,
+    ) -> None:
+        """Record one LLM HTTP attempt from its response, settling what admit() reserved."""
+        body = body or {}
+        usage = body.get("usage") or {}
+        model = body.get("model") or "unknown"
+        prompt_tokens = int(usage.get("prompt_tokens") or 0)
+        completion_tokens = int(usage.get("completion_tokens") or 0)
+        cached_tokens = int((usage.get("prompt_tokens_details") or {}).get("cached_tokens") or 0)
+        cost = usage.get("cost")
+        cost = float(cost) if cost is not None else self.cost(model, prompt_tokens, cached_tokens, completion_tokens)
+        if cost:
+            LLM_COST.inc(cost, family=family, model=model)
+
+        attribution = attribution or {}
+        self._add_spend(attribution.get("organization_id"), self.lane(family), cost - reserved)
+
+        self._append(self._row(
+            family, attribution, model,
+            outcome="ok" if 200 <= status_code < 300 else "error",
+            status_code=status_code,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            cached_tokens=cached_tokens,
+            cache_hit=cached_tokens > 0,
+            latency_ms=int(latency * 1000),
+            cost_usd=round(cost, 6),
+        ))
+
+    def record_abandoned(
+        self, family: str, attribution: Optional[Dict[str, str]], model: Optional[str], reserved: float, latency: float,
+    ) -> None:
+        """
+        Record an attempt dropped before its response was read (a hedged
+        call's loser). The provider may still bill it, so it is charged what
+        admit() reserved.
+        """
+        if reserved:
+            LLM_COST.inc(reserved, family=family, model=model or "unknown")
+        self._append(self._row(
+            family, attribution or {}, model, outcome="cancelled",
+            latency_ms=int(latency * 1000), cost_usd=round(reserved, 6),
+        ))
+
+    def _row(self, family: str, attribution: Dict[str, str], model: Optional[str], outcome: str, **fields) -> Dict[str, Any]:
+        return {
+            "organization_id": attribution.get("organization_id"),
+            "job_id": attribution.get("job_id"),
+            "candidate_id": attribution.get("candidate_id"),
+            "family": family,
+            "lane": self.lane(family),
+            "model": model,
+            "outcome": outcome,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            **fields,
+        }
+
+    # -- persistence ----------------------------------------------------------
+
+    def _append(self, row: Dict[str, Any]) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._buffer.append(row)
+            if len(self._buffer) < self.flush_size and time.monotonic() - self._last_flush < self.flush_interval:
+                return
+            batch, self._buffer = self._buffer, []
+            self._last_flush = time.monotonic()
+
+        # Off the event loop when there is one; sync clients already run in a worker thread
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._write(batch)
+            return
+        future = loop.run_in_executor(None, self._write, batch)
+        self._pending.add(future)
+        future.add_done_callback(self._pending.discard)
+
+    def _write(self, batch: List[Dict[str, Any]]) -> None:
+        from repositories.llm_usage_repository import LLMUsageRepository
+
+        try:
+            LLMUsageRepository().insert_many_sync(batch)
+        except Exception as e:
+            logger.error(f"Writing {len(batch)} LLM usage records failed: {e}")
+
+    def flush(self) -> int:
+        """Write buffered records now (blocking). Returns how many were written."""
+        with self._lock:
+            batch, self._buffer = self._buffer, []
+            self._last_flush = time.monotonic()
+        if batch:
+            self._write(batch)
+        return len(batch)
+
+
+usage_ledger = UsageLedger()
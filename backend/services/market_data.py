@@ -5,9 +5,10 @@ import logging
 import os
 import json
 import random
-from openai import AsyncOpenAI
 import httpx
 
+from services.llm_clients import LazyOpenAIClient
+
 logger = logging.getLogger(__name__)
 
 class MarketInsights(BaseModel):
@@ -79,10 +80,7 @@ class WebSearchMarketProvider(MarketDataProvider):
     """
     def __init__(self):
         self.api_key = os.getenv("SERPAPI_KEY")
-        self.client = AsyncOpenAI(
-            base_url="https://openrouter.ai/api/v1",
-            api_key=os.getenv("OPENROUTER_API_KEY")
-        )
+        self.client = LazyOpenAIClient("market_data")
         self.model = os.getenv("LLM_MODEL", "google/gemini-2.5-flash")
     
     async def get_insights(self, role: str, location: str) -> MarketInsights:
@@ -191,8 +189,28 @@ class WebSearchMarketProvider(MarketDataProvider):
                 sources=[f"Error accessing market data: {str(e)}"]
             )
 
+class CachedMarketDataProvider(MarketDataProvider):
+    """
+    Serves insights from the market insights store (normalised role/location
+    key, SQLite-backed TTL cache) in front of the web search provider.
+    """
+    def __init__(self, store=None):
+        if store is None:
+            from services.market_insights_store import market_insights_store
+            store = market_insights_store
+        self.store = store
+
+    async def get_insights(self, role: str, location: str) -> MarketInsights:
+        return await self.store.get_insights(role, location)
+
+_market_data_service: Optional[MarketDataProvider] = None
+
 def get_market_data_service() -> MarketDataProvider:
     """Factory to get the configured provider."""
-    # Always return WebSearch provider as requested by user.
+    # Always use the WebSearch provider as requested by user (via the store's cache).
     # It handles its own fallback/error states if key is missing.
-    return WebSearchMarketProvider()
+    # Shared instance: one OpenRouter client and insights store per process.
+    global _market_data_service
+    if _market_data_service is None:
+        _market_data_service = CachedMarketDataProvider()
+    return _market_data_service
@@ -0,0 +1,456 @@
+"""
+Market Insights Store.
+Caches offer-prep compensation research and Job Architect market insights
+by normalised (role, location), persisted in a local SQLite table so known
+roles answer in milliseconds instead of a 20-40s search + LLM extraction.
+
+Freshness follows the company intel cache: fresh entries are served as-is,
+stale entries are served while a background refresh runs, expired entries
+are researched again. Concurrent requests for the same key share one
+in-flight research, and open jobs' roles can be prefetched in bulk.
+"""
+import asyncio
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from config import (
+    MARKET_DATA_FRESH_TTL,
+    MARKET_DATA_STALE_TTL,
+    MARKET_DATA_PREFETCH_CONCURRENCY,
+)
+from models.compensation import CompensationData
+from services.market_data import MarketInsights
+from services.single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LOCATION = "San Francisco"
+
+ROLE_ALIASES = {
+    "sr": "senior",
+    "snr": "senior",
+    "jr": "junior",
+    "eng": "engineer",
+    "engr": "engineer",
+    "dev": "developer",
+    "mgr": "manager",
+    "swe": "software engineer",
+    "sde": "software engineer",
+    "pm": "product manager",
+    "em": "engineering manager",
+    "ml": "machine learning",
+    "fe": "frontend",
+    "be": "backend",
+}
+
+LOCATION_ALIASES = {
+    "sf": "san francisco",
+    "sfo": "san francisco",
+    "san fran": "san francisco",
+    "bay area": "san francisco",
+    "sf bay area": "san francisco",
+    "nyc": "new york",
+    "ny": "new york",
+    "new york city": "new york",
+    "la": "los angeles",
+    "dc": "washington",
+    "washington dc": "washington",
+}
+
+
+def normalize_role(role: Optional[str]) -> str:
+    """'Sr. Software Eng (Backend)' -> 'senior software engineer backend'."""
+    tokens = re.sub(r"[^a-z0-9+#]+", " ", (role or "").lower()).split()
+    return " ".join(ROLE_ALIASES.get(token, token) for token in tokens) or "unknown"
+
+
+def normalize_location(location: Optional[str]) -> str:
+    """'San Francisco, CA' / 'SF' / 'Bay Area' -> 'san francisco'; any remote variant -> 'remote'."""
+    text = (location or "").lower().strip()
+    if not text:
+        return normalize_location(DEFAULT_LOCATION)
+    if "remote" in text:
+        return "remote"
+    # Drop state/country qualifiers: "austin, tx, usa" -> "austin"
+    city = re.sub(r"[^a-z0-9 ]+", " ", text.split(",")[0])
+    city = " ".join(city.split())
+    return LOCATION_ALIASES.get(city, city) or "unknown"
+
+
+@dataclass
+class MarketEntry:
+    """One cached research result."""
+    payload: Dict[str, Any]
+    fetched_at: float = field(default_factory=time.time)
+
+    def age(self) -> float:
+        return time.time() - self.fetched_at
+
+
+@dataclass
+class CompensationLookup:
+    """Compensation data plus the search metadata offer prep reports back."""
+    data: CompensationData
+    results_count: int = 0
+    errors: List[str] = field(default_factory=list)
+    cached: bool = False
+
+
+CacheKey = Tuple[str, str, str, str]
+
+
+class MarketInsightsStore:
+    """(role, location)-keyed market research cache backed by SQLite."""
+
+    def __init__(
+        self,
+        search_service=None,
+        extractor=None,
+        provider=None,
+        company_cache=None,
+        db_path: Optional[str] = None,
+        fresh_ttl: float = MARKET_DATA_FRESH_TTL,
+        stale_ttl: float = MARKET_DATA_STALE_TTL,
+    ):
+        self._search_service = search_service
+        self._extractor = extractor
+        self._provider = provider
+        self._company_cache = company_cache
+        if db_path is None:
+            db_path = Path(__file__).parent.parent / "data" / "market_insights.db"
+        self.db_path = Path(db_path)
+        self.fresh_ttl = fresh_ttl
+        self.stale_ttl = stale_ttl
+        self._entries: Dict[CacheKey, MarketEntry] = {}
+        self._flights = SingleFlight("market research")
+        self._conn: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+
+    # ==========================================================================
+    # Dependencies (resolved lazily so importing the store stays cheap)
+    # ==========================================================================
+
+    @property
+    def search_service(self):
+        if self._search_service is None:
+            from services.parallel_ai import parallel_service
+            self._search_service = parallel_service
+        return self._search_service
+
+    @property
+    def extractor(self):
+        if self._extractor is None:
+            from services.compensation_extractor import compensation_extractor
+            self._extractor = compensation_extractor
+        return self._extractor
+
+    @property
+    def provider(self):
+        if self._provider is None:
+            from services.market_data import WebSearchMarketProvider
+            self._provider = WebSearchMarketProvider()
+        return self._provider
+
+    @property
+    def company_cache(self):
+        if self._company_cache is None:
+            from services.company_intel_cache import company_intel_cache
+            self._company_cache = company_intel_cache
+        return self._company_cache
+
+    # ==========================================================================
+    # Public API
+    # ==========================================================================
+
+    async def get_compensation(
+        self,
+        role_title: str,
+        location: Optional[str] = None,
+        company_stage: Optional[str] = None,
+        years_experience: Optional[int] = None,
+        industry: Optional[str] = None,
+        specific_company: Optional[str] = None,
+        company_website: Optional[str] = None,
+    ) -> CompensationLookup:
+        """Compensation research + extraction for a role, cached by normalised key."""
+        location = location or DEFAULT_LOCATION
+        variant = self._variant(
+            company_stage=company_stage,
+            years_experience=years_experience,
+            industry=industry,
+            specific_company=specific_company,
+            company_website=company_website,
+        )
+        key = ("compensation", normalize_role(role_title), normalize_location(location), variant)
+
+        async def research() -> Dict[str, Any]:
+            return await self._research_compensation(
+                role_title, location, company_stage, years_experience,
+                industry, specific_company, company_website,
+            )
+
+        entry, cached = await self._get(key, research, self._compensation_cacheable)
+        payload = entry.payload
+        return CompensationLookup(
+            data=CompensationData(**payload["data"]),
+            results_count=payload.get("results_count", 0),
+            # Search errors only describe the request that produced them
+            errors=[] if cached else list(payload.get("errors", [])),
+            cached=cached,
+        )
+
+    async def get_insights(self, role: str, location: Optional[str] = None) -> MarketInsights:
+        """Job Architect market insights for a role, cached by normalised key."""
+        location = location or DEFAULT_LOCATION
+        key = ("insights", normalize_role(role), normalize_location(location), "")
+
+        async def research() -> Dict[str, Any]:
+            insights = await self.provider.get_insights(role, location)
+            return insights.model_dump(mode="json")
+
+        entry, _ = await self._get(key, research, self._insights_cacheable)
+        insights = MarketInsights(**entry.payload)
+        # The cached entry may have been fetched under a different spelling
+        insights.role = role
+        insights.location = location
+        return insights
+
+    async def prefetch(
+        self,
+        roles: Iterable[Tuple[str, Optional[str]]],
+        concurrency: int = MARKET_DATA_PREFETCH_CONCURRENCY,
+    ) -> Dict[str, int]:
+        """
+        Warm compensation entries for (role, location) pairs.
+
+        Pairs are de-duplicated by normalised key; fresh entries are skipped and
+        at most `concurrency` researches run at once.
+        """
+        pairs: Dict[Tuple[str, str], Tuple[str, str]] = {}
+        for role, location in roles:
+            if not role:
+                continue
+            location = location or DEFAULT_LOCATION
+            pairs.setdefault((normalize_role(role), normalize_location(location)), (role, location))
+
+        semaphore = asyncio.Semaphore(max(concurrency, 1))
+        summary = {"pairs": len(pairs), "fresh": 0, "refreshed": 0, "failed": 0}
+
+        async def warm(role: str, location: str) -> None:
+            key = ("compensation", normalize_role(role), normalize_location(location), "")
+            entry = self._lookup(key)
+            if entry is not None and entry.age() < self.fresh_ttl:
+                summary["fresh"] += 1
+                return
+            async with semaphore:
+                try:
+                    entry = await self._flights.run(key, lambda: self._refresh(
+                        key,
+                        lambda: self._research_compensation(role, location),
+                        self._compensation_cacheable,
+                    ))
+                except Exception as e:
+                    logger.warning(f"Market data prefetch failed for {role} in {location}: {e}")
+                    summary["failed"] += 1
+                    return
+            if self._compensation_cacheable(entry.payload):
+                summary["refreshed"] += 1
+            else:
+                summary["failed"] += 1
+
+        await asyncio.gather(*[warm(role, location) for role, location in pairs.values()])
+        logger.info(f"Market data prefetch complete: {summary}")
+        return summary
+
+    async def prefetch_open_jobs(self, concurrency: int = MARKET_DATA_PREFETCH_CONCURRENCY) -> Dict[str, int]:
+        """Warm compensation entries for every active job's role and location."""
+        from repositories.streamlined.job_repo import JobRepository
+
+        roles = await asyncio.to_thread(JobRepository().list_role_locations_sync)
+        summary = await self.prefetch(roles, concurrency=concurrency)
+        summary["jobs"] = len(roles)
+        return summary
+
+    def invalidate(self, role: str, location: Optional[str] = None) -> int:
+        """Forget every cached entry (all kinds and variants) for a role and location."""
+        role_key = normalize_role(role)
+        location_key = normalize_location(location)
+        for key in [k for k in self._entries if k[1] == role_key and k[2] == location_key]:
+            del self._entries[key]
+        with self._db_lock:
+            cursor = self._db().execute(
+                "DELETE FROM market_insights WHERE role_key = ? AND location_key = ?",
+                (role_key, location_key),
+            )
+            self._db().commit()
+            return cursor.rowcount
+
+    # ==========================================================================
+    # Cache Mechanics
+    # ==========================================================================
+
+    async def _get(
+        self,
+        key: CacheKey,
+        research: Callable,
+        cacheable: Callable[[Dict[str, Any]], bool],
+    ) -> Tuple[MarketEntry, bool]:
+        """Return (entry, served_from_cache) for a key."""
+        entry = self._lookup(key)
+
+        if entry is not None and entry.age() < self.fresh_ttl:
+            logger.info(f"Market data cache hit for {key}")
+            return entry, True
+
+        if entry is not None and entry.age() < self.stale_ttl:
+            logger.info(f"Market data stale for {key}, refreshing in background")
+            self._flights.run(key, lambda: self._refresh(key, research, cacheable))
+            return entry, True
+
+        entry = await self._flights.run(key, lambda: self._refresh(key, research, cacheable))
+        return entry, False
+
+    async def _refresh(
+        self,
+        key: CacheKey,
+        research: Callable,
+        cacheable: Callable[[Dict[str, Any]], bool],
+    ) -> MarketEntry:
+        entry = MarketEntry(payload=await research())
+        if cacheable(entry.payload):
+            self._store(key, entry)
+        else:
+            logger.info(f"Not caching incomplete market data for {key}")
+        return entry
+
+    async def _research_compensation(
+        self,
+        role_title: str,
+        location: str,
+        company_stage: Optional[str] = None,
+        years_experience: Optional[int] = None,
+        industry: Optional[str] = None,
+        specific_company: Optional[str] = None,
+        company_website: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        raw_results = await self.search_service.research_compensation(
+            role_title=role_title,
+            location=location,
+            company_stage=company_stage,
+            years_experience=years_experience,
+            industry=industry,
+            specific_company=specific_company
+        )
+
+        # Company-specific research adds context for the extraction
+        if company_website and specific_company:
+            try:
+                company_results = await self.company_cache.get_raw_results(
+                    company_name=specific_company,
+                    website=company_website
+                )
+                if company_results.get("search_results"):
+                    raw_results["company_context"] = company_results.get("search_results", [])[:3]
+            except Exception as e:
+                logger.warning(f"Company research failed: {e}")
+
+        compensation_data = await self.extractor.extract(raw_results)
+        return {
+            "data": compensation_data.model_dump(mode="json"),
+            "results_count": len(raw_results.get("search_results", [])),
+            "errors": [
+                f"Search error: {error.get('error', 'Unknown')}"
+                for error in raw_results.get("errors", [])
+            ],
+        }
+
+    @staticmethod
+    def _compensation_cacheable(payload: Dict[str, Any]) -> bool:
+        """Only cache extractions that found a salary band; retry the rest next time."""
+        data = payload.get("data") or {}
+        return bool(data.get("salary_median") or (data.get("salary_min") and data.get("salary_max")))
+
+    @staticmethod
+    def _insights_cacheable(payload: Dict[str, Any]) -> bool:
+        """The web provider reports failures as a zeroed range; don't cache those."""
+        return bool(payload.get("salary_range_high"))
+
+    @staticmethod
+    def _variant(**params: Any) -> str:
+        """Stable key fragment for the optional research parameters."""
+        normalised = {
+            name: (str(value).strip().lower() if isinstance(value, str) else value)
+            for name, value in params.items()
+            if value not in (None, "")
+        }
+        return json.dumps(normalised, sort_keys=True) if normalised else ""
+
+    # ==========================================================================
+    # Persistence
+    # ==========================================================================
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS market_insights (
+                    kind TEXT NOT NULL,
+                    role_key TEXT NOT NULL,
+                    location_key TEXT NOT NULL,
+                    variant TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    fetched_at REAL NOT NULL,
+                    PRIMARY KEY (kind, role_key, location_key, variant)
+                )
+                """
+            )
+            self._conn.commit()
+        return self._conn
+
+    def _lookup(self, key: CacheKey) -> Optional[MarketEntry]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            return entry
+        try:
+            with self._db_lock:
+                row = self._db().execute(
+                    "SELECT payload, fetched_at FROM market_insights "
+                    "WHERE kind = ? AND role_key = ? AND location_key = ? AND variant = ?",
+                    key,
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to read market data for {key}: {e}")
+            return None
+        if row is None:
+            return None
+        entry = MarketEntry(payload=json.loads(row[0]), fetched_at=row[1])
+        self._entries[key] = entry
+        return entry
+
+    def _store(self, key: CacheKey, entry: MarketEntry) -> None:
+        self._entries[key] = entry
+        try:
+            with self._db_lock:
+                self._db().execute(
+                    "INSERT OR REPLACE INTO market_insights "
+                    "(kind, role_key, location_key, variant, payload, fetched_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (*key, json.dumps(entry.payload, default=str), entry.fetched_at),
+                )
+                self._db().commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to persist market data for {key}: {e}")
+
+
+# Global instance
+market_insights_store = MarketInsightsStore()
@@ -4,11 +4,15 @@ Uses Parallel.ai's v1beta Search API to gather company information.
 
 API Documentation: https://docs.parallel.ai/
 """
+import asyncio
 import httpx
+import json
 import logging
+import re
+from pathlib import Path
 from typing import Optional, Dict, Any, List
 
-from config import PARALLEL_API_KEY, PARALLEL_API_URL
+from config import PARALLEL_API_KEY, PARALLEL_API_URL, PARALLEL_API_MODE
 
 logger = logging.getLogger(__name__)
 
@@ -320,5 +324,61 @@ class ParallelAIService:
             return {"error": str(e), "results": []}
 
 
+class LocalParallelAIService(ParallelAIService):
+    """
+    Offline stand-in for the Parallel.ai Search API.
+
+    Returns canned results from data/parallel_fixtures/<domain>.json when
+    present, otherwise synthesizes plausible excerpts from the queries.
+    Enable with PARALLEL_API_MODE=local; latency is tunable for tests.
+    """
+
+    def __init__(self, fixtures_dir: Optional[str] = None, latency: float = 0.0):
+        super().__init__()
+        if fixtures_dir is None:
+            fixtures_dir = Path(__file__).parent.parent / "data" / "parallel_fixtures"
+        self.fixtures_dir = Path(fixtures_dir)
+        self.latency = latency
+        self.search_count = 0
+
+    def _fixture_for(self, search_queries: List[str]) -> Optional[Dict[str, Any]]:
+        """Find a canned response via a site: query (e.g. 'site:stripe.com')."""
+        for query in search_queries:
+            match = re.search(r"site:(?:https?://)?(?:www\.)?([^/\s]+)", query)
+            if match:
+                fixture = self.fixtures_dir / f"{match.group(1).lower()}.json"
+                if fixture.exists():
+                    with open(fixture, 'r') as f:
+                        return json.load(f)
+        return None
+
+    async def search(
+        self,
+        objective: str,
+        search_queries: List[str],
+        max_results: int = 10,
+        max_chars_per_result: int = 10000
+    ) -> Dict[str, Any]:
+        """Serve a search from fixtures or synthesized results, without network."""
+        self.search_count += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        fixture = self._fixture_for(search_queries)
+        if fixture is not None:
+            return {"results": fixture.get("results", [])[:max_results]}
+
+        return {
+            "results": [
+                {
+                    "url": f"https://example.com/search/{i}",
+                    "title": query,
+                    "excerpts": [f"{objective[:200]} Result for: {query}"[:max_chars_per_result]],
+                }
+                for i, query in enumerate(search_queries[:max_results])
+            ]
+        }
+
+
 # Global instance
-parallel_service = ParallelAIService()
+parallel_service = LocalParallelAIService() if PARALLEL_API_MODE == "local" else ParallelAIService()
@@ -6,14 +6,17 @@ Adapted from Pluto/backend/extract_data.py and score_candidates.py
 import json
 import asyncio
 import logging
+from copy import copy
 from typing import Any, List, Optional, Literal
 from datetime import datetime
 
 import pandas as pd
-from openai import AsyncOpenAI
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, create_model
 
-from config import OPENROUTER_API_KEY, LLM_MODEL
+from config import LLM_MODEL
+from services.llm_clients import LazyOpenAIClient
+from services.structured_output import generate_structured
+from services.telemetry import llm_family, record_llm_retry, span
 
 # Configure logging
 logging.basicConfig(
@@ -24,18 +27,14 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 # OpenRouter configuration
-OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
 EXTRACTION_MODEL = LLM_MODEL  # Controlled via LLM_MODEL env var
 SCORING_MODEL = LLM_MODEL     # Controlled via LLM_MODEL env var
 BATCH_SIZE = 15
 MAX_RETRIES = 2
 RATE_LIMIT_RETRY_DELAY = 1.0  # Base delay for rate limit retries
 
-# Initialize OpenRouter client
-client = AsyncOpenAI(
-    base_url=OPENROUTER_BASE_URL,
-    api_key=OPENROUTER_API_KEY,
-)
+# OpenRouter client (built on the first call)
+client = LazyOpenAIClient("pluto")
 
 
 # ============================================================================
@@ -231,6 +230,7 @@ async def with_rate_limit_retry(coro, max_retries: int = MAX_RETRIES, context: s
             if is_rate_limit and attempt < max_retries:
                 delay = RATE_LIMIT_RETRY_DELAY * (2 ** attempt)
                 logger.warning(f"Rate limit hit for {context}, retrying in {delay}s (attempt {attempt + 1}/{max_retries})")
+                record_llm_retry("pluto")
                 await asyncio.sleep(delay)
                 continue
             
@@ -438,90 +438,102 @@ EXTRACT the following information based on the JOB REQUIREMENTS. Return ONLY val
 """
 
 
-async def extract_dynamic_fields(candidate_data: dict, enrichment: dict, extraction_fields: list) -> dict:
-    """Extract dynamic fields using the JD Compiler schema."""
-    prompt = build_dynamic_extraction_prompt(enrichment, candidate_data["name"], extraction_fields)
-    
-    for attempt in range(MAX_RETRIES + 1):
+EXTRACTION_SYSTEM_PROMPT = "You are a precise data extraction engine. Return only valid JSON."
+
+# JD Compiler field types -> (annotation, default) for validating dynamic extraction
+DYNAMIC_FIELD_TYPES = {
+    "boolean": (bool, False),
+    "number": (Optional[float], None),
+    "string_list": (List[str], []),
+    "string": (str, ""),
+}
+
+
+def dynamic_extraction_model(extraction_fields: list) -> type:
+    """ExtractionResult-shaped model whose extraction holds the JD Compiler fields."""
+    fields = {"bio_summary": (str, "")}
+    for i, field in enumerate(extraction_fields):
+        name = field.get("field_name")
+        if not name or name == "bio_summary":
+            continue
+        annotation, default = DYNAMIC_FIELD_TYPES.get(field.get("field_type"), DYNAMIC_FIELD_TYPES["string"])
+        # Aliased, so any field name (even one shadowing a BaseModel attribute) is allowed
+        fields[f"field_{i}"] = (annotation, Field(default=copy(default), alias=name, description=field.get("description")))
+    extraction = create_model("DynamicExtraction", __config__=ConfigDict(extra="allow"), **fields)
+    return create_model(
+        "DynamicExtractionResult",
+        extraction=(extraction, Field(default_factory=extraction)),
+        red_flags=(RedFlags, Field(default_factory=RedFlags)),
+    )
+
+
+async def _complete_extraction(messages: list, attempt: int) -> Optional[str]:
+    """One extraction call; API errors get a short pause and another try."""
+    for api_attempt in range(MAX_RETRIES + 1):
         try:
-            response = await client.chat.completions.create(
-                model=EXTRACTION_MODEL,
-                messages=[
-                    {"role": "system", "content": "You are a precise data extraction engine. Return only valid JSON."},
-                    {"role": "user", "content": prompt},
-                ],
-                response_format={"type": "json_object"},
-                temperature=0.1,
-            )
-            
-            content = response.choices[0].message.content
-            if not content:
-                raise ValueError("Empty response")
-            
-            data = json.loads(content)
-            extraction = data.get("extraction", {})
-            red_flags = data.get("red_flags", {})
-            
-            # Calculate red flag count
-            red_flag_count = sum([
-                red_flags.get("job_hopping", False),
-                red_flags.get("title_inflation", False),
-                red_flags.get("gaps_in_employment", False),
-                red_flags.get("overqualified", False),
-            ])
-            
-            return {
-                "extraction": extraction,
-                "red_flags": red_flags.get("concerns", []),
-                "red_flag_count": red_flag_count,
-            }
-            
+            with llm_family("pluto_extraction"):
+                response = await client.chat.completions.create(
+                    model=EXTRACTION_MODEL,
+                    messages=messages,
+                    response_format={"type": "json_object"},
+                    temperature=0.1,
+                )
+            return response.choices[0].message.content
         except Exception as e:
-            logger.warning(f"Dynamic extraction attempt {attempt + 1} failed for {candidate_data['name']}: {e}")
-            if attempt == MAX_RETRIES:
-                return {
-                    "extraction": {"bio_summary": "Unable to extract profile."},
-                    "red_flags": [],
-                    "red_flag_count": 0,
-                }
+            if api_attempt == MAX_RETRIES:
+                raise
+            logger.warning(f"Extraction call attempt {api_attempt + 1} failed: {e}")
+            record_llm_retry("pluto_extraction", reason="error")
             await asyncio.sleep(1)
-    
-    return {"extraction": {}, "red_flags": [], "red_flag_count": 0}
+
+
+async def extract_dynamic_fields(candidate_data: dict, enrichment: dict, extraction_fields: list) -> dict:
+    """Extract dynamic fields using the JD Compiler schema."""
+    prompt = build_dynamic_extraction_prompt(enrichment, candidate_data["name"], extraction_fields)
+    messages = [
+        {"role": "system", "content": EXTRACTION_SYSTEM_PROMPT},
+        {"role": "user", "content": prompt},
+    ]
+
+    try:
+        result = await generate_structured(
+            dynamic_extraction_model(extraction_fields), messages, _complete_extraction,
+            family="pluto_extraction", max_attempts=MAX_RETRIES + 1,
+        )
+    except Exception as e:
+        logger.warning(f"Dynamic extraction failed for {candidate_data['name']}: {e}")
+        return {
+            "extraction": {"bio_summary": "Unable to extract profile."},
+            "red_flags": [],
+            "red_flag_count": 0,
+        }
+
+    return {
+        "extraction": result.extraction.model_dump(by_alias=True),
+        "red_flags": result.red_flags.concerns,
+        "red_flag_count": result.red_flags.red_flag_count,
+    }
 
 
 async def extract_semantic(candidate_data: dict, enrichment: dict) -> ExtractionResult:
     """Call LLM to extract semantic data."""
     prompt = build_extraction_prompt(enrichment, candidate_data["name"])
-    
-    for attempt in range(MAX_RETRIES + 1):
-        try:
-            response = await client.chat.completions.create(
-                model=EXTRACTION_MODEL,
-                messages=[
-                    {"role": "system", "content": "You are a precise data extraction engine. Return only valid JSON."},
-                    {"role": "user", "content": prompt},
-                ],
-                response_format={"type": "json_object"},
-                temperature=0.1,
-            )
-            
-            content = response.choices[0].message.content
-            if not content:
-                raise ValueError("Empty response")
-            
-            data = json.loads(content)
-            return ExtractionResult.model_validate(data)
-            
-        except Exception as e:
-            logger.warning(f"Attempt {attempt + 1} failed for {candidate_data['name']}: {e}")
-            if attempt == MAX_RETRIES:
-                return ExtractionResult(
-                    extraction=CandidateExtraction(bio_summary="Unable to extract profile."),
-                    red_flags=RedFlags(),
-                )
-            await asyncio.sleep(1)
-    
-    return ExtractionResult(extraction=CandidateExtraction(), red_flags=RedFlags())
+    messages = [
+        {"role": "system", "content": EXTRACTION_SYSTEM_PROMPT},
+        {"role": "user", "content": prompt},
+    ]
+
+    try:
+        return await generate_structured(
+            ExtractionResult, messages, _complete_extraction,
+            family="pluto_extraction", max_attempts=MAX_RETRIES + 1,
+        )
+    except Exception as e:
+        logger.warning(f"Extraction failed for {candidate_data['name']}: {e}")
+        return ExtractionResult(
+            extraction=CandidateExtraction(bio_summary="Unable to extract profile."),
+            red_flags=RedFlags(),
+        )
 
 
 # ============================================================================
@@ -640,15 +652,16 @@ async def evaluate_candidate(candidate: dict, job_description: str = "", scoring
     prompt = build_evaluation_prompt(candidate, job_description, scoring_criteria, red_flag_indicators)
     
     try:
-        completion = await client.beta.chat.completions.parse(
-            model=SCORING_MODEL,
-            messages=[
-                {"role": "system", "content": "You are an expert recruiter. Return precise JSON."},
-                {"role": "user", "content": prompt},
-            ],
-            response_format=Evaluation,
-            temperature=0.4,
-        )
+        with llm_family("pluto_scoring"):
+            completion = await client.beta.chat.completions.parse(
+                model=SCORING_MODEL,
+                messages=[
+                    {"role": "system", "content": "You are an expert recruiter. Return precise JSON."},
+                    {"role": "user", "content": prompt},
+                ],
+                response_format=Evaluation,
+                temperature=0.4,
+            )
         return completion.choices[0].message.parsed
 
     except Exception as e:
@@ -830,15 +843,16 @@ Provide a comprehensive, evidence-based evaluation. Be specific and quote direct
 
     try:
         # Use OpenAI Structured Outputs for reliable Pydantic validation
-        completion = await client.beta.chat.completions.parse(
-            model=SCORING_MODEL,
-            messages=[
-                {"role": "system", "content": "You are a precise, objective interview analytics engine. Provide evidence-based assessments with direct quotes. Be thorough but fair."},
-                {"role": "user", "content": prompt}
-            ],
-            response_format=DeepAnalytics,
-            temperature=0.2
-        )
+        with llm_family("pluto_deep_analytics"):
+            completion = await client.beta.chat.completions.parse(
+                model=SCORING_MODEL,
+                messages=[
+                    {"role": "system", "content": "You are a precise, objective interview analytics engine. Provide evidence-based assessments with direct quotes. Be thorough but fair."},
+                    {"role": "user", "content": prompt}
+                ],
+                response_format=DeepAnalytics,
+                temperature=0.2
+            )
 
         # Get parsed Pydantic object
         analytics = completion.choices[0].message.parsed
@@ -987,7 +1001,8 @@ async def process_csv_file(file_content: bytes, progress_callback=None, job_desc
         # Run all extractions in parallel using asyncio.gather
         api_tasks = [t for t in extraction_tasks if t is not None]
         if api_tasks:
-            api_results = await asyncio.gather(*api_tasks, return_exceptions=True)
+            with span("pluto.extraction_batch", candidates=len(api_tasks)):
+                api_results = await asyncio.gather(*api_tasks, return_exceptions=True)
         else:
             api_results = []
         
@@ -1128,7 +1143,8 @@ async def run_ai_scoring(candidates_list: List[Any], progress_callback=None, job
             batch_tasks.append(task)
         
         # Run batch concurrently
-        batch_results = await asyncio.gather(*batch_tasks)
+        with span("pluto.scoring_batch", candidates=len(batch_tasks)):
+            batch_results = await asyncio.gather(*batch_tasks)
         
         batch_time = time.time() - batch_start
         logger.info(f"⏱️ Scoring batch {i // BATCH_SIZE + 1} complete: {len(batch)} candidates in {batch_time:.2f}s")
@@ -0,0 +1,177 @@
+"""
+Post-Call Pipeline.
+Everything that happens after Vapi reports the end of a candidate interview,
+run as a durable task so the webhook can ack straight away:
+
+1. Persist the transcript and mark the interview completed
+2. Parse the call's messages into speaker turns (transcripts table)
+3. Generate candidate analytics and, when an interviewer is assigned,
+   interviewer analytics, concurrently
+4. Mark the candidate's interview completed
+
+Each step checks what is already stored before doing work, so a Vapi retry
+or a task retry after a partial failure never writes analytics twice.
+
+Writing analytics drops the job analytics summary and offer-prep snapshot
+built from the interview. When the pipeline runs in a worker process, only
+that process's caches are dropped directly. The api processes that serve
+those views get the invalidation through services/cache_invalidation.py,
+within CACHE_INVALIDATION_POLL_INTERVAL (or only after the caches' TTLs if
+that is set to the memory backend).
+"""
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+logger = logging.getLogger(__name__)
+
+# In candidate interviews the Vapi assistant plays the candidate
+SPEAKERS = {
+    "assistant": "candidate",
+    "bot": "candidate",
+    "user": "interviewer",
+}
+
+
+def parse_call_turns(messages: Optional[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """Vapi call messages -> transcript turns ({speaker, text, timestamp}); system prompts dropped."""
+    turns = []
+    for message in messages or []:
+        speaker = SPEAKERS.get(message.get("role"))
+        text = (message.get("message") or message.get("content") or "").strip()
+        if not speaker or not text:
+            continue
+        turns.append({
+            "speaker": speaker,
+            "text": text,
+            "timestamp": message.get("secondsFromStart"),
+        })
+    return turns
+
+
+def _parse_time(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).replace(tzinfo=None)
+    except ValueError:
+        return None
+
+
+def _complete_interview(interview_id: str, payload: Dict[str, Any]):
+    """Step 1: store transcript, end time and duration (skipped if already completed with a transcript)."""
+    from repositories.streamlined.interview_repo import InterviewRepository
+    from models.streamlined.interview import InterviewUpdate, InterviewSessionStatus
+
+    interview_repo = InterviewRepository()
+    interview = interview_repo.get_by_id_sync(UUID(interview_id))
+    if not interview:
+        raise ValueError(f"Interview {interview_id} not found")
+
+    if interview.status == InterviewSessionStatus.COMPLETED and interview.transcript:
+        return interview
+
+    # Prefer Vapi's own timings so a retry stores the same values
+    ended_at = _parse_time(payload.get("ended_at")) or datetime.utcnow()
+    duration_seconds = payload.get("duration_seconds")
+    if duration_seconds is None and interview.started_at:
+        started_at = interview.started_at
+        if started_at.tzinfo is not None:
+            started_at = started_at.replace(tzinfo=None)
+        duration_seconds = (ended_at - started_at).total_seconds()
+
+    interview_repo.update_sync(UUID(interview_id), InterviewUpdate(
+        status=InterviewSessionStatus.COMPLETED,
+        ended_at=ended_at,
+        duration_seconds=int(duration_seconds) if duration_seconds is not None else None,
+        transcript=payload.get("transcript") or interview.transcript or "",
+    ))
+    return interview
+
+
+def _save_turns(interview_id: str, turns: List[Dict[str, Any]]) -> None:
+    """Step 2: upsert parsed turns for the interview."""
+    from repositories.analytics_repository import AnalyticsRepository
+
+    if not turns:
+        return
+    repo = AnalyticsRepository()
+    if not repo.update_transcript(interview_id, turns):
+        repo.create_transcript(interview_id, turns)
+
+
+def _candidate_analytics(interview_id: str) -> None:
+    from repositories.streamlined.analytics_repo import AnalyticsRepository
+    from services.analytics_generator import generate_analytics_sync
+
+    if AnalyticsRepository().get_by_interview_sync(UUID(interview_id)):
+        logger.info(f"Candidate analytics already exist for interview {interview_id}")
+        return
+    generate_analytics_sync(UUID(interview_id))
+
+
+async def _interviewer_analytics(interview_id: str, interviewer_id: str, transcript: str, turns: List[Dict[str, Any]]) -> None:
+    from repositories.interviewer_analytics_repository import get_interviewer_analytics_repository
+    from services.interviewer_analyzer import get_interviewer_analyzer
+
+    repo = get_interviewer_analytics_repository()
+    if await asyncio.to_thread(repo.get_by_interview, interview_id):
+        logger.info(f"Interviewer analytics already exist for interview {interview_id}")
+        return
+
+    questions = [t["text"] for t in turns if t["speaker"] == "interviewer"]
+    result = await get_interviewer_analyzer().analyze_interview(
+        transcript=transcript,
+        questions=questions,
+        interviewer_id=interviewer_id,
+    )
+    await asyncio.to_thread(repo.save_analytics, interview_id, interviewer_id, result)
+
+
+def _interviewer_for(interview_id: str) -> Optional[str]:
+    from repositories.interview_repository import InterviewRepository
+
+    row = InterviewRepository().get_by_id(interview_id) or {}
+    return row.get("interviewer_id")
+
+
+def _complete_candidate(candidate_id) -> None:
+    """Step 4: candidate's interview status (idempotent)."""
+    from repositories.streamlined.candidate_repo import CandidateRepository
+    from models.streamlined.candidate import CandidateUpdate, InterviewStatus
+
+    CandidateRepository().update_sync(candidate_id, CandidateUpdate(
+        interview_status=InterviewStatus.COMPLETED,
+    ))
+
+
+async def run_post_call_pipeline(payload: Dict[str, Any]) -> None:
+    """
+    Run the post-call steps for one Vapi call.
+
+    Payload: interview_id, call_id, transcript, messages (Vapi call messages),
+    ended_at and duration_seconds when Vapi reported them. Raises if any
+    analytics step failed, after the others finished, so the task is retried
+    and only the missing pieces run again.
+    """
+    interview_id = payload["interview_id"]
+
+    interview = await asyncio.to_thread(_complete_interview, interview_id, payload)
+    turns = parse_call_turns(payload.get("messages"))
+    await asyncio.to_thread(_save_turns, interview_id, turns)
+
+    transcript = payload.get("transcript") or interview.transcript or ""
+    steps = [asyncio.to_thread(_candidate_analytics, interview_id)]
+    interviewer_id = await asyncio.to_thread(_interviewer_for, interview_id)
+    if interviewer_id:
+        steps.append(_interviewer_analytics(interview_id, interviewer_id, transcript, turns))
+    results = await asyncio.gather(*steps, return_exceptions=True)
+
+    await asyncio.to_thread(_complete_candidate, interview.candidate_id)
+
+    errors = [r for r in results if isinstance(r, Exception)]
+    if errors:
+        raise errors[0]
+    logger.info(f"Post-call pipeline finished for interview {interview_id} (call {payload.get('call_id')})")
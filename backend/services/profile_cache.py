@@ -0,0 +1,179 @@
+"""
+Session cache for voice-ingest job profiles.
+
+Holds the JobProfile of a live Vapi call in memory so tool calls mutate
+the cached object instead of re-reading and re-writing the repository on
+every webhook. Dirty profiles are flushed write-behind: debounced after
+the last mutation, and immediately at end of call.
+"""
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Dict, Optional, AsyncIterator
+
+from config import PROFILE_CACHE_ENABLED, PROFILE_CACHE_FLUSH_DELAY, PROFILE_CACHE_IDLE_TTL
+from models.voice_ingest import JobProfile
+from repositories import job_profile_repo
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _CacheEntry:
+    """A hot profile plus its write-behind bookkeeping."""
+    profile: Optional[JobProfile] = None
+    dirty: bool = False
+    last_access: float = field(default_factory=time.monotonic)
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    flush_task: Optional[asyncio.Task] = None
+
+
+class ProfileSessionCache:
+    """
+    Write-behind cache of JobProfiles keyed by voice-ingest session ID.
+
+    Tool calls for a session are serialized through a per-session lock,
+    so concurrent webhooks for the same call never interleave their
+    read-modify-write. When disabled, every mutation is written through
+    immediately (the original behaviour).
+    """
+
+    def __init__(
+        self,
+        repo=None,
+        enabled: bool = PROFILE_CACHE_ENABLED,
+        flush_delay: float = PROFILE_CACHE_FLUSH_DELAY,
+        idle_ttl: float = PROFILE_CACHE_IDLE_TTL,
+    ):
+        self.repo = repo or job_profile_repo
+        self.enabled = enabled
+        self.flush_delay = flush_delay
+        self.idle_ttl = idle_ttl
+        self._entries: Dict[str, _CacheEntry] = {}
+
+    def _entry(self, session_id: str) -> _CacheEntry:
+        entry = self._entries.get(session_id)
+        if entry is None:
+            entry = _CacheEntry()
+            self._entries[session_id] = entry
+        entry.last_access = time.monotonic()
+        return entry
+
+    @asynccontextmanager
+    async def session(self, session_id: str) -> AsyncIterator[Optional[JobProfile]]:
+        """
+        Hold the session lock and yield its profile (None if not found).
+
+        Callers mutate the yielded profile in place and call mark_dirty()
+        before leaving the block to have the change persisted.
+        """
+        self._evict_idle()
+        entry = self._entry(session_id)
+        async with entry.lock:
+            if entry.profile is None or not self.enabled:
+                entry.profile = await self.repo.get(session_id)
+            yield entry.profile
+
+    async def mark_dirty(self, session_id: str) -> None:
+        """Schedule a debounced flush for a mutated session profile."""
+        entry = self._entries.get(session_id)
+        if entry is None or entry.profile is None:
+            return
+
+        entry.dirty = True
+        if not self.enabled:
+            await self._write(session_id, entry)
+            return
+
+        if entry.flush_task and not entry.flush_task.done():
+            entry.flush_task.cancel()
+        entry.flush_task = asyncio.create_task(self._delayed_flush(session_id))
+
+    async def _delayed_flush(self, session_id: str) -> None:
+        try:
+            await asyncio.sleep(self.flush_delay)
+        except asyncio.CancelledError:
+            return
+        await self.flush(session_id, _from_timer=True)
+
+    async def _write(self, session_id: str, entry: _CacheEntry) -> bool:
+        if not entry.dirty or entry.profile is None:
+            return True
+        saved = await self.repo.save(entry.profile)
+        if saved is None:
+            logger.error(f"Write-behind flush failed for session {session_id}")
+            return False
+        entry.dirty = False
+        return True
+
+    async def flush(self, session_id: str, _from_timer: bool = False) -> bool:
+        """Persist a session's pending changes now."""
+        entry = self._entries.get(session_id)
+        if entry is None:
+            return True
+
+        if not _from_timer and entry.flush_task and not entry.flush_task.done():
+            entry.flush_task.cancel()
+
+        async with entry.lock:
+            return await self._write(session_id, entry)
+
+    async def end_session(self, session_id: str) -> bool:
+        """Flush a session and drop it from the cache (end of call)."""
+        flushed = await self.flush(session_id)
+        self._entries.pop(session_id, None)
+        return flushed
+
+    @asynccontextmanager
+    async def exclusive(self, session_id: str) -> AsyncIterator[None]:
+        """
+        Flush and evict a session, then hold its lock while the caller
+        writes to the repository directly.
+
+        Used by code paths outside the live call (REST edits, company
+        research) so their writes are neither overwritten by a pending
+        flush nor interleaved with a tool call.
+        """
+        entry = self._entry(session_id)
+        if entry.flush_task and not entry.flush_task.done():
+            entry.flush_task.cancel()
+        async with entry.lock:
+            await self._write(session_id, entry)
+            entry.profile = None
+            entry.dirty = False
+            yield
+
+    async def evict(self, session_id: str) -> None:
+        """Flush and drop a session's hot copy before an out-of-call write."""
+        async with self.exclusive(session_id):
+            pass
+
+    async def get(self, session_id: str) -> Optional[JobProfile]:
+        """Read a profile, preferring the hot copy of a live session."""
+        entry = self._entries.get(session_id)
+        if entry is not None and entry.profile is not None and self.enabled:
+            return entry.profile
+        return await self.repo.get(session_id)
+
+    async def flush_all(self) -> None:
+        """Flush every dirty session (used on shutdown)."""
+        for session_id in list(self._entries.keys()):
+            await self.flush(session_id)
+
+    def _evict_idle(self) -> None:
+        """Drop clean sessions that have not been touched within the TTL."""
+        cutoff = time.monotonic() - self.idle_ttl
+        for session_id, entry in list(self._entries.items()):
+            if entry.last_access < cutoff and not entry.dirty and not entry.lock.locked():
+                del self._entries[session_id]
+
+    def is_cached(self, session_id: str) -> bool:
+        """Whether a session currently has a hot profile in memory."""
+        entry = self._entries.get(session_id)
+        return entry is not None and entry.profile is not None
+
+
+# Global singleton instance
+profile_cache = ProfileSessionCache()
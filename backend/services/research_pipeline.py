@@ -5,8 +5,8 @@ Orchestrates the full company research flow as a background task.
 import logging
 from typing import Optional
 
-from services.parallel_ai import parallel_service
-from services.company_extractor import company_extractor
+from services.company_intel_cache import company_intel_cache
+from services.profile_cache import profile_cache
 from repositories import job_profile_repo
 from models.voice_ingest import CompanyIntelligence
 
@@ -23,6 +23,8 @@ async def research_company(
 
     This function is designed to run as a background task.
     It updates the job profile's research status as it progresses.
+    Search and extraction are served from the company intel cache when the
+    company's domain has been researched recently.
 
     Args:
         session_id: Job profile session ID
@@ -36,39 +38,35 @@ async def research_company(
 
     try:
         # Step 1: Mark research as in-progress
-        await job_profile_repo.update_research_status(session_id, "in_progress")
+        async with profile_cache.exclusive(session_id):
+            await job_profile_repo.update_research_status(session_id, "in_progress")
 
-        # Step 2: Search via Parallel.ai
-        logger.info(f"Searching Parallel.ai for {company_name}")
-        raw_results = await parallel_service.research_company(
+        # Step 2-3: Search via Parallel.ai and extract structured data via LLM
+        # (failed searches are not cached; extraction falls back to LLM knowledge)
+        logger.info(f"Researching {company_name}")
+        company_intel = await company_intel_cache.get_intelligence(
             company_name=company_name,
             website=website
         )
 
-        # Check for complete failure
-        if not raw_results.get("search_results") and raw_results.get("errors"):
-            logger.warning(f"All Parallel.ai searches failed for {company_name}")
-            # Continue with empty results - extraction will return fallback
-
-        # Step 3: Extract structured data via LLM
-        logger.info(f"Extracting structured data for {company_name}")
-        company_intel = await company_extractor.extract(raw_results)
-
         # Step 4: Update job profile with enriched company data
         logger.info(f"Saving company intel for session {session_id}")
-        success = await job_profile_repo.update_company_intel(session_id, company_intel)
+        async with profile_cache.exclusive(session_id):
+            success = await job_profile_repo.update_company_intel(session_id, company_intel)
 
         if success:
             logger.info(f"Research pipeline complete for session {session_id}")
             return company_intel
         else:
             logger.error(f"Failed to save company intel for session {session_id}")
-            await job_profile_repo.update_research_status(session_id, "failed")
+            async with profile_cache.exclusive(session_id):
+                await job_profile_repo.update_research_status(session_id, "failed")
             return None
 
     except Exception as e:
         logger.error(f"Research pipeline failed for session {session_id}: {e}")
-        await job_profile_repo.update_research_status(session_id, "failed")
+        async with profile_cache.exclusive(session_id):
+            await job_profile_repo.update_research_status(session_id, "failed")
         return None
 
 
@@ -108,8 +106,9 @@ async def research_company_with_fallback(
 
     # Try to save the fallback
     try:
-        await job_profile_repo.update_company_intel(session_id, fallback_intel)
-        await job_profile_repo.update_research_status(session_id, "partial")
+        async with profile_cache.exclusive(session_id):
+            await job_profile_repo.update_company_intel(session_id, fallback_intel)
+            await job_profile_repo.update_research_status(session_id, "partial")
     except Exception:
         pass
 
@@ -122,8 +121,8 @@ async def quick_research(
     website: str
 ) -> Optional[CompanyIntelligence]:
     """
-    Quick research using fewer searches.
-    Use when speed is more important than comprehensiveness.
+    Quick research from the company intel cache.
+    Use when speed is more important than freshness; researches on a miss.
 
     Args:
         session_id: Job profile session ID
@@ -136,22 +135,23 @@ async def quick_research(
     logger.info(f"Starting quick research for {company_name}")
 
     try:
-        await job_profile_repo.update_research_status(session_id, "in_progress")
+        async with profile_cache.exclusive(session_id):
+            await job_profile_repo.update_research_status(session_id, "in_progress")
 
-        # Use quick search instead of full research
-        raw_results = await parallel_service.quick_search(
+        # Served from the company intel cache when available
+        company_intel = await company_intel_cache.get_intelligence(
             company_name=company_name,
             website=website
         )
 
-        company_intel = await company_extractor.extract(raw_results)
-
-        await job_profile_repo.update_company_intel(session_id, company_intel)
+        async with profile_cache.exclusive(session_id):
+            await job_profile_repo.update_company_intel(session_id, company_intel)
 
         logger.info(f"Quick research complete for {company_name}")
         return company_intel
 
     except Exception as e:
         logger.error(f"Quick research failed: {e}")
-        await job_profile_repo.update_research_status(session_id, "failed")
+        async with profile_cache.exclusive(session_id):
+            await job_profile_repo.update_research_status(session_id, "failed")
         return None
@@ -10,11 +10,12 @@ import json
 import logging
 from typing import Dict, Any, Optional
 
-from config import OPENROUTER_API_KEY, LLM_MODEL
+from config import OPENROUTER_API_KEY, OPENROUTER_BASE_URL, LLM_MODEL
+from services.telemetry import llm_event_hooks
 
 logger = logging.getLogger(__name__)
 
-OPENROUTER_URL = "https://openrouter.ai/api/v1/chat/completions"
+OPENROUTER_URL = f"{OPENROUTER_BASE_URL}/chat/completions"
 
 RESUME_EXTRACTION_PROMPT = """You are an expert recruiter. Analyze this resume and extract key information.
 
@@ -82,7 +83,7 @@ async def extract_resume_data(
     )
 
     try:
-        async with httpx.AsyncClient(timeout=60.0) as client:
+        async with httpx.AsyncClient(timeout=60.0, event_hooks=llm_event_hooks("resume_extraction")) as client:
             response = await client.post(
                 OPENROUTER_URL,
                 headers={
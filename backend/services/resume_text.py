@@ -0,0 +1,264 @@
+"""
+Resume Text Extraction.
+Turns uploaded resume files (PDF, DOCX, plain text) into text for the resume
+processor and screening, without parsing on the event loop.
+
+Parsing runs on a small process pool (pypdf holds the GIL, so threads would
+not help) with a per-file timeout and a page limit; a file that hangs the
+parser has its worker killed and the pool replaced, as does a worker crash
+(the parse is then retried once on the new pool). Extracted text is cached
+by SHA-256 of the file contents, in memory and on disk (up to
+RESUME_TEXT_DISK_CACHE_MB, least recently used first out), so
+re-applications and re-screens with the same file skip parsing entirely.
+"""
+import asyncio
+import hashlib
+import io
+import logging
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Optional
+
+from config import (
+    RESUME_PARSE_WORKERS,
+    RESUME_PARSE_TIMEOUT,
+    RESUME_MAX_PAGES,
+    RESUME_TEXT_CACHE_SIZE,
+    RESUME_TEXT_DISK_CACHE_MB,
+)
+from services.single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# Parsers (run in worker processes; module-level so they pickle)
+# =============================================================================
+
+def _pdf_text(data: bytes, max_pages: int) -> str:
+    from pypdf import PdfReader
+
+    reader = PdfReader(io.BytesIO(data))
+    pages = []
+    for index, page in enumerate(reader.pages):
+        if index >= max_pages:
+            break
+        pages.append(page.extract_text() or "")
+    return "\n".join(pages)
+
+
+def _docx_text(data: bytes) -> str:
+    import docx
+
+    return "\n".join(para.text for para in docx.Document(io.BytesIO(data)).paragraphs)
+
+
+def parse_resume_bytes(data: bytes, ext: str, max_pages: int = RESUME_MAX_PAGES) -> str:
+    """Extract text from resume file contents by extension (anything unknown is read as text)."""
+    if ext == ".pdf":
+        return _pdf_text(data, max_pages)
+    if ext in (".docx", ".doc"):
+        return _docx_text(data)
+    return data.decode("utf-8", errors="ignore")
+
+
+# =============================================================================
+# Extractor
+# =============================================================================
+
+class ResumeTextExtractor:
+    """Process-pool resume parsing with a content-hash text cache."""
+
+    def __init__(
+        self,
+        workers: int = RESUME_PARSE_WORKERS,
+        timeout: float = RESUME_PARSE_TIMEOUT,
+        max_pages: int = RESUME_MAX_PAGES,
+        cache_size: int = RESUME_TEXT_CACHE_SIZE,
+        cache_dir: Optional[str] = None,
+        disk_cache_bytes: int = int(RESUME_TEXT_DISK_CACHE_MB * 1024 * 1024),
+    ):
+        self.workers = workers
+        self.timeout = timeout
+        self.max_pages = max_pages
+        self.cache_size = cache_size
+        if cache_dir is None:
+            cache_dir = Path(__file__).parent.parent / "data" / "resume_text"
+        self.cache_dir = Path(cache_dir)
+        self.disk_cache_bytes = disk_cache_bytes
+        self._disk_bytes: Optional[int] = None  # counted on first write
+        self._disk_lock = threading.Lock()
+        self._texts: "OrderedDict[str, str]" = OrderedDict()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+        self._flights = SingleFlight("resume parse")
+
+    async def extract(self, file_path: Optional[str]) -> Optional[str]:
+        """Text of a resume file, or None if it is missing, unreadable or times out."""
+        if not file_path or not os.path.exists(file_path):
+            return None
+
+        data = await asyncio.to_thread(Path(file_path).read_bytes)
+        digest = hashlib.sha256(data).hexdigest()
+
+        text = self._cached(digest)
+        if text is None:
+            text = await self._cached_on_disk(digest)
+        if text is not None:
+            logger.info(f"Resume text cache hit for {os.path.basename(file_path)}")
+            return text
+
+        ext = os.path.splitext(file_path)[1].lower()
+        # Identical files uploaded together are parsed once
+        return await self._flights.run(digest, lambda: self._parse_and_store(digest, data, ext, file_path))
+
+    async def _parse_and_store(self, digest: str, data: bytes, ext: str, file_path: str) -> Optional[str]:
+        try:
+            text = await self._parse(data, ext)
+        except asyncio.TimeoutError:
+            logger.error(f"Text extraction timed out after {self.timeout}s for {file_path}")
+            return None
+        except Exception as e:
+            logger.error(f"Text extraction failed for {file_path}: {e}")
+            return None
+
+        self._remember(digest, text)
+        await asyncio.to_thread(self._write_disk, digest, text)
+        return text
+
+    async def _parse(self, data: bytes, ext: str) -> str:
+        if self.workers <= 0:
+            return await asyncio.wait_for(
+                asyncio.to_thread(parse_resume_bytes, data, ext, self.max_pages), self.timeout
+            )
+
+        for attempt in range(2):
+            pool = self._get_pool()
+            try:
+                future = asyncio.get_running_loop().run_in_executor(pool, parse_resume_bytes, data, ext, self.max_pages)
+                return await asyncio.wait_for(future, self.timeout)
+            except asyncio.TimeoutError:
+                # The worker is still chewing on the file; kill it rather than leak it
+                self._reset_pool(pool)
+                raise
+            except BrokenProcessPool:
+                # A worker died (this file or another one); later parses need a fresh pool
+                self._reset_pool(pool)
+                if attempt:
+                    raise
+                logger.warning("Resume parser pool broke; retrying on a new pool")
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+            return self._pool
+
+    def _reset_pool(self, pool: ProcessPoolExecutor) -> None:
+        with self._pool_lock:
+            if self._pool is pool:
+                self._pool = None
+        # Parses still running on this pool fail with it (their resumes come back empty)
+        for process in list((getattr(pool, "_processes", None) or {}).values()):
+            process.terminate()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self) -> None:
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    # ==========================================================================
+    # Cache
+    # ==========================================================================
+
+    def _cached(self, digest: str) -> Optional[str]:
+        text = self._texts.get(digest)
+        if text is not None:
+            self._texts.move_to_end(digest)
+        return text
+
+    def _remember(self, digest: str, text: str) -> None:
+        if self.cache_size <= 0:
+            return
+        self._texts[digest] = text
+        self._texts.move_to_end(digest)
+        while len(self._texts) > self.cache_size:
+            self._texts.popitem(last=False)
+
+    def _entry_path(self, digest: str) -> Path:
+        return self.cache_dir / f"{digest}.txt"
+
+    async def _cached_on_disk(self, digest: str) -> Optional[str]:
+        if self.cache_size <= 0:
+            return None
+        text = await asyncio.to_thread(self._read_disk, digest)
+        if text is not None:
+            self._remember(digest, text)
+        return text
+
+    def _read_disk(self, digest: str) -> Optional[str]:
+        path = self._entry_path(digest)
+        try:
+            text = path.read_text(encoding="utf-8")
+            os.utime(path)  # recently used: pruned last
+            return text
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logger.warning(f"Could not read cached resume text {digest[:12]}: {e}")
+            return None
+
+    def _write_disk(self, digest: str, text: str) -> None:
+        if self.cache_size <= 0:
+            return
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp = self._entry_path(digest).with_suffix(".tmp")
+            tmp.write_text(text, encoding="utf-8")
+            tmp.replace(self._entry_path(digest))
+        except OSError as e:
+            logger.warning(f"Could not cache resume text {digest[:12]}: {e}")
+            return
+        with self._disk_lock:
+            if self._disk_bytes is None:
+                self._disk_bytes = sum(size for _, size, _ in self._disk_entries())
+            else:
+                self._disk_bytes += len(text.encode("utf-8"))
+            if self._disk_bytes > self.disk_cache_bytes:
+                self._prune_disk()
+
+    def _disk_entries(self):
+        """(path, size, mtime) of every cached text."""
+        entries = []
+        for path in self.cache_dir.glob("*.txt"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((path, stat.st_size, stat.st_mtime))
+        return entries
+
+    def _prune_disk(self) -> None:
+        """Remove least recently used texts until the cache is at 90% of its cap."""
+        entries = sorted(self._disk_entries(), key=lambda entry: entry[2])
+        total = sum(size for _, size, _ in entries)
+        target = self.disk_cache_bytes * 0.9
+        for path, size, _ in entries:
+            if total <= target:
+                break
+            try:
+                path.unlink()
+                total -= size
+            except OSError:
+                pass
+        self._disk_bytes = total
+
+
+# Global instance
+resume_text_extractor = ResumeTextExtractor()
@@ -0,0 +1,38 @@
+"""
+Single-flight helper for async caches.
+Concurrent callers asking for the same key share one in-flight task
+instead of each starting the same expensive research.
+"""
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """Deduplicates concurrent async work by key."""
+
+    def __init__(self, name: str = "single-flight"):
+        self.name = name
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+
+    def run(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        """Start the work for a key, or return the task already running for it."""
+        task = self._inflight.get(key)
+        if task is None or task.done():
+            task = asyncio.create_task(factory())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._on_done(key, t))
+        return task
+
+    def _on_done(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Retrieve the exception so fire-and-forget refreshes don't warn
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"{self.name} task for {key} failed: {task.exception()}")
+
+    def in_flight(self, key: Hashable) -> bool:
+        task = self._inflight.get(key)
+        return task is not None and not task.done()
@@ -0,0 +1,426 @@
+"""
+Structured LLM output: tolerant JSON extraction, schema-guided repair and
+targeted re-asks.
+
+A malformed response used to cost a full extra round trip. Instead:
+
+1. extract_json() pulls the JSON out of the response text: markdown fences,
+   leading or trailing prose, trailing commas, and output cut off mid-array
+   (the incomplete tail is dropped and the open brackets closed).
+2. repair() walks the data against the Pydantic model and fixes what the
+   model would otherwise reject: enum/Literal values in the wrong case or
+   spelling ("Expert", "not found"), numbers outside ge/le bounds (clamped),
+   scores given as "85%" or 85.5 for an int, null for a list, and - when the
+   output was truncated - an incomplete last item of a list.
+3. generate_structured() validates; if only some fields are still missing or
+   invalid it re-asks for just those fields (one small call, merged into the
+   rest), and only makes a full new call when no JSON could be recovered.
+
+Outcomes (valid, repaired, reasked, retried, failed) and repairs are counted
+per prompt family in llm_structured_outputs_total / llm_output_repairs_total.
+"""
+import json
+import logging
+import re
+import types
+import typing
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple, Type
+
+from pydantic import BaseModel, Field, ValidationError, create_model
+
+from services.telemetry import record_llm_retry, record_structured_output
+
+logger = logging.getLogger(__name__)
+
+# Repair kinds, as counted in llm_output_repairs_total{repair}
+FENCE = "fence"
+SURROUNDING_TEXT = "surrounding_text"
+TRAILING_COMMA = "trailing_comma"
+TRUNCATED = "truncated"
+ENUM_CASE = "enum_case"
+OUT_OF_RANGE = "out_of_range"
+NUMBER_FORMAT = "number_format"
+NULL_LIST = "null_list"
+DROPPED_ITEM = "dropped_item"
+
+_FENCE_RE = re.compile(r"```(?:json|JSON)?\s*(.*?)(?:```|$)", re.DOTALL)
+_TRAILING_COMMA_RE = re.compile(r",(\s*[}\]])")
+_NUMBER_RE = re.compile(r"^\s*(-?\d+(?:\.\d+)?)\s*(?:%|/\s*100)?\s*$")
+
+_decoder = json.JSONDecoder()
+
+Path = Tuple[str, ...]
+Complete = Callable[[List[Dict[str, str]], int], Awaitable[Optional[str]]]
+
+
+class StructuredOutputError(ValueError):
+    """No valid structured output after repairs, re-asks and retries."""
+
+
+@dataclass
+class StructuredParse:
+    """One response parsed against a model."""
+    data: Any
+    repairs: List[str] = field(default_factory=list)
+    value: Optional[BaseModel] = None
+    invalid: List[Path] = field(default_factory=list)  # fields still failing validation
+    error: Optional[str] = None
+
+
+# =============================================================================
+# JSON extraction
+# =============================================================================
+
+def _close_truncated(text: str) -> Optional[str]:
+    """Cut text back to the last complete value and close the brackets left open."""
+    stack: List[str] = []
+    cut: Optional[Tuple[int, List[str]]] = None
+    in_string = escaped = False
+    for i, char in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in "{[":
+            stack.append(char)
+        elif char in "}]":
+            if not stack:
+                return None
+            stack.pop()
+            if not stack:
+                return None  # complete document; truncation is not the problem
+            cut = (i + 1, list(stack))
+        elif char == "," and stack:
+            cut = (i, list(stack))
+    if cut is None:
+        return None
+    end, open_brackets = cut
+    return text[:end] + "".join("}" if b == "{" else "]" for b in reversed(open_brackets))
+
+
+def extract_json(text: Optional[str]) -> Tuple[Any, List[str]]:
+    """
+    Parse the JSON object or array in an LLM response.
+
+    Returns (data, repairs). Raises ValueError when no JSON can be recovered.
+    """
+    if not text or not text.strip():
+        raise ValueError("Empty response")
+    repairs: List[str] = []
+    text = text.strip()
+
+    if "```" in text:
+        fenced = _FENCE_RE.search(text)
+        if fenced and fenced.group(1).strip():
+            text = fenced.group(1).strip()
+            repairs.append(FENCE)
+
+    starts = [i for i in (text.find("{"), text.find("[")) if i >= 0]
+    if not starts:
+        raise ValueError("No JSON in response")
+    if min(starts) > 0:
+        repairs.append(SURROUNDING_TEXT)
+    text = text[min(starts):]
+
+    candidates = [(text, [])]
+    without_commas = _TRAILING_COMMA_RE.sub(r"\1", text)
+    if without_commas != text:
+        candidates.append((without_commas, [TRAILING_COMMA]))
+    closed = _close_truncated(without_commas)
+    if closed:
+        candidates.append((closed, [TRUNCATED] + ([TRAILING_COMMA] if without_commas != text else [])))
+
+    error = None
+    for candidate, fixes in candidates:
+        try:
+            data, end = _decoder.raw_decode(candidate)
+        except json.JSONDecodeError as e:
+            error = e
+            continue
+        if candidate[end:].strip() and SURROUNDING_TEXT not in repairs:
+            repairs.append(SURROUNDING_TEXT)
+        return data, repairs + fixes
+    raise ValueError(f"Invalid JSON: {error}")
+
+
+# =============================================================================
+# Schema-guided repair
+# =============================================================================
+
+def _unwrap_optional(annotation: Any) -> Any:
+    if typing.get_origin(annotation) in (typing.Union, types.UnionType):
+        args = [a for a in typing.get_args(annotation) if a is not type(None)]
+        if len(args) == 1:
+            return args[0]
+    return annotation
+
+
+def _is_class(annotation: Any, base: type) -> bool:
+    return typing.get_origin(annotation) is None and isinstance(annotation, type) and issubclass(annotation, base)
+
+
+def _model_class(annotation: Any) -> Optional[Type[BaseModel]]:
+    annotation = _unwrap_optional(annotation)
+    return annotation if _is_class(annotation, BaseModel) else None
+
+
+def _field(model: Type[BaseModel], key: str) -> Tuple[Optional[str], Any]:
+    """The (name, FieldInfo) behind a key of the JSON, which may be an alias."""
+    for name, info in model.model_fields.items():
+        if (info.alias or name) == key:
+            return name, info
+    return None, None
+
+
+def _normalise_choice(value: str) -> str:
+    return re.sub(r"[\s\-]+", "_", value.strip().lower())
+
+
+def _bounds(metadata: Sequence[Any]) -> Tuple[Optional[float], Optional[float]]:
+    low = high = None
+    for item in metadata:
+        low = getattr(item, "ge", None) if getattr(item, "ge", None) is not None else low
+        high = getattr(item, "le", None) if getattr(item, "le", None) is not None else high
+    return low, high
+
+
+def _repair_value(value: Any, annotation: Any, metadata: Sequence[Any], truncated: bool, repairs: List[str]) -> Any:
+    if value is None and _unwrap_optional(annotation) is not annotation:
+        return value
+    annotation = _unwrap_optional(annotation)
+    origin = typing.get_origin(annotation)
+
+    model = _model_class(annotation)
+    if model is not None:
+        return _repair_object(value, model, truncated, repairs) if isinstance(value, dict) else value
+
+    if origin in (list, List):
+        if value is None:
+            repairs.append(NULL_LIST)
+            return []
+        if not isinstance(value, list):
+            return value
+        (item_type,) = typing.get_args(annotation) or (Any,)
+        items = [_repair_value(item, item_type, (), truncated, repairs) for item in value]
+        item_model = _model_class(item_type)
+        if truncated and items and item_model is not None:
+            # The last item of a cut-off array is usually incomplete
+            try:
+                item_model.model_validate(items[-1])
+            except ValidationError:
+                items.pop()
+                repairs.append(DROPPED_ITEM)
+        return items
+
+    if isinstance(value, str):
+        if _is_class(annotation, Enum):
+            choices = {_normalise_choice(str(m.value)): m.value for m in annotation}
+            choices.update({_normalise_choice(m.name): m.value for m in annotation})
+        elif origin is typing.Literal:
+            choices = {_normalise_choice(str(v)): v for v in typing.get_args(annotation)}
+        else:
+            choices = None
+        if choices is not None:
+            if value not in choices.values() and _normalise_choice(value) in choices:
+                repairs.append(ENUM_CASE)
+                return choices[_normalise_choice(value)]
+            return value
+        if annotation in (int, float):
+            match = _NUMBER_RE.match(value)
+            if not match:
+                return value
+            if "%" in value or "/" in value:
+                repairs.append(NUMBER_FORMAT)
+            value = float(match.group(1))
+
+    if annotation in (int, float) and isinstance(value, (int, float)) and not isinstance(value, bool):
+        low, high = _bounds(metadata)
+        if low is not None and value < low:
+            value = low
+            repairs.append(OUT_OF_RANGE)
+        elif high is not None and value > high:
+            value = high
+            repairs.append(OUT_OF_RANGE)
+        if annotation is int and not float(value).is_integer():
+            value = round(value)
+            repairs.append(NUMBER_FORMAT)
+        elif annotation is int:
+            value = int(value)
+    return value
+
+
+def _repair_object(data: Dict[str, Any], model: Type[BaseModel], truncated: bool, repairs: List[str]) -> Dict[str, Any]:
+    repaired = dict(data)
+    for name, info in model.model_fields.items():
+        key = info.alias or name
+        if key in repaired:
+            repaired[key] = _repair_value(repaired[key], info.annotation, info.metadata, truncated, repairs)
+    return repaired
+
+
+def repair(data: Any, model: Type[BaseModel], truncated: bool = False) -> Tuple[Any, List[str]]:
+    """Fix values the model would reject but whose intent is clear. Returns (data, repairs)."""
+    repairs: List[str] = []
+    if isinstance(data, dict):
+        data = _repair_object(data, model, truncated, repairs)
+    return data, repairs
+
+
+# =============================================================================
+# Validation and targeted re-asks
+# =============================================================================
+
+def _invalid_paths(model: Type[BaseModel], errors: List[Dict[str, Any]]) -> List[Path]:
+    """Fields to re-ask for: a nested model's own field, otherwise the top-level field."""
+    paths: List[Path] = []
+    for error in errors:
+        loc = error["loc"]
+        _, info = _field(model, str(loc[0])) if loc else (None, None)
+        if info is None:
+            path: Path = ()  # not a field: only a full retry can fix it
+        else:
+            nested = _model_class(info.annotation)
+            if nested is not None and len(loc) > 1 and isinstance(loc[1], str) and _field(nested, loc[1])[0]:
+                path = (str(loc[0]), loc[1])
+            else:
+                path = (str(loc[0]),)
+        if path not in paths:
+            paths.append(path)
+    return paths
+
+
+def _validate(data: Any, model: Type[BaseModel], repairs: List[str]) -> StructuredParse:
+    parsed = StructuredParse(data=data, repairs=repairs)
+    try:
+        parsed.value = model.model_validate(data)
+    except ValidationError as e:
+        parsed.invalid = _invalid_paths(model, e.errors())
+        parsed.error = "; ".join(
+            f"{'.'.join(str(p) for p in err['loc']) or 'response'}: {err['msg']}" for err in e.errors()[:5]
+        )
+    return parsed
+
+
+def parse_structured(
+    text: Optional[str],
+    model: Type[BaseModel],
+    normalize: Optional[Callable[[Any], Any]] = None,
+) -> StructuredParse:
+    """Extract, repair and validate one response. Raises ValueError when it holds no JSON."""
+    data, repairs = extract_json(text)
+    if normalize is not None and isinstance(data, dict):
+        data = normalize(data)
+    data, fixes = repair(data, model, truncated=TRUNCATED in repairs)
+    return _validate(data, model, repairs + fixes)
+
+
+def _patch_model(model: Type[BaseModel], paths: List[Path]) -> Type[BaseModel]:
+    """A model holding only the given fields (nested ones inside their parent)."""
+    fields: Dict[str, Any] = {}
+    nested: Dict[str, List[Path]] = {}
+    for path in paths:
+        if len(path) == 1:
+            name, info = _field(model, path[0])
+            fields[name] = (info.annotation, info)
+        else:
+            nested.setdefault(path[0], []).append(path[1:])
+    for key, sub_paths in nested.items():
+        name, info = _field(model, key)
+        if name not in fields:
+            fields[name] = (_patch_model(_model_class(info.annotation), sub_paths), Field(..., alias=info.alias))
+    return create_model(f"{model.__name__}Patch", **fields)
+
+
+def _merge(data: Dict[str, Any], patch: Any, paths: List[Path]) -> Dict[str, Any]:
+    merged = dict(data)
+    if not isinstance(patch, dict):
+        return merged
+    for path in paths:
+        source = patch
+        for key in path:
+            source = source.get(key) if isinstance(source, dict) else None
+        if source is None:
+            continue
+        target = merged
+        for key in path[:-1]:
+            target[key] = dict(target.get(key) or {})
+            target = target[key]
+        target[path[-1]] = source
+    return merged
+
+
+def reask_prompt(model: Type[BaseModel], paths: List[Path], error: Optional[str]) -> str:
+    """The follow-up asking for just the fields that are missing or invalid."""
+    names = ", ".join(".".join(path) for path in paths)
+    schema = json.dumps(_patch_model(model, paths).model_json_schema())
+    return (
+        f"Your JSON was missing or had invalid values for: {names}"
+        + (f" ({error})" if error else "")
+        + ". Reply with ONLY a JSON object containing just these fields, nested as in your answer, "
+        f"matching this JSON schema:\n{schema}\nDo not repeat the other fields."
+    )
+
+
+async def generate_structured(
+    model: Type[BaseModel],
+    messages: List[Dict[str, str]],
+    complete: Complete,
+    family: str,
+    normalize: Optional[Callable[[Any], Any]] = None,
+    max_attempts: int = 2,
+    max_reasks: int = 1,
+) -> BaseModel:
+    """
+    Get an instance of model from an LLM, repairing before re-asking before retrying.
+
+    complete(messages, attempt) sends a chat completion and returns the message
+    content; attempt counts full attempts from 0 (e.g. to raise temperature).
+    Transport errors from it propagate. Raises StructuredOutputError when no
+    valid output is obtained.
+    """
+    last_error = None
+    for attempt in range(max_attempts):
+        if attempt:
+            record_llm_retry(family, reason="invalid_output")
+        content = await complete(messages, attempt)
+        try:
+            parsed = parse_structured(content, model, normalize)
+        except ValueError as e:
+            logger.warning(f"{family}: no JSON in response (attempt {attempt + 1}): {e}")
+            last_error = str(e)
+            continue
+
+        reasks = 0
+        while parsed.value is None and reasks < max_reasks and isinstance(parsed.data, dict) and () not in parsed.invalid:
+            reasks += 1
+            record_llm_retry(family, reason="reask")
+            logger.info(f"{family}: re-asking for {parsed.invalid} ({parsed.error})")
+            followup = messages + [
+                {"role": "assistant", "content": json.dumps(parsed.data, default=str)},
+                {"role": "user", "content": reask_prompt(model, parsed.invalid, parsed.error)},
+            ]
+            try:
+                patch, patch_repairs = extract_json(await complete(followup, attempt))
+            except ValueError as e:
+                logger.warning(f"{family}: re-ask returned no JSON: {e}")
+                break
+            merged = _merge(parsed.data, patch, parsed.invalid)
+            merged, fixes = repair(merged, model, truncated=TRUNCATED in patch_repairs)
+            parsed = _validate(merged, model, parsed.repairs + patch_repairs + fixes)
+
+        if parsed.value is not None:
+            outcome = "retried" if attempt else "reasked" if reasks else "repaired" if parsed.repairs else "valid"
+            record_structured_output(family, outcome, parsed.repairs)
+            return parsed.value
+        logger.warning(f"{family}: invalid output (attempt {attempt + 1}): {parsed.error}")
+        last_error = parsed.error
+
+    record_structured_output(family, "failed")
+    raise StructuredOutputError(f"No valid {model.__name__} from {family}: {last_error}")
@@ -0,0 +1,311 @@
+"""
+Task Handlers.
+Background work run by the durable task queue, plus the helpers routers use
+to enqueue it. Payloads are JSON: handlers reload jobs and candidates from
+the database rather than carrying models across a restart.
+
+Handlers raise on failure so the queue can retry with backoff.
+"""
+import asyncio
+import functools
+import hashlib
+import logging
+import time
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from config import PIPELINE_COUNTS_RECONCILE_INTERVAL
+from services.llm_usage import llm_attribution
+from services.task_queue import (
+    task_queue,
+    task_handler,
+    PRIORITY_HIGH,
+    PRIORITY_NORMAL,
+    PRIORITY_LOW,
+    STATUS_DEAD,
+)
+
+logger = logging.getLogger(__name__)
+
+KIND_APPLICATION = "application"
+KIND_SCREENING = "screening"
+KIND_SCREENING_PACK = "screening_pack"
+KIND_RESUME = "resume_extraction"
+KIND_JD_EXTRACTION = "jd_extraction"
+KIND_ANALYTICS = "interview_analytics"
+KIND_POST_CALL = "post_call"
+KIND_RECONCILE_COUNTS = "reconcile_pipeline_counts"
+
+
+def _load_job(job_id: str):
+    from repositories.streamlined.job_repo import JobRepository
+
+    job = JobRepository().get_by_id_sync(UUID(str(job_id)))
+    if not job:
+        raise ValueError(f"Job {job_id} not found")
+    return job
+
+
+def _attributed(handler):
+    """Attribute a handler's LLM usage to the job / candidate / interview in its payload."""
+    @functools.wraps(handler)
+    async def wrapper(payload: Dict[str, Any]) -> None:
+        with llm_attribution(
+            job_id=payload.get("job_id"),
+            candidate_id=payload.get("candidate_id"),
+            interview_id=payload.get("interview_id"),
+        ):
+            await handler(payload)
+    return wrapper
+
+
+# =============================================================================
+# Handlers
+# =============================================================================
+
+@task_handler(KIND_APPLICATION)
+@_attributed
+async def handle_application(payload: Dict[str, Any]) -> None:
+    """Resume parsing + screening for a public application."""
+    from services.application_processor import process_new_application
+
+    await process_new_application(UUID(payload["candidate_id"]), payload.get("resume_path"))
+
+
+@task_handler(KIND_SCREENING)
+@_attributed
+async def handle_screening(payload: Dict[str, Any]) -> None:
+    """LLM screening for one uploaded candidate."""
+    from services.candidate_screening import process_candidate_screening
+
+    job = _load_job(payload["job_id"])
+    await process_candidate_screening(
+        UUID(payload["candidate_id"]),
+        UUID(payload["person_id"]),
+        payload["enrichment_data"],
+        job.title,
+        job.raw_description or "",
+        job.extracted_requirements,
+    )
+
+
+@task_handler(KIND_SCREENING_PACK)
+@_attributed
+async def handle_screening_pack(payload: Dict[str, Any]) -> None:
+    """LLM screening for several uploaded candidates in shared-prefix calls."""
+    from services.candidate_screening import screen_candidates_batch, apply_screening_result
+
+    job = _load_job(payload["job_id"])
+    candidates = payload["candidates"]
+    screened = await screen_candidates_batch(
+        candidates,
+        job.title,
+        job.raw_description or "",
+        job.extracted_requirements,
+        pack_size=len(candidates),
+    )
+
+    # Screening is the expensive part, so a failed save only re-queues that candidate
+    for candidate, item in zip(candidates, screened):
+        try:
+            await apply_screening_result(
+                UUID(candidate["candidate_id"]),
+                UUID(candidate["person_id"]),
+                candidate["enrichment_data"],
+                job.title,
+                item["result"],
+            )
+        except Exception as e:
+            logger.error(f"Saving packed screening for candidate {candidate['candidate_id']} failed: {e}")
+            await asyncio.to_thread(enqueue_screenings, payload["job_id"], [candidate], pack_size=1)
+
+
+@task_handler(KIND_RESUME)
+@_attributed
+async def handle_resume_extraction(payload: Dict[str, Any]) -> None:
+    """Extract bio summary and skills from an uploaded resume."""
+    from services.resume_processor import extract_resume_data
+    from repositories.streamlined.candidate_repo import CandidateRepository
+    from models.streamlined.candidate import CandidateUpdate
+
+    job = _load_job(payload["job_id"])
+    extracted = await extract_resume_data(payload["resume_text"], job.extracted_requirements)
+    if not extracted:
+        raise RuntimeError("Resume extraction returned no data")
+
+    CandidateRepository().update_sync(UUID(payload["candidate_id"]), CandidateUpdate(
+        bio_summary=extracted.get("bio_summary"),
+        skills=extracted.get("skills", []),
+    ))
+    logger.info(f"Processed resume for candidate {payload['candidate_id']}")
+
+
+@task_handler(KIND_JD_EXTRACTION)
+@_attributed
+async def handle_jd_extraction(payload: Dict[str, Any]) -> None:
+    """Extract structured requirements from a job description."""
+    from services.jd_extractor import trigger_jd_extraction_for_job
+
+    # Use the stored description so a retry or re-trigger sees the latest edit
+    job = _load_job(payload["job_id"])
+    if not job.raw_description:
+        logger.warning(f"Job {payload['job_id']} has no description to extract")
+        return
+    await trigger_jd_extraction_for_job(payload["job_id"], job.raw_description)
+
+
+@task_handler(KIND_ANALYTICS)
+@_attributed
+async def handle_interview_analytics(payload: Dict[str, Any]) -> None:
+    """Generate analytics for a completed interview (sync generator, run off-loop)."""
+    from services.analytics_generator import generate_analytics_sync
+
+    await asyncio.to_thread(generate_analytics_sync, UUID(payload["interview_id"]))
+
+
+@task_handler(KIND_POST_CALL)
+@_attributed
+async def handle_post_call(payload: Dict[str, Any]) -> None:
+    """Transcript, turns, candidate + interviewer analytics and status after a Vapi call ends."""
+    from services.post_call_pipeline import run_post_call_pipeline
+
+    await run_post_call_pipeline(payload)
+
+
+@task_handler(KIND_RECONCILE_COUNTS)
+async def handle_reconcile_pipeline_counts(payload: Dict[str, Any]) -> None:
+    """Repair drift in job_pipeline_counts from candidate rows, then schedule the next run."""
+    from repositories.streamlined.job_repo import JobRepository
+
+    corrected = await asyncio.to_thread(JobRepository().reconcile_pipeline_counts_sync, payload.get("job_ids"))
+    if corrected:
+        logger.warning(f"Reconciled {corrected} drifted job pipeline count rows")
+
+    # Stop rescheduling if the counts migration isn't installed
+    if payload.get("recurring") and JobRepository._counts_table_available:
+        await asyncio.to_thread(enqueue_pipeline_counts_reconcile, delay=PIPELINE_COUNTS_RECONCILE_INTERVAL)
+
+
+# =============================================================================
+# Enqueue helpers
+# =============================================================================
+
+def enqueue_application(candidate_id: UUID, resume_path: Optional[str]) -> Dict[str, Any]:
+    """Public applications are candidate-facing, so they jump bulk work."""
+    return task_queue.enqueue(
+        KIND_APPLICATION,
+        {"candidate_id": str(candidate_id), "resume_path": resume_path},
+        key=f"{KIND_APPLICATION}:{candidate_id}",
+        priority=PRIORITY_HIGH,
+    )
+
+
+def enqueue_screenings(
+    job_id: UUID,
+    candidates: List[Dict[str, Any]],
+    pack_size: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Queue screening for candidates (dicts with candidate_id, person_id, enrichment_data).
+
+    One task per candidate, or one task per SCREENING_PACK_SIZE candidates when
+    packed screening is enabled.
+    """
+    from config import SCREENING_PACK_SIZE
+
+    pack_size = pack_size or SCREENING_PACK_SIZE
+    payloads = [
+        {
+            "job_id": str(job_id),
+            "candidate_id": str(c["candidate_id"]),
+            "person_id": str(c["person_id"]),
+            "enrichment_data": c["enrichment_data"],
+        }
+        for c in candidates
+    ]
+    if pack_size > 1:
+        packs = [
+            {"job_id": str(job_id), "candidates": payloads[i:i + pack_size]}
+            for i in range(0, len(payloads), pack_size)
+        ]
+        return task_queue.enqueue_many(
+            KIND_SCREENING_PACK,
+            packs,
+            key_fn=_pack_key,
+            priority=PRIORITY_LOW,
+        )
+
+    return task_queue.enqueue_many(
+        KIND_SCREENING,
+        payloads,
+        key_fn=lambda p: f"{KIND_SCREENING}:{p['candidate_id']}",
+        priority=PRIORITY_LOW,
+    )
+
+
+def _pack_key(pack: Dict[str, Any]) -> str:
+    ids = ",".join(sorted(c["candidate_id"] for c in pack["candidates"]))
+    return f"{KIND_SCREENING_PACK}:{hashlib.sha1(ids.encode()).hexdigest()[:16]}"
+
+
+def enqueue_resume_extraction(job_id: UUID, candidate_id: str, resume_text: str) -> Dict[str, Any]:
+    return task_queue.enqueue(
+        KIND_RESUME,
+        {"job_id": str(job_id), "candidate_id": str(candidate_id), "resume_text": resume_text},
+        key=f"{KIND_RESUME}:{candidate_id}",
+        priority=PRIORITY_LOW,
+    )
+
+
+def enqueue_jd_extraction(job_id: str) -> Dict[str, Any]:
+    return task_queue.enqueue(
+        KIND_JD_EXTRACTION,
+        {"job_id": str(job_id)},
+        key=f"{KIND_JD_EXTRACTION}:{job_id}",
+        priority=PRIORITY_NORMAL,
+    )
+
+
+def enqueue_interview_analytics(interview_id: str) -> Dict[str, Any]:
+    return task_queue.enqueue(
+        KIND_ANALYTICS,
+        {"interview_id": str(interview_id)},
+        key=f"{KIND_ANALYTICS}:{interview_id}",
+        priority=PRIORITY_NORMAL,
+    )
+
+
+def enqueue_post_call(payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Queue the post-call pipeline for a Vapi call (payload carries interview_id and call_id).
+
+    Keyed on the call ID and skipped if that call was already processed, not
+    just while it is pending, so Vapi's webhook retries never redo the work.
+    Returns None when skipped.
+    """
+    key = f"{KIND_POST_CALL}:{payload.get('call_id') or payload['interview_id']}"
+    existing = task_queue.get_by_key(key)
+    if existing and existing["status"] != STATUS_DEAD:
+        logger.info(f"Post-call pipeline for {key} already {existing['status']}, skipping")
+        return None
+    return task_queue.enqueue(KIND_POST_CALL, payload, key=key, priority=PRIORITY_NORMAL)
+
+
+def enqueue_pipeline_counts_reconcile(delay: float = 0.0) -> Optional[Dict[str, Any]]:
+    """
+    Schedule the periodic job_pipeline_counts reconciliation.
+
+    Keyed on the interval slot it runs in, so API processes starting up and
+    the previous run rescheduling itself queue one run per interval. Returns
+    None when reconciliation is disabled.
+    """
+    if PIPELINE_COUNTS_RECONCILE_INTERVAL <= 0:
+        return None
+    slot = int((time.time() + delay) // PIPELINE_COUNTS_RECONCILE_INTERVAL)
+    return task_queue.enqueue(
+        KIND_RECONCILE_COUNTS,
+        {"recurring": True},
+        key=f"{KIND_RECONCILE_COUNTS}:{slot}",
+        priority=PRIORITY_LOW,
+        delay=delay,
+    )
@@ -0,0 +1,491 @@
+"""
+Durable Task Queue.
+SQLite-backed queue for background work (screening, resume parsing, JD
+extraction, analytics) that must survive restarts and deploys. Tasks are
+claimed with a lease by worker processes (see worker.py); a task whose
+worker dies is reclaimed once its lease expires.
+
+Lifecycle:
+    queued -> running -> succeeded
+                      -> queued (retry after exponential backoff)
+                      -> dead   (attempts exhausted; retry via the status API)
+
+Lower priority numbers run first. A task key makes enqueueing idempotent
+while a task with the same key is still queued or running.
+"""
+import asyncio
+import json
+import logging
+import os
+import random
+import socket
+import sqlite3
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+from config import (
+    TASK_QUEUE_DB_PATH,
+    TASK_QUEUE_LEASE_SECONDS,
+    TASK_QUEUE_MAX_ATTEMPTS,
+    TASK_QUEUE_RETRY_BASE_DELAY,
+    TASK_QUEUE_RETRY_MAX_DELAY,
+)
+from services.telemetry import span
+
+logger = logging.getLogger(__name__)
+
+# Priorities (lower runs first)
+PRIORITY_HIGH = 0      # candidate-facing work, e.g. public applications
+PRIORITY_NORMAL = 5    # recruiter-triggered single items
+PRIORITY_LOW = 10      # bulk uploads and re-screens
+
+STATUS_QUEUED = "queued"
+STATUS_RUNNING = "running"
+STATUS_SUCCEEDED = "succeeded"
+STATUS_DEAD = "dead"
+
+TaskHandler = Callable[[Dict[str, Any]], Awaitable[Any]]
+
+# Registered handlers by task kind (see services/task_handlers.py)
+TASK_HANDLERS: Dict[str, TaskHandler] = {}
+
+
+def task_handler(kind: str) -> Callable[[TaskHandler], TaskHandler]:
+    """Register an async handler for a task kind."""
+    def decorator(func: TaskHandler) -> TaskHandler:
+        TASK_HANDLERS[kind] = func
+        return func
+    return decorator
+
+
+class TaskQueue:
+    """SQLite task table with leased claims, retries and idempotent keys."""
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        lease_seconds: float = TASK_QUEUE_LEASE_SECONDS,
+        max_attempts: int = TASK_QUEUE_MAX_ATTEMPTS,
+        retry_base_delay: float = TASK_QUEUE_RETRY_BASE_DELAY,
+        retry_max_delay: float = TASK_QUEUE_RETRY_MAX_DELAY,
+    ):
+        if db_path is None:
+            db_path = TASK_QUEUE_DB_PATH or Path(__file__).parent.parent / "data" / "task_queue.db"
+        self.db_path = Path(db_path)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self._initialized = False
+
+    # ==========================================================================
+    # Connection
+    # ==========================================================================
+
+    @contextmanager
+    def _connect(self, immediate: bool = False):
+        """One connection per operation; safe across threads and processes."""
+        if not self._initialized:
+            self._init_db()
+        conn = sqlite3.connect(str(self.db_path), timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            conn.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+            yield conn
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def _init_db(self) -> None:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.db_path), timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS tasks (
+                    id TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    task_key TEXT,
+                    payload TEXT NOT NULL,
+                    priority INTEGER NOT NULL,
+                    status TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    max_attempts INTEGER NOT NULL,
+                    run_after REAL NOT NULL,
+                    locked_by TEXT,
+                    locked_until REAL,
+                    last_error TEXT,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL,
+                    finished_at REAL
+                );
+                CREATE INDEX IF NOT EXISTS idx_tasks_ready
+                    ON tasks (status, priority, run_after);
+                CREATE INDEX IF NOT EXISTS idx_tasks_key
+                    ON tasks (task_key, status);
+                """
+            )
+            conn.commit()
+        finally:
+            conn.close()
+        self._initialized = True
+
+    # ==========================================================================
+    # Producer API
+    # ==========================================================================
+
+    def enqueue(
+        self,
+        kind: str,
+        payload: Dict[str, Any],
+        key: Optional[str] = None,
+        priority: int = PRIORITY_NORMAL,
+        max_attempts: Optional[int] = None,
+        delay: float = 0.0,
+    ) -> Dict[str, Any]:
+        """
+        Add a task and return its row.
+
+        If a task with the same key is already queued or running, that task is
+        returned instead. A still-queued duplicate takes the new payload and
+        the higher of the two priorities.
+        """
+        with self._connect(immediate=True) as conn:
+            task = self._insert(conn, kind, payload, key, priority, max_attempts, delay)
+        return task
+
+    def enqueue_many(
+        self,
+        kind: str,
+        items: Iterable[Dict[str, Any]],
+        key_fn: Optional[Callable[[Dict[str, Any]], str]] = None,
+        priority: int = PRIORITY_NORMAL,
+    ) -> List[Dict[str, Any]]:
+        """Enqueue one task per payload in a single transaction (e.g. a CSV upload's screenings)."""
+        with self._connect(immediate=True) as conn:
+            return [
+                self._insert(conn, kind, payload, key_fn(payload) if key_fn else None, priority, None, 0.0)
+                for payload in items
+            ]
+
+    def _insert(
+        self,
+        conn: sqlite3.Connection,
+        kind: str,
+        payload: Dict[str, Any],
+        key: Optional[str],
+        priority: int,
+        max_attempts: Optional[int],
+        delay: float,
+    ) -> Dict[str, Any]:
+        now = time.time()
+        if key:
+            existing = conn.execute(
+                "SELECT * FROM tasks WHERE task_key = ? AND status IN (?, ?)",
+                (key, STATUS_QUEUED, STATUS_RUNNING),
+            ).fetchone()
+            if existing is not None:
+                if existing["status"] == STATUS_QUEUED:
+                    # Not started yet: run it once, with the newest payload and highest priority
+                    conn.execute(
+                        "UPDATE tasks SET payload = ?, priority = ?, updated_at = ? WHERE id = ?",
+                        (json.dumps(payload, default=str), min(priority, existing["priority"]), now, existing["id"]),
+                    )
+                    existing = conn.execute("SELECT * FROM tasks WHERE id = ?", (existing["id"],)).fetchone()
+                logger.info(f"Task {key} already pending as {existing['id']}")
+                return self._row_to_dict(existing)
+
+        task_id = str(uuid.uuid4())
+        conn.execute(
+            "INSERT INTO tasks (id, kind, task_key, payload, priority, status, attempts, "
+            "max_attempts, run_after, created_at, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, 0, ?, ?, ?, ?)",
+            (
+                task_id, kind, key, json.dumps(payload, default=str), priority, STATUS_QUEUED,
+                max_attempts or self.max_attempts, now + delay, now, now,
+            ),
+        )
+        logger.info(f"Enqueued {kind} task {task_id} (key={key}, priority={priority})")
+        row = conn.execute("SELECT * FROM tasks WHERE id = ?", (task_id,)).fetchone()
+        return self._row_to_dict(row)
+
+    # ==========================================================================
+    # Worker API
+    # ==========================================================================
+
+    def claim(self, worker_id: str, kinds: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Lease the next ready task for a worker.
+
+        Ready means queued and past its backoff, or running with an expired
+        lease (the previous worker died mid-task).
+        """
+        now = time.time()
+        kind_filter = ""
+        params: List[Any] = [STATUS_QUEUED, now, STATUS_RUNNING, now]
+        if kinds:
+            kind_filter = f" AND kind IN ({', '.join('?' for _ in kinds)})"
+            params.extend(kinds)
+
+        with self._connect(immediate=True) as conn:
+            row = conn.execute(
+                "SELECT id FROM tasks "
+                "WHERE ((status = ? AND run_after <= ?) OR (status = ? AND locked_until < ?))"
+                f"{kind_filter} ORDER BY priority, run_after, created_at LIMIT 1",
+                params,
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE tasks SET status = ?, attempts = attempts + 1, locked_by = ?, "
+                "locked_until = ?, updated_at = ? WHERE id = ?",
+                (STATUS_RUNNING, worker_id, now + self.lease_seconds, now, row["id"]),
+            )
+            task = conn.execute("SELECT * FROM tasks WHERE id = ?", (row["id"],)).fetchone()
+        return self._row_to_dict(task)
+
+    def heartbeat(self, task_id: str, worker_id: str) -> bool:
+        """Extend a running task's lease; False if the worker no longer owns it."""
+        now = time.time()
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE tasks SET locked_until = ?, updated_at = ? "
+                "WHERE id = ? AND status = ? AND locked_by = ?",
+                (now + self.lease_seconds, now, task_id, STATUS_RUNNING, worker_id),
+            )
+            return cursor.rowcount == 1
+
+    def complete(self, task_id: str, worker_id: str) -> None:
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE tasks SET status = ?, locked_by = NULL, locked_until = NULL, "
+                "last_error = NULL, finished_at = ?, updated_at = ? "
+                "WHERE id = ? AND locked_by = ?",
+                (STATUS_SUCCEEDED, now, now, task_id, worker_id),
+            )
+
+    def fail(self, task_id: str, worker_id: str, error: str, retryable: bool = True) -> str:
+        """Record a failure; requeue with backoff or mark dead. Returns the new status."""
+        now = time.time()
+        with self._connect(immediate=True) as conn:
+            row = conn.execute(
+                "SELECT attempts, max_attempts FROM tasks WHERE id = ? AND locked_by = ?",
+                (task_id, worker_id),
+            ).fetchone()
+            if row is None:
+                return STATUS_RUNNING  # Lease was lost to another worker
+            if retryable and row["attempts"] < row["max_attempts"]:
+                status = STATUS_QUEUED
+                run_after = now + self._backoff(row["attempts"])
+                finished_at = None
+            else:
+                status = STATUS_DEAD
+                run_after = now
+                finished_at = now
+            conn.execute(
+                "UPDATE tasks SET status = ?, run_after = ?, locked_by = NULL, locked_until = NULL, "
+                "last_error = ?, finished_at = ?, updated_at = ? WHERE id = ?",
+                (status, run_after, error[:2000], finished_at, now, task_id),
+            )
+        return status
+
+    def _backoff(self, attempts: int) -> float:
+        """Exponential backoff with jitter: base, 2x base, 4x base ... capped."""
+        delay = min(self.retry_base_delay * (2 ** max(attempts - 1, 0)), self.retry_max_delay)
+        return delay * random.uniform(0.8, 1.2)
+
+    # ==========================================================================
+    # Status API
+    # ==========================================================================
+
+    def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM tasks WHERE id = ?", (task_id,)).fetchone()
+        return self._row_to_dict(row) if row else None
+
+    def get_by_key(self, key: str) -> Optional[Dict[str, Any]]:
+        """Most recent task for an idempotency key."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT * FROM tasks WHERE task_key = ? ORDER BY created_at DESC LIMIT 1", (key,)
+            ).fetchone()
+        return self._row_to_dict(row) if row else None
+
+    def list_tasks(
+        self,
+        status: Optional[str] = None,
+        kind: Optional[str] = None,
+        limit: int = 50,
+        offset: int = 0,
+    ) -> List[Dict[str, Any]]:
+        clauses, params = [], []
+        if status:
+            clauses.append("status = ?")
+            params.append(status)
+        if kind:
+            clauses.append("kind = ?")
+            params.append(kind)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT * FROM tasks {where} ORDER BY created_at DESC LIMIT ? OFFSET ?",
+                (*params, limit, offset),
+            ).fetchall()
+        return [self._row_to_dict(row) for row in rows]
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Task counts by kind and status."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT kind, status, COUNT(*) AS n FROM tasks GROUP BY kind, status"
+            ).fetchall()
+        stats: Dict[str, Dict[str, int]] = {}
+        for row in rows:
+            stats.setdefault(row["kind"], {})[row["status"]] = row["n"]
+        return stats
+
+    def retry(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """Requeue a dead task with a fresh attempt budget."""
+        now = time.time()
+        with self._connect(immediate=True) as conn:
+            cursor = conn.execute(
+                "UPDATE tasks SET status = ?, attempts = 0, run_after = ?, finished_at = NULL, "
+                "updated_at = ? WHERE id = ? AND status = ?",
+                (STATUS_QUEUED, now, now, task_id, STATUS_DEAD),
+            )
+            if cursor.rowcount == 0:
+                return None
+            row = conn.execute("SELECT * FROM tasks WHERE id = ?", (task_id,)).fetchone()
+        return self._row_to_dict(row)
+
+    def purge_finished(self, older_than: float) -> int:
+        """Delete succeeded tasks finished more than `older_than` seconds ago."""
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "DELETE FROM tasks WHERE status = ? AND finished_at < ?",
+                (STATUS_SUCCEEDED, time.time() - older_than),
+            )
+            return cursor.rowcount
+
+    @staticmethod
+    def _row_to_dict(row: sqlite3.Row) -> Dict[str, Any]:
+        task = dict(row)
+        task["payload"] = json.loads(task["payload"])
+        return task
+
+
+class TaskWorker:
+    """Claims tasks from a queue and runs their handlers with bounded concurrency."""
+
+    def __init__(
+        self,
+        queue: TaskQueue,
+        handlers: Optional[Dict[str, TaskHandler]] = None,
+        concurrency: int = 4,
+        poll_interval: float = 1.0,
+        kinds: Optional[List[str]] = None,
+        worker_id: Optional[str] = None,
+    ):
+        self.queue = queue
+        self.handlers = handlers if handlers is not None else TASK_HANDLERS
+        self.concurrency = max(concurrency, 1)
+        self.poll_interval = poll_interval
+        self.kinds = kinds
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self._stopping = asyncio.Event()
+
+    def stop(self) -> None:
+        """Stop claiming new tasks; in-flight tasks finish."""
+        self._stopping.set()
+
+    async def run(self) -> None:
+        logger.info(f"Task worker {self.worker_id} started (concurrency={self.concurrency})")
+        slots = [asyncio.create_task(self._slot()) for _ in range(self.concurrency)]
+        try:
+            await asyncio.gather(*slots)
+        finally:
+            logger.info(f"Task worker {self.worker_id} stopped")
+
+    async def _slot(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                ran = await self.run_once()
+            except Exception as e:
+                logger.error(f"Task worker {self.worker_id} error: {e}")
+                ran = False
+            if not ran:
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def run_once(self) -> bool:
+        """Claim and run one task. Returns False when nothing was ready."""
+        task = await asyncio.to_thread(self.queue.claim, self.worker_id, self.kinds)
+        if task is None:
+            return False
+
+        handler = self.handlers.get(task["kind"])
+        if handler is None:
+            logger.error(f"No handler registered for task kind {task['kind']}")
+            await asyncio.to_thread(
+                self.queue.fail, task["id"], self.worker_id, f"Unknown task kind: {task['kind']}", False
+            )
+            return True
+
+        work = asyncio.create_task(self._handle(handler, task))
+        lease_lost = asyncio.Event()
+        heartbeat = asyncio.create_task(self._heartbeat(task["id"], work, lease_lost))
+        start = time.perf_counter()
+        try:
+            await work
+        except asyncio.CancelledError:
+            if not lease_lost.is_set():
+                raise
+            # Another worker has re-claimed the task; it owns the outcome now
+            logger.warning(
+                f"Task {task['kind']} {task['id']} lost its lease after "
+                f"{time.perf_counter() - start:.1f}s; stopped the handler"
+            )
+        except Exception as e:
+            status = await asyncio.to_thread(self.queue.fail, task["id"], self.worker_id, repr(e))
+            logger.error(
+                f"Task {task['kind']} {task['id']} failed (attempt {task['attempts']}/"
+                f"{task['max_attempts']}, now {status}): {e}"
+            )
+        else:
+            await asyncio.to_thread(self.queue.complete, task["id"], self.worker_id)
+            logger.info(f"Task {task['kind']} {task['id']} succeeded in {time.perf_counter() - start:.1f}s")
+        finally:
+            heartbeat.cancel()
+        return True
+
+    async def _handle(self, handler: TaskHandler, task: Dict[str, Any]) -> None:
+        with span(f"task.{task['kind']}", task_id=task["id"], attempt=task["attempts"]):
+            await handler(task["payload"])
+
+    async def _heartbeat(self, task_id: str, work: asyncio.Task, lease_lost: asyncio.Event) -> None:
+        interval = max(self.queue.lease_seconds / 3, 0.05)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                owned = await asyncio.to_thread(self.queue.heartbeat, task_id, self.worker_id)
+            except Exception as e:
+                logger.warning(f"Heartbeat failed for task {task_id}: {e}")
+                continue
+            if not owned:
+                lease_lost.set()
+                work.cancel()
+                return
+
+
+# Global instance
+task_queue = TaskQueue()
@@ -0,0 +1,595 @@
+"""
+Request, database and LLM telemetry.
+Records where request time goes and exports it in Prometheus text format
+on GET /metrics:
+
+- http_request_duration_seconds{method,route,status}: per-route latency,
+  labelled with the route template (/api/jobs/{job_id}) rather than the path
+- http_request_db_round_trips{method,route}: DB queries made per request
+- db_query_duration_seconds{repository,method,table,operation}: every
+  PostgREST round trip, attributed to the repository method that ran it
+- llm_request_duration_seconds{family,model,status}, llm_tokens_total and
+  llm_retries_total: every LLM HTTP attempt, tagged by prompt family
+- llm_structured_outputs_total{family,outcome} and llm_output_repairs_total:
+  how structured outputs were made valid (see services/structured_output.py)
+- span_duration_seconds{span}: anything wrapped in span() or @traced
+
+Spans nest through a context variable, so they follow asyncio tasks and
+asyncio.to_thread; DB and LLM calls count towards the request that caused
+them. When OTEL_EXPORTER_OTLP_ENDPOINT is set and opentelemetry-sdk plus the
+OTLP HTTP exporter are installed, spans are also exported as traces.
+
+Metrics are per process: with several uvicorn workers each one serves its
+own /metrics.
+"""
+import contextvars
+import functools
+import inspect
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Sequence, Tuple
+
+from config import METRICS_ENABLED, OTEL_EXPORTER_OTLP_ENDPOINT, OTEL_SERVICE_NAME
+
+logger = logging.getLogger(__name__)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4"  # Starlette appends the charset
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+LLM_LATENCY_BUCKETS = (0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 15.0, 30.0, 60.0, 120.0)
+ROUND_TRIP_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+
+# =============================================================================
+# Metrics registry
+# =============================================================================
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Counter:
+    """Monotonic counter with labels."""
+
+    type = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = tuple(str(labels.get(n, "")) for n in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(tuple(str(labels.get(n, "")) for n in self.labelnames), 0)
+
+    def samples(self) -> Iterator[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            yield f"{self.name}{_labels(self.labelnames, key)} {_number(value)}"
+
+
+class Histogram:
+    """Cumulative-bucket histogram with labels."""
+
+    type = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # key -> [per-bucket counts (+Inf last), sum, count]
+        self._values: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels) -> None:
+        key = tuple(str(labels.get(n, "")) for n in self.labelnames)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][index] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def count(self, **labels) -> int:
+        entry = self._values.get(tuple(str(labels.get(n, "")) for n in self.labelnames))
+        return entry[2] if entry else 0
+
+    def samples(self) -> Iterator[str]:
+        with self._lock:
+            items = sorted((key, [list(e[0]), e[1], e[2]]) for key, e in self._values.items())
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float("inf"),), counts):
+                cumulative += n
+                le = 'le="+Inf"' if bound == float("inf") else f'le="{_number(bound)}"'
+                yield f"{self.name}_bucket{_labels(self.labelnames, key, le)} {cumulative}"
+            yield f"{self.name}_sum{_labels(self.labelnames, key)} {_number(total)}"
+            yield f"{self.name}_count{_labels(self.labelnames, key)} {count}"
+
+
+class MetricsRegistry:
+    """The metrics this process exports."""
+
+    def __init__(self):
+        self._metrics: Dict[str, Any] = {}
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._metrics.setdefault(name, Counter(name, help, labelnames))
+
+    def histogram(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._metrics.setdefault(name, Histogram(name, help, labelnames, buckets))
+
+    def render(self) -> str:
+        """Prometheus text exposition format."""
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+HTTP_SECONDS = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template",
+    ["method", "route", "status"],
+)
+HTTP_DB_ROUND_TRIPS = registry.histogram(
+    "http_request_db_round_trips", "Database queries made while serving one request",
+    ["method", "route"], buckets=ROUND_TRIP_BUCKETS,
+)
+DB_SECONDS = registry.histogram(
+    "db_query_duration_seconds", "Database round trip time by repository method",
+    ["repository", "method", "table", "operation"],
+)
+DB_ERRORS = registry.counter(
+    "db_query_errors_total", "Database round trips that raised",
+    ["repository", "method", "table", "operation"],
+)
+LLM_SECONDS = registry.histogram(
+    "llm_request_duration_seconds", "LLM HTTP attempt latency (including reading the body)",
+    ["family", "model", "status"], buckets=LLM_LATENCY_BUCKETS,
+)
+LLM_TOKENS = registry.counter(
+    "llm_tokens_total", "LLM tokens reported in response usage",
+    ["family", "model", "type"],
+)
+LLM_RETRIES = registry.counter(
+    "llm_retries_total", "LLM attempts that were retries of an earlier attempt",
+    ["family", "reason"],
+)
+LLM_STRUCTURED = registry.counter(
+    "llm_structured_outputs_total", "Structured LLM outputs by how they were made valid",
+    ["family", "outcome"],
+)
+LLM_REPAIRS = registry.counter(
+    "llm_output_repairs_total", "Defects in structured LLM output repaired without another call",
+    ["family", "repair"],
+)
+SPAN_SECONDS = registry.histogram(
+    "span_duration_seconds", "Duration of named spans",
+    ["span"],
+)
+
+
+# =============================================================================
+# Spans
+# =============================================================================
+
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("telemetry_span", default=None)
+
+_tracer = None
+_tracer_checked = False
+
+
+def _otel_tracer():
+    """The OpenTelemetry tracer, or None when no OTLP endpoint is configured."""
+    global _tracer, _tracer_checked
+    if _tracer_checked:
+        return _tracer
+    _tracer_checked = True
+    if not OTEL_EXPORTER_OTLP_ENDPOINT:
+        return None
+    try:
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+    except ImportError:
+        logger.warning(
+            "OTEL_EXPORTER_OTLP_ENDPOINT is set but opentelemetry-sdk / "
+            "opentelemetry-exporter-otlp-proto-http are not installed; not exporting traces"
+        )
+        return None
+
+    provider = TracerProvider(resource=Resource.create({"service.name": OTEL_SERVICE_NAME}))
+    # The exporter reads OTEL_EXPORTER_OTLP_ENDPOINT (and headers) from the environment
+    provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter()))
+    _tracer = provider.get_tracer("briefing-room")
+    logger.info(f"Exporting traces to {OTEL_EXPORTER_OTLP_ENDPOINT}")
+    return _tracer
+
+
+def _otel_attributes(attributes: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: v if isinstance(v, (str, bool, int, float)) else str(v) for k, v in attributes.items() if v is not None}
+
+
+def _export_finished(name: str, start: float, end: float, attributes: Dict[str, Any]) -> None:
+    """Export an already finished child span (DB and LLM calls are timed outside span())."""
+    tracer = _otel_tracer()
+    if tracer is None:
+        return
+    # perf_counter -> wall clock nanoseconds
+    offset = time.time_ns() - int(time.perf_counter() * 1e9)
+    otel_span = tracer.start_span(name, start_time=int(start * 1e9) + offset, attributes=_otel_attributes(attributes))
+    otel_span.end(end_time=int(end * 1e9) + offset)
+
+
+class Span:
+    """A timed unit of work. The outermost span (usually the request) collects DB/LLM counts."""
+
+    __slots__ = ("name", "kind", "attributes", "parent", "root", "start", "end", "db_round_trips", "llm_calls", "_otel")
+
+    def __init__(self, name: str, kind: str, attributes: Dict[str, Any], parent: Optional["Span"]):
+        self.name = name
+        self.kind = kind
+        self.attributes = attributes
+        self.parent = parent
+        self.root = parent.root if parent is not None else self
+        self.start = time.perf_counter()
+        self.end: Optional[float] = None
+        self.db_round_trips = 0
+        self.llm_calls = 0
+        self._otel = None
+
+    @property
+    def duration(self) -> float:
+        return (self.end or time.perf_counter()) - self.start
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+        if self._otel is not None and value is not None:
+            self._otel.set_attribute(key, value if isinstance(value, (str, bool, int, float)) else str(value))
+
+    def rename(self, name: str) -> None:
+        self.name = name
+        if self._otel is not None:
+            self._otel.update_name(name)
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+@contextmanager
+def span(name: str, kind: str = "internal", **attributes) -> Iterator[Span]:
+    """
+    Time a block of work as a span nested under the current one.
+
+    Internal spans are recorded in span_duration_seconds{span=name}; keep
+    names low-cardinality (no ids) and put ids in attributes instead.
+    """
+    s = Span(name, kind, attributes, _current_span.get())
+    token = _current_span.set(s)
+    tracer = _otel_tracer()
+    otel_cm = tracer.start_as_current_span(name, attributes=_otel_attributes(attributes)) if tracer else nullcontext()
+    try:
+        with otel_cm as otel_span:
+            s._otel = otel_span
+            try:
+                yield s
+            except BaseException as e:
+                s.set_attribute("error", type(e).__name__)
+                raise
+    finally:
+        s.end = time.perf_counter()
+        _current_span.reset(token)
+        if kind == "internal":
+            SPAN_SECONDS.observe(s.duration, span=s.name)
+
+
+def traced(name: Optional[str] = None):
+    """Decorator form of span() for sync and async functions."""
+    def decorator(func):
+        span_name = name or f"{func.__module__.rsplit('.', 1)[-1]}.{func.__qualname__}"
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(span_name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(span_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def record_request(method: str, route: str, status: int, seconds: float, db_round_trips: int) -> None:
+    HTTP_SECONDS.observe(seconds, method=method, route=route, status=status)
+    HTTP_DB_ROUND_TRIPS.observe(db_round_trips, method=method, route=route)
+
+
+# =============================================================================
+# Database round trips
+# =============================================================================
+
+_THIS_FILE = os.path.normcase(os.path.abspath(__file__))
+_REPOSITORY_DIR = f"{os.sep}repositories{os.sep}"
+_LIBRARY_PREFIXES = tuple({os.path.normcase(sys.prefix), os.path.normcase(sys.base_prefix)})
+
+
+def _is_library(filename: str) -> bool:
+    return filename.startswith(("<",) + _LIBRARY_PREFIXES) or f"{os.sep}site-packages{os.sep}" in filename
+
+
+_QUERY_OPERATIONS = {"select", "insert", "update", "upsert", "delete"}
+
+
+def _query_caller() -> Tuple[str, str]:
+    """(repository, method) that issued the current query, found by walking the stack."""
+    frame = sys._getframe(2)
+    fallback = None
+    while frame is not None:
+        filename = os.path.normcase(frame.f_code.co_filename)
+        if filename != _THIS_FILE:
+            if _REPOSITORY_DIR in filename:
+                owner = frame.f_locals.get("self")
+                return (type(owner).__name__ if owner is not None else Path(filename).stem), frame.f_code.co_name
+            if fallback is None and not _is_library(filename):
+                # Not a repository (e.g. a router querying directly): use the first app frame
+                fallback = (Path(filename).stem, frame.f_code.co_name)
+        frame = frame.f_back
+    return fallback or ("unknown", "unknown")
+
+
+class _TracedQuery:
+    """Wraps a PostgREST query builder so execute() is timed and attributed."""
+
+    __slots__ = ("_query", "_table", "_operation")
+
+    def __init__(self, query, table: str, operation: Optional[str]):
+        self._query = query
+        self._table = table
+        self._operation = operation
+
+    def __getattr__(self, name):
+        attr = getattr(self._query, name)
+        if name == "execute":
+            return self._execute
+        operation = name if name in _QUERY_OPERATIONS else self._operation
+        if callable(attr):
+            @functools.wraps(attr)
+            def call(*args, **kwargs):
+                return self._wrap(attr(*args, **kwargs), operation)
+            return call
+        # Properties such as .not_ return the builder
+        return self._wrap(attr, operation)
+
+    def _wrap(self, value, operation):
+        if hasattr(value, "execute") and not isinstance(value, _TracedQuery):
+            return _TracedQuery(value, self._table, operation)
+        return value
+
+    def _execute(self, *args, **kwargs):
+        repository, method = _query_caller()
+        labels = dict(repository=repository, method=method, table=self._table, operation=self._operation or "select")
+        start = time.perf_counter()
+        try:
+            return self._query.execute(*args, **kwargs)
+        except Exception:
+            DB_ERRORS.inc(**labels)
+            raise
+        finally:
+            end = time.perf_counter()
+            DB_SECONDS.observe(end - start, **labels)
+            parent = _current_span.get()
+            if parent is not None:
+                parent.db_round_trips += 1
+                if parent.root is not parent:
+                    parent.root.db_round_trips += 1
+            _export_finished(
+                f"db {labels['operation']} {self._table}", start, end,
+                {"db.system": "postgresql", "db.sql.table": self._table, "code.namespace": repository, "code.function": method},
+            )
+
+
+def instrument_db_client(client):
+    """Time every query made through client.table()/from_()/rpc(). Returns the same client."""
+    if not METRICS_ENABLED or getattr(client, "_telemetry_instrumented", False):
+        return client
+
+    table = client.table
+    client.table = functools.wraps(table)(lambda name: _TracedQuery(table(name), name, None))
+    if hasattr(client, "from_"):
+        client.from_ = client.table
+    if hasattr(client, "rpc"):
+        rpc = client.rpc
+        client.rpc = functools.wraps(rpc)(lambda fn, *args, **kwargs: _TracedQuery(rpc(fn, *args, **kwargs), fn, "rpc"))
+    client._telemetry_instrumented = True
+    return client
+
+
+# =============================================================================
+# LLM calls
+# =============================================================================
+
+_llm_family: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("telemetry_llm_family", default=None)
+
+
+@contextmanager
+def llm_family(family: str):
+    """Tag LLM calls made inside the block with a prompt family, overriding the client's default."""
+    token = _llm_family.set(family)
+    try:
+        yield
+    finally:
+        _llm_family.reset(token)
+
+
+def current_llm_family(default: str) -> str:
+    """The prompt family set with llm_family(), or default."""
+    return _llm_family.get() or default
+
+
+def record_llm_retry(family: str, reason: str = "rate_limit") -> None:
+    """Count a retry made by an application-level retry loop."""
+    LLM_RETRIES.inc(family=_llm_family.get() or family, reason=reason)
+
+
+def record_structured_output(family: str, outcome: str, repairs: Sequence[str] = ()) -> None:
+    """Count a structured output (valid, repaired, reasked, retried or failed) and its repairs."""
+    family = _llm_family.get() or family
+    LLM_STRUCTURED.inc(family=family, outcome=outcome)
+    for repair in repairs:
+        LLM_REPAIRS.inc(family=family, repair=repair)
+
+
+def _record_llm_response(response, default_family: str, body: Optional[dict]) -> None:
+    request = response.request
+    start, family, attribution, reserved = request.extensions.get("telemetry", (None, default_family, None, 0.0))
+    if start is None:
+        return
+    end = time.perf_counter()
+
+    from services.llm_usage import usage_ledger
+    try:
+        usage_ledger.record(family, attribution, response.status_code, body, end - start, reserved)
+    except Exception as e:
+        logger.error(f"Recording LLM usage failed: {e}")
+    if not METRICS_ENABLED:
+        return
+
+    usage = (body or {}).get("usage") or {}
+    model = (body or {}).get("model") or "unknown"
+    LLM_SECONDS.observe(end - start, family=family, model=model, status=response.status_code)
+    for kind in ("prompt", "completion"):
+        tokens = usage.get(f"{kind}_tokens")
+        if tokens:
+            LLM_TOKENS.inc(tokens, family=family, model=model, type=kind)
+
+    # The OpenAI SDK numbers its own retries
+    retry_count = request.headers.get("x-stainless-retry-count")
+    if retry_count and retry_count != "0":
+        LLM_RETRIES.inc(family=family, reason="sdk")
+
+    parent = _current_span.get()
+    if parent is not None:
+        parent.llm_calls += 1
+        if parent.root is not parent:
+            parent.root.llm_calls += 1
+    _export_finished(
+        f"llm {family}", start, end,
+        {"llm.family": family, "llm.model": model, "http.status_code": response.status_code,
+         "llm.prompt_tokens": usage.get("prompt_tokens"), "llm.completion_tokens": usage.get("completion_tokens")},
+    )
+
+
+def _request_json(request) -> Optional[dict]:
+    if "json" not in request.headers.get("content-type", ""):
+        return None
+    try:
+        data = json.loads(request.content)
+    except (ValueError, RuntimeError):  # RuntimeError: httpx.RequestNotRead for a streamed body
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _response_json(response) -> Optional[dict]:
+    if "json" not in response.headers.get("content-type", ""):
+        return None
+    try:
+        data = response.json()
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def llm_event_hooks(family: str, sync: bool = False) -> Dict[str, list]:
+    """
+    httpx event hooks that record each LLM attempt under a prompt family.
+
+    Pass as httpx.AsyncClient(event_hooks=...). The request hook admits the
+    call against its organization's limits (see services/llm_usage.py), which
+    may wait or raise LLMLimitExceeded before anything is sent. The response
+    hook reads the body (the caller's later read is served from memory) to
+    get token usage for the metrics and the usage ledger. Attempts that fail
+    below HTTP (timeouts, resets) are not recorded, but keep the cost
+    reserved for them at admission.
+    """
+    from services.llm_usage import usage_ledger
+
+    if not METRICS_ENABLED and not usage_ledger.active:
+        return {}
+
+    def on_request(request):
+        call_family = _llm_family.get() or family
+        attribution, reserved = usage_ledger.admit_sync(call_family, usage_ledger.estimate_cost(_request_json(request)))
+        request.extensions["telemetry"] = (time.perf_counter(), call_family, attribution, reserved)
+
+    def on_response(response):
+        response.read()
+        _record_llm_response(response, family, _response_json(response))
+
+    async def on_request_async(request):
+        call_family = _llm_family.get() or family
+        attribution, reserved = await usage_ledger.admit(call_family, usage_ledger.estimate_cost(_request_json(request)))
+        request.extensions["telemetry"] = (time.perf_counter(), call_family, attribution, reserved)
+
+    async def on_response_async(response):
+        await response.aread()
+        _record_llm_response(response, family, _response_json(response))
+
+    if sync:
+        return {"request": [on_request], "response": [on_response]}
+    return {"request": [on_request_async], "response": [on_response_async]}
+
+
+def llm_http_client(family: str, sync: bool = False):
+    """
+    An httpx client for the OpenAI SDK (http_client=...) with LLM telemetry
+    hooks. Async clients also get the scheduler transport (deadlines, hedging,
+    interactive priority; see services/llm_scheduler.py).
+    """
+    import openai
+
+    if sync:
+        return openai.DefaultHttpxClient(event_hooks=llm_event_hooks(family, sync=True))
+    from services.llm_scheduler import LLMTransport
+
+    return openai.DefaultAsyncHttpxClient(
+        transport=LLMTransport(family, limits=openai.DEFAULT_CONNECTION_LIMITS),
+        event_hooks=llm_event_hooks(family),
+    )
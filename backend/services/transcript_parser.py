@@ -3,12 +3,12 @@ Smart Transcript Parser using Gemini 2.5 Flash via OpenRouter.
 Intelligently parses raw transcript text into structured conversation turns.
 """
 
-import json
 import logging
 from typing import Optional
-from openai import AsyncOpenAI
 from pydantic import BaseModel
 from config import OPENROUTER_API_KEY, LLM_MODEL
+from services.llm_clients import LazyOpenAIClient
+from services.structured_output import StructuredOutputError, generate_structured
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +22,14 @@ class ParsedTurn(BaseModel):
     cleaned_text: Optional[str] = None  # Cleaned/normalized version
 
 
+class TranscriptParseOutput(BaseModel):
+    """The JSON the parse prompt asks for; counts are derived from the turns."""
+    turns: list[ParsedTurn] = []
+    interviewer_name: Optional[str] = None
+    candidate_name: Optional[str] = None
+    parsing_notes: Optional[str] = None
+
+
 class ParsedTranscript(BaseModel):
     """Result of smart transcript parsing."""
     turns: list[ParsedTurn]
@@ -96,10 +104,7 @@ class TranscriptParser:
         if not OPENROUTER_API_KEY:
             raise ValueError("OPENROUTER_API_KEY not configured")
 
-        self.client = AsyncOpenAI(
-            base_url="https://openrouter.ai/api/v1",
-            api_key=OPENROUTER_API_KEY,
-        )
+        self.client = LazyOpenAIClient("transcript_parse")
         # Use Gemini 2.5 Flash for fast parsing
         self.model = LLM_MODEL
 
@@ -128,41 +133,30 @@ class TranscriptParser:
             context_parts.append(f"The interviewer's name is: {interviewer_name}")
         context = "\n".join(context_parts) if context_parts else ""
 
-        try:
+        async def complete(messages: list, attempt: int) -> Optional[str]:
             response = await self.client.chat.completions.create(
                 model=self.model,
-                messages=[
-                    {"role": "system", "content": PARSE_SYSTEM_PROMPT},
-                    {"role": "user", "content": PARSE_USER_PROMPT.format(
-                        transcript=raw_transcript,
-                        context=f"## Context:\n{context}" if context else ""
-                    )}
-                ],
+                messages=messages,
                 temperature=0.2,  # Low temperature for consistent parsing
                 max_tokens=8000,  # Allow for long transcripts
                 response_format={"type": "json_object"}
             )
+            return response.choices[0].message.content
 
-            content = response.choices[0].message.content
-
-            # Handle markdown-wrapped JSON
-            if "```json" in content:
-                content = content.split("```json")[1].split("```")[0]
-            elif "```" in content:
-                content = content.split("```")[1].split("```")[0]
+        messages = [
+            {"role": "system", "content": PARSE_SYSTEM_PROMPT},
+            {"role": "user", "content": PARSE_USER_PROMPT.format(
+                transcript=raw_transcript,
+                context=f"## Context:\n{context}" if context else ""
+            )}
+        ]
 
-            data = json.loads(content.strip())
-
-            # Convert to ParsedTurn objects
-            turns = []
-            for turn_data in data.get("turns", []):
-                turns.append(ParsedTurn(
-                    speaker=turn_data.get("speaker", "unknown"),
-                    speaker_name=turn_data.get("speaker_name"),
-                    text=turn_data.get("text", ""),
-                    is_question=turn_data.get("is_question", False),
-                    cleaned_text=turn_data.get("cleaned_text")
-                ))
+        try:
+            # Fences and a cut-off turns array are repaired; invalid fields are re-asked, not the whole parse
+            data = await generate_structured(
+                TranscriptParseOutput, messages, complete, family="transcript_parse", max_attempts=1
+            )
+            turns = data.turns
 
             # Calculate counts
             interviewer_turns = sum(1 for t in turns if t.speaker == "interviewer")
@@ -171,16 +165,16 @@ class TranscriptParser:
 
             return ParsedTranscript(
                 turns=turns,
-                interviewer_name=data.get("interviewer_name") or interviewer_name,
-                candidate_name=data.get("candidate_name") or candidate_name,
+                interviewer_name=data.interviewer_name or interviewer_name,
+                candidate_name=data.candidate_name or candidate_name,
                 total_turns=len(turns),
                 interviewer_turns=interviewer_turns,
                 candidate_turns=candidate_turns,
                 questions_count=questions_count,
-                parsing_notes=data.get("parsing_notes")
+                parsing_notes=data.parsing_notes
             )
 
-        except json.JSONDecodeError as e:
+        except StructuredOutputError as e:
             logger.error(f"Failed to parse LLM response as JSON: {e}")
             raise ValueError(f"Failed to parse transcript: Invalid JSON response")
         except Exception as e:
@@ -0,0 +1,112 @@
+"""
+Shared fixtures.
+
+local_db runs the code under test against LocalSupabase (db/local_client.py),
+so filters, joins and missing-migration fallbacks behave as they do against
+PostgREST, and records every query that reaches it so tests can also check
+how many round trips a code path makes.
+"""
+from contextlib import contextmanager
+from typing import List, Optional, Tuple
+
+import pytest
+
+from db import client as db_client
+from db.client import use_db_client
+from db.local_client import LocalQuery, LocalSupabase, LocalTable
+from repositories.streamlined.analytics_repo import AnalyticsRepository
+from repositories.streamlined.candidate_repo import CandidateRepository
+from repositories.streamlined.job_repo import JobRepository
+
+
+class RecordingSupabase(LocalSupabase):
+    """
+    LocalSupabase that logs each executed query as (method, table, columns).
+
+    method is select/insert/update/upsert/delete or rpc (with the function
+    name as table); columns is the select list, None otherwise. seed() and
+    the queries a registered RPC makes (inside the database) are not logged.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.queries: List[Tuple[str, str, Optional[str]]] = []
+        self._unlogged = False
+
+    def table(self, name: str) -> LocalTable:
+        return _RecordingTable(self, name)
+
+    from_ = table
+
+    def rpc(self, name: str, params: Optional[dict] = None, **kwargs):
+        call = super().rpc(name, params, **kwargs)
+        execute = call.execute
+
+        def record():
+            self.queries.append(("rpc", name, None))
+            with self._not_logged():
+                return execute()
+
+        call.execute = record
+        return call
+
+    def seed(self, table: str, rows: List[dict]) -> List[dict]:
+        with self._not_logged():
+            return super().seed(table, rows)
+
+    @contextmanager
+    def _not_logged(self):
+        previous, self._unlogged = self._unlogged, True
+        try:
+            yield
+        finally:
+            self._unlogged = previous
+
+    def selects(self, table: Optional[str] = None) -> List[Tuple[str, Optional[str]]]:
+        """(table, columns) of each select, optionally only those on one table."""
+        return [(t, columns) for method, t, columns in self.queries if method == "select" and table in (None, t)]
+
+
+class _RecordingTable(LocalTable):
+    def select(self, *columns: str, **kwargs) -> LocalQuery:
+        return self._record(super().select(*columns, **kwargs))
+
+    def insert(self, json, **kwargs) -> LocalQuery:
+        return self._record(super().insert(json, **kwargs))
+
+    def upsert(self, json, **kwargs) -> LocalQuery:
+        return self._record(super().upsert(json, **kwargs))
+
+    def update(self, json, **kwargs) -> LocalQuery:
+        return self._record(super().update(json, **kwargs))
+
+    def delete(self, **kwargs) -> LocalQuery:
+        return self._record(super().delete(**kwargs))
+
+    def _record(self, query: LocalQuery) -> LocalQuery:
+        if getattr(query, "_recorded", False):  # insert(upsert=True) goes through upsert()
+            return query
+        client, execute = self._client, query.execute
+
+        def record():
+            if not client._unlogged:
+                columns = query._columns if query._method == "select" else None
+                client.queries.append((query._method, self._name, columns))
+            return execute()
+
+        query.execute = record
+        query._recorded = True
+        return query
+
+
+@pytest.fixture
+def local_db(monkeypatch):
+    """A fresh RecordingSupabase installed as the client get_db() returns."""
+    local = RecordingSupabase()
+    monkeypatch.setattr(db_client, "_supabase_client", None)
+    use_db_client(local)
+    # Repositories remember a missing RPC or table on the class; start each test fresh
+    monkeypatch.setattr(CandidateRepository, "_bulk_rpc_available", True)
+    monkeypatch.setattr(JobRepository, "_counts_table_available", True)
+    monkeypatch.setattr(AnalyticsRepository, "_summary_rpc_available", True)
+    return local
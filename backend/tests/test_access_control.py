@@ -0,0 +1,98 @@
+"""
+Tests for cached, batched organization ownership checks.
+
+Runs against the LocalSupabase test database, counting queries, to verify
+ownership is resolved from id/org columns in one query per batch, served from
+cache afterwards, memoised per request and dropped on delete.
+
+Run with: pytest tests/test_access_control.py -v
+"""
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+
+from services import access_control
+from services.access_control import (
+    CANDIDATE,
+    INTERVIEW,
+    JOB,
+    OwnershipResolver,
+    filter_accessible,
+    ownership_scope,
+    require_candidate_access,
+    require_interview_access,
+    require_job_access,
+)
+
+ORG, OTHER_ORG = str(uuid4()), str(uuid4())
+
+
+@pytest.fixture
+def client(local_db, monkeypatch):
+    monkeypatch.setattr(access_control, "ownership_resolver", OwnershipResolver(ttl=300))
+    jobs = local_db.seed("job_postings", [
+        {"organization_id": ORG}, {"organization_id": ORG}, {"organization_id": OTHER_ORG},
+    ])
+    candidates = local_db.seed("candidates", [
+        {"job_posting_id": jobs[0]["id"]}, {"job_posting_id": jobs[2]["id"]},
+    ])
+    interviews = local_db.seed("interviews", [{"candidate_id": candidates[0]["id"]}])
+    return SimpleNamespace(
+        db=local_db,
+        jobs=[job["id"] for job in jobs],
+        candidate=candidates[0]["id"],
+        other_org_candidate=candidates[1]["id"],
+        interview=interviews[0]["id"],
+    )
+
+
+def test_list_view_is_filtered_in_one_query_then_cached(client):
+    unknown = str(uuid4())
+
+    assert filter_accessible(JOB, client.jobs + [unknown], ORG) == client.jobs[:2]
+    assert client.db.selects() == [("job_postings", "id, organization_id")]
+
+    require_job_access(client.jobs[0], ORG)
+    with pytest.raises(HTTPException) as exc:
+        require_job_access(client.jobs[2], ORG)
+    assert exc.value.status_code == 404
+    # Unknown ids aren't cached as missing, so only they are looked up again
+    filter_accessible(JOB, client.jobs + [unknown], ORG)
+    assert len(client.db.selects()) == 2
+
+
+def test_interview_resolves_through_candidate_and_seeds_job(client):
+    require_interview_access(client.interview, ORG)
+    require_candidate_access(client.candidate, ORG)
+    require_job_access(client.jobs[0], ORG)
+
+    assert [table for table, _ in client.db.selects()] == ["interviews", "candidates"]
+    with pytest.raises(HTTPException):
+        require_interview_access(client.interview, OTHER_ORG)
+    with pytest.raises(HTTPException):
+        require_candidate_access(client.other_org_candidate, ORG)
+
+
+def test_deleting_a_job_forgets_its_candidates(client):
+    require_candidate_access(client.candidate, ORG)
+    access_control.ownership_resolver.invalidate(JOB, client.jobs[0])
+
+    client.db.table("candidates").delete().eq("id", client.candidate).execute()
+    with pytest.raises(HTTPException):
+        require_candidate_access(client.candidate, ORG)
+
+
+def test_request_scope_memoises_without_cache(client, monkeypatch):
+    monkeypatch.setattr(access_control, "ownership_resolver", OwnershipResolver(ttl=0))
+
+    with ownership_scope():
+        for _ in range(3):
+            require_job_access(client.jobs[0], ORG)
+        with pytest.raises(HTTPException):
+            require_job_access(str(uuid4()), ORG)
+    assert len(client.db.selects()) == 2
+
+    require_job_access(client.jobs[0], ORG)
+    assert len(client.db.selects()) == 3
@@ -0,0 +1,83 @@
+"""
+Tests for off-loop password hashing and the verified-token cache.
+
+Run with: pytest tests/test_auth_service.py -v
+"""
+import time
+from uuid import uuid4
+
+import jwt
+import pytest
+
+from services import auth_service
+from services.auth_service import (
+    TokenCache,
+    create_access_token,
+    decode_access_token,
+    hash_password_async,
+    verify_password_async,
+)
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache(monkeypatch):
+    monkeypatch.setattr(auth_service, "token_cache", TokenCache(max_entries=2))
+    monkeypatch.setattr(auth_service, "BCRYPT_ROUNDS", 4)
+
+
+def _token(**overrides):
+    payload = {
+        "recruiter_id": str(uuid4()),
+        "organization_id": str(uuid4()),
+        "email": "ada@example.com",
+        "role": "recruiter",
+        "name": "Ada",
+        "exp": int(time.time()) + 3600,
+    }
+    payload.update(overrides)
+    return jwt.encode(payload, auth_service.JWT_SECRET, algorithm=auth_service.JWT_ALGORITHM)
+
+
+@pytest.mark.asyncio
+async def test_async_hashing_round_trip():
+    password_hash = await hash_password_async("s3cret-pass")
+
+    assert password_hash.startswith("$2b$04$")
+    assert await verify_password_async("s3cret-pass", password_hash)
+    assert not await verify_password_async("wrong", password_hash)
+    assert not await verify_password_async("s3cret-pass", "not-a-hash")
+
+
+def test_verified_token_served_from_cache(monkeypatch):
+    token = create_access_token(str(uuid4()), str(uuid4()), "ada@example.com", "admin", "Ada")
+    first = decode_access_token(token)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("token decoded twice")
+
+    monkeypatch.setattr(auth_service.jwt, "decode", fail)
+    assert decode_access_token(token) is first
+
+
+def test_cached_token_expires_with_its_exp(monkeypatch):
+    token = _token(exp=int(time.time()) + 60)
+    assert decode_access_token(token) is not None
+
+    now = time.time()
+    monkeypatch.setattr(auth_service.time, "time", lambda: now + 61)
+    assert auth_service.token_cache.get(token) is None
+
+
+def test_invalid_tokens_are_not_cached():
+    assert decode_access_token("garbage") is None
+    assert decode_access_token(_token(exp=int(time.time()) - 10)) is None
+    assert not auth_service.token_cache._users
+
+
+def test_cache_is_bounded():
+    tokens = [_token() for _ in range(3)]
+    for token in tokens:
+        decode_access_token(token)
+
+    assert auth_service.token_cache.get(tokens[0]) is None
+    assert auth_service.token_cache.get(tokens[2]) is not None
@@ -0,0 +1,159 @@
+"""
+Tests for packed (multi-candidate) screening.
+
+Uses a stub structured-output client to verify packs share the single-call
+job-context prefix, results map back to the right candidates, and partial
+or failed packs are retried in smaller calls.
+
+Run with: pytest tests/test_batched_screening.py -v
+"""
+import os
+import re
+from types import SimpleNamespace
+
+import pytest
+
+# The screening module builds its OpenAI client at import; no request is sent
+os.environ.setdefault("OPENROUTER_API_KEY", "test-key")
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+from services import candidate_screening
+from services import task_handlers
+from services.candidate_screening import (
+    ExtractedProfile,
+    PackedScreeningItem,
+    PackedScreeningResponse,
+    ScreeningResult,
+    build_job_context_prompt,
+    build_packed_screening_prompt,
+    build_screening_prompt,
+    screen_candidates_batch,
+)
+from services.task_queue import TaskQueue
+
+CANDIDATE_HEADER = re.compile(r"=== CANDIDATE (C\d+) ===\n(.*?)(?=\n\n=== CANDIDATE|\Z)", re.S)
+
+
+def _result(name: str, recommendation: str = "Good Fit") -> ScreeningResult:
+    return ScreeningResult(
+        profile=ExtractedProfile(name=name),
+        overall_score=70,
+        recommendation=recommendation,
+        fit_summary=f"{name} fits",
+    )
+
+
+class StubCompletions:
+    """Answers packed prompts by echoing each candidate's name, with hooks to misbehave."""
+
+    def __init__(self, fail_above: int = 0, drop=(), bad=()):
+        self.calls = []
+        self.fail_above = fail_above
+        self.drop = set(drop)
+        self.bad = set(bad)
+
+    async def parse(self, model, messages, response_format, temperature):
+        prompt = messages[-1]["content"]
+        self.calls.append((response_format, prompt))
+
+        if response_format is ScreeningResult:
+            name = re.search(r'"name": "([^"]+)"', prompt).group(1)
+            parsed = _result(name)
+        else:
+            candidates = CANDIDATE_HEADER.findall(prompt)
+            if self.fail_above and len(candidates) > self.fail_above:
+                raise ValueError("Invalid JSON: truncated response")
+            items = []
+            for ref, body in candidates:
+                name = re.search(r'"name": "([^"]+)"', body).group(1)
+                if name in self.drop:
+                    continue
+                recommendation = "Maybe" if name in self.bad else "Good Fit"
+                items.append(PackedScreeningItem(candidate_ref=ref, result=_result(name, recommendation)))
+            parsed = PackedScreeningResponse(results=items)
+
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(parsed=parsed))])
+
+
+@pytest.fixture
+def completions(monkeypatch):
+    stub = StubCompletions()
+    client = SimpleNamespace(beta=SimpleNamespace(chat=SimpleNamespace(completions=stub)))
+    monkeypatch.setattr(candidate_screening, "client", client)
+    return stub
+
+
+def _candidates(n: int):
+    return [
+        {"candidate_id": f"cand-{i}", "person_id": f"person-{i}", "enrichment_data": {"name": f"Person {i}"}}
+        for i in range(n)
+    ]
+
+
+def _packed_calls(stub):
+    return [prompt for fmt, prompt in stub.calls if fmt is PackedScreeningResponse]
+
+
+def _single_calls(stub):
+    return [prompt for fmt, prompt in stub.calls if fmt is ScreeningResult]
+
+
+def test_single_and_packed_prompts_share_job_prefix():
+    context = build_job_context_prompt("Staff Engineer", "Build the platform.")
+
+    single = build_screening_prompt({"name": "Ada"}, "Staff Engineer", "Build the platform.")
+    packed = build_packed_screening_prompt(context, [("C1", {"name": "Ada"}), ("C2", {"name": "Grace"})])
+
+    assert single.startswith(context)
+    assert packed.startswith(context)
+    assert packed.count("Build the platform.") == 1
+
+
+@pytest.mark.asyncio
+async def test_packs_candidates_into_one_call_per_pack(completions):
+    screened = await screen_candidates_batch(_candidates(10), "Engineer", "JD", pack_size=4)
+
+    assert len(_packed_calls(completions)) == 3
+    assert _single_calls(completions) == []
+    assert [s["candidate_id"] for s in screened] == [f"cand-{i}" for i in range(10)]
+    assert [s["result"].profile.name for s in screened] == [f"Person {i}" for i in range(10)]
+
+
+@pytest.mark.asyncio
+async def test_missing_and_invalid_results_are_retried(completions):
+    completions.drop = {"Person 1"}
+    completions.bad = {"Person 2"}
+
+    screened = await screen_candidates_batch(_candidates(4), "Engineer", "JD", pack_size=4)
+
+    # One packed call, then the two rejected candidates re-packed together, then each alone
+    assert len(_packed_calls(completions)) == 2
+    assert len(_single_calls(completions)) == 2
+    assert {s["result"].profile.name for s in screened} == {f"Person {i}" for i in range(4)}
+    assert all(s["result"].recommendation == "Good Fit" for s in screened)
+
+
+@pytest.mark.asyncio
+async def test_failed_pack_is_split_until_it_succeeds(completions):
+    completions.fail_above = 2
+
+    screened = await screen_candidates_batch(_candidates(8), "Engineer", "JD", pack_size=8)
+
+    # 8 fails, 4 + 4 fail, four packs of 2 succeed
+    pack_sizes = [len(CANDIDATE_HEADER.findall(p)) for p in _packed_calls(completions)]
+    assert sorted(pack_sizes) == [2, 2, 2, 2, 4, 4, 8]
+    assert _single_calls(completions) == []
+    assert [s["result"].profile.name for s in screened] == [f"Person {i}" for i in range(8)]
+
+
+def test_enqueue_screenings_packs_tasks(tmp_path, monkeypatch):
+    queue = TaskQueue(db_path=str(tmp_path / "tasks.db"))
+    monkeypatch.setattr(task_handlers, "task_queue", queue)
+
+    tasks = task_handlers.enqueue_screenings("job-1", _candidates(5), pack_size=2)
+
+    assert [t["kind"] for t in tasks] == [task_handlers.KIND_SCREENING_PACK] * 3
+    assert [len(t["payload"]["candidates"]) for t in tasks] == [2, 2, 1]
+    # Re-uploading the same candidates does not queue duplicate packs
+    again = task_handlers.enqueue_screenings("job-1", _candidates(5), pack_size=2)
+    assert [t["id"] for t in again] == [t["id"] for t in tasks]
@@ -0,0 +1,106 @@
+"""
+Tests for set-based bulk candidate updates.
+
+Runs against the LocalSupabase test database to verify membership is checked
+in one query per chunk, the status change is one job-filtered update (or the
+RPC when installed), and the endpoint reports a result per ID.
+
+Run with: pytest tests/test_bulk_update_candidates.py -v
+"""
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from postgrest import APIError
+
+from routers import jobs
+from repositories.streamlined.candidate_repo import CandidateRepository
+
+
+def _bulk_update_candidate_status(db, p_job_id, p_candidate_ids, p_pipeline_status):
+    return db.table("candidates")\
+        .update({"pipeline_status": p_pipeline_status})\
+        .eq("job_posting_id", p_job_id)\
+        .in_("id", p_candidate_ids)\
+        .execute().data
+
+
+@pytest.fixture
+def data(local_db):
+    job_id, other_job = str(uuid4()), str(uuid4())
+    rows = local_db.seed(
+        "candidates",
+        [{"job_posting_id": job_id, "pipeline_status": "new"} for _ in range(450)]
+        + [{"job_posting_id": other_job, "pipeline_status": "new"}],
+    )
+    return SimpleNamespace(job_id=job_id, ids=[row["id"] for row in rows], db=local_db)
+
+
+def _statuses(db):
+    return {row["id"]: row["pipeline_status"] for row in db.rows("candidates")}
+
+
+def _methods(db):
+    return [method for method, _, _ in db.queries]
+
+
+def test_chunked_update_only_touches_the_job(data):
+    repo = CandidateRepository()
+
+    updated = repo.bulk_update_pipeline_status_sync(data.job_id, data.ids, "rejected")
+
+    assert sorted(updated) == sorted(data.ids[:450])
+    statuses = _statuses(data.db)
+    assert all(statuses[i] == "rejected" for i in data.ids[:450])
+    assert statuses[data.ids[-1]] == "new"
+    # RPC probe, then three chunked updates; the RPC is not retried next time
+    assert _methods(data.db) == ["rpc"] + ["update"] * 3
+    repo.bulk_update_pipeline_status_sync(data.job_id, data.ids[:1], "accepted")
+    assert _methods(data.db) == ["rpc"] + ["update"] * 4
+
+
+def test_rpc_used_when_installed(data):
+    data.db.register_rpc("bulk_update_candidate_status", _bulk_update_candidate_status)
+    ids = data.ids[:10] + [data.ids[-1]]
+
+    updated = CandidateRepository().bulk_update_pipeline_status_sync(data.job_id, ids, "round_2")
+
+    assert sorted(updated) == sorted(data.ids[:10])
+    assert _statuses(data.db)[data.ids[-1]] == "new"
+    assert _methods(data.db) == ["rpc"]
+
+
+def test_other_rpc_errors_naming_the_function_are_raised(data):
+    def violates_constraint(db, **params):
+        raise APIError({
+            "message": 'insert or update on table "candidates" violates a constraint in bulk_update_candidate_status',
+            "code": "23503",
+        })
+
+    data.db.register_rpc("bulk_update_candidate_status", violates_constraint)
+    with pytest.raises(APIError):
+        CandidateRepository().bulk_update_pipeline_status_sync(data.job_id, data.ids[:1], "rejected")
+    assert CandidateRepository._bulk_rpc_available is True
+
+
+@pytest.mark.asyncio
+async def test_endpoint_reports_each_candidate(data, monkeypatch):
+    monkeypatch.setattr(jobs, "require_job_access", lambda job_id, org_id: None)
+    own = data.ids[:2]
+    other_job = data.ids[-1]
+    missing = str(uuid4())
+
+    result = await jobs.bulk_update_candidates(
+        data.job_id,
+        jobs.BulkUpdateRequest(candidate_ids=own + [other_job, missing], action="reject"),
+        current_user=SimpleNamespace(organization_id=uuid4()),
+    )
+
+    assert result.updated_ids == own
+    assert [r.status for r in result.results] == ["updated", "updated", "wrong_job", "not_found"]
+    assert result.failed_ids == [other_job, missing]
+    statuses = _statuses(data.db)
+    assert [statuses[i] for i in own] == ["rejected", "rejected"]
+    assert statuses[other_job] == "new"
+    # One membership query and one update (the RPC isn't installed) for the whole request
+    assert _methods(data.db) == ["select", "rpc", "update"]
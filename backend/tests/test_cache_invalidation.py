@@ -0,0 +1,154 @@
+"""
+Tests for sharing cache invalidations between processes on one host.
+
+Each CacheInvalidationLog below stands in for one process (e.g. an api
+process and a task worker) sharing the same SQLite file.
+
+Run with: pytest tests/test_cache_invalidation.py -v
+"""
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from services import access_control, candidate_intel_cache, job_analytics_cache
+from services.access_control import CANDIDATE, JOB, OwnershipResolver
+from services.cache_invalidation import CacheInvalidationLog
+from services.candidate_intel_cache import CandidateIntelCache
+from services.job_analytics_cache import JobAnalyticsCache
+
+BACKEND_DIR = Path(__file__).parent.parent
+
+
+@pytest.fixture
+def processes(tmp_path):
+    """Invalidation logs of an api and a worker process on the same host."""
+    path = tmp_path / "cache_invalidation.db"
+    return (
+        CacheInvalidationLog(db_path=path, enabled=True, poll_interval=0),
+        CacheInvalidationLog(db_path=path, enabled=True, poll_interval=0),
+    )
+
+
+def _in_process(monkeypatch, module, log, build):
+    """Build a cache as the given process's global instance would be."""
+    monkeypatch.setattr(module, "invalidation_log", log)
+    return build()
+
+
+def test_worker_analytics_drop_the_summaries_and_snapshots_the_api_cached(monkeypatch, processes):
+    api, worker = processes
+    jobs = {"iv-1": "job-1"}.get
+
+    api_summaries = _in_process(
+        monkeypatch, job_analytics_cache, api, lambda: JobAnalyticsCache(resolve_job=jobs, channel="job_analytics")
+    )
+    api_intel = _in_process(monkeypatch, candidate_intel_cache, api, lambda: CandidateIntelCache(channel="candidate_intel"))
+    assert api_summaries.get("job-1") is None and api_intel.get("cand-1") is None
+    api_summaries.put("job-1", {"average_score": 70})
+    api_summaries.put("job-2", {"average_score": 50})
+    api_intel.put("cand-1", {"interviews": 1}, interview_ids=["iv-1"])
+
+    # The worker caches nothing, but still has to tell the api processes
+    worker_summaries = _in_process(
+        monkeypatch, job_analytics_cache, worker, lambda: JobAnalyticsCache(resolve_job=jobs, channel="job_analytics")
+    )
+    worker_intel = _in_process(
+        monkeypatch, candidate_intel_cache, worker, lambda: CandidateIntelCache(channel="candidate_intel")
+    )
+    worker_summaries.invalidate_interview("iv-1")
+    worker_intel.invalidate_interview("iv-1")
+
+    assert api_summaries.get("job-1") is None
+    assert api_summaries.get("job-2") == {"average_score": 50}
+    assert api_intel.get("cand-1") is None
+
+
+def test_ownership_dropped_in_one_process_is_dropped_in_the_others(monkeypatch, processes):
+    api, worker = processes
+    api_owners = _in_process(monkeypatch, access_control, api, lambda: OwnershipResolver(channel="ownership"))
+    worker_owners = _in_process(monkeypatch, access_control, worker, lambda: OwnershipResolver(channel="ownership"))
+    api.poll()
+    api_owners.remember(JOB, "job-1", "org-1")
+    api_owners.remember(CANDIDATE, "cand-1", "org-1", job_id="job-1")
+    api_owners.remember(JOB, "job-2", "org-1")
+
+    worker_owners.invalidate(JOB, "job-1")
+
+    assert api_owners._get(CANDIDATE, "cand-1") is None
+    assert api_owners._get(JOB, "job-1") is None
+    assert api_owners._get(JOB, "job-2") == "org-1"
+
+
+def test_replays_are_not_logged_again_and_own_entries_are_skipped(processes):
+    api, worker = processes
+    applied = []
+
+    class Cache:
+        def __init__(self, log):
+            self.log = log
+
+        def invalidate(self, key):
+            applied.append(key)
+            self.log.publish("test", "invalidate", key)
+
+    api.subscribe("test", Cache(api))
+    worker.subscribe("test", Cache(worker))
+    api.poll()
+    worker.poll()
+
+    worker.publish("test", "invalidate", "a")
+    api.publish("test", "invalidate", "b")
+    api.poll()
+    worker.poll()
+
+    # Each process replays only the other's entry, and the replay adds no row
+    assert sorted(applied) == ["a", "b"]
+    with api._connect() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM cache_invalidations").fetchone() == (2,)
+
+
+def test_polls_are_throttled_and_a_disabled_log_does_nothing(tmp_path, processes):
+    api, worker = processes
+    applied = []
+    api.poll_interval = 60
+    api.subscribe("test", type("Cache", (), {"invalidate": lambda self, key: applied.append(key)})())
+    api.poll()
+
+    worker.publish("test", "invalidate", "a")
+    api.poll()
+    assert applied == []
+    api._next_poll = 0
+    api.poll()
+    assert applied == ["a"]
+
+    disabled = CacheInvalidationLog(db_path=tmp_path / "off.db", enabled=False)
+    disabled.publish("test", "invalidate", "a")
+    disabled.poll()
+    assert not (tmp_path / "off.db").exists()
+
+
+def _shared_backends(**env) -> list:
+    keep = {k: v for k, v in os.environ.items() if k not in {
+        "API_ROLES", "TASK_WORKER_MODE", "API_WORKERS", "REALTIME_WORKERS",
+        "IDEMPOTENCY_BACKEND", "CACHE_INVALIDATION_BACKEND",
+    }}
+    script = env.pop("script", "import config")
+    out = subprocess.run(
+        [sys.executable, "-c", script + "\nimport json, config\n"
+         "print(json.dumps([config.IDEMPOTENCY_BACKEND, config.CACHE_INVALIDATION_BACKEND]))"],
+        cwd=BACKEND_DIR, env={**keep, **env}, capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def test_backends_are_shared_once_the_backend_runs_as_several_processes():
+    assert _shared_backends() == ["memory", "memory"]
+    assert _shared_backends(API_ROLES="recruiter,public", TASK_WORKER_MODE="external") == ["sqlite", "sqlite"]
+    assert _shared_backends(API_WORKERS="4") == ["sqlite", "sqlite"]
+    # python worker.py exists only alongside an api with an external task worker
+    assert _shared_backends(script="import worker") == ["sqlite", "sqlite"]
+    assert _shared_backends(API_WORKERS="4", IDEMPOTENCY_BACKEND="memory") == ["memory", "sqlite"]
@@ -0,0 +1,111 @@
+"""
+Tests for offer-prep candidate intelligence caching.
+
+Uses stub candidate/interview repositories to verify the aggregation runs
+one interview query, is served from the snapshot cache afterwards, is
+invalidated by analytics writes, and that the lightweight mode drops
+transcripts.
+
+Run with: pytest tests/test_candidate_intel_cache.py -v
+"""
+import pytest
+
+from routers import offer_prep
+from services.candidate_intel_cache import CandidateIntelCache
+
+
+class StubCandidateRepo:
+    def get_by_id(self, candidate_id):
+        return {"id": candidate_id, "name": "Ada Lovelace", "job_title": "Staff Engineer"}
+
+
+class StubInterviewRepo:
+    """Returns interviews with embedded analytics and transcripts, counting queries."""
+
+    def __init__(self):
+        self.queries = 0
+        self.score = 80
+
+    def get_candidate_interviews(self, candidate_id, job_posting_id=None):
+        self.queries += 1
+        return [
+            {
+                "id": f"int-{stage}",
+                "stage": stage,
+                "status": "completed",
+                "analytics": [{"overall_score": self.score, "recommendation": "hire"}],
+                "transcripts": [{"turns": [{"speaker": "candidate", "text": "hi"}] * 3, "full_text": "hi"}],
+            }
+            for stage in ["round_1", "round_2"]
+        ] + [{"id": "int-round_3", "stage": "round_3", "status": "scheduled"}]
+
+
+@pytest.fixture
+def repos(monkeypatch):
+    interviews = StubInterviewRepo()
+    cache = CandidateIntelCache(ttl=600)
+    monkeypatch.setattr(offer_prep, "candidate_repo", StubCandidateRepo())
+    monkeypatch.setattr(offer_prep, "interview_repo", interviews)
+    monkeypatch.setattr(offer_prep, "candidate_intel_cache", cache)
+    return interviews, cache
+
+
+@pytest.mark.asyncio
+async def test_aggregates_from_single_query_and_caches(repos):
+    interviews, _ = repos
+
+    first = await offer_prep.get_candidate_intelligence("cand-1")
+    second = await offer_prep.get_candidate_intelligence("cand-1")
+
+    assert interviews.queries == 1
+    assert first.interviews_completed == 2
+    assert first.total_transcript_turns == 6
+    assert len(second.all_transcripts) == 2
+    assert second.average_interview_score == 80
+
+
+@pytest.mark.asyncio
+async def test_lightweight_mode_omits_transcripts(repos):
+    lite = await offer_prep.get_candidate_intelligence("cand-1", include_transcripts=False)
+    full = await offer_prep.get_candidate_intelligence("cand-1")
+
+    assert lite.all_transcripts == []
+    assert lite.total_transcript_turns == 6
+    assert len(lite.all_analytics) == 2
+    assert len(full.all_transcripts) == 2
+
+
+@pytest.mark.asyncio
+async def test_analytics_write_invalidates_snapshot(repos):
+    interviews, cache = repos
+    await offer_prep.get_candidate_intelligence("cand-1")
+
+    interviews.score = 90
+    cache.invalidate_interview("int-round_2")
+    refreshed = await offer_prep.get_candidate_intelligence("cand-1")
+
+    assert interviews.queries == 2
+    assert refreshed.average_interview_score == 90
+
+
+@pytest.mark.asyncio
+async def test_returned_copies_do_not_mutate_cache(repos):
+    first = await offer_prep.get_candidate_intelligence("cand-1")
+    first.all_analytics.clear()
+
+    assert len((await offer_prep.get_candidate_intelligence("cand-1")).all_analytics) == 2
+
+
+def test_cache_is_bounded_and_expires():
+    cache = CandidateIntelCache(ttl=600, max_entries=2)
+    for candidate_id in ["a", "b", "c"]:
+        cache.put(candidate_id, candidate_id, [f"{candidate_id}-1"])
+
+    assert cache.get("a") is None
+    assert cache.get("c") == "c"
+    cache.invalidate_interview("b-1")
+    assert cache.get("b") is None
+
+    expired = CandidateIntelCache(ttl=0)
+    expired.put("a", "a")
+    assert expired.get("a") is None
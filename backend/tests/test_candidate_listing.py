@@ -0,0 +1,164 @@
+"""
+Tests for paginated, projection-aware candidate listing.
+
+Uses a recording stand-in for the Supabase query builder to verify the
+summary projection, page size and keyset filters sent for each sort, and
+the cursors handed back to the caller.
+
+Run with: pytest tests/test_candidate_listing.py -v
+"""
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from repositories.streamlined import candidate_repo as candidate_repo_module
+from repositories.streamlined.candidate_repo import (
+    CandidateRepository,
+    LIST_ITEM_COLUMNS,
+    decode_cursor,
+    encode_cursor,
+    pipeline_stage_order,
+)
+from models.streamlined.candidate import Candidate, CandidateListItem
+
+
+class RecordingQuery:
+    """Records builder calls and returns the rows queued for the next execute()."""
+
+    def __init__(self, client):
+        self.client = client
+        self.calls = []
+
+    def __getattr__(self, name):
+        def record(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+            return self
+        return record
+
+    def execute(self):
+        self.client.executed.append(self.calls)
+        return SimpleNamespace(data=self.client.pages.pop(0), count=None)
+
+
+class RecordingClient:
+    def __init__(self, pages):
+        self.pages = pages
+        self.executed = []
+
+    def table(self, name):
+        return RecordingQuery(self)
+
+
+def _row(score=None, status="new"):
+    return {
+        "id": str(uuid4()),
+        "person_id": str(uuid4()),
+        "job_posting_id": str(uuid4()),
+        "combined_score": score,
+        "tier": "A",
+        "pipeline_status": status,
+        "created_at": "2026-01-01T00:00:00+00:00",
+        "updated_at": "2026-01-01T00:00:00+00:00",
+        "persons": {"name": "Ada", "email": "ada@example.com"},
+    }
+
+
+@pytest.fixture
+def use_client(monkeypatch):
+    def install(pages):
+        client = RecordingClient(pages)
+        monkeypatch.setattr(candidate_repo_module, "get_db", lambda: client)
+        return client
+    return install
+
+
+def _calls(executed, name):
+    return [args for call, args, _ in executed if call == name]
+
+
+def test_cursor_round_trip_and_rejects_garbage():
+    values = ["score", 87, str(uuid4())]
+    assert decode_cursor(encode_cursor(values)) == values
+
+    for bad in ["not-a-cursor", encode_cursor({"a": 1}), encode_cursor(["score"])]:
+        with pytest.raises(ValueError):
+            decode_cursor(bad)
+
+
+def test_tampered_cursor_is_rejected_before_reaching_a_filter(use_client):
+    client = use_client([])
+    row_id = str(uuid4())
+    tampered = [
+        ["score", 90, "cand-9"],
+        ["score", 90, "00000000-0000-0000-0000-000000000000,id.gt.0"],
+        ["score", '90",combined_score.gt."0', row_id],
+        ["created", "2026-01-01)", row_id],
+        ["score", True, row_id],
+        ["score", float("nan"), row_id],
+        ["score", [1], row_id],
+        ["score", 90, 7],
+    ]
+    for values in tampered:
+        with pytest.raises(ValueError):
+            CandidateRepository().list_page_by_job_sync(uuid4(), sort=values[0], limit=2, cursor=encode_cursor(values))
+    assert client.executed == []
+
+    # Timestamps are re-serialised rather than passed through as sent
+    assert decode_cursor(encode_cursor(["created", "2026-01-01T00:00:00Z", row_id]))[1] == "2026-01-01T00:00:00+00:00"
+
+
+def test_stage_order_includes_configured_stages():
+    order = pipeline_stage_order(2)
+    assert order.index("new") < order.index("stage_1") < order.index("decision_pending")
+
+
+def test_summary_page_selects_list_columns_and_returns_cursor(use_client):
+    rows = [_row(score) for score in (95, 90, 80)]
+    client = use_client([rows])
+
+    page, next_cursor = CandidateRepository().list_page_by_job_sync(
+        uuid4(), sort="score", limit=2, fields="summary"
+    )
+
+    executed = client.executed[0]
+    assert _calls(executed, "select") == [(LIST_ITEM_COLUMNS,)]
+    assert _calls(executed, "limit") == [(3,)]
+    assert all(isinstance(c, CandidateListItem) for c in page)
+    assert [c.combined_score for c in page] == [95, 90]
+    assert decode_cursor(next_cursor) == ["score", 90, rows[1]["id"]]
+
+
+def test_next_page_uses_keyset_filter(use_client):
+    client = use_client([[_row(70)]])
+    last_id = str(uuid4())
+    cursor = encode_cursor(["score", 90, last_id])
+
+    page, next_cursor = CandidateRepository().list_page_by_job_sync(uuid4(), sort="score", limit=2, cursor=cursor)
+
+    (filters,) = _calls(client.executed[0], "or_")
+    assert filters[0] == f'combined_score.lt."90",combined_score.is.null,and(combined_score.eq."90",id.lt.{last_id})'
+    assert isinstance(page[0], Candidate)
+    assert next_cursor is None
+
+
+def test_stage_sort_walks_stages_until_page_is_full(use_client):
+    client = use_client([
+        [_row(60, "new")],
+        [_row(88, "round_1"), _row(75, "round_1"), _row(50, "round_1")],
+    ])
+
+    page, next_cursor = CandidateRepository().list_page_by_job_sync(
+        uuid4(), sort="stage", limit=3, fields="summary"
+    )
+
+    # Two stage queries fill the page; later stages are never read
+    assert len(client.executed) == 2
+    assert [c.pipeline_status for c in page] == ["new", "round_1", "round_1"]
+    assert decode_cursor(next_cursor)[:3] == ["stage", "round_1", 75]
+
+
+def test_cursor_from_another_sort_is_rejected(use_client):
+    use_client([])
+    with pytest.raises(ValueError):
+        CandidateRepository().list_page_by_job_sync(uuid4(), sort="created", cursor=encode_cursor(["score", 1, str(uuid4())]))
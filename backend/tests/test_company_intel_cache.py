@@ -0,0 +1,146 @@
+"""
+Tests for the company intel cache.
+
+Runs fully offline against LocalParallelAIService and a stub extractor,
+verifying domain normalisation, TTL freshness, single-flight
+deduplication and stale-while-revalidate.
+
+Run with: pytest tests/test_company_intel_cache.py -v
+"""
+import asyncio
+import json
+
+import pytest
+
+from models.voice_ingest import CompanyIntelligence
+from services.parallel_ai import LocalParallelAIService
+from services.company_intel_cache import CompanyIntelCache, normalize_company_domain
+
+
+class StubExtractor:
+    """Counts extractions and returns a recognisable CompanyIntelligence."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def extract(self, raw_results):
+        self.calls += 1
+        return CompanyIntelligence(
+            name=raw_results.get("company_name", ""),
+            website=raw_results.get("website", ""),
+            tagline=f"extraction #{self.calls}",
+        )
+
+
+@pytest.fixture
+def search():
+    return LocalParallelAIService(latency=0.05)
+
+
+@pytest.fixture
+def extractor():
+    return StubExtractor()
+
+
+@pytest.fixture
+def cache(tmp_path, search, extractor):
+    return CompanyIntelCache(search_service=search, extractor=extractor, data_dir=str(tmp_path))
+
+
+def test_normalize_company_domain():
+    assert normalize_company_domain("https://www.Stripe.com/jobs?x=1") == "stripe.com"
+    assert normalize_company_domain("stripe.com") == "stripe.com"
+    assert normalize_company_domain("http://stripe.com:8080/") == "stripe.com"
+    assert normalize_company_domain("", "Acme Corp") == "name-acme-corp"
+
+
+@pytest.mark.asyncio
+async def test_repeat_requests_hit_cache(cache, search, extractor):
+    first = await cache.get_intelligence("Stripe", "https://stripe.com")
+    second = await cache.get_intelligence("Stripe", "www.stripe.com/about")
+
+    assert search.search_count == 1
+    assert extractor.calls == 1
+    assert second.tagline == first.tagline
+    # Returned copies are independent of the cached object
+    second.work_style = "async"
+    assert (await cache.get_intelligence("Stripe", "stripe.com")).work_style is None
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_are_single_flight(cache, search, extractor):
+    results = await asyncio.gather(*[
+        cache.get_intelligence("Ramp", "https://ramp.com") for _ in range(5)
+    ])
+
+    assert search.search_count == 1
+    assert extractor.calls == 1
+    assert len({r.tagline for r in results}) == 1
+
+
+@pytest.mark.asyncio
+async def test_stale_entry_served_while_revalidating(tmp_path, search, extractor):
+    cache = CompanyIntelCache(
+        search_service=search, extractor=extractor, data_dir=str(tmp_path),
+        fresh_ttl=0, stale_ttl=3600,
+    )
+    await cache.get_intelligence("Linear", "linear.app")
+
+    stale = await cache.get_intelligence("Linear", "linear.app")
+    assert stale.tagline == "extraction #1"
+
+    await asyncio.sleep(0.1)
+    assert extractor.calls == 2
+    assert cache._lookup("linear.app").intel.tagline == "extraction #2"
+
+
+@pytest.mark.asyncio
+async def test_persisted_entries_survive_restart(tmp_path, search, extractor):
+    await CompanyIntelCache(search_service=search, extractor=extractor, data_dir=str(tmp_path)) \
+        .get_intelligence("Notion", "notion.so")
+
+    restarted = CompanyIntelCache(search_service=search, extractor=extractor, data_dir=str(tmp_path))
+    await restarted.get_intelligence("Notion", "notion.so")
+
+    assert search.search_count == 1
+
+
+@pytest.mark.asyncio
+async def test_raw_results_then_intel_reuses_search(cache, search, extractor):
+    raw = await cache.get_raw_results("Figma", "figma.com")
+    assert raw["search_results"]
+    assert extractor.calls == 0
+
+    await cache.get_intelligence("Figma", "figma.com")
+    assert search.search_count == 1
+    assert extractor.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_search_is_not_cached(tmp_path, extractor):
+    class FailingSearch:
+        calls = 0
+
+        async def research_company(self, company_name, website):
+            self.calls += 1
+            return {"company_name": company_name, "website": website,
+                    "search_results": [], "errors": [{"error": "HTTP 500"}]}
+
+    search = FailingSearch()
+    cache = CompanyIntelCache(search_service=search, extractor=extractor, data_dir=str(tmp_path))
+
+    await cache.get_intelligence("Acme", "acme.com")
+    await cache.get_intelligence("Acme", "acme.com")
+    assert search.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_local_search_serves_fixtures(tmp_path):
+    (tmp_path / "stripe.com.json").write_text(json.dumps({
+        "results": [{"url": "https://stripe.com/about", "title": "About", "excerpts": ["Payments infrastructure"]}]
+    }))
+    search = LocalParallelAIService(fixtures_dir=str(tmp_path))
+
+    results = await search.research_company("Stripe", "stripe.com")
+
+    assert results["search_results"][0]["content"] == "Payments infrastructure"
@@ -0,0 +1,133 @@
+"""
+Tests for idempotency key stores and the Idempotency-Key middleware.
+
+Run with: pytest tests/test_idempotency.py -v
+"""
+import httpx
+import pytest
+from fastapi import FastAPI, HTTPException
+
+from middleware import idempotency
+from middleware.idempotency import (
+    IdempotencyMiddleware,
+    MemoryIdempotencyStore,
+    SqliteIdempotencyStore,
+)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_memory_store_expires_from_the_front_and_is_bounded(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(idempotency.time, "time", clock)
+    store = MemoryIdempotencyStore(ttl=60, in_progress_ttl=5, max_keys=2)
+
+    assert store.reserve("a")
+    assert not store.reserve("a")
+    assert store.get("a") == {"response": None, "in_progress": True}
+    clock.now += 6
+    # An abandoned claim is released after in_progress_ttl
+    assert store.reserve("a")
+
+    store.put("a", {"n": 1})
+    store.put("b", {"n": 2})
+    store.put("c", {"n": 3})
+    assert store.get("a") is None
+    assert store.get("c") == {"response": {"n": 3}}
+
+    clock.now += 61
+    assert store.get("b") is None and store.get("c") is None
+
+
+def test_sqlite_store_is_shared_between_processes(tmp_path):
+    path = tmp_path / "idempotency.db"
+    first, second = SqliteIdempotencyStore(db_path=path), SqliteIdempotencyStore(db_path=path)
+
+    assert first.reserve("k")
+    assert not second.reserve("k")
+    assert second.get("k")["in_progress"]
+
+    first.release("k")
+    assert second.reserve("k")
+    second.put("k", {"status": 201})
+    assert first.get("k") == {"response": {"status": 201}}
+
+
+def test_sqlite_store_purges_expired_and_excess_rows(tmp_path):
+    store = SqliteIdempotencyStore(db_path=tmp_path / "idempotency.db", ttl=60, max_keys=3)
+    store.PURGE_EVERY = 5
+
+    for i in range(5):
+        store.put(f"k{i}", {"i": i})
+
+    with store._connect() as conn:
+        keys = [row[0] for row in conn.execute("SELECT key FROM idempotency_keys ORDER BY key")]
+    assert keys == ["k2", "k3", "k4"]
+
+
+def _client(store):
+    app = FastAPI()
+    calls = {"n": 0}
+
+    @app.post("/items")
+    async def create_item(item: dict):
+        calls["n"] += 1
+        if item.get("fail"):
+            raise HTTPException(status_code=503, detail="try later")
+        return {"id": calls["n"], **item}
+
+    app.add_middleware(IdempotencyMiddleware, store=store)
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+    return client, calls
+
+
+@pytest.mark.asyncio
+async def test_middleware_replays_first_response():
+    client, calls = _client(MemoryIdempotencyStore())
+    headers = {"Idempotency-Key": "abc", "Authorization": "Bearer t1"}
+
+    first = await client.post("/items", json={"name": "x"}, headers=headers)
+    retry = await client.post("/items", json={"name": "x"}, headers=headers)
+
+    assert first.json() == retry.json() == {"id": 1, "name": "x"}
+    assert retry.headers["idempotent-replayed"] == "true"
+    assert calls["n"] == 1
+
+    # Same key from another caller, or with no key at all, runs normally
+    await client.post("/items", json={"name": "x"}, headers={"Idempotency-Key": "abc", "Authorization": "Bearer t2"})
+    await client.post("/items", json={"name": "x"})
+    assert calls["n"] == 3
+
+
+@pytest.mark.asyncio
+async def test_middleware_rejects_reused_key_and_releases_failures():
+    client, calls = _client(MemoryIdempotencyStore())
+
+    await client.post("/items", json={"name": "x"}, headers={"Idempotency-Key": "k"})
+    mismatch = await client.post("/items", json={"name": "y"}, headers={"Idempotency-Key": "k"})
+    assert mismatch.status_code == 422
+
+    for _ in range(2):
+        failed = await client.post("/items", json={"fail": True}, headers={"Idempotency-Key": "f"})
+        assert failed.status_code == 503
+    assert calls["n"] == 3
+
+
+@pytest.mark.asyncio
+async def test_middleware_reports_in_progress_key():
+    class BusyStore(MemoryIdempotencyStore):
+        def reserve(self, key):
+            super().reserve(key)
+            return False
+
+    client, calls = _client(BusyStore())
+    response = await client.post("/items", json={}, headers={"Idempotency-Key": "p"})
+
+    assert response.status_code == 409
+    assert calls["n"] == 0
@@ -0,0 +1,118 @@
+"""
+Tests for the job analytics summary aggregate and its per-job cache.
+
+Runs against the LocalSupabase test database (no RPC installed) to check the
+fallback aggregation matches the old in-Python summary, that the endpoint
+serves repeat requests from cache, and that analytics writes invalidate the
+job's summary.
+
+Run with: pytest tests/test_job_analytics_summary.py -v
+"""
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from routers import jobs
+from models.streamlined.analytics import AnalyticsCreate, Recommendation
+from repositories.streamlined.analytics_repo import AnalyticsRepository
+from services import job_analytics_cache as job_analytics_cache_module
+from services.job_analytics_cache import JobAnalyticsCache
+
+JOB_ID = str(uuid4())
+OTHER_JOB_ID = str(uuid4())
+INTERVIEW_IDS = [str(uuid4()) for _ in range(9)]
+
+
+@pytest.fixture
+def client(local_db):
+    candidates = local_db.seed("candidates", [{"name": f"Cand {i}"} for i in range(10)])
+    local_db.seed("interviews", [
+        {"id": INTERVIEW_IDS[i], "job_posting_id": JOB_ID, "candidate_id": candidates[i]["id"]}
+        for i in range(9)
+    ])
+    # Another job's interview and analytics must not leak into this job's summary
+    other = local_db.seed("interviews", [{"job_posting_id": OTHER_JOB_ID, "candidate_id": candidates[9]["id"]}])
+    scores = [92, 85, 70, 0, 64, 88, 55, 79]
+    recs = ["Strong Hire", "hire", "Leaning Hire", None, "No Hire", "strong_hire", "no_hire", "maybe"]
+    local_db.seed("analytics", [
+        {"interview_id": INTERVIEW_IDS[i], "overall_score": s, "recommendation": r}
+        for i, (s, r) in enumerate(zip(scores, recs))
+    ] + [{"interview_id": other[0]["id"], "overall_score": 100, "recommendation": "strong_hire"}])
+    return local_db
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    resolved = []
+
+    def resolve(interview_id):
+        resolved.append(interview_id)
+        return JOB_ID
+
+    cache = JobAnalyticsCache(ttl=300, resolve_job=resolve)
+    cache.resolved = resolved
+    monkeypatch.setattr(job_analytics_cache_module, "job_analytics_cache", cache)
+    return cache
+
+
+def test_fallback_aggregate_projects_and_limits(client):
+    summary = AnalyticsRepository().get_job_summary_sync(JOB_ID)
+
+    assert summary["total_candidates"] == 8
+    # Zero scores are left out of the average, as before
+    assert summary["avg_score"] == round((92 + 85 + 70 + 64 + 88 + 55 + 79) / 7, 1)
+    assert summary["recommendation_breakdown"] == {"strong_hire": 2, "hire": 1, "maybe": 3, "no_hire": 2}
+    assert [c["score"] for c in summary["top_candidates"]] == [92, 88, 85, 79, 70]
+    assert summary["top_candidates"][0]["candidate_name"] == "Cand 0"
+    # Only score and recommendation columns are read from analytics
+    assert client.selects("analytics") == [("analytics", "interview_id, overall_score, recommendation")]
+
+
+@pytest.mark.asyncio
+async def test_summary_is_cached_until_analytics_written(client, cache, monkeypatch):
+    monkeypatch.setattr(jobs, "get_job_repo", lambda: SimpleNamespace(
+        get_by_id_for_org_sync=lambda job_id, org_id: SimpleNamespace(title="Engineer"),
+    ))
+    user = SimpleNamespace(organization_id=uuid4())
+
+    first = await jobs.get_job_analytics_summary(JOB_ID, current_user=user)
+    await jobs.get_job_analytics_summary(JOB_ID, current_user=user)
+    assert len(client.selects("analytics")) == 1
+
+    # Interview 8 has no analytics yet
+    AnalyticsRepository().create_sync(AnalyticsCreate(
+        interview_id=INTERVIEW_IDS[8], overall_score=99, competency_scores=[], strengths=[], concerns=[],
+        red_flags_detected=[], recommendation=Recommendation.STRONG_HIRE, summary="New",
+    ))
+    refreshed = await jobs.get_job_analytics_summary(JOB_ID, current_user=user)
+
+    assert len(cache.resolved) == 1
+    assert refreshed["total_candidates"] == first["total_candidates"] + 1
+    assert refreshed["job_title"] == "Engineer"
+
+
+def test_invalidation_skips_lookup_when_nothing_cached():
+    calls = []
+    cache = JobAnalyticsCache(ttl=300, resolve_job=lambda interview_id: calls.append(interview_id))
+
+    cache.invalidate_interview("int-1")
+    assert calls == []
+
+    cache.put("job-1", {"total_candidates": 1})
+    cache.put("job-2", {"total_candidates": 2})
+    cache.invalidate_interview("int-1", job_id="job-1")
+    assert cache.get("job-1") is None
+    assert cache.get("job-2") == {"total_candidates": 2}
+    assert calls == []
+
+
+def test_unresolvable_interview_clears_all_summaries():
+    def broken(interview_id):
+        raise RuntimeError("db down")
+
+    cache = JobAnalyticsCache(ttl=300, resolve_job=broken)
+    cache.put("job-1", {})
+    cache.invalidate_interview("int-1")
+
+    assert cache.get("job-1") is None
@@ -0,0 +1,84 @@
+"""
+Tests for the JobSummary list projection and requirement parsing.
+
+Runs against the LocalSupabase test database, so the summary path's
+organization and soft-delete filters are exercised, not just its columns.
+
+Run with: pytest tests/test_job_list_projection.py -v
+"""
+from uuid import uuid4
+
+import pytest
+
+from models.streamlined.job import Job, JobSummary
+from repositories.streamlined.job_repo import JOB_LIST_COLUMNS, JobRepository
+
+ORG_ID = str(uuid4())
+OTHER_ORG_ID = str(uuid4())
+JOB_ID = str(uuid4())
+
+
+def _job(job_id, organization_id, title, deleted_at=None):
+    return {
+        "id": job_id,
+        "organization_id": organization_id,
+        "title": title,
+        "description": "Build pipelines",
+        "status": "active",
+        "interview_stages": ["Screen", "Onsite"],
+        "interview_stage_icons": ["phone", "users"],
+        "created_at": "2026-03-01T00:00:00",
+        "updated_at": "2026-03-02T00:00:00",
+        "deleted_at": deleted_at,
+        # Legacy format: plain strings where weighted attributes are expected
+        "extracted_requirements": {"required_skills": ["SQL", "Airflow"], "preferred_skills": []},
+    }
+
+
+@pytest.fixture
+def client(local_db):
+    local_db.seed("job_postings", [
+        _job(JOB_ID, ORG_ID, "Data Engineer"),
+        _job(str(uuid4()), OTHER_ORG_ID, "Another tenant's job"),
+        _job(str(uuid4()), ORG_ID, "Archived job", deleted_at="2026-03-03T00:00:00"),
+    ])
+    local_db.absent_tables.discard("job_pipeline_counts")
+    local_db.seed("job_pipeline_counts", [
+        {"job_posting_id": JOB_ID, "pipeline_status": "new", "count": 3},
+        {"job_posting_id": JOB_ID, "pipeline_status": "stage_1", "count": 2},
+    ])
+    return local_db
+
+
+def test_summary_selects_list_columns_with_counts(client):
+    jobs = JobRepository().list_all_for_org_sync(ORG_ID, fields="summary")
+
+    assert client.selects("job_postings") == [("job_postings", JOB_LIST_COLUMNS)]
+    # Another organization's job and the archived job are filtered out
+    assert len(jobs) == 1 and type(jobs[0]) is JobSummary
+    job = jobs[0]
+    assert job.title == "Data Engineer"
+    assert job.interview_stages == ["Screen", "Onsite"]
+    assert job.interview_stage_icons == ["phone", "users"]
+    assert (job.candidate_count, job.interviewed_count) == (5, 2)
+    assert [(s.stage_key, s.count) for s in job.stage_counts] == [("new", 3), ("stage_0", 0), ("stage_1", 2), ("offer", 0)]
+
+
+def test_summary_can_include_archived_jobs_of_the_org_only(client):
+    jobs = JobRepository().list_all_for_org_sync(ORG_ID, fields="summary", include_archived=True)
+
+    assert sorted(job.title for job in jobs) == ["Archived job", "Data Engineer"]
+    assert JobRepository().list_all_for_org_sync(OTHER_ORG_ID, fields="summary")[0].title == "Another tenant's job"
+
+
+def test_full_view_converts_legacy_requirements(client):
+    job = JobRepository().get_by_id_for_org_sync(JOB_ID, ORG_ID)
+
+    assert isinstance(job, Job)
+    assert job.interview_stage_icons == ["phone", "users"]
+    assert [(a.value, a.weight) for a in job.extracted_requirements.required_skills] == [("SQL", 0.7), ("Airflow", 0.7)]
+
+
+def test_unknown_fields_rejected(client):
+    with pytest.raises(ValueError):
+        JobRepository().list_all_for_org_sync(ORG_ID, fields="everything")
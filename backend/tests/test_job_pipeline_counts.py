@@ -0,0 +1,115 @@
+"""
+Tests for per-job pipeline counts.
+
+Runs against the LocalSupabase test database to check that job listings read
+job_pipeline_counts instead of candidate rows, that counts match the old
+row-counting results (including the fallback when the table isn't installed),
+and that organization totals come from the same counts.
+
+Run with: pytest tests/test_job_pipeline_counts.py -v
+"""
+from uuid import uuid4
+
+import pytest
+
+from repositories.streamlined.job_repo import JobRepository, build_stage_counts
+from repositories.streamlined.candidate_repo import CandidateRepository
+
+ORG_ID = str(uuid4())
+JOB_A = str(uuid4())
+JOB_B = str(uuid4())
+ARCHIVED_JOB = str(uuid4())
+OTHER_ORG_JOB = str(uuid4())
+
+CANDIDATE_STATUSES = {
+    JOB_A: ["new", "new", None, "round_1", "stage_0", "stage_1", "decision_pending", "accepted", "rejected"],
+    JOB_B: ["new", "stage_2"],
+    ARCHIVED_JOB: ["new"],
+    OTHER_ORG_JOB: ["new", "accepted"],
+}
+
+
+def _seed(db, with_counts_table=True):
+    db.seed("job_postings", [
+        {"id": job_id, "title": title, "description": f"{title} role", "organization_id": org_id,
+         "created_at": "2026-01-01T00:00:00", "updated_at": "2026-01-01T00:00:00", "deleted_at": deleted_at}
+        for job_id, title, org_id, deleted_at in [
+            (JOB_A, "Backend Engineer", ORG_ID, None),
+            (JOB_B, "Designer", ORG_ID, None),
+            (ARCHIVED_JOB, "Old", ORG_ID, "2026-02-01T00:00:00"),
+            (OTHER_ORG_JOB, "Elsewhere", str(uuid4()), None),
+        ]
+    ])
+    candidates = db.seed("candidates", [
+        {"job_posting_id": job_id, "pipeline_status": status}
+        for job_id, statuses in CANDIDATE_STATUSES.items()
+        for status in statuses
+    ])
+    if not with_counts_table:
+        return
+    # What the trigger maintains (NULL counted as 'new'); one zeroed row left behind
+    db.absent_tables.discard("job_pipeline_counts")
+    counts = {}
+    for row in candidates:
+        key = (row["job_posting_id"], row["pipeline_status"] or "new")
+        counts[key] = counts.get(key, 0) + 1
+    db.seed("job_pipeline_counts", [
+        {"job_posting_id": job_id, "pipeline_status": status, "count": n}
+        for (job_id, status), n in counts.items()
+    ] + [{"job_posting_id": JOB_B, "pipeline_status": "round_2", "count": 0}])
+
+
+def _selected_tables(db):
+    return [table for table, _ in db.selects()]
+
+
+def _summary(job):
+    return job.candidate_count, job.interviewed_count, [(s.stage_key, s.count) for s in job.stage_counts]
+
+
+def test_job_list_reads_counts_table(local_db):
+    _seed(local_db)
+
+    jobs = {str(job.id): job for job in JobRepository().list_all_for_org_sync(ORG_ID)}
+
+    assert set(jobs) == {JOB_A, JOB_B}
+    assert "candidates" not in _selected_tables(local_db)
+    assert _selected_tables(local_db).count("job_pipeline_counts") == 1
+    # round_1 (legacy) and stage_0 share the first interview column
+    assert _summary(jobs[JOB_A]) == (
+        9, 5, [("new", 3), ("stage_0", 2), ("stage_1", 1), ("stage_2", 0), ("offer", 2)]
+    )
+    assert _summary(jobs[JOB_B]) == (2, 1, [("new", 1), ("stage_0", 0), ("stage_1", 0), ("stage_2", 1), ("offer", 0)])
+
+
+def test_fallback_counts_candidate_rows(local_db):
+    _seed(local_db)
+    expected = {str(job.id): _summary(job) for job in JobRepository().list_all_for_org_sync(ORG_ID)}
+
+    local_db.absent_tables.add("job_pipeline_counts")
+    jobs = JobRepository().list_all_for_org_sync(ORG_ID)
+
+    assert {str(job.id): _summary(job) for job in jobs} == expected
+    assert JobRepository._counts_table_available is False
+    assert "candidates" in _selected_tables(local_db)
+
+
+@pytest.mark.parametrize("with_counts_table", [True, False])
+def test_org_totals_skip_archived_and_other_org_jobs(local_db, with_counts_table):
+    _seed(local_db, with_counts_table)
+    repo = CandidateRepository()
+
+    assert repo.count_for_org_sync(ORG_ID) == {"total": 11, "interviewed": 6}
+    assert repo.count_by_jobs_batch_sync([JOB_A, JOB_B, ARCHIVED_JOB]) == {JOB_A: 9, JOB_B: 2, ARCHIVED_JOB: 1}
+    assert repo.count_by_interview_status_sync([JOB_A]) == {
+        "pending": 5, "in_progress": 1, "completed": 2, "rejected": 1,
+    }
+
+
+def test_stage_counts_for_custom_stages():
+    stages = build_stage_counts({"new": 1, "stage_3": 4, "round_3": 2}, ["a", "b", "c", "d"])
+
+    assert [(s.stage_key, s.stage_name, s.count) for s in stages] == [
+        ("new", "Screen", 1), ("stage_0", "a", 0), ("stage_1", "b", 0),
+        ("stage_2", "c", 2), ("stage_3", "d", 4), ("offer", "Offer", 0),
+    ]
@@ -0,0 +1,130 @@
+"""
+Tests for the per-profile local job profile storage.
+
+Verifies legacy migration, list ordering and pagination through the
+index, delete/compaction, and that concurrent writer processes do not
+clobber each other.
+
+Run with: pytest tests/test_job_profile_local.py -v
+"""
+import asyncio
+import json
+import multiprocessing
+import uuid
+
+import pytest
+
+from models.voice_ingest import JobProfile, CompanyIntelligence, HardRequirements, CandidateTrait
+from repositories.job_profile_local import LocalJobProfileRepository
+
+
+def _profile(title: str = "Engineer") -> JobProfile:
+    return JobProfile(
+        id=str(uuid.uuid4()),
+        recruiter_first_name="Test",
+        recruiter_last_name="User",
+        company=CompanyIntelligence(name="TestCorp", website="https://test.com"),
+        requirements=HardRequirements(job_title=title),
+    )
+
+
+def _add_traits(data_dir: str, session_id: str, prefix: str, count: int):
+    repo = LocalJobProfileRepository(data_dir=data_dir)
+    for i in range(count):
+        trait = CandidateTrait(name=f"{prefix}-{i}", description="Concurrent trait")
+        asyncio.run(repo.add_trait(session_id, trait))
+
+
+@pytest.mark.asyncio
+async def test_migrates_legacy_single_file(tmp_path):
+    legacy = LocalJobProfileRepository(data_dir=str(tmp_path / "scratch"))
+    profiles = {}
+    for title in ["Older", "Newer"]:
+        profile = _profile(title)
+        data = legacy._to_dict(profile)
+        profiles[profile.id] = data
+    list(profiles.values())[0]["created_at"] = "2024-01-01T00:00:00"
+    list(profiles.values())[1]["created_at"] = "2025-01-01T00:00:00"
+    (tmp_path / "job_profiles.json").write_text(json.dumps(profiles))
+
+    repo = LocalJobProfileRepository(data_dir=str(tmp_path))
+
+    listed = await repo.list_all()
+    assert [p.requirements.job_title for p in listed] == ["Newer", "Older"]
+    for profile_id in profiles:
+        assert (await repo.get(profile_id)) is not None
+
+
+@pytest.mark.asyncio
+async def test_list_all_orders_and_paginates(tmp_path):
+    repo = LocalJobProfileRepository(data_dir=str(tmp_path))
+    created = []
+    for i in range(5):
+        profile = _profile(f"Role {i}")
+        await repo.create(profile)
+        created.append(profile.id)
+
+    first_page = await repo.list_all(limit=2)
+    second_page = await repo.list_all(limit=2, offset=2)
+
+    assert [p.id for p in first_page] == created[::-1][:2]
+    assert [p.id for p in second_page] == created[::-1][2:4]
+    assert await repo.count() == 5
+
+
+@pytest.mark.asyncio
+async def test_delete_removes_from_index_and_compacts(tmp_path):
+    repo = LocalJobProfileRepository(data_dir=str(tmp_path))
+    ids = []
+    for i in range(4):
+        profile = _profile()
+        await repo.create(profile)
+        ids.append(profile.id)
+
+    for profile_id in ids[:3]:
+        assert await repo.delete(profile_id)
+    assert not await repo.delete(ids[0])
+
+    listed = await repo.list_all()
+    assert [p.id for p in listed] == [ids[3]]
+    # Tombstones outnumbered live entries, so the index was rewritten
+    assert len(repo.index_file.read_text().splitlines()) == 1
+
+
+@pytest.mark.asyncio
+async def test_update_preserves_created_at(tmp_path):
+    repo = LocalJobProfileRepository(data_dir=str(tmp_path))
+    profile = _profile()
+    created = await repo.create(profile)
+
+    created.requirements.job_title = "Staff Engineer"
+    updated = await repo.update(profile.id, created)
+
+    assert updated.requirements.job_title == "Staff Engineer"
+    assert updated.created_at == created.created_at
+    assert await repo.update("missing-id", created) is None
+
+
+@pytest.mark.asyncio
+async def test_rejects_path_traversal_ids(tmp_path):
+    repo = LocalJobProfileRepository(data_dir=str(tmp_path))
+    assert await repo.get("../job_profiles") is None
+
+
+def test_concurrent_processes_do_not_clobber(tmp_path):
+    repo = LocalJobProfileRepository(data_dir=str(tmp_path))
+    profile = _profile()
+    asyncio.run(repo.create(profile))
+
+    ctx = multiprocessing.get_context("fork")
+    workers = [
+        ctx.Process(target=_add_traits, args=(str(tmp_path), profile.id, prefix, 15))
+        for prefix in ["a", "b"]
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    stored = asyncio.run(repo.get(profile.id))
+    assert len(stored.traits) == 30
@@ -0,0 +1,218 @@
+"""
+Tests for LLM request scheduling: route deadlines, hedged requests and
+interactive priority in the concurrency budget.
+
+Run with: pytest tests/test_llm_scheduler.py -v
+"""
+import asyncio
+import json
+from uuid import uuid4
+
+import httpx
+import pytest
+from fastapi import Depends, FastAPI
+
+from db import client as db_client
+from db.client import use_db_client
+from db.local_client import LocalSupabase
+from services import llm_scheduler as llm_scheduler_module
+from services import llm_usage
+from services.llm_scheduler import (
+    LLM_HEDGES,
+    LLMConcurrencyLimiter,
+    LLMDeadlineExceeded,
+    LLMScheduler,
+    LLMTransport,
+    llm_deadline,
+    request_deadline,
+)
+from services.llm_usage import BULK, INTERACTIVE, OrgLimits, UsageLedger, llm_attribution
+from services.telemetry import llm_event_hooks, llm_family
+
+
+class Provider(httpx.AsyncBaseTransport):
+    """Answers chat completions after a per-model delay, recording what was sent and cancelled."""
+
+    def __init__(self, delays):
+        self.delays = delays
+        self.sent = []
+        self.cancelled = []
+
+    async def handle_async_request(self, request):
+        model = json.loads(request.content)["model"]
+        self.sent.append(model)
+        try:
+            await asyncio.sleep(self.delays[model])
+        except asyncio.CancelledError:
+            self.cancelled.append(model)
+            raise
+        return httpx.Response(200, json={
+            "model": model,
+            "choices": [{"message": {"content": model}}],
+            "usage": {"prompt_tokens": 1000, "completion_tokens": 200},
+        })
+
+
+def _client(provider, family, **scheduler):
+    scheduler = LLMScheduler(limiter=LLMConcurrencyLimiter(4, 1), **scheduler)
+    transport = LLMTransport(family, transport=provider, scheduler=scheduler)
+    return httpx.AsyncClient(transport=transport, base_url="http://llm"), scheduler
+
+
+@pytest.mark.asyncio
+async def test_slow_call_is_hedged_to_the_fallback_model_and_the_loser_cancelled():
+    provider = Provider({"slow-model": 5.0, "fast-model": 0.01})
+    client, scheduler = _client(
+        provider, "hedge_test", hedge_families=["hedge_test"], hedge_min_delay=0.05,
+        hedge_default_delay=0.05, fallback_model="fast-model",
+    )
+    hedge_wins = LLM_HEDGES.value(family="hedge_test", winner="hedge")
+
+    async with client:
+        response = await client.post("/chat/completions", json={"model": "slow-model", "messages": []})
+        await asyncio.sleep(0)
+
+    assert response.json()["choices"][0]["message"]["content"] == "fast-model"
+    assert provider.sent == ["slow-model", "fast-model"] and provider.cancelled == ["slow-model"]
+    assert LLM_HEDGES.value(family="hedge_test", winner="hedge") == hedge_wins + 1
+    # Both slots are back once the winner's body is read
+    assert scheduler.limiter.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_pluto_scoring_is_hedged_under_its_prompt_family():
+    provider = Provider({"slow-model": 0.3, "fast-model": 0.01})
+    client, _ = _client(provider, "pluto", hedge_min_delay=0.05, hedge_default_delay=0.05, fallback_model="fast-model")
+
+    async with client:
+        with llm_family("pluto_scoring"):
+            hedged = await client.post("/chat/completions", json={"model": "slow-model"})
+        assert provider.sent == ["slow-model", "fast-model"]
+        assert hedged.json()["model"] == "fast-model"
+
+        # Pluto's other calls (extraction, deep analytics) are not hedged
+        provider.sent.clear()
+        with llm_family("pluto_extraction"):
+            await client.post("/chat/completions", json={"model": "slow-model"})
+        assert provider.sent == ["slow-model"]
+
+
+@pytest.mark.asyncio
+async def test_hedges_are_admitted_and_the_loser_is_charged(monkeypatch):
+    monkeypatch.setattr(db_client, "_supabase_client", None)
+    use_db_client(LocalSupabase())
+    ledger = UsageLedger(enabled=False, org_limits={}, default_limits=OrgLimits(daily_budget_usd=1.0))
+    monkeypatch.setattr(llm_usage, "usage_ledger", ledger)
+    monkeypatch.setattr(llm_scheduler_module, "usage_ledger", ledger)
+    org_id = str(uuid4())
+
+    provider = Provider({"google/gemini-2.5-flash": 5.0, "openai/gpt-4o-mini": 0.01})
+    scheduler = LLMScheduler(
+        limiter=LLMConcurrencyLimiter(4, 1), hedge_families=["coach_chat"], hedge_min_delay=0.05,
+        hedge_default_delay=0.05, fallback_model="openai/gpt-4o-mini",
+    )
+    transport = LLMTransport("coach_chat", transport=provider, scheduler=scheduler)
+    body = {"model": "google/gemini-2.5-flash", "messages": [{"role": "user", "content": "hi"}], "max_tokens": 200}
+
+    async with httpx.AsyncClient(transport=transport, event_hooks=llm_event_hooks("coach_chat")) as client:
+        with llm_attribution(organization_id=org_id):
+            response = await client.post("http://llm/chat/completions", json=body)
+
+    assert response.json()["model"] == "openai/gpt-4o-mini"
+    # The winner is settled at its actual cost; the cancelled primary keeps its reservation
+    winner_cost = ledger.cost("openai/gpt-4o-mini", 1000, 0, 200)
+    assert ledger.spent_today(org_id)["interactive"] == pytest.approx(winner_cost + ledger.estimate_cost(body))
+
+
+@pytest.mark.asyncio
+async def test_sdk_client_keeps_openai_connection_limits():
+    import openai
+    from services.telemetry import llm_http_client
+
+    client = llm_http_client("limits_test")
+    pool = client._transport._transport._pool
+    limits = openai.DEFAULT_CONNECTION_LIMITS
+    assert (pool._max_connections, pool._max_keepalive_connections, pool._keepalive_expiry) == (
+        limits.max_connections, limits.max_keepalive_connections, limits.keepalive_expiry,
+    )
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_route_deadline_bounds_llm_calls():
+    provider = Provider({"slow-model": 5.0})
+    client, scheduler = _client(provider, "deadline_test", hedge_families=[])
+    app = FastAPI()
+
+    @app.post("/ask", dependencies=[Depends(request_deadline(10))])
+    async def ask():
+        try:
+            await client.post("/chat/completions", json={"model": "slow-model"})
+        except httpx.TimeoutException:
+            return {"timed_out": True}
+        return {"timed_out": False}
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://app") as api:
+        # The header can only shorten the route's deadline
+        response = await api.post("/ask", headers={"X-Request-Timeout": "0.1"})
+    assert response.json() == {"timed_out": True}
+    assert loop.time() - start < 1.0
+    assert provider.cancelled == ["slow-model"] and scheduler.limiter.in_flight == 0
+
+    with llm_deadline(0.05):
+        with pytest.raises(LLMDeadlineExceeded):
+            await client.post("/chat/completions", json={"model": "slow-model"})
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_coach_routes_report_a_missed_deadline_instead_of_a_fallback(monkeypatch):
+    from fastapi import HTTPException
+    from routers import coach
+
+    provider = Provider({coach.GEMINI_ANALYTICS_MODEL: 5.0})
+    scheduler = LLMScheduler(limiter=LLMConcurrencyLimiter(4, 1), hedge_families=[])
+    monkeypatch.setattr(coach, "llm_transport", lambda family: LLMTransport(family, transport=provider, scheduler=scheduler))
+    monkeypatch.setattr(coach, "OPENROUTER_API_KEY", "test-key")
+
+    with llm_deadline(0.05):
+        with pytest.raises(HTTPException) as chat:
+            await coach.coach_chat(coach.ChatRequest(messages=[{"role": "user", "content": "Any red flags?"}]))
+        with pytest.raises(HTTPException) as suggestion:
+            await coach.get_coach_suggestion(coach.CoachRequest(
+                last_exchange="Interviewer: Why? Candidate: Because.", full_transcript="", elapsed_minutes=5,
+            ))
+    assert chat.value.status_code == suggestion.value.status_code == 504
+
+
+@pytest.mark.asyncio
+async def test_interactive_calls_skip_queued_bulk_calls_and_keep_reserved_slots():
+    limiter = LLMConcurrencyLimiter(limit=3, interactive_reserved=1)
+    await limiter.acquire(BULK)
+    await limiter.acquire(BULK)
+    # The last slot is reserved for interactive traffic
+    with pytest.raises(asyncio.TimeoutError):
+        await limiter.acquire(BULK, timeout=0.01)
+    await limiter.acquire(INTERACTIVE)
+
+    order = []
+
+    async def call(lane, name):
+        await limiter.acquire(lane)
+        order.append(name)
+
+    waiting = [asyncio.create_task(call(BULK, "bulk")), asyncio.create_task(call(INTERACTIVE, "interactive"))]
+    await asyncio.sleep(0.01)
+    assert order == []
+
+    limiter.release()  # the interactive call is admitted first, though it queued last
+    await asyncio.sleep(0.01)
+    assert order == ["interactive"]
+    limiter.release()
+    await asyncio.sleep(0.01)
+    assert order == ["interactive"]  # bulk still may not take the reserved slot
+    limiter.release()
+    await asyncio.gather(*waiting)
+    assert order == ["interactive", "bulk"] and limiter.in_flight == 2
@@ -0,0 +1,217 @@
+"""
+Tests for the LLM usage ledger and per-organization LLM limits.
+
+Run with: pytest tests/test_llm_usage.py -v
+"""
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from uuid import uuid4
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from db import client as db_client
+from db.client import use_db_client
+from db.local_client import LocalSupabase
+from middleware.auth_middleware import get_current_user
+from models.auth import CurrentUser
+from repositories.llm_usage_repository import LLMUsageRepository
+from routers import usage as usage_router
+from services import llm_usage
+from services.llm_usage import LLMLimitExceeded, OrgLimits, UsageLedger, llm_attribution
+from services.telemetry import llm_event_hooks
+
+
+def _reply(request):
+    return httpx.Response(200, json={
+        "model": "google/gemini-2.5-flash",
+        "choices": [{"message": {"content": "{}"}}],
+        "usage": {"prompt_tokens": 1000, "completion_tokens": 200, "prompt_tokens_details": {"cached_tokens": 400}},
+    })
+
+
+@pytest.fixture
+def db(monkeypatch):
+    local = LocalSupabase()
+    monkeypatch.setattr(db_client, "_supabase_client", None)
+    use_db_client(local)
+    monkeypatch.setattr(LLMUsageRepository, "_table_available", True)
+    monkeypatch.setattr(LLMUsageRepository, "_summary_rpc_available", True)
+    return local
+
+
+def _midnight() -> datetime:
+    return datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _ledger(monkeypatch, **kwargs) -> UsageLedger:
+    ledger = UsageLedger(enabled=True, flush_size=100, flush_interval=3600, org_limits={}, **kwargs)
+    monkeypatch.setattr(llm_usage, "usage_ledger", ledger)
+    return ledger
+
+
+@pytest.mark.asyncio
+async def test_calls_are_attributed_costed_and_summarised(db, monkeypatch):
+    ledger = _ledger(monkeypatch, default_limits=OrgLimits())
+    org_id = str(uuid4())
+    job = db.seed("job_postings", [{"organization_id": org_id, "title": "Designer"}])[0]
+    candidate_id = str(uuid4())
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(_reply), event_hooks=llm_event_hooks("screening")) as client:
+        # Organization looked up from the job
+        with llm_attribution(job_id=job["id"], candidate_id=candidate_id):
+            await client.post("http://llm/chat/completions", json={})
+            await client.post("http://llm/chat/completions", json={})
+        with llm_attribution(organization_id=org_id):
+            await client.post("http://llm/chat/completions", json={})
+
+    assert ledger.flush() == 3
+    rows = db.rows("llm_usage")
+    assert [row["organization_id"] for row in rows] == [org_id] * 3
+    assert rows[0]["job_id"] == job["id"] and rows[0]["candidate_id"] == candidate_id
+    assert rows[0]["cache_hit"] is True and rows[0]["cached_tokens"] == 400
+    # 600 uncached input, 400 cached input, 200 output at gemini-2.5-flash prices
+    assert rows[0]["cost_usd"] == pytest.approx((600 * 0.30 + 400 * 0.075 + 200 * 2.50) / 1e6)
+
+    # No summary RPC locally: aggregated from the rows
+    by_job = LLMUsageRepository().summary_sync(org_id, "job", since=_midnight())
+    assert {row["key"]: row["calls"] for row in by_job} == {job["id"]: 2, None: 1}
+    assert LLMUsageRepository._summary_rpc_available is False
+
+    app = FastAPI()
+    app.include_router(usage_router.router)
+    user = CurrentUser(recruiter_id=uuid4(), organization_id=org_id, email="r@example.com", role="admin", name="R")
+    app.dependency_overrides[get_current_user] = lambda: user
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        summary = (await client.get("/api/usage/summary", params={"group_by": "family"})).json()
+        assert (await client.get("/api/usage/summary", params={"group_by": "organization"})).status_code == 422
+
+    assert summary["rows"][0]["key"] == "screening"
+    assert summary["totals"]["calls"] == 3
+    assert summary["totals"]["prompt_tokens"] == 3000
+    assert summary["totals"]["cache_hits"] == 3
+
+
+@pytest.mark.asyncio
+async def test_bulk_rate_lane_does_not_starve_interactive(db, monkeypatch):
+    _ledger(monkeypatch, default_limits=OrgLimits(bulk_rpm=6, interactive_rpm=60), max_wait=0.0)
+    org_id = str(uuid4())
+
+    sent = []
+
+    def reply(request):
+        sent.append(request)
+        return _reply(request)
+
+    transport = httpx.MockTransport(reply)
+    async with httpx.AsyncClient(transport=transport, event_hooks=llm_event_hooks("screening")) as bulk, \
+            httpx.AsyncClient(transport=transport, event_hooks=llm_event_hooks("coach_chat")) as live:
+        with llm_attribution(organization_id=org_id):
+            # A burst of 6/min is one call; the next would have to wait, and may not
+            await bulk.post("http://llm/chat/completions", json={})
+            with pytest.raises(LLMLimitExceeded) as refused:
+                await bulk.post("http://llm/chat/completions", json={})
+            assert (refused.value.lane, refused.value.reason) == ("bulk", "rate")
+
+            for _ in range(5):
+                await live.post("http://llm/chat/completions", json={})
+
+        # Another organization has its own lanes
+        with llm_attribution(organization_id=str(uuid4())):
+            await bulk.post("http://llm/chat/completions", json={})
+
+    assert len(sent) == 7
+
+
+def test_bulk_budget_share_keeps_interactive_headroom(db, monkeypatch):
+    ledger = _ledger(monkeypatch, default_limits=OrgLimits(daily_budget_usd=0.002), bulk_budget_share=0.5)
+    org_id = str(uuid4())
+
+    def call(family):
+        with httpx.Client(transport=httpx.MockTransport(_reply), event_hooks=llm_event_hooks(family, sync=True)) as client:
+            client.post("http://llm/chat/completions", json={})
+
+    # Each call costs ~$0.00071: bulk stops after crossing $0.001, interactive continues to $0.002
+    with llm_attribution(organization_id=org_id):
+        call("screening")
+        call("screening")
+        with pytest.raises(LLMLimitExceeded) as refused:
+            call("pluto")
+        assert (refused.value.lane, refused.value.reason) == ("bulk", "budget")
+        call("coach_chat")
+        with pytest.raises(LLMLimitExceeded):
+            call("coach_chat")
+
+    spent = ledger.spent_today(org_id)
+    assert spent["bulk"] > 0.001 and sum(spent.values()) >= 0.002
+
+    ledger.flush()
+    outcomes = [row["outcome"] for row in db.rows("llm_usage")]
+    assert outcomes == ["ok", "ok", "limited", "ok", "limited"]
+
+
+@pytest.mark.asyncio
+async def test_admission_reserves_estimated_cost_until_the_response(db, monkeypatch):
+    ledger = _ledger(monkeypatch, default_limits=OrgLimits(daily_budget_usd=0.002), bulk_budget_share=1.0)
+    org_id = str(uuid4())
+    request = {"model": "google/gemini-2.5-flash", "messages": [{"role": "user", "content": "x" * 3967}], "max_tokens": 200}
+    estimate = ledger.estimate_cost(request)
+    assert estimate == pytest.approx((1000 * 0.30 + 200 * 2.50) / 1e6)
+
+    # Concurrent calls see each other's reservations before any response arrives
+    with llm_attribution(organization_id=org_id):
+        admitted = [await ledger.admit("screening", estimate) for _ in range(3)]
+        with pytest.raises(LLMLimitExceeded):
+            await ledger.admit("screening", estimate)
+    assert ledger.spent_today(org_id)["bulk"] == pytest.approx(3 * estimate)
+
+    # The response settles the reservation at the actual cost; an abandoned call keeps it
+    attribution, reserved = admitted[0]
+    ledger.record("screening", attribution, 200, _reply(None).json(), 0.5, reserved)
+    abandoned, held = admitted[1]
+    ledger.record_abandoned("screening", abandoned, "google/gemini-2.5-flash", held, 0.5)
+    actual = (600 * 0.30 + 400 * 0.075 + 200 * 2.50) / 1e6
+    assert ledger.spent_today(org_id)["bulk"] == pytest.approx(actual + 2 * estimate)
+
+
+@pytest.mark.asyncio
+async def test_live_routes_surface_limit_refusals_instead_of_fallback_answers(db, monkeypatch):
+    from routers import coach, rooms
+
+    ledger = _ledger(monkeypatch, default_limits=OrgLimits(interactive_rpm=1), max_wait=0.0)
+    for router in (coach, rooms):
+        monkeypatch.setattr(router, "OPENROUTER_API_KEY", "test-key")
+
+    with llm_attribution(organization_id=str(uuid4())):
+        await ledger.admit("coach_chat")  # the organization's one interactive call this minute
+        # Refused before anything is sent; main.py turns these into 429s
+        with pytest.raises(LLMLimitExceeded):
+            await coach.coach_chat(coach.ChatRequest(messages=[{"role": "user", "content": "Any red flags?"}]))
+        with pytest.raises(LLMLimitExceeded):
+            await coach.get_coach_suggestion(coach.CoachRequest(
+                last_exchange="Interviewer: Why? Candidate: Because.", full_transcript="", elapsed_minutes=5,
+            ))
+        with pytest.raises(LLMLimitExceeded):
+            await rooms.chat("room-1", rooms.ChatRequest(message="Any red flags?"))
+
+
+def test_ledger_write_errors_only_disable_it_when_the_table_is_missing(db, monkeypatch):
+    from postgrest import APIError
+
+    def failing(code, message):
+        def insert(rows):
+            raise APIError({"message": message, "code": code})
+        return SimpleNamespace(insert=insert)
+
+    repo = LLMUsageRepository()
+    monkeypatch.setattr(repo.client, "table", lambda name: failing(
+        "23503", 'insert or update on table "llm_usage" violates foreign key constraint "llm_usage_organization_id_fkey"'))
+    with pytest.raises(APIError):
+        repo.insert_many_sync([{"family": "screening"}])
+    assert LLMUsageRepository._table_available is True
+
+    monkeypatch.setattr(repo.client, "table", lambda name: failing(
+        "PGRST205", "Could not find the table 'public.llm_usage' in the schema cache"))
+    assert repo.insert_many_sync([{"family": "screening"}]) == 0
+    assert LLMUsageRepository._table_available is False
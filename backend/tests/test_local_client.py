@@ -0,0 +1,148 @@
+"""
+Tests for the SQLite-backed Supabase stand-in (db/local_client.py).
+
+Covers the query builder subset the repositories use, embedded selects, and
+real repositories running against it through db.client.get_db, including
+their fallbacks for RPCs and trigger-maintained tables the local database
+doesn't have.
+
+Run with: pytest tests/test_local_client.py -v
+"""
+import time
+from uuid import uuid4
+
+import pytest
+from postgrest import APIError
+
+from db import client as db_client
+from db.client import get_db, use_db_client
+from db.local_client import LocalSupabase
+from repositories.streamlined.candidate_repo import CandidateRepository
+from repositories.streamlined.job_repo import JobRepository
+
+ORG_ID = str(uuid4())
+
+
+@pytest.fixture
+def db(monkeypatch):
+    local = LocalSupabase()
+    monkeypatch.setattr(db_client, "_supabase_client", None)
+    use_db_client(local)
+    # Repositories remember missing RPCs/tables on the class; restore afterwards
+    monkeypatch.setattr(JobRepository, "_counts_table_available", True)
+    monkeypatch.setattr(CandidateRepository, "_bulk_rpc_available", True)
+    return local
+
+
+def test_filters_order_paging_and_count(db):
+    db.seed("persons", [
+        {"name": "Ada Lovelace", "skills": ["Python", "SQL"], "score": 91, "location": None},
+        {"name": "Alan Turing", "skills": ["Python"], "score": 78, "location": "London"},
+        {"name": "Grace Hopper", "skills": ["COBOL", "SQL"], "score": None, "location": "Arlington"},
+    ])
+    people = db.table("persons")
+
+    assert [p["name"] for p in people.select("name").ilike("name", "%a%").order("name").execute().data] == [
+        "Ada Lovelace", "Alan Turing", "Grace Hopper",
+    ]
+    assert [p["name"] for p in people.select("*").contains("skills", ["SQL"]).execute().data] == [
+        "Ada Lovelace", "Grace Hopper",
+    ]
+    assert [p["name"] for p in people.select("*").not_.is_("location", "null").execute().data] == [
+        "Alan Turing", "Grace Hopper",
+    ]
+    # Postgres puts NULLs first when sorting descending unless told otherwise
+    assert [p["score"] for p in people.select("score").order("score", desc=True).execute().data] == [None, 91, 78]
+    assert [p["score"] for p in people.select("score").order("score", desc=True, nullsfirst=False).execute().data] == [91, 78, None]
+    # Values arrive as text from PostgREST filter strings and compare numerically
+    assert [p["name"] for p in people.select("name").gte("score", "80").execute().data] == ["Ada Lovelace"]
+    assert [p["name"] for p in people.select("name").or_('score.lt."80",and(score.is.null,name.ilike.*hopper*)').execute().data] == [
+        "Alan Turing", "Grace Hopper",
+    ]
+
+    page = people.select("name", count="exact").order("name").range(1, 1).execute()
+    assert (page.count, [p["name"] for p in page.data]) == (3, ["Alan Turing"])
+
+
+def test_writes_single_and_duplicate_keys(db):
+    row = db.table("jobs").insert({"title": "Designer"}).execute().data[0]
+    assert row["id"] and row["created_at"]
+
+    with pytest.raises(APIError) as exc:
+        db.table("jobs").insert({"id": row["id"], "title": "Copy"}).execute()
+    assert exc.value.code == "23505"
+
+    db.table("jobs").update({"status": "active"}).eq("id", row["id"]).execute()
+    db.table("jobs").upsert({"id": row["id"], "title": "Product Designer"}).execute()
+    stored = db.table("jobs").select("*").eq("id", row["id"]).single().execute().data
+    assert (stored["title"], stored["status"]) == ("Product Designer", "active")
+
+    assert db.table("jobs").delete().eq("id", row["id"]).execute().data[0]["id"] == row["id"]
+    assert db.table("jobs").select("*").eq("id", row["id"]).maybe_single().execute() is None
+    with pytest.raises(APIError):
+        db.table("jobs").select("*").eq("id", row["id"]).single().execute()
+
+
+def test_embedded_selects(db):
+    person = db.seed("persons", [{"name": "Ada", "email": "ada@example.com"}])[0]
+    job = db.seed("job_postings", [{"title": "Data Engineer"}])[0]
+    candidate = db.seed("candidates", [{"person_id": person["id"], "job_posting_id": job["id"], "name": "Ada"}])[0]
+    db.seed("interviews", [{"candidate_id": candidate["id"], "job_posting_id": job["id"]}])
+
+    row = db.table("candidates").select("*, persons(name, email), job_postings(title)").execute().data[0]
+    assert row["persons"] == {"name": "Ada", "email": "ada@example.com"}
+    assert row["job_postings"] == {"title": "Data Engineer"}
+
+    interview = db.table("interviews")\
+        .select("id, candidates!fk_interviews_candidate(name, job_postings(title))")\
+        .execute().data[0]
+    assert interview["candidates"] == {"name": "Ada", "job_postings": {"title": "Data Engineer"}}
+
+    assert db.table("persons").select("name, candidates(id)").execute().data == [
+        {"name": "Ada", "candidates": [{"id": candidate["id"]}]}
+    ]
+
+
+def test_repositories_run_against_local_db(db):
+    jobs = db.seed("job_postings", [
+        {"organization_id": ORG_ID, "title": title, "description": f"{title} role", "status": "active",
+         "interview_stages": ["Screen", "Onsite"], "deleted_at": None}
+        for title in ("Backend Engineer", "Designer")
+    ])
+    job_id = jobs[0]["id"]
+    scores = [88, None, 72, 95, 60, None, 81]
+    db.seed("candidates", [
+        {"job_posting_id": job_id, "name": f"C{i}", "pipeline_status": "new", "combined_score": score}
+        for i, score in enumerate(scores)
+    ])
+
+    # job_pipeline_counts is trigger-maintained, so the repository counts candidate rows
+    listed = {job.title: job for job in JobRepository().list_all_for_org_sync(ORG_ID, fields="summary")}
+    assert listed["Backend Engineer"].candidate_count == 7
+    assert JobRepository._counts_table_available is False
+
+    repo = CandidateRepository()
+    seen, cursor = [], None
+    while True:
+        page, cursor = repo.list_page_by_job_sync(job_id, sort="score", limit=3, cursor=cursor, fields="summary")
+        seen.extend(c.combined_score for c in page)
+        if cursor is None:
+            break
+    assert seen == [95, 88, 81, 72, 60, None, None]
+
+    # No RPCs locally: the bulk update falls back to chunked updates
+    ids = [row["id"] for row in db.rows("candidates")[:2]]
+    assert sorted(repo.bulk_update_pipeline_status_sync(job_id, ids, "stage_0")) == sorted(ids)
+    assert CandidateRepository._bulk_rpc_available is False
+    assert repo.count_by_job_sync(job_id, "stage_0") == 2
+
+
+def test_latency_and_backend_selection(monkeypatch):
+    slow = LocalSupabase(latency=0.02)
+    start = time.perf_counter()
+    slow.table("persons").select("*").execute()
+    assert time.perf_counter() - start >= 0.02
+
+    monkeypatch.setattr(db_client, "_supabase_client", None)
+    monkeypatch.setattr(db_client, "DB_BACKEND", "local")
+    assert isinstance(get_db(), LocalSupabase)
@@ -0,0 +1,164 @@
+"""
+Tests for the market insights store.
+
+Runs offline against LocalParallelAIService, a stub compensation extractor
+and a stub insights provider, verifying key normalisation, SQLite
+persistence, single-flight, stale-while-revalidate and prefetch.
+
+Run with: pytest tests/test_market_insights_store.py -v
+"""
+import asyncio
+
+import pytest
+
+from models.compensation import CompensationData
+from services.market_data import MarketInsights
+from services.parallel_ai import LocalParallelAIService
+from services.market_insights_store import MarketInsightsStore, normalize_role, normalize_location
+
+
+class StubExtractor:
+    """Counts extractions; returns a salary band unless told the search failed."""
+
+    def __init__(self, salary: bool = True):
+        self.calls = 0
+        self.salary = salary
+
+    async def extract(self, raw_results):
+        self.calls += 1
+        return CompensationData(
+            role_title=raw_results.get("role_title", ""),
+            location=raw_results.get("location", ""),
+            salary_min=150000 if self.salary else None,
+            salary_median=175000 if self.salary else None,
+            salary_max=200000 if self.salary else None,
+            sample_size_estimate=f"extraction #{self.calls}",
+        )
+
+
+class StubProvider:
+    def __init__(self):
+        self.calls = 0
+
+    async def get_insights(self, role, location):
+        self.calls += 1
+        return MarketInsights(
+            role=role, location=location,
+            salary_range_low=100000, salary_range_high=130000,
+            top_skills=["Python"], demand_level="High", average_time_to_hire_days=40,
+        )
+
+
+@pytest.fixture
+def search():
+    return LocalParallelAIService(latency=0.05)
+
+
+@pytest.fixture
+def extractor():
+    return StubExtractor()
+
+
+@pytest.fixture
+def store(tmp_path, search, extractor):
+    return MarketInsightsStore(
+        search_service=search, extractor=extractor, provider=StubProvider(),
+        db_path=str(tmp_path / "market.db"),
+    )
+
+
+def test_normalisation():
+    assert normalize_role("Sr. Software Eng (Backend)") == "senior software engineer backend"
+    assert normalize_role("senior software engineer, backend") == "senior software engineer backend"
+    assert normalize_location("San Francisco, CA") == normalize_location("SF") == "san francisco"
+    assert normalize_location("Remote (US)") == "remote"
+    assert normalize_location(None) == "san francisco"
+
+
+@pytest.mark.asyncio
+async def test_equivalent_requests_share_one_entry(store, search, extractor):
+    first = await store.get_compensation("Senior Software Engineer", "San Francisco, CA")
+    second = await store.get_compensation("Sr Software Engineer", "SF")
+
+    assert not first.cached and second.cached
+    assert extractor.calls == 1
+    assert second.data.salary_median == 175000
+    # Optional parameters are part of the key
+    await store.get_compensation("Senior Software Engineer", "SF", company_stage="Series B")
+    assert extractor.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_are_single_flight(store, extractor):
+    results = await asyncio.gather(*[
+        store.get_compensation("Product Manager", "NYC") for _ in range(5)
+    ])
+
+    assert extractor.calls == 1
+    assert {r.data.sample_size_estimate for r in results} == {"extraction #1"}
+
+
+@pytest.mark.asyncio
+async def test_persisted_entries_survive_restart(tmp_path, search, extractor):
+    db_path = str(tmp_path / "market.db")
+    await MarketInsightsStore(search_service=search, extractor=extractor, db_path=db_path) \
+        .get_compensation("Data Scientist", "Austin, TX")
+
+    restarted = MarketInsightsStore(search_service=search, extractor=extractor, db_path=db_path)
+    lookup = await restarted.get_compensation("data scientist", "Austin")
+
+    assert lookup.cached
+    assert extractor.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_stale_entry_served_while_revalidating(tmp_path, search, extractor):
+    store = MarketInsightsStore(
+        search_service=search, extractor=extractor, db_path=str(tmp_path / "market.db"),
+        fresh_ttl=0, stale_ttl=3600,
+    )
+    await store.get_compensation("Designer", "Seattle")
+
+    stale = await store.get_compensation("Designer", "Seattle")
+    assert stale.cached
+    assert stale.data.sample_size_estimate == "extraction #1"
+
+    await asyncio.sleep(0.15)
+    assert extractor.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_results_without_salary_are_not_cached(tmp_path, search):
+    extractor = StubExtractor(salary=False)
+    store = MarketInsightsStore(search_service=search, extractor=extractor, db_path=str(tmp_path / "market.db"))
+
+    await store.get_compensation("Recruiter", "Denver")
+    await store.get_compensation("Recruiter", "Denver")
+    assert extractor.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_prefetch_dedupes_and_skips_fresh(store, extractor):
+    await store.get_compensation("Backend Engineer", "Remote")
+
+    summary = await store.prefetch([
+        ("Backend Engineer", "remote - US"),
+        ("Frontend Engineer", "SF"),
+        ("frontend eng", "San Francisco, CA"),
+        ("ML Engineer", None),
+    ], concurrency=2)
+
+    assert summary == {"pairs": 3, "fresh": 1, "refreshed": 2, "failed": 0}
+    assert extractor.calls == 3
+    assert (await store.get_compensation("Machine Learning Engineer", "San Francisco")).cached
+
+
+@pytest.mark.asyncio
+async def test_insights_cached_and_relabelled(store):
+    first = await store.get_insights("Senior Python Developer", "New York City")
+    second = await store.get_insights("Sr Python Dev", "NYC")
+
+    assert store.provider.calls == 1
+    assert first.salary_range_high == second.salary_range_high
+    assert second.role == "Sr Python Dev"
+    assert second.location == "NYC"
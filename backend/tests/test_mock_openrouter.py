@@ -0,0 +1,71 @@
+"""
+Tests for the mock OpenRouter server used by scripts/bench_pipeline.py.
+
+Covers structured-output synthesis against the screening schemas, filling
+prompt-embedded JSON templates, and rate limiting.
+
+Run with: pytest tests/test_mock_openrouter.py -v
+"""
+import json
+import os
+import random
+
+import httpx
+import pytest
+
+# The screening module builds its OpenAI client at import; no request is sent
+os.environ.setdefault("OPENROUTER_API_KEY", "test-key")
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+from scripts.mock_openrouter import LatencyModel, create_app, fill_template, synthesize_from_schema
+from services.candidate_screening import PackedScreeningResponse, ScreeningResult
+
+
+def test_schema_synthesis_validates():
+    rng = random.Random(1)
+    for _ in range(20):
+        ScreeningResult.model_validate(synthesize_from_schema(ScreeningResult.model_json_schema(), rng))
+
+    prompt = "=== CANDIDATE C1 ===\nAda\n\n=== CANDIDATE C2 ===\nAlan\n"
+    packed = PackedScreeningResponse.model_validate(
+        synthesize_from_schema(PackedScreeningResponse.model_json_schema(), rng, prompt)
+    )
+    assert [r.candidate_ref for r in packed.results] == ["C1", "C2"]
+
+
+def test_fill_template_from_prompt():
+    prompt = """Score the candidate.
+
+Return JSON:
+{
+    "score": <0-100>,
+    "fit": "Strong Fit" or "Not a Fit",
+    "remote": true/false,
+    "notes": ["string"],  // short bullet points
+    "salary": number or null
+}"""
+    data = fill_template(prompt, random.Random(3))
+
+    assert 0 <= data["score"] <= 100
+    assert data["fit"] in ("Strong Fit", "Not a Fit")
+    assert isinstance(data["remote"], bool)
+    assert isinstance(data["notes"], list)
+    assert fill_template("No template here.", random.Random(3)) is None
+
+
+@pytest.mark.asyncio
+async def test_completions_and_rate_limits():
+    app = create_app(LatencyModel("fixed:0"), rate_429=0.5, seed=5)
+    body = {"model": "mock", "messages": [{"role": "user", "content": 'Reply with JSON: {"ok": true/false}'}]}
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://mock") as client:
+        responses = [await client.post("/chat/completions", json=body) for _ in range(20)]
+        stats = (await client.get("/stats")).json()
+
+    limited = [r for r in responses if r.status_code == 429]
+    ok = [r for r in responses if r.status_code == 200]
+    assert limited and ok
+    assert all(r.headers["retry-after"] == "1" for r in limited)
+    assert isinstance(json.loads(ok[0].json()["choices"][0]["message"]["content"])["ok"], bool)
+    assert stats["429"] == len(limited)
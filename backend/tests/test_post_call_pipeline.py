@@ -0,0 +1,171 @@
+"""
+Tests for the Vapi end-of-call webhook and post-call pipeline.
+
+Checks the webhook only queues work (once per call ID, even after it has
+run), that call messages become speaker turns, and that the pipeline runs
+both analytics, finishes the remaining steps when one fails, skips
+analytics that already exist and that analytics written by a worker process
+reach the caches of the api processes.
+
+Run with: pytest tests/test_post_call_pipeline.py -v
+"""
+import asyncio
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from routers import jobs
+from services import post_call_pipeline, task_handlers
+from services.cache_invalidation import CacheInvalidationLog
+from services.post_call_pipeline import parse_call_turns, run_post_call_pipeline
+from services.task_queue import TaskQueue, STATUS_QUEUED
+
+
+def _report(call_id, interview_id):
+    return {
+        "message": {
+            "type": "end-of-call-report",
+            "call": {"id": call_id, "assistantOverrides": {"metadata": {"interviewId": interview_id}}},
+            "transcript": "AI: Hi\nUser: Tell me about yourself",
+            "messages": [
+                {"role": "system", "message": "You are a candidate"},
+                {"role": "bot", "message": "Hi, thanks for having me.", "secondsFromStart": 1.2},
+                {"role": "user", "message": "Tell me about yourself.", "secondsFromStart": 3.0},
+                {"role": "user", "message": "  "},
+            ],
+            "endedAt": "2026-03-01T10:30:00.000Z",
+            "durationSeconds": 612.4,
+        }
+    }
+
+
+@pytest.fixture
+def queue(tmp_path, monkeypatch):
+    queue = TaskQueue(db_path=str(tmp_path / "tasks.db"))
+    monkeypatch.setattr(task_handlers, "task_queue", queue)
+    return queue
+
+
+def test_call_messages_become_turns():
+    turns = parse_call_turns(_report("c", "i")["message"]["messages"])
+
+    assert turns == [
+        {"speaker": "candidate", "text": "Hi, thanks for having me.", "timestamp": 1.2},
+        {"speaker": "interviewer", "text": "Tell me about yourself.", "timestamp": 3.0},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_webhook_queues_once_per_call(queue):
+    interview_id = str(uuid4())
+
+    assert await jobs.interview_webhook(_report("call-1", interview_id)) == {"status": "ok"}
+    await jobs.interview_webhook(_report("call-1", interview_id))
+
+    tasks = queue.list_tasks(kind=task_handlers.KIND_POST_CALL)
+    assert len(tasks) == 1
+    assert tasks[0]["status"] == STATUS_QUEUED
+    assert tasks[0]["payload"]["duration_seconds"] == 612.4
+
+    # A redelivery after the pipeline ran is still ignored
+    task = queue.claim("worker")
+    queue.complete(task["id"], "worker")
+    await jobs.interview_webhook(_report("call-1", interview_id))
+    assert len(queue.list_tasks(kind=task_handlers.KIND_POST_CALL)) == 1
+
+
+@pytest.fixture
+def steps(monkeypatch):
+    calls = []
+    candidate_id = uuid4()
+
+    def record(name, result=None):
+        def step(*args):
+            calls.append(name)
+            return result
+        return step
+
+    async def interviewer(*args):
+        await asyncio.sleep(0)
+        calls.append("interviewer_analytics")
+
+    monkeypatch.setattr(post_call_pipeline, "_complete_interview", record(
+        "complete_interview", SimpleNamespace(transcript="", candidate_id=candidate_id),
+    ))
+    monkeypatch.setattr(post_call_pipeline, "_save_turns", record("save_turns"))
+    monkeypatch.setattr(post_call_pipeline, "_candidate_analytics", record("candidate_analytics"))
+    monkeypatch.setattr(post_call_pipeline, "_interviewer_for", lambda interview_id: "interviewer-1")
+    monkeypatch.setattr(post_call_pipeline, "_interviewer_analytics", interviewer)
+    monkeypatch.setattr(post_call_pipeline, "_complete_candidate", record("complete_candidate"))
+    return calls
+
+
+@pytest.mark.asyncio
+async def test_pipeline_runs_every_step(steps):
+    await run_post_call_pipeline({"interview_id": str(uuid4()), "call_id": "c"})
+
+    assert steps[:2] == ["complete_interview", "save_turns"]
+    assert set(steps[2:4]) == {"candidate_analytics", "interviewer_analytics"}
+    assert steps[-1] == "complete_candidate"
+
+
+@pytest.mark.asyncio
+async def test_failed_analytics_still_finishes_then_raises(steps, monkeypatch):
+    def broken(interview_id):
+        raise RuntimeError("LLM down")
+
+    monkeypatch.setattr(post_call_pipeline, "_candidate_analytics", broken)
+
+    with pytest.raises(RuntimeError, match="LLM down"):
+        await run_post_call_pipeline({"interview_id": str(uuid4()), "call_id": "c"})
+    assert "interviewer_analytics" in steps
+    assert steps[-1] == "complete_candidate"
+
+
+def test_existing_candidate_analytics_are_not_regenerated(monkeypatch):
+    from repositories.streamlined import analytics_repo
+    from services import analytics_generator
+
+    monkeypatch.setattr(analytics_repo, "get_db", lambda: None)
+    monkeypatch.setattr(analytics_repo.AnalyticsRepository, "get_by_interview_sync", lambda self, i: object())
+
+    def fail(interview_id):
+        raise AssertionError("analytics generated twice")
+
+    monkeypatch.setattr(analytics_generator, "generate_analytics_sync", fail)
+    post_call_pipeline._candidate_analytics(str(uuid4()))
+
+
+def test_worker_analytics_drop_the_api_processes_cached_views(local_db, monkeypatch, tmp_path):
+    from models.streamlined.analytics import AnalyticsCreate, Recommendation
+    from repositories.streamlined.analytics_repo import AnalyticsRepository
+    from services import analytics_generator, candidate_intel_cache, job_analytics_cache
+    from services.candidate_intel_cache import CandidateIntelCache
+    from services.job_analytics_cache import JobAnalyticsCache
+
+    interview_id, job_id, candidate_id = str(uuid4()), str(uuid4()), str(uuid4())
+    api, worker = (CacheInvalidationLog(db_path=tmp_path / "invalidations.db", enabled=True, poll_interval=0)
+                   for _ in range(2))
+    # This process is the worker; the api process holds the job summary and offer-prep snapshot
+    monkeypatch.setattr(job_analytics_cache.job_analytics_cache, "_invalidations", worker)
+    monkeypatch.setattr(candidate_intel_cache.candidate_intel_cache, "_invalidations", worker)
+    monkeypatch.setattr(job_analytics_cache, "invalidation_log", api)
+    monkeypatch.setattr(candidate_intel_cache, "invalidation_log", api)
+    api_summaries = JobAnalyticsCache(resolve_job={interview_id: job_id}.get, channel="job_analytics")
+    api_intel = CandidateIntelCache(channel="candidate_intel")
+    api.poll()
+    api_summaries.put(job_id, {"average_score": None})
+    api_intel.put(candidate_id, {"interviews": 0}, interview_ids=[interview_id])
+
+    def generate(interview_uuid):
+        AnalyticsRepository().create_sync(AnalyticsCreate(
+            interview_id=interview_uuid, overall_score=80, competency_scores=[], strengths=[],
+            concerns=[], red_flags_detected=[], recommendation=Recommendation.HIRE, summary="Solid",
+        ))
+
+    monkeypatch.setattr(analytics_generator, "generate_analytics_sync", generate)
+    post_call_pipeline._candidate_analytics(interview_id)
+
+    assert api_summaries.get(job_id) is None
+    assert api_intel.get(candidate_id) is None
@@ -0,0 +1,78 @@
+"""
+Tests for the api / realtime / worker process roles and the local front door.
+
+Run with: pytest tests/test_process_roles.py -v
+"""
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from db import client as db_client
+from db.client import use_db_client
+from db.local_client import LocalSupabase
+from serve import role_env
+
+
+@pytest.fixture(scope="module")
+def main():
+    # Routers build their repositories at import
+    previous = db_client._supabase_client
+    use_db_client(LocalSupabase())
+    try:
+        import main
+        yield main
+    finally:
+        use_db_client(previous)
+
+
+def _paths(main, roles) -> set:
+    app = FastAPI(openapi_url=None, docs_url=None, redoc_url=None)
+    main.include_routers(app, roles)
+    return {route.path for route in app.routes}
+
+
+def test_realtime_role_takes_live_call_routes_and_every_webhook(main):
+    realtime = _paths(main, role_env("realtime")["API_ROLES"].split(","))
+    api = _paths(main, role_env("api")["API_ROLES"].split(","))
+
+    assert "/api/voice-ingest/ws/{session_id}" in realtime
+    assert {"/api/jobs/interviews/webhook", "/api/jobs/enrich-webhook", "/api/vapi-interview/webhook"} <= realtime
+    # Only the webhooks of the jobs router
+    assert [path for path in realtime if path.startswith("/api/jobs")] == [
+        path for path in realtime if path.startswith("/api/jobs") and path.endswith("webhook")
+    ]
+    assert not any(path.startswith(("/api/voice-ingest", "/api/rooms")) for path in api)
+    assert role_env("api")["TASK_WORKER_MODE"] == role_env("realtime")["TASK_WORKER_MODE"] == "external"
+
+    with pytest.raises(ValueError):
+        main.include_routers(FastAPI(), ["realtime"])
+
+
+@pytest.mark.asyncio
+async def test_front_door_sends_requests_to_the_owning_process(main):
+    from scripts.run_local import FrontDoor, realtime_routes
+
+    seen = []
+
+    async def upstream(scope, receive, send):
+        body = (await receive())["body"]
+        port = scope["server"][1]
+        seen.append((port, scope["raw_path"] + b"?" + scope["query_string"], body))
+        await send({"type": "http.response.start", "status": 201, "headers": [(b"x-upstream", str(port).encode())]})
+        await send({"type": "http.response.body", "body": b'{"ok": true}'})
+
+    front = FrontDoor(realtime_routes(), "http://127.0.0.1:8010", "http://127.0.0.1:8011")
+    front.client = httpx.AsyncClient(transport=httpx.ASGITransport(app=upstream))
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=front), base_url="http://front") as client:
+        webhook = await client.post("/api/jobs/interviews/webhook", json={"message": {}})
+        jobs = await client.get("/api/jobs/", params={"status": "active"})
+        session = await client.get("/api/voice-ingest/abc")
+        health = await client.get("/health")
+    await front.client.aclose()
+
+    assert webhook.status_code == 201 and webhook.json() == {"ok": True}
+    assert [port for port, _, _ in seen] == [8011, 8010, 8011, 8010]
+    assert seen[0][1:] == (b"/api/jobs/interviews/webhook?", b'{"message":{}}')
+    assert seen[1][1] == b"/api/jobs/?status=active"
+    assert jobs.headers["x-upstream"] == "8010" and session.headers["x-upstream"] == "8011"
+    assert health.status_code == 201
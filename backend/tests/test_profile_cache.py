@@ -0,0 +1,146 @@
+"""
+Tests for the voice-ingest profile session cache.
+
+Verifies that tool-call mutations stay in memory, are flushed
+write-behind (debounced and at end of call), and that out-of-call
+writers see a flushed, evicted session.
+
+Run with: pytest tests/test_profile_cache.py -v
+"""
+import asyncio
+import uuid
+
+import pytest
+
+from models.voice_ingest import JobProfile, CompanyIntelligence, HardRequirements
+from repositories.job_profile_local import LocalJobProfileRepository
+from services.profile_cache import ProfileSessionCache
+
+
+class CountingRepository(LocalJobProfileRepository):
+    """Local repository that counts reads and writes."""
+
+    def __init__(self, data_dir: str):
+        super().__init__(data_dir=data_dir)
+        self.gets = 0
+        self.saves = 0
+
+    async def get(self, profile_id):
+        self.gets += 1
+        return await super().get(profile_id)
+
+    async def save(self, profile):
+        self.saves += 1
+        return await super().save(profile)
+
+
+@pytest.fixture
+def repo(tmp_path):
+    return CountingRepository(data_dir=str(tmp_path))
+
+
+@pytest.fixture
+def session_id(repo):
+    profile = JobProfile(
+        id=str(uuid.uuid4()),
+        recruiter_first_name="Test",
+        recruiter_last_name="User",
+        company=CompanyIntelligence(name="TestCorp", website="https://test.com"),
+        requirements=HardRequirements(),
+    )
+    asyncio.run(repo.create(profile))
+    return profile.id
+
+
+async def _set_title(cache: ProfileSessionCache, session_id: str, title: str):
+    async with cache.session(session_id) as profile:
+        profile.requirements.job_title = title
+        await cache.mark_dirty(session_id)
+
+
+@pytest.mark.asyncio
+async def test_tool_calls_are_batched_into_one_flush(repo, session_id):
+    cache = ProfileSessionCache(repo=repo, enabled=True, flush_delay=0.05)
+
+    for i in range(10):
+        await _set_title(cache, session_id, f"Engineer {i}")
+
+    assert repo.gets == 1
+    assert repo.saves == 0
+
+    await asyncio.sleep(0.1)
+    assert repo.saves == 1
+    stored = await LocalJobProfileRepository(data_dir=str(repo.data_dir)).get(session_id)
+    assert stored.requirements.job_title == "Engineer 9"
+
+
+@pytest.mark.asyncio
+async def test_end_session_flushes_and_evicts(repo, session_id):
+    cache = ProfileSessionCache(repo=repo, enabled=True, flush_delay=60)
+
+    await _set_title(cache, session_id, "Staff Engineer")
+    assert await cache.end_session(session_id)
+
+    assert repo.saves == 1
+    assert not cache.is_cached(session_id)
+    assert (await repo.get(session_id)).requirements.job_title == "Staff Engineer"
+
+
+@pytest.mark.asyncio
+async def test_disabled_cache_writes_through(repo, session_id):
+    cache = ProfileSessionCache(repo=repo, enabled=False)
+
+    await _set_title(cache, session_id, "A")
+    await _set_title(cache, session_id, "B")
+
+    assert repo.gets == 2
+    assert repo.saves == 2
+
+
+@pytest.mark.asyncio
+async def test_exclusive_flushes_pending_before_direct_write(repo, session_id):
+    cache = ProfileSessionCache(repo=repo, enabled=True, flush_delay=60)
+    await _set_title(cache, session_id, "From the call")
+
+    async with cache.exclusive(session_id):
+        await repo.update_research_status(session_id, "complete")
+
+    profile = await cache.get(session_id)
+    assert profile.requirements.job_title == "From the call"
+    assert profile.parallel_research_status == "complete"
+
+
+@pytest.mark.asyncio
+async def test_missing_session_yields_none(repo):
+    cache = ProfileSessionCache(repo=repo, enabled=True)
+    async with cache.session("does-not-exist") as profile:
+        assert profile is None
+
+
+@pytest.mark.asyncio
+async def test_rest_edit_is_not_overwritten_by_a_concurrent_tool_call(repo, session_id, monkeypatch):
+    from routers import voice_ingest
+
+    cache = ProfileSessionCache(repo=repo, enabled=True, flush_delay=0.1)
+    monkeypatch.setattr(voice_ingest, "profile_cache", cache)
+    monkeypatch.setattr(voice_ingest, "job_profile_repo", repo)
+
+    add_trait = repo.add_trait
+
+    async def slow_add_trait(*args):
+        await asyncio.sleep(0.05)
+        return await add_trait(*args)
+
+    monkeypatch.setattr(repo, "add_trait", slow_add_trait)
+
+    request = voice_ingest.CreateTraitRequest(name="Ownership", description="Drives work to completion")
+    rest = asyncio.create_task(voice_ingest.create_trait(session_id, request))
+    await asyncio.sleep(0.01)
+    # The tool call waits for the REST write, then loads the profile that includes it
+    await _set_title(cache, session_id, "From the call")
+    await rest
+    await asyncio.sleep(0.15)
+
+    stored = await LocalJobProfileRepository(data_dir=str(repo.data_dir)).get(session_id)
+    assert stored.requirements.job_title == "From the call"
+    assert [trait.name for trait in stored.traits] == ["Ownership"]
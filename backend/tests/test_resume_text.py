@@ -0,0 +1,140 @@
+"""
+Tests for resume text extraction: page limits, content-hash caching and
+parse timeouts or worker crashes.
+
+Run with: pytest tests/test_resume_text.py -v
+"""
+import asyncio
+import os
+import time
+
+import pytest
+
+from services import resume_text
+from services.resume_text import ResumeTextExtractor, parse_resume_bytes
+
+
+def _pdf(pages):
+    """Tiny PDF with one line of Helvetica text per page."""
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for text in pages:
+        stream = b"BT /F1 12 Tf 72 720 Td (%s) Tj ET" % text.encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % len(objects)
+        )
+        kids.append(len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(b"%d 0 R" % k for k in kids), len(kids))
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, obj)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+def _slow_parse(data, ext, max_pages):
+    time.sleep(5)
+    return "too late"
+
+
+def _crashing_parse(data, ext, max_pages):
+    if data == b"crash":
+        os._exit(1)
+    return parse_resume_bytes(data, ext, max_pages)
+
+
+def test_pdf_pages_joined_and_limited():
+    data = _pdf(["Page one", "Page two", "Page three"])
+
+    assert parse_resume_bytes(data, ".pdf", max_pages=10).split("\n") == ["Page one", "Page two", "Page three"]
+    assert parse_resume_bytes(data, ".pdf", max_pages=2).split("\n") == ["Page one", "Page two"]
+
+
+@pytest.mark.asyncio
+async def test_same_content_parsed_once(tmp_path, monkeypatch):
+    calls = []
+
+    def counting_parse(data, ext, max_pages):
+        calls.append(ext)
+        return data.decode()
+
+    monkeypatch.setattr(resume_text, "parse_resume_bytes", counting_parse)
+    extractor = ResumeTextExtractor(workers=0, cache_dir=str(tmp_path / "cache"))
+    first = tmp_path / "a.txt"
+    second = tmp_path / "b.txt"
+    first.write_text("Ada Lovelace, analyst")
+    second.write_text("Ada Lovelace, analyst")
+
+    texts = await asyncio.gather(extractor.extract(str(first)), extractor.extract(str(first)))
+    assert texts == ["Ada Lovelace, analyst"] * 2
+    assert await extractor.extract(str(second)) == "Ada Lovelace, analyst"
+    assert calls == [".txt"]
+
+    # A fresh process finds the text on disk
+    restarted = ResumeTextExtractor(workers=0, cache_dir=str(tmp_path / "cache"))
+    assert await restarted.extract(str(second)) == "Ada Lovelace, analyst"
+    assert calls == [".txt"]
+
+
+@pytest.mark.asyncio
+async def test_missing_or_unparseable_files(tmp_path):
+    extractor = ResumeTextExtractor(workers=0, cache_dir=str(tmp_path / "cache"))
+    broken = tmp_path / "broken.pdf"
+    broken.write_bytes(b"not a pdf")
+
+    assert await extractor.extract(None) is None
+    assert await extractor.extract(str(tmp_path / "missing.pdf")) is None
+    assert await extractor.extract(str(broken)) is None
+    assert not (tmp_path / "cache").exists()
+
+
+@pytest.mark.asyncio
+async def test_timeout_replaces_the_pool(tmp_path, monkeypatch):
+    monkeypatch.setattr(resume_text, "parse_resume_bytes", _slow_parse)
+    extractor = ResumeTextExtractor(workers=1, timeout=0.5, cache_dir=str(tmp_path / "cache"))
+    resume = tmp_path / "resume.txt"
+    resume.write_text("hangs the parser")
+
+    try:
+        assert await extractor.extract(str(resume)) is None
+        assert extractor._pool is None
+
+        monkeypatch.setattr(resume_text, "parse_resume_bytes", parse_resume_bytes)
+        assert await extractor.extract(str(resume)) == "hangs the parser"
+    finally:
+        extractor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_worker_crash_does_not_break_later_parses(tmp_path, monkeypatch):
+    monkeypatch.setattr(resume_text, "parse_resume_bytes", _crashing_parse)
+    extractor = ResumeTextExtractor(workers=1, cache_dir=str(tmp_path / "cache"))
+    crash, fine = tmp_path / "crash.txt", tmp_path / "fine.txt"
+    crash.write_bytes(b"crash")
+    fine.write_text("an ordinary resume")
+
+    try:
+        assert await extractor.extract(str(crash)) is None
+        assert await extractor.extract(str(fine)) == "an ordinary resume"
+    finally:
+        extractor.shutdown()
+
+
+def test_disk_cache_drops_least_recently_used_texts(tmp_path):
+    extractor = ResumeTextExtractor(workers=0, cache_dir=str(tmp_path), disk_cache_bytes=250)
+    for i, digest in enumerate(["a", "b", "c"]):
+        extractor._write_disk(digest, str(i) * 100)
+        os.utime(extractor._entry_path(digest), (i, i))
+        if digest == "b":
+            extractor._read_disk("a")  # a is used again, so b is now the oldest
+
+    assert sorted(p.stem for p in tmp_path.glob("*.txt")) == ["a", "c"]
+    assert extractor._disk_bytes == 200
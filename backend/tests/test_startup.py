@@ -0,0 +1,53 @@
+"""
+Tests for API cold start: deferred heavy imports and per-role router subsets.
+
+Run with: pytest tests/test_startup.py -v
+"""
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from services.llm_clients import LazyOpenAIClient
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+PROBE = """
+import json, sys
+import main
+print(json.dumps({
+    "paths": sorted({route.path for route in main.app.routes}),
+    "heavy": [m for m in ("openai", "supabase", "pandas") if m in sys.modules],
+}))
+"""
+
+
+def _import_main(roles: str) -> dict:
+    env = {**os.environ, "API_ROLES": roles, "DB_BACKEND": "local"}
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE], cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_public_role_serves_only_career_pages_without_heavy_imports():
+    public = _import_main("public")
+    assert public["heavy"] == []
+    assert all(
+        path.startswith(("/api/public", "/docs", "/openapi", "/redoc")) or path in ("/health", "/metrics")
+        for path in public["paths"]
+    )
+    assert any(path.startswith("/api/public") for path in public["paths"])
+
+    voice = _import_main("voice,public")
+    assert any(path.startswith("/api/vapi-interview") for path in voice["paths"])
+    assert not any(path.startswith("/api/jobs") for path in voice["paths"])
+
+
+def test_lazy_openai_client_builds_on_first_use():
+    client = LazyOpenAIClient("startup_test", api_key="test-key")
+    assert client._client is None
+    completions = client.chat.completions
+    assert client._client is not None
+    assert completions is client.get().chat.completions
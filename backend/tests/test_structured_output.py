@@ -0,0 +1,140 @@
+"""
+Tests for structured LLM output: tolerant JSON extraction, schema-guided
+repair and targeted re-asks.
+
+Run with: pytest tests/test_structured_output.py -v
+"""
+import json
+import os
+from types import SimpleNamespace
+
+import pytest
+
+os.environ.setdefault("OPENROUTER_API_KEY", "test-key")
+
+from models.prebrief import ScoreBreakdown, SkillLevel, SkillMatch
+from pydantic import BaseModel
+from services import pluto_processor
+from services.structured_output import StructuredOutputError, extract_json, generate_structured, repair
+from services.telemetry import LLM_REPAIRS, LLM_RETRIES, LLM_STRUCTURED
+
+
+class Brief(BaseModel):
+    candidate_name: str
+    overall_fit_score: int
+    score_breakdown: ScoreBreakdown
+    skill_matches: list[SkillMatch]
+
+
+SCORES = {
+    "technical_skills": 80, "experience_relevance": 70, "leadership_potential": 60,
+    "communication_signals": 75, "culture_fit_signals": 65, "growth_trajectory": 90,
+}
+
+
+def _skill(name, level="expert"):
+    return {"skill": name, "required_level": "senior", "candidate_level": level, "is_match": True}
+
+
+def _scripted(*replies):
+    sent = []
+
+    async def complete(messages, attempt):
+        sent.append((messages, attempt))
+        return replies[len(sent) - 1]
+
+    return complete, sent
+
+
+def test_extracts_json_from_fenced_chatty_and_truncated_output():
+    assert extract_json('Here you go:\n```json\n{"a": [1, 2,],}\n```\nLet me know!') == (
+        {"a": [1, 2]}, ["fence", "trailing_comma"]
+    )
+    assert extract_json('{"a": 1} Note: scores are estimates.') == ({"a": 1}, ["surrounding_text"])
+
+    cut = json.dumps({"name": "Ada", "skill_matches": [_skill("Go"), _skill("SQL")]})[:-30]
+    data, repairs = extract_json(cut)
+    assert repairs == ["truncated"]
+    assert data["name"] == "Ada" and data["skill_matches"][0] == _skill("Go")
+
+    # The incomplete last item of a cut-off array is dropped
+    data, fixes = repair(data, Brief, truncated=True)
+    assert data["skill_matches"] == [_skill("Go")] and fixes == ["dropped_item"]
+
+    with pytest.raises(ValueError):
+        extract_json("I could not evaluate this candidate.")
+
+
+def test_repairs_enum_case_and_out_of_range_scores():
+    data, repairs = repair({
+        "candidate_name": "Ada",
+        "overall_fit_score": "85%",
+        "score_breakdown": {**SCORES, "technical_skills": 112, "growth_trajectory": 72.6},
+        "skill_matches": [_skill("Go", "Expert"), _skill("Rust", "Not Found")],
+    }, Brief)
+
+    brief = Brief.model_validate(data)
+    assert brief.overall_fit_score == 85
+    assert brief.score_breakdown.technical_skills == 100 and brief.score_breakdown.growth_trajectory == 73
+    assert [s.candidate_level for s in brief.skill_matches] == [SkillLevel.EXPERT, SkillLevel.NOT_FOUND]
+    assert sorted(repairs) == ["enum_case", "enum_case", "number_format", "number_format", "out_of_range"]
+
+
+@pytest.mark.asyncio
+async def test_reasks_for_only_the_missing_fields():
+    first = {"candidate_name": "Ada", "overall_fit_score": 77, "skill_matches": [_skill("Go", "EXPERT")],
+             "score_breakdown": {k: v for k, v in SCORES.items() if k != "leadership_potential"}}
+    complete, sent = _scripted(json.dumps(first), '{"score_breakdown": {"leadership_potential": 55}}')
+    reasked = LLM_STRUCTURED.value(family="structured_test", outcome="reasked")
+
+    brief = await generate_structured(Brief, [{"role": "user", "content": "brief"}], complete, family="structured_test")
+
+    assert brief.score_breakdown.leadership_potential == 55
+    assert brief.skill_matches[0].candidate_level == SkillLevel.EXPERT
+    assert len(sent) == 2
+    followup = sent[1][0][-1]["content"]
+    assert "score_breakdown.leadership_potential" in followup and "technical_skills" not in followup
+    assert LLM_STRUCTURED.value(family="structured_test", outcome="reasked") == reasked + 1
+    assert LLM_REPAIRS.value(family="structured_test", repair="enum_case") >= 1
+
+
+@pytest.mark.asyncio
+async def test_full_retry_only_when_no_json_is_recovered():
+    valid = {"candidate_name": "Ada", "overall_fit_score": 77, "score_breakdown": SCORES, "skill_matches": []}
+    complete, sent = _scripted("Sorry, I can't help with that.", json.dumps(valid))
+    retries = LLM_RETRIES.value(family="structured_test", reason="invalid_output")
+
+    brief = await generate_structured(Brief, [{"role": "user", "content": "brief"}], complete, family="structured_test")
+    assert brief.candidate_name == "Ada"
+    assert [attempt for _, attempt in sent] == [0, 1]
+    assert LLM_RETRIES.value(family="structured_test", reason="invalid_output") == retries + 1
+
+    complete, _ = _scripted("no", "still no")
+    with pytest.raises(StructuredOutputError):
+        await generate_structured(Brief, [], complete, family="structured_test")
+
+
+@pytest.mark.asyncio
+async def test_dynamic_extraction_reasks_an_invalid_field(monkeypatch):
+    replies = iter([
+        '```json\n{"extraction": {"bio_summary": "I sell.", "years_selling": "about five", "crm_tools": null},'
+        ' "red_flags": {"job_hopping": true, "concerns": ["3 jobs in 2 years"]}}\n```',
+        '{"extraction": {"years_selling": 5}}',
+    ])
+    calls = []
+
+    async def create(**kwargs):
+        calls.append(kwargs["messages"])
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=next(replies)))])
+
+    monkeypatch.setattr(pluto_processor, "client", SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create))))
+    fields = [
+        {"field_name": "years_selling", "field_type": "number", "description": "Years in sales"},
+        {"field_name": "crm_tools", "field_type": "string_list", "description": "CRMs used"},
+    ]
+
+    result = await pluto_processor.extract_dynamic_fields({"name": "Ada"}, {"headline": "AE"}, fields)
+
+    assert result["extraction"] == {"bio_summary": "I sell.", "years_selling": 5.0, "crm_tools": []}
+    assert result["red_flags"] == ["3 jobs in 2 years"] and result["red_flag_count"] == 1
+    assert len(calls) == 2 and "extraction.years_selling" in calls[1][-1]["content"]
@@ -0,0 +1,181 @@
+"""
+Tests for the durable SQLite task queue.
+
+Covers priority ordering, idempotent keys, retries with backoff, dead
+tasks and manual retry, lease reclaim after a worker dies, and
+cross-process claiming.
+
+Run with: pytest tests/test_task_queue.py -v
+"""
+import asyncio
+import multiprocessing
+import time
+
+import pytest
+
+from services.task_queue import (
+    TaskQueue,
+    TaskWorker,
+    PRIORITY_HIGH,
+    PRIORITY_LOW,
+    STATUS_DEAD,
+    STATUS_QUEUED,
+    STATUS_RUNNING,
+    STATUS_SUCCEEDED,
+)
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return TaskQueue(db_path=str(tmp_path / "tasks.db"), retry_base_delay=0, max_attempts=3)
+
+
+def _claim_all(db_path: str, worker_id: str, result_queue) -> None:
+    queue = TaskQueue(db_path=db_path)
+    claimed = []
+    while True:
+        task = queue.claim(worker_id)
+        if task is None:
+            break
+        claimed.append(task["id"])
+        queue.complete(task["id"], worker_id)
+    result_queue.put(claimed)
+
+
+def test_higher_priority_claimed_first(queue):
+    queue.enqueue("screening", {"n": 1}, priority=PRIORITY_LOW)
+    queue.enqueue("application", {"n": 2}, priority=PRIORITY_HIGH)
+
+    assert queue.claim("w1")["kind"] == "application"
+    assert queue.claim("w1")["kind"] == "screening"
+    assert queue.claim("w1") is None
+
+
+def test_pending_key_is_idempotent(queue):
+    first = queue.enqueue("screening", {"v": 1}, key="screening:c1", priority=PRIORITY_LOW)
+    second = queue.enqueue("screening", {"v": 2}, key="screening:c1", priority=PRIORITY_HIGH)
+
+    assert second["id"] == first["id"]
+    # The queued task takes the newest payload and the higher priority
+    assert second["payload"] == {"v": 2}
+    assert second["priority"] == PRIORITY_HIGH
+
+    task = queue.claim("w1")
+    queue.complete(task["id"], "w1")
+    # Once finished, the same key enqueues new work
+    assert queue.enqueue("screening", {"v": 3}, key="screening:c1")["id"] != first["id"]
+
+
+@pytest.mark.asyncio
+async def test_failures_retry_then_go_dead(queue):
+    calls = []
+
+    async def flaky(payload):
+        calls.append(payload)
+        raise RuntimeError("LLM timeout")
+
+    task = queue.enqueue("screening", {"candidate_id": "c1"})
+    worker = TaskWorker(queue, handlers={"screening": flaky})
+
+    for _ in range(3):
+        assert await worker.run_once()
+    assert not await worker.run_once()
+
+    dead = queue.get(task["id"])
+    assert len(calls) == 3
+    assert dead["status"] == STATUS_DEAD
+    assert "LLM timeout" in dead["last_error"]
+
+    assert queue.retry(task["id"])["status"] == STATUS_QUEUED
+    assert queue.stats() == {"screening": {STATUS_QUEUED: 1}}
+
+
+@pytest.mark.asyncio
+async def test_backoff_delays_retry(tmp_path):
+    queue = TaskQueue(db_path=str(tmp_path / "tasks.db"), retry_base_delay=60)
+
+    async def failing(payload):
+        raise RuntimeError("boom")
+
+    task = queue.enqueue("screening", {})
+    worker = TaskWorker(queue, handlers={"screening": failing})
+    await worker.run_once()
+
+    requeued = queue.get(task["id"])
+    assert requeued["status"] == STATUS_QUEUED
+    assert requeued["run_after"] > time.time() + 30
+    assert queue.claim("w1") is None
+
+
+@pytest.mark.asyncio
+async def test_success_and_unknown_kind(queue):
+    seen = []
+
+    async def ok(payload):
+        seen.append(payload["x"])
+
+    done = queue.enqueue("jd_extraction", {"x": 1})
+    unknown = queue.enqueue("mystery", {})
+    worker = TaskWorker(queue, handlers={"jd_extraction": ok})
+    while await worker.run_once():
+        pass
+
+    assert seen == [1]
+    assert queue.get(done["id"])["status"] == STATUS_SUCCEEDED
+    assert queue.get(unknown["id"])["status"] == STATUS_DEAD
+
+
+def test_expired_lease_is_reclaimed(tmp_path):
+    queue = TaskQueue(db_path=str(tmp_path / "tasks.db"), lease_seconds=0.05)
+    task = queue.enqueue("screening", {})
+
+    assert queue.claim("crashed-worker")["id"] == task["id"]
+    assert queue.claim("w2") is None
+    time.sleep(0.1)
+
+    reclaimed = queue.claim("w2")
+    assert reclaimed["id"] == task["id"]
+    assert reclaimed["attempts"] == 2
+    # The crashed worker can no longer complete it
+    queue.complete(task["id"], "crashed-worker")
+    assert queue.get(task["id"])["status"] != STATUS_SUCCEEDED
+
+
+@pytest.mark.asyncio
+async def test_handler_is_cancelled_when_its_lease_is_lost(tmp_path):
+    queue = TaskQueue(db_path=str(tmp_path / "tasks.db"), lease_seconds=0.15)
+    task = queue.enqueue("screening", {})
+    cancelled = []
+
+    async def stalled(payload):
+        time.sleep(0.2)  # blocks the loop past the lease, as a stuck handler would
+        assert queue.claim("w2")["id"] == task["id"]
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    worker = TaskWorker(queue, handlers={"screening": stalled}, worker_id="w1")
+    assert await asyncio.wait_for(worker.run_once(), timeout=2)
+
+    assert cancelled == [True]
+    # The worker that re-claimed the task still owns it
+    reclaimed = queue.get(task["id"])
+    assert reclaimed["status"] == STATUS_RUNNING and reclaimed["locked_by"] == "w2"
+
+
+def test_workers_in_separate_processes_never_double_claim(queue):
+    ids = {t["id"] for t in queue.enqueue_many("screening", [{"n": i} for i in range(60)])}
+
+    ctx = multiprocessing.get_context("fork")
+    results = ctx.Queue()
+    workers = [ctx.Process(target=_claim_all, args=(str(queue.db_path), f"w{i}", results)) for i in range(3)]
+    for worker in workers:
+        worker.start()
+    claimed = [task_id for _ in workers for task_id in results.get(timeout=30)]
+    for worker in workers:
+        worker.join()
+
+    assert sorted(claimed) == sorted(ids)
+    assert queue.stats() == {"screening": {STATUS_SUCCEEDED: 60}}
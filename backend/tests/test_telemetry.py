@@ -0,0 +1,130 @@
+"""
+Tests for request/DB/LLM telemetry and the Prometheus exposition.
+
+Run with: pytest tests/test_telemetry.py -v
+"""
+from uuid import uuid4
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
+
+from db import client as db_client
+from db.client import use_db_client
+from db.local_client import LocalSupabase
+from middleware.metrics import MetricsMiddleware
+from repositories.streamlined.job_repo import JobRepository
+from services import telemetry
+from services.telemetry import (
+    DB_SECONDS,
+    HTTP_DB_ROUND_TRIPS,
+    HTTP_SECONDS,
+    LLM_RETRIES,
+    LLM_SECONDS,
+    LLM_TOKENS,
+    SPAN_SECONDS,
+    Histogram,
+    MetricsRegistry,
+    instrument_db_client,
+    llm_event_hooks,
+    llm_family,
+    span,
+)
+
+
+def test_prometheus_exposition():
+    registry = MetricsRegistry()
+    hist = registry.histogram("demo_seconds", "Demo latency", ["route"], buckets=(0.1, 1.0))
+    counter = registry.counter("demo_total", "Demo count", ["kind"])
+    hist.observe(0.05, route="/a")
+    hist.observe(0.5, route="/a")
+    hist.observe(3, route="/a")
+    counter.inc(2, kind='say "hi"')
+
+    text = registry.render()
+    assert '# TYPE demo_seconds histogram' in text
+    assert 'demo_seconds_bucket{route="/a",le="0.1"} 1' in text
+    assert 'demo_seconds_bucket{route="/a",le="1"} 2' in text
+    assert 'demo_seconds_bucket{route="/a",le="+Inf"} 3' in text
+    assert 'demo_seconds_count{route="/a"} 3' in text
+    assert 'demo_seconds_sum{route="/a"} 3.55' in text
+    assert 'demo_total{kind="say \\"hi\\""} 2' in text
+
+
+@pytest.fixture
+def db(monkeypatch):
+    local = instrument_db_client(LocalSupabase())
+    monkeypatch.setattr(db_client, "_supabase_client", None)
+    use_db_client(local)
+    monkeypatch.setattr(JobRepository, "_counts_table_available", True)
+    return local
+
+
+@pytest.mark.asyncio
+async def test_request_and_repository_metrics(db):
+    org_id = str(uuid4())
+    db.seed("job_postings", [{"organization_id": org_id, "title": "Designer", "status": "active", "deleted_at": None}])
+
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/orgs/{org_id}/jobs")
+    async def list_jobs(org_id: str):
+        with span("test.list_jobs"):
+            return [job.title for job in JobRepository().list_all_for_org_sync(org_id, fields="summary")]
+
+    @app.get("/metrics")
+    async def metrics():
+        return PlainTextResponse(telemetry.registry.render())
+
+    route = "/orgs/{org_id}/jobs"
+    before = HTTP_SECONDS.count(method="GET", route=route, status=200)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        assert (await client.get(f"/orgs/{org_id}/jobs")).json() == ["Designer"]
+        assert (await client.get("/nowhere")).status_code == 404
+        text = (await client.get("/metrics")).text
+
+    # Labelled by route template, not by the org id in the path
+    assert HTTP_SECONDS.count(method="GET", route=route, status=200) == before + 1
+    assert HTTP_SECONDS.count(method="GET", route="unmatched", status=404) >= 1
+    assert SPAN_SECONDS.count(span="test.list_jobs") >= 1
+    # The job query, then the counts table (absent locally) and the fallback count
+    assert DB_SECONDS.count(repository="JobRepository", method="list_all_for_org_sync", table="job_postings", operation="select") >= 1
+    assert 'http_request_db_round_trips_bucket{method="GET",route="/orgs/{org_id}/jobs",le="0"} 0' in text
+    assert HTTP_DB_ROUND_TRIPS.count(method="GET", route=route) >= 1
+
+
+@pytest.mark.asyncio
+async def test_llm_hooks_record_latency_tokens_and_retries():
+    def reply(request):
+        return httpx.Response(200, json={
+            "model": "mock/model",
+            "choices": [{"message": {"content": "{}"}}],
+            "usage": {"prompt_tokens": 120, "completion_tokens": 30},
+        })
+
+    before = LLM_SECONDS.count(family="telemetry_test", model="mock/model", status=200)
+    async with httpx.AsyncClient(transport=httpx.MockTransport(reply), event_hooks=llm_event_hooks("telemetry_test")) as client:
+        response = await client.post("http://llm/chat/completions", json={})
+        # The hook read the body; the caller still can
+        assert response.json()["usage"]["completion_tokens"] == 30
+        await client.post("http://llm/chat/completions", json={}, headers={"x-stainless-retry-count": "1"})
+        with llm_family("telemetry_override"):
+            await client.post("http://llm/chat/completions", json={})
+
+    assert LLM_SECONDS.count(family="telemetry_test", model="mock/model", status=200) == before + 2
+    assert LLM_TOKENS.value(family="telemetry_test", model="mock/model", type="prompt") >= 240
+    assert LLM_RETRIES.value(family="telemetry_test", reason="sdk") >= 1
+    assert LLM_SECONDS.count(family="telemetry_override", model="mock/model", status=200) >= 1
+
+
+def test_histogram_bucket_edges():
+    hist = Histogram("edge_seconds", "Edges", buckets=(1.0, 2.0))
+    hist.observe(1.0)
+    hist.observe(2.5)
+    samples = list(hist.samples())
+    assert 'edge_seconds_bucket{le="1"} 1' in samples
+    assert 'edge_seconds_bucket{le="2"} 1' in samples
+    assert 'edge_seconds_bucket{le="+Inf"} 2' in samples
@@ -10,6 +10,7 @@ import asyncio
 import sys
 import os
 import json
+import shutil
 import uuid
 from pathlib import Path
 from datetime import datetime
@@ -378,12 +379,8 @@ def test_phase2_repository():
         except Exception as e:
             results.add_result("Repository delete", False, str(e))
 
-        # Cleanup test file
-        try:
-            (test_dir / "job_profiles.json").unlink(missing_ok=True)
-            test_dir.rmdir()
-        except:
-            pass
+        # Cleanup test data
+        shutil.rmtree(test_dir, ignore_errors=True)
 
     asyncio.run(run_repo_tests())
 
@@ -810,11 +807,7 @@ def test_integration():
 
             # Cleanup
             await repo.delete(session_id)
-            try:
-                (test_dir / "job_profiles.json").unlink(missing_ok=True)
-                test_dir.rmdir()
-            except:
-                pass
+            shutil.rmtree(test_dir, ignore_errors=True)
 
             results.add_result("Integration workflow complete", True)
 
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Background task worker.
+
+Runs queued screening, resume, JD extraction and analytics tasks outside the
+API process. Start one or more alongside the API and set
+TASK_WORKER_MODE=external so the API stops running tasks itself.
+
+Usage: python worker.py [--concurrency 4] [--kinds screening application]
+       (or python serve.py worker, the common entry point for every process role)
+"""
+import argparse
+import asyncio
+import logging
+import os
+import signal
+
+# The API runs with TASK_WORKER_MODE=external whenever this process exists; set it
+# before config is imported so the shared idempotency and cache invalidation
+# backends are picked here too (see MULTI_PROCESS in config.py)
+os.environ["TASK_WORKER_MODE"] = "external"
+
+from config import TASK_WORKER_CONCURRENCY
+from services.llm_usage import usage_ledger
+from services.task_queue import task_queue, TaskWorker
+import services.task_handlers  # noqa: F401  (registers handlers)
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s")
+
+
+async def main(concurrency: int, kinds: list) -> None:
+    worker = TaskWorker(task_queue, concurrency=concurrency, kinds=kinds or None)
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        # Stop claiming; running tasks finish (or are reclaimed after their lease)
+        loop.add_signal_handler(sig, worker.stop)
+    await worker.run()
+    # Write buffered LLM usage records before exit
+    await asyncio.to_thread(usage_ledger.flush)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concurrency", type=int, default=TASK_WORKER_CONCURRENCY)
+    parser.add_argument("--kinds", nargs="*", default=[], help="Only run these task kinds")
+    args = parser.parse_args()
+    asyncio.run(main(args.concurrency, args.kinds))
@@ -672,7 +672,7 @@ export default function DashboardPage() {
 
         // Jobs - required
         try {
-          const jobsResponse = await fetch(`${API_URL}/api/jobs/?recruiter_id=${recruiterId}`, { headers });
+          const jobsResponse = await fetch(`${API_URL}/api/jobs/?recruiter_id=${recruiterId}&fields=summary`, { headers });
           if (jobsResponse.ok) {
             const jobsData = await jobsResponse.json();
             const sortedJobs = jobsData.sort((a: Job, b: Job) => {
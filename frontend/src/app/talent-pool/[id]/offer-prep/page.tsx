@@ -248,7 +248,7 @@ export default function OfferPrepPage() {
         try {
             setLoading(true);
             const res = await fetch(
-                `${API_URL}/api/offer-prep/candidate/${candidateId}/context?include_market_data=true`
+                `${API_URL}/api/offer-prep/candidate/${candidateId}/context?include_market_data=true&include_transcripts=false`
             );
             if (!res.ok) {
                 const data = await res.json();
@@ -105,11 +105,12 @@ export function useJobs(recruiterId?: string, status?: string) {
   return useQuery({
     queryKey: ["jobs", recruiterId, status],
     queryFn: async (): Promise<Job[]> => {
-      const params = new URLSearchParams();
+      // List views only render title, status, stages and counts
+      const params = new URLSearchParams({ fields: "summary" });
       if (recruiterId) params.append("recruiter_id", recruiterId);
       if (status && status !== "all") params.append("status", status);
 
-      const url = `${API_URL}/api/jobs/${params.toString() ? `?${params}` : ""}`;
+      const url = `${API_URL}/api/jobs/?${params}`;
       const response = await fetch(url, { headers: getHeaders() });
 
       if (!response.ok) {